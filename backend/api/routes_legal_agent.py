@@ -30,8 +30,8 @@ from models.schemas import (
     LegalGroundingChunk,
 )
 from core.legal_rag_service import LegalRAGService
+from core.supabase_vector_store import SupabaseVectorStore
 from core.document_processor_v2 import DocumentProcessor
-from core.contract_storage import ContractStorageService
 from core.clause_extractor import extract_clauses
 from core.dependencies import (
     get_legal_service,
@@ -249,6 +249,9 @@ async def legal_chat_agent(
     # ---------- 2. 모드별 컨텍스트 준비 ----------
     contract_analysis = None
     situation_analysis = None
+    # 분석 리포트 원본 (세션 캐시 스냅샷, 요청당 한 번만 조회)
+    contract_saved_analysis: Optional[Dict[str, Any]] = None
+    situation_saved_analysis: Optional[Dict[str, Any]] = None
     used_reports: List[UsedReportMeta] = []
     used_sources: List[UsedSourceMeta] = []
     
@@ -477,14 +480,16 @@ async def legal_chat_agent(
         
         # 후속 요청: 기존 분석 참고 (고정 ID 사용)
         if contract_analysis_id is not None and contract_analysis is None:
-            saved_analysis = await storage_service.get_contract_analysis(contract_analysis_id, user_id)
-            if saved_analysis:
+            contract_saved_analysis = await storage_service.get_session_analysis(
+                session_id, "contract", contract_analysis_id, user_id
+            )
+            if contract_saved_analysis:
                 contract_analysis = ContractAnalysisSummary(
-                    id=saved_analysis.get("id", contract_analysis_id),
-                    title=saved_analysis.get("title"),
-                    riskScore=saved_analysis.get("riskScore") or saved_analysis.get("risk_score"),
-                    riskLevel=saved_analysis.get("riskLevel") or saved_analysis.get("risk_level"),
-                    summary=saved_analysis.get("summary"),
+                    id=contract_saved_analysis.get("id", contract_analysis_id),
+                    title=contract_saved_analysis.get("title"),
+                    riskScore=contract_saved_analysis.get("riskScore") or contract_saved_analysis.get("risk_score"),
+                    riskLevel=contract_saved_analysis.get("riskLevel") or contract_saved_analysis.get("risk_level"),
+                    summary=contract_saved_analysis.get("summary"),
                 )
             else:
                 raise HTTPException(
@@ -670,14 +675,16 @@ async def legal_chat_agent(
         
         # 후속 요청: 기존 분석 참고
         if situation_analysis_id is not None and situation_analysis is None:
-            saved_analysis = await storage_service.get_situation_analysis(situation_analysis_id, user_id)
-            if saved_analysis:
+            situation_saved_analysis = await storage_service.get_session_analysis(
+                session_id, "situation", situation_analysis_id, user_id
+            )
+            if situation_saved_analysis:
                 situation_analysis = SituationAnalysisSummary(
-                    id=saved_analysis.get("id", situation_analysis_id),
-                    title=saved_analysis.get("title"),
-                    riskScore=saved_analysis.get("riskScore") or saved_analysis.get("risk_score"),
-                    riskLevel=saved_analysis.get("riskLevel") or saved_analysis.get("risk_level"),
-                    summary=saved_analysis.get("summary") or saved_analysis.get("answer", ""),
+                    id=situation_saved_analysis.get("id", situation_analysis_id),
+                    title=situation_saved_analysis.get("title"),
+                    riskScore=situation_saved_analysis.get("riskScore") or situation_saved_analysis.get("risk_score"),
+                    riskLevel=situation_saved_analysis.get("riskLevel") or situation_saved_analysis.get("risk_level"),
+                    summary=situation_saved_analysis.get("summary") or situation_saved_analysis.get("answer", ""),
                 )
             else:
                 raise HTTPException(
@@ -695,29 +702,24 @@ async def legal_chat_agent(
             )
     
     # ---------- 3. 히스토리 로드 ----------
-    history_messages = await storage_service.get_chat_messages(session_id, user_id)
-    # 최근 30개만 사용 (sequence_number 역순으로 정렬되어 있으므로 뒤에서 30개)
-    history_messages = history_messages[-30:] if len(history_messages) > 30 else history_messages
+    # 최근 N개만 사용 (세션 캐시 우선, 없으면 ORDER BY sequence_number DESC LIMIT N)
+    history_messages = await storage_service.get_recent_chat_messages(session_id, user_id)
     
     # ---------- 4. LLM 컨텍스트 구성 + 답변 생성 ----------
     # 컨텍스트 데이터 준비
     context_type = _context_type_from_mode(mode)
     context_data = None
     
-    if contract_analysis:
-        saved_analysis = await storage_service.get_contract_analysis(contract_analysis.id, user_id)
-        if saved_analysis:
-            context_data = {
-                "type": "contract",
-                "analysis": saved_analysis,
-            }
-    elif situation_analysis:
-        saved_analysis = await storage_service.get_situation_analysis(situation_analysis.id, user_id)
-        if saved_analysis:
-            context_data = {
-                "type": "situation",
-                "analysis": saved_analysis,
-            }
+    if contract_analysis and contract_saved_analysis:
+        context_data = {
+            "type": "contract",
+            "analysis": contract_saved_analysis,
+        }
+    elif situation_analysis and situation_saved_analysis:
+        context_data = {
+            "type": "situation",
+            "analysis": situation_saved_analysis,
+        }
     
     # RAG 검색 및 답변 생성 (Agent 서비스 사용)
     agent_service = AgentChatService()
@@ -751,7 +753,7 @@ async def legal_chat_agent(
             )
     elif mode == LegalChatMode.contract and contract_analysis:
         # Contract 모드: 계약서 분석 결과 기반
-        saved_analysis = await storage_service.get_contract_analysis(contract_analysis.id, user_id)
+        saved_analysis = contract_saved_analysis
         if saved_analysis:
             answer_markdown = await agent_service.chat_contract(
                 query=message,
@@ -778,7 +780,7 @@ async def legal_chat_agent(
                 )
     elif mode == LegalChatMode.situation and situation_analysis:
         # Situation 모드: 상황 분석 결과 기반
-        saved_analysis = await storage_service.get_situation_analysis(situation_analysis.id, user_id)
+        saved_analysis = situation_saved_analysis
         if saved_analysis:
             # 상황 분석 결과를 dict 형식으로 변환
             analysis_dict = {
@@ -859,7 +861,7 @@ async def legal_chat_agent(
         logger.info(f"[Agent API] source_type별 개수: {source_type_counts}")
         
         # case 타입 chunk를 케이스 카드로 변환
-        extracted_cases = await _extract_cases_from_chunks(legal_chunks, storage_service)
+        extracted_cases = await _extract_cases_from_chunks(legal_chunks, legal_service.vector_store)
         logger.info(f"[Agent API] 케이스 추출 완료: {len(extracted_cases)}개")
         
         # LLM 응답(answer_markdown)에서 JSON 추출 및 cases 필드를 실제 추출한 cases로 대체
@@ -932,23 +934,6 @@ async def legal_chat_agent(
             )
     
     # ---------- 5. 메시지 저장 ----------
-    # 시퀀스 번호 계산
-    if history_messages:
-        max_seq = max(msg.get("sequence_number", 0) for msg in history_messages)
-        next_seq = max_seq + 1
-    else:
-        next_seq = 1
-    
-    await storage_service.save_chat_message(
-        session_id=session_id,
-        user_id=user_id,
-        sender_type="user",
-        message=message,
-        sequence_number=next_seq,
-        context_type=context_type,
-        context_id=contract_analysis_id or situation_analysis_id,
-    )
-    
     # assistant 메시지 metadata에 cases 추가 (situation 모드일 때만)
     assistant_metadata = None
     if mode == LegalChatMode.situation:
@@ -958,15 +943,16 @@ async def legal_chat_agent(
         }
         logger.info(f"[Agent API] assistant metadata에 cases 저장: {len(extracted_cases)}개")
     
-    await storage_service.save_chat_message(
+    # user + assistant 메시지를 한 번에 저장 (sequence_number는 서버에서 할당)
+    await storage_service.save_chat_turn(
         session_id=session_id,
         user_id=user_id,
-        sender_type="assistant",
-        message=answer_markdown,
-        sequence_number=next_seq + 1,
+        messages=[
+            {"sender_type": "user", "message": message},
+            {"sender_type": "assistant", "message": answer_markdown, "metadata": assistant_metadata},
+        ],
         context_type=context_type,
         context_id=contract_analysis_id or situation_analysis_id,
-        metadata=assistant_metadata,
     )
     
     # ---------- 6. 응답 ----------
@@ -1004,14 +990,14 @@ def _context_type_from_mode(mode: LegalChatMode) -> str:
 
 async def _extract_cases_from_chunks(
     legal_chunks: List[Dict[str, Any]], 
-    storage_service: Optional[ContractStorageService] = None
+    vector_store: Optional[SupabaseVectorStore] = None
 ) -> List[CaseCard]:
     """
     legal chunk 중 source_type이 'case'인 것들을 케이스 카드 형태로 변환
     
     Args:
         legal_chunks: legal chunk 목록 (dict)
-        storage_service: DB에서 metadata를 조회하기 위한 서비스 (옵션)
+        vector_store: metadata가 없는 케이스를 일괄 조회하기 위한 공유 벡터 스토어 (옵션)
     
     Returns:
         CaseCard 목록
@@ -1021,12 +1007,13 @@ async def _extract_cases_from_chunks(
     
     logger.info(f"[케이스 추출] legal_chunks 개수: {len(legal_chunks)}개")
     
+    # 1단계: case 타입 chunk 수집 (중복 제거)
+    case_chunks = []
     for chunk in legal_chunks:
         # dict 형태 처리
         source_type = chunk.get("source_type", "")
         external_id = chunk.get("external_id") or chunk.get("externalId", "")
         title = chunk.get("title", "")
-        snippet = chunk.get("snippet", "") or chunk.get("content", "")
         
         # case 타입만 처리
         if source_type != "case":
@@ -1039,35 +1026,33 @@ async def _extract_cases_from_chunks(
         if not case_id or case_id in seen_case_ids:
             continue
         seen_case_ids.add(case_id)
+        case_chunks.append((case_id, chunk))
+    
+    # 2단계: metadata가 없는 케이스는 한 번의 in_ 쿼리로 일괄 조회 (메모리 캐시 사용)
+    fetched_metadata: Dict[str, Dict[str, Any]] = {}
+    if vector_store is not None:
+        missing_ids = [
+            chunk.get("external_id") or chunk.get("externalId")
+            for _, chunk in case_chunks
+            if not chunk.get("metadata") and (chunk.get("external_id") or chunk.get("externalId"))
+        ]
+        if missing_ids:
+            fetched_metadata = vector_store.get_case_metadata_batch(missing_ids)
+    
+    # 3단계: 케이스 카드 구성
+    for case_id, chunk in case_chunks:
+        external_id = chunk.get("external_id") or chunk.get("externalId", "")
+        title = chunk.get("title", "")
+        snippet = chunk.get("snippet", "") or chunk.get("content", "")
         
-        # metadata 추출 (chunk에서 직접 또는 DB에서 조회)
-        metadata = chunk.get("metadata", {})
-        
-        # metadata가 없고 storage_service가 있으면 DB에서 조회 시도
-        if not metadata and storage_service and external_id:
-            try:
-                # legal_chunks 테이블에서 metadata 조회
-                from config import settings
-                from supabase import create_client
-                sb = create_client(settings.supabase_url, settings.supabase_key)
-                result = sb.table("legal_chunks")\
-                    .select("metadata")\
-                    .eq("external_id", external_id)\
-                    .eq("source_type", "case")\
-                    .limit(1)\
-                    .execute()
-                
-                if result.data and len(result.data) > 0:
-                    metadata = result.data[0].get("metadata", {})
-            except Exception as e:
-                logger.warning(f"[케이스 추출] DB에서 metadata 조회 실패 (external_id={external_id}): {str(e)}")
+        # metadata 추출 (chunk에서 직접 또는 일괄 조회 결과에서)
+        metadata = chunk.get("metadata") or fetched_metadata.get(external_id, {})
         
         # metadata가 문자열이면 파싱
         if isinstance(metadata, str):
             try:
-                import json
                 metadata = json.loads(metadata)
-            except:
+            except ValueError:
                 metadata = {}
         
         # 케이스 카드 데이터 구성
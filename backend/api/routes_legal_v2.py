@@ -3,8 +3,9 @@ Legal RAG API Routes v2
 법률 리스크 분석 API 엔드포인트 (v2 - 가이드 스펙 준수)
 """
 
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException, status, Query, Header
-from fastapi.responses import StreamingResponse, RedirectResponse
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, status, Query, Header, Request
+from fastapi.responses import RedirectResponse
+from starlette.background import BackgroundTask
 from typing import Optional, List, Dict, Any
 import tempfile
 import os
@@ -14,7 +15,6 @@ from pathlib import Path
 from datetime import datetime
 import uuid
 import re
-from supabase import create_client
 from config import settings
 
 from models.schemas import (
@@ -47,18 +47,21 @@ from models.schemas import (
     ContractAnalysisSummary,
     SituationAnalysisSummary,
 )
-from core.legal_rag_service import LegalRAGService
+from core.legal_rag_service import LegalRAGService, CONTRACT_ANALYSIS_MODES
 from core.document_processor_v2 import DocumentProcessor
 from core.contract_storage import ContractStorageService
 from core.tools import ClauseLabelingTool, HighlightTool, RewriteTool
-from core.snippet_analyzer import analyze_snippet
+from core.snippet_analyzer import get_snippet_analysis_store
 from core.dependencies import (
     get_legal_service_dep,
     get_processor_dep,
     get_storage_service_dep,
 )
-from core.logging_config import get_logger
+from core.logging_config import get_logger, preview
 from core.clause_extractor import extract_clauses
+from core.clause_alignment import compare_clauses
+from core.file_serving import serve_local_file, guess_content_type, get_legal_file_cache
+from core.file_utils import get_storage_url_resolver
 
 router = APIRouter(
     prefix="/api/v2/legal",
@@ -91,6 +94,24 @@ _contract_analyses = {}
 logger = get_logger(__name__)
 
 
+def parse_history_cursor(before: Optional[str], before_id: Optional[str]) -> tuple[Optional[str], Optional[str]]:
+    """
+    히스토리 keyset 커서 검증 및 정규화 (PostgREST 필터에 그대로 들어가므로 형식이 틀리면 400)
+
+    Returns:
+        (ISO-8601 created_at, UUID 문자열)
+    """
+    try:
+        before_value = datetime.fromisoformat(before).isoformat() if before else None
+        before_id_value = str(uuid.UUID(before_id)) if before_id else None
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="before는 ISO-8601 시각, before_id는 UUID여야 합니다",
+        )
+    return before_value, before_id_value
+
+
 @router.get("/health")
 async def health():
     """헬스 체크"""
@@ -152,6 +173,7 @@ async def analyze_contract(
     user_role: Optional[str] = Form(None, description="역할: worker (을/프리랜서/근로자) | employer (갑/발주사/고용주)"),
     field: Optional[str] = Form(None, description="분야: it_dev | design | marketing | other"),
     concerns: Optional[str] = Form(None, description="우선 확인하고 싶은 고민"),
+    analysis_mode: Optional[str] = Form(None, description="분석 모드: monolithic (전체 한 번) | map_reduce (조항 그룹별 병렬), 기본값은 설정값"),
 ):
     """
     계약서 PDF/HWPX 업로드 → 위험 분석
@@ -163,6 +185,11 @@ async def analyze_contract(
     
     if not file.filename:
         raise HTTPException(status_code=400, detail="파일이 필요합니다.")
+    if analysis_mode and analysis_mode not in CONTRACT_ANALYSIS_MODES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"analysis_mode는 {', '.join(CONTRACT_ANALYSIS_MODES)} 중 하나여야 합니다.",
+        )
 
     # STEP 1 - 캐시 조회: 같은 파일이면 DB에서 바로 불러오기
     # ⚠️ 개발/테스트 단계: 캐시 조회 비활성화 (항상 분석 수행)
@@ -223,7 +250,10 @@ async def analyze_contract(
         )
         
         # extracted_text 추출 확인 로깅
-        logger.info(f"[계약서 분석] 텍스트 추출 완료: extracted_text 길이={len(extracted_text) if extracted_text else 0}, 미리보기={extracted_text[:100] if extracted_text else '(없음)'}")
+        logger.info(
+            "[계약서 분석] 텍스트 추출 완료: extracted_text 길이=%d, 미리보기=%s",
+            len(extracted_text) if extracted_text else 0, preview(extracted_text, 100),
+        )
         
         if not extracted_text or extracted_text.strip() == "":
             logger.error(f"[계약서 분석] 텍스트 추출 실패: extracted_text가 비어있음")
@@ -306,6 +336,7 @@ async def analyze_contract(
                 contract_type=contract_type,
                 user_role=user_role,
                 field=field,
+                analysis_mode=analysis_mode,
             )
         
         # 분석 실행
@@ -326,6 +357,8 @@ async def analyze_contract(
             "probation_termination": 0,
             "stock_option_ip": 0,
         }
+        if result.sections:
+            sections.update(result.sections)  # map-reduce 모드: 조항 점수 기반 영역별 점수
         
         # issues 변환: clause_id 기반으로 original_text 채우기
         issues = []
@@ -335,8 +368,7 @@ async def analyze_contract(
         raw_issues_count = len(result.issues) if result and result.issues else 0
         logger.info(f"[DEBUG] rawIssues 개수: {raw_issues_count}")
         if result and result.issues and len(result.issues) > 0:
-            logger.info(f"[DEBUG] rawIssues[0] 샘플: {result.issues[0]}")
-            logger.info(f"[DEBUG] rawIssues[0] 속성: name={getattr(result.issues[0], 'name', 'N/A')}, clause_id={getattr(result.issues[0], 'clause_id', 'N/A')}, category={getattr(result.issues[0], 'category', 'N/A')}")
+            logger.debug("[DEBUG] rawIssues[0] 샘플: %s", preview(result.issues[0], 300))
         
         logger.info(f"[계약서 분석] result.issues 개수: {raw_issues_count}")
         
@@ -788,7 +820,39 @@ async def analyze_contract(
                         logger.debug(f"[하이라이트 생성] issue {issue_v2.id}에 startIndex={issue_v2.startIndex}, endIndex={issue_v2.endIndex} 설정")
                     else:
                         logger.warning(f"[하이라이트 생성] issue {issue_v2.id}의 clauseId {issue_v2.clauseId}를 clauses_dict에서 찾을 수 없음")
-            
+
+            # 6. 조항에 매칭되지 않은 이슈는 originalText 위치를 원문에서 찾아 하이라이트 (HighlightTool)
+            highlighted_issue_ids = {ht.issueId for ht in highlighted_texts}
+            unmatched_issues = [
+                {"id": issue_v2.id, "originalText": issue_v2.originalText, "severity": issue_v2.severity}
+                for issue_v2 in issues
+                if issue_v2.id not in highlighted_issue_ids and issue_v2.originalText
+            ]
+            if unmatched_issues and extracted_text:
+                highlight_result = await HighlightTool().execute(
+                    contract_text=extracted_text,
+                    issues=unmatched_issues,
+                )
+                issues_by_id = {issue_v2.id: issue_v2 for issue_v2 in issues}
+                for ht_dict in highlight_result.get("highlightedTexts", []):
+                    highlighted_texts.append(
+                        HighlightedTextV2(
+                            text=ht_dict["text"],
+                            startIndex=ht_dict["startIndex"],
+                            endIndex=ht_dict["endIndex"],
+                            severity=ht_dict["severity"],
+                            issueId=ht_dict["issueId"],
+                        )
+                    )
+                    issue_v2 = issues_by_id.get(ht_dict["issueId"])
+                    if issue_v2 is not None and issue_v2.startIndex is None:
+                        issue_v2.startIndex = ht_dict["startIndex"]
+                        issue_v2.endIndex = ht_dict["endIndex"]
+                logger.info(
+                    f"[하이라이트 생성] 조항 미매칭 이슈 {len(unmatched_issues)}개 중 "
+                    f"{len(highlight_result.get('highlightedTexts', []))}개 원문 위치 매칭"
+                )
+
             logger.info(f"[계약서 분석] clause 기반 처리 완료: {len(clauses)}개 조항, {len(highlighted_texts)}개 하이라이트")
             
             # 검증: clauses가 비어있으면 경고
@@ -1013,59 +1077,30 @@ async def compare_contracts(
     try:
         storage_service = get_storage_service()
         
-        # 이전 계약서 조회
-        old_contract = await storage_service.get_contract_analysis(request.oldContractId)
+        # 이전/새 계약서 동시 조회
+        old_contract, new_contract = await asyncio.gather(
+            storage_service.get_contract_analysis(request.oldContractId),
+            storage_service.get_contract_analysis(request.newContractId),
+        )
         if not old_contract:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"이전 계약서를 찾을 수 없습니다: {request.oldContractId}"
             )
-        
-        # 새 계약서 조회
-        new_contract = await storage_service.get_contract_analysis(request.newContractId)
         if not new_contract:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"새 계약서를 찾을 수 없습니다: {request.newContractId}"
             )
         
-        # 변경된 조항 찾기
-        changed_clauses = []
-        old_clauses = {clause.get("id"): clause for clause in old_contract.get("clauses", [])}
-        new_clauses = {clause.get("id"): clause for clause in new_contract.get("clauses", [])}
-        
-        # 새로 추가된 조항
-        for clause_id, clause in new_clauses.items():
-            if clause_id not in old_clauses:
-                changed_clauses.append({
-                    "type": "added",
-                    "clauseId": clause_id,
-                    "title": clause.get("title"),
-                    "content": clause.get("content")
-                })
-        
-        # 삭제된 조항
-        for clause_id, clause in old_clauses.items():
-            if clause_id not in new_clauses:
-                changed_clauses.append({
-                    "type": "removed",
-                    "clauseId": clause_id,
-                    "title": clause.get("title"),
-                    "content": clause.get("content")
-                })
-        
-        # 수정된 조항
-        for clause_id in old_clauses.keys() & new_clauses.keys():
-            old_clause = old_clauses[clause_id]
-            new_clause = new_clauses[clause_id]
-            if old_clause.get("content") != new_clause.get("content"):
-                changed_clauses.append({
-                    "type": "modified",
-                    "clauseId": clause_id,
-                    "title": new_clause.get("title"),
-                    "oldContent": old_clause.get("content"),
-                    "newContent": new_clause.get("content")
-                })
+        # 변경된 조항 찾기 (조항 번호가 아니라 내용으로 정렬 후 비교)
+        alignment_stats: Dict[str, Any] = {}
+        changed_clauses = compare_clauses(
+            old_contract.get("clauses", []) or [],
+            new_contract.get("clauses", []) or [],
+            stats=alignment_stats,
+        )
+        logger.info(f"[계약서 비교] 조항 정렬 결과: {alignment_stats}")
         
         # 위험도 변화
         risk_change = {
@@ -1077,7 +1112,10 @@ async def compare_contracts(
         }
         
         # 비교 요약 생성
-        summary = f"총 {len(changed_clauses)}개 조항이 변경되었습니다. "
+        summary = (
+            f"총 {len(changed_clauses)}개 조항이 변경되었습니다 "
+            f"(수정 {alignment_stats['modified']}, 추가 {alignment_stats['added']}, 삭제 {alignment_stats['removed']}). "
+        )
         summary += f"위험도: {risk_change['oldRiskScore']:.1f} → {risk_change['newRiskScore']:.1f} "
         summary += f"({risk_change['riskScoreDelta']:+.1f})"
         
@@ -1156,16 +1194,21 @@ async def get_contract_history(
     x_user_id: str = Header(..., alias="X-User-Id", description="사용자 ID"),
     limit: int = Query(20, ge=1, le=100, description="조회 개수"),
     offset: int = Query(0, ge=0, description="오프셋"),
+    before: Optional[str] = Query(None, description="keyset 커서: 이전 페이지 마지막 항목의 created_at (지정 시 offset 무시)"),
+    before_id: Optional[str] = Query(None, description="keyset 커서 보조키: 이전 페이지 마지막 항목의 id (before와 함께 사용)"),
 ):
     """
     사용자별 계약서 분석 히스토리 조회
     """
+    before, before_id = parse_history_cursor(before, before_id)
     try:
         storage_service = get_storage_service()
         history = await storage_service.get_user_contract_analyses(
             user_id=x_user_id,
             limit=limit,
             offset=offset,
+            before=before,
+            before_id=before_id,
         )
         return history
     except Exception as e:
@@ -1498,9 +1541,16 @@ async def analyze_situation(
         # DB 조회용 vector_store 인스턴스
         from core.supabase_vector_store import SupabaseVectorStore
         vector_store = SupabaseVectorStore()
-        # snippet 분석 함수 (이미 위에서 import됨)
+        # snippet 분석: 사전 계산 결과 일괄 조회 (source별 LLM 호출 없음, 미스는 snippet_analysis_fill_mode에 따라 처리)
+        try:
+            analyzed_snippets = await get_snippet_analysis_store().get_many(
+                [chunk.get("snippet", "") for chunk in grounding_chunks]
+            )
+        except Exception as e:
+            _logger.error(f"source snippet 분석 결과 조회 실패: {str(e)}", exc_info=True)
+            analyzed_snippets = [None] * len(grounding_chunks)
         
-        for chunk in grounding_chunks:
+        for chunk, analyzed_snippet in zip(grounding_chunks, analyzed_snippets):
             source_id = chunk.get("source_id", "")  # legal_chunks.id (UUID)
             source_type = chunk.get("source_type", "law")
             # externalId는 grounding_chunks에서 제공된 external_id 사용 (실제 파일 ID)
@@ -1525,18 +1575,7 @@ async def analyze_situation(
                 except Exception as e:
                     _logger.warning(f"source fileUrl 생성 실패 (externalId={external_id}, sourceType={source_type}): {str(e)}")
             
-            # snippet 분석
             original_snippet = chunk.get("snippet", "")
-            analyzed_snippet = None
-            try:
-                _logger.debug(f"[analyze-situation] source snippet 분석 시작 (sourceId={source_id}, snippet 길이={len(original_snippet)})")
-                analyzed_snippet = await analyze_snippet(original_snippet)
-                if analyzed_snippet:
-                    _logger.debug(f"[analyze-situation] source snippet 분석 성공 (sourceId={source_id}): core_clause={analyzed_snippet.get('core_clause', '')[:50]}")
-                else:
-                    _logger.warning(f"[analyze-situation] source snippet 분석 결과 None (sourceId={source_id})")
-            except Exception as e:
-                _logger.error(f"source snippet 분석 실패 (sourceId={source_id}): {str(e)}", exc_info=True)
             
             sources.append({
                 "sourceId": source_id,  # legal_chunks.id (UUID)
@@ -1676,10 +1715,13 @@ async def get_situation_history(
     x_user_id: Optional[str] = Header(None, alias="X-User-Id", description="사용자 ID"),
     limit: int = Query(20, ge=1, le=100, description="조회 개수"),
     offset: int = Query(0, ge=0, description="오프셋"),
+    before: Optional[str] = Query(None, description="keyset 커서: 이전 페이지 마지막 항목의 created_at (지정 시 offset 무시)"),
+    before_id: Optional[str] = Query(None, description="keyset 커서 보조키: 이전 페이지 마지막 항목의 id (before와 함께 사용)"),
 ):
     """
     사용자별 상황 분석 히스토리 조회
     """
+    before, before_id = parse_history_cursor(before, before_id)
     try:
         if not x_user_id:
             logger.warning("사용자 ID가 제공되지 않아 빈 배열 반환")
@@ -1690,6 +1732,8 @@ async def get_situation_history(
             user_id=x_user_id,
             limit=limit,
             offset=offset,
+            before=before,
+            before_id=before_id,
         )
         return history
     except Exception as e:
@@ -2081,6 +2125,7 @@ async def chat_with_contract(
 
 @router.get("/file")
 async def get_legal_file(
+    request: Request,
     path: str = Query(..., description="파일 경로 (Storage 경로 또는 로컬 상대 경로)"),
     download: bool = Query(False, description="다운로드 모드 (Content-Disposition: attachment)"),
 ):
@@ -2094,7 +2139,8 @@ async def get_legal_file(
         download: True면 다운로드 모드, False면 브라우저에서 열기
     
     Returns:
-        파일 스트림 또는 Supabase Storage 직접 URL로 리다이렉트
+        로컬/캐시 파일 응답 (Range, ETag, Last-Modified, Cache-Control 지원)
+        또는 Supabase Storage Public URL로 리다이렉트 (legal_file_serve_mode="redirect")
     """
     try:
         # 경로 검증 (보안: 상위 디렉토리 접근 방지)
@@ -2112,106 +2158,61 @@ async def get_legal_file(
             backend_dir = Path(__file__).parent.parent.parent
             local_file_path = backend_dir / path
             
-            if not local_file_path.exists():
+            if not local_file_path.is_file():
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail="파일을 찾을 수 없습니다"
                 )
             
-            # 파일명 추출
-            filename = local_file_path.name
-            
-            # Content-Type 추정
-            ext = local_file_path.suffix.lower()
-            content_type_map = {
-                ".pdf": "application/pdf",
-                ".txt": "text/plain",
-                ".md": "text/markdown",
-                ".hwp": "application/x-hwp",
-                ".hwpx": "application/x-hwpx",
-            }
-            content_type = content_type_map.get(ext, "application/octet-stream")
-            
-            # 다운로드 모드 설정
-            headers = {}
-            if download:
-                headers["Content-Disposition"] = f'attachment; filename="{filename}"'
-            else:
-                headers["Content-Disposition"] = f'inline; filename="{filename}"'
-            
-            # 파일 읽기 및 스트리밍
-            def file_generator():
-                with open(local_file_path, "rb") as f:
-                    while True:
-                        chunk = f.read(8192)  # 8KB 청크
-                        if not chunk:
-                            break
-                        yield chunk
-            
-            return StreamingResponse(
-                file_generator(),
-                media_type=content_type,
-                headers=headers,
-            )
-        else:
-            # 방법 2: Supabase Storage에서 파일 가져오기
-            supabase_url = os.getenv("SUPABASE_URL") or settings.supabase_url
-            supabase_key = os.getenv("SUPABASE_SERVICE_ROLE_KEY") or settings.supabase_service_role_key
-            
-            if not supabase_url or not supabase_key:
+            return serve_local_file(request, local_file_path, download=download)
+        
+        filename = path.split("/")[-1] if "/" in path else path
+        
+        # 방법 2-1: Public 버킷이면 Storage URL로 리다이렉트 (SDK 클라이언트 생성 없음)
+        if settings.legal_file_serve_mode != "proxy":
+            public_url = get_storage_url_resolver().resolve_path(path)
+            if not public_url:
                 raise HTTPException(
                     status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                     detail="Supabase 설정이 없습니다"
                 )
-            
-            supabase = create_client(supabase_url, supabase_key)
-            STORAGE_BUCKET = "legal-sources"  # 지시서에 따라 "legal-sources" 사용
-            
-            # 방법 2-1: Public 버킷인 경우 직접 URL로 리다이렉트 (권장)
-            try:
-                public_url = f"{supabase_url}/storage/v1/object/public/{STORAGE_BUCKET}/{path}"
-                return RedirectResponse(url=public_url, status_code=302)
-            except:
-                pass
-            
-            # 방법 2-2: Private 버킷이거나 Public URL이 안 되는 경우 파일 다운로드
-            try:
-                response = supabase.storage.from_(STORAGE_BUCKET).download(path)
-                
-                if not response:
-                    raise HTTPException(
-                        status_code=status.HTTP_404_NOT_FOUND,
-                        detail="파일을 찾을 수 없습니다"
-                    )
-                
-                filename = path.split("/")[-1] if "/" in path else path
-                ext = Path(path).suffix.lower()
-                content_type_map = {
-                    ".pdf": "application/pdf",
-                    ".txt": "text/plain",
-                    ".md": "text/markdown",
-                    ".hwp": "application/x-hwp",
-                    ".hwpx": "application/x-hwpx",
-                }
-                content_type = content_type_map.get(ext, "application/octet-stream")
-                
-                headers = {}
-                if download:
-                    headers["Content-Disposition"] = f'attachment; filename="{filename}"'
-                else:
-                    headers["Content-Disposition"] = f'inline; filename="{filename}"'
-                
-                return StreamingResponse(
-                    iter([response]),
-                    media_type=content_type,
-                    headers=headers,
-                )
-            except Exception as download_err:
-                logger.error(f"파일 다운로드 실패: {str(download_err)}")
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail=f"파일을 가져오는 중 오류가 발생했습니다: {str(download_err)}"
-                )
+            return RedirectResponse(
+                url=public_url,
+                status_code=302,
+                headers={"Cache-Control": f"public, max-age={settings.legal_file_max_age}"},
+            )
+        
+        # 방법 2-2: Private 버킷이면 로컬 디스크 캐시를 거쳐 서빙 (ETag로 Storage 신선도 확인)
+        file_cache = get_legal_file_cache()
+        try:
+            cached_path = await file_cache.fetch(path)
+        except Exception as download_err:
+            logger.error(f"파일 다운로드 실패: {str(download_err)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"파일을 가져오는 중 오류가 발생했습니다: {str(download_err)}"
+            )
+        
+        if cached_path is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="파일을 찾을 수 없습니다"
+            )
+        
+        # 전송이 끝날 때까지 캐시 정리에서 제외 (응답 전송 후 background로 release)
+        try:
+            response = serve_local_file(
+                request,
+                cached_path,
+                filename=filename,
+                download=download,
+                content_type=guess_content_type(path),
+            )
+        except Exception:
+            file_cache.release(cached_path)
+            raise
+        response.background = BackgroundTask(file_cache.release, cached_path)
+        return response
             
     except HTTPException:
         raise
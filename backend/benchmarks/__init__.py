@@ -0,0 +1,6 @@
+"""
+오프라인 벤치마크 스위트
+Supabase/LLM 대신 결정적인 로컬 대체 구현(stand_ins)으로 주요 시나리오 지연/처리량을 측정합니다.
+
+사용법은 scripts/benchmark_offline.py 참고
+"""
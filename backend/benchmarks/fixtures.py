@@ -0,0 +1,263 @@
+"""
+벤치마크 픽스처
+- 법령/가이드/표준계약서/케이스 legal_chunks 코퍼스
+- 분석용 계약서, 상황 설명, 챗 질문, 검색 질의
+내용은 고정값이므로 실행할 때마다 같은 코퍼스와 같은 임베딩이 만들어집니다.
+"""
+
+from typing import List, Dict, Any
+
+# ============================================================================
+# legal_chunks 코퍼스
+# ============================================================================
+
+LEGAL_DOCUMENTS: List[Dict[str, Any]] = [
+    {
+        "external_id": "law-labor-standards",
+        "source_type": "law",
+        "title": "근로기준법",
+        "topic_main": "working_hours",
+        "paragraphs": [
+            "제17조(근로조건의 명시) 사용자는 근로계약을 체결할 때에 근로자에게 임금, 소정근로시간, 휴일, 연차 유급휴가를 명시하여야 한다.",
+            "제23조(해고 등의 제한) 사용자는 근로자에게 정당한 이유 없이 해고, 휴직, 정직, 전직, 감봉, 그 밖의 징벌을 하지 못한다.",
+            "제26조(해고의 예고) 사용자는 근로자를 해고하려면 적어도 30일 전에 예고를 하여야 하고, 30일 전에 예고를 하지 아니하였을 때에는 30일분 이상의 통상임금을 지급하여야 한다.",
+            "제43조(임금 지급) 임금은 통화로 직접 근로자에게 그 전액을 지급하여야 하며, 매월 1회 이상 일정한 날짜를 정하여 지급하여야 한다.",
+            "제50조(근로시간) 1주 간의 근로시간은 휴게시간을 제외하고 40시간을 초과할 수 없다. 1일의 근로시간은 휴게시간을 제외하고 8시간을 초과할 수 없다.",
+            "제53조(연장 근로의 제한) 당사자 간에 합의하면 1주 간에 12시간을 한도로 근로시간을 연장할 수 있다.",
+            "제54조(휴게) 사용자는 근로시간이 4시간인 경우에는 30분 이상, 8시간인 경우에는 1시간 이상의 휴게시간을 근로시간 도중에 주어야 한다.",
+            "제56조(연장·야간 및 휴일 근로) 사용자는 연장근로에 대하여는 통상임금의 100분의 50 이상을 가산하여 근로자에게 지급하여야 한다.",
+            "제60조(연차 유급휴가) 사용자는 1년간 80퍼센트 이상 출근한 근로자에게 15일의 유급휴가를 주어야 한다.",
+        ],
+    },
+    {
+        "external_id": "law-minimum-wage",
+        "source_type": "law",
+        "title": "최저임금법",
+        "topic_main": "wage",
+        "paragraphs": [
+            "제6조(최저임금의 효력) 사용자는 최저임금의 적용을 받는 근로자에게 최저임금액 이상의 임금을 지급하여야 한다.",
+            "제5조(최저임금액) 1년 이상의 기간을 정하여 근로계약을 체결하고 수습 중에 있는 근로자로서 수습을 시작한 날부터 3개월 이내인 사람에 대하여는 최저임금액의 100분의 10을 감액할 수 있다.",
+            "최저임금액에 미치지 못하는 금액을 임금으로 정한 근로계약은 그 부분에 한하여 무효로 하며, 무효로 된 부분은 최저임금액과 동일한 임금을 지급하기로 한 것으로 본다.",
+        ],
+    },
+    {
+        "external_id": "law-retirement-benefit",
+        "source_type": "law",
+        "title": "근로자퇴직급여 보장법",
+        "topic_main": "benefits",
+        "paragraphs": [
+            "제8조(퇴직금제도의 설정 등) 퇴직금제도를 설정하려는 사용자는 계속근로기간 1년에 대하여 30일분 이상의 평균임금을 퇴직금으로 퇴직 근로자에게 지급할 수 있는 제도를 설정하여야 한다.",
+            "제9조(퇴직금의 지급) 사용자는 근로자가 퇴직한 경우에는 그 지급사유가 발생한 날부터 14일 이내에 퇴직금을 지급하여야 한다.",
+        ],
+    },
+    {
+        "external_id": "manual-freelancer-guide",
+        "source_type": "manual",
+        "title": "프리랜서 계약 체크리스트",
+        "topic_main": "contract",
+        "paragraphs": [
+            "업무 범위와 산출물, 검수 기준을 계약서에 구체적으로 적어야 추가 작업 요구에 대응할 수 있습니다.",
+            "대금 지급 시기와 방법, 지연 시 이자를 명시하고 선금 비율을 확인하세요.",
+            "지식재산권 귀속 조항이 대금 완납 전에 모든 권리를 넘기도록 되어 있다면 수정을 요청하세요.",
+            "계약 해지 시 이미 수행한 업무에 대한 대가 정산 방법이 있는지 확인하세요.",
+        ],
+    },
+    {
+        "external_id": "manual-intern-guide",
+        "source_type": "manual",
+        "title": "청년 인턴·수습 근로 가이드",
+        "topic_main": "probation_termination",
+        "paragraphs": [
+            "수습기간이라도 근로기준법상 근로자에 해당하며 최저임금, 주휴수당, 4대보험이 적용됩니다.",
+            "수습기간 종료 후 본채용 거부는 해고에 해당할 수 있으므로 객관적이고 합리적인 평가 기준이 필요합니다.",
+            "무급 인턴, 열정페이 요구는 근로기준법 위반 소지가 있으므로 근로시간과 업무 지시 기록을 남겨두세요.",
+        ],
+    },
+    {
+        "external_id": "manual-overtime-guide",
+        "source_type": "manual",
+        "title": "포괄임금제 및 연장근로 수당 안내",
+        "topic_main": "overtime",
+        "paragraphs": [
+            "포괄임금 약정이 있더라도 실제 연장근로시간이 약정 시간을 초과하면 초과분 수당을 청구할 수 있습니다.",
+            "근로자가 법정 수당 청구권을 미리 포기하는 약정은 근로기준법에 위반되어 무효입니다.",
+            "출퇴근 기록, 메신저 업무 지시 내역은 연장근로 입증 자료로 사용할 수 있습니다.",
+        ],
+    },
+    {
+        "external_id": "standard-employment-contract",
+        "source_type": "standard_contract",
+        "title": "표준근로계약서(기간의 정함이 없는 경우)",
+        "topic_main": "contract",
+        "paragraphs": [
+            "1. 근로개시일: 년 월 일부터 2. 근무장소: 3. 업무의 내용:",
+            "4. 소정근로시간: 시 분부터 시 분까지 (휴게시간: 시 분 ~ 시 분)",
+            "6. 임금 - 월(일, 시간)급: 원 - 상여금: 있음 원, 없음 - 기타급여(제수당 등): 있음, 없음",
+            "9. 사회보험 적용여부: 고용보험, 산재보험, 국민연금, 건강보험",
+        ],
+    },
+    {
+        "external_id": "case-unpaid-overtime",
+        "source_type": "case",
+        "title": "야근 수당 미지급 사례",
+        "topic_main": "overtime",
+        "metadata": {
+            "situation": "스타트업 개발자가 매일 2~3시간씩 야근했지만 포괄임금제라는 이유로 수당을 받지 못했다.",
+            "issues": ["포괄임금 약정의 유효성", "연장근로 수당 청구"],
+        },
+        "paragraphs": [
+            "상황: 월 급여에 연장근로 수당이 포함되어 있다는 계약 조항을 근거로 회사는 추가 수당 지급을 거부했다.",
+            "판단: 실제 연장근로시간이 약정 시간을 크게 초과하여 초과분 수당 지급 의무가 인정되었다.",
+        ],
+    },
+    {
+        "external_id": "case-probation-dismissal",
+        "source_type": "case",
+        "title": "수습기간 중 부당해고 사례",
+        "topic_main": "probation_termination",
+        "metadata": {
+            "situation": "수습 2개월 차 인턴이 구두로 내일부터 나오지 말라는 통보를 받았다.",
+            "issues": ["서면 통지 의무", "해고 예고", "본채용 거부의 정당성"],
+        },
+        "paragraphs": [
+            "상황: 회사는 수습기간이므로 언제든 해고할 수 있다고 주장했다.",
+            "판단: 해고 사유와 시기를 서면으로 통지하지 않아 해고가 무효로 판단되었다.",
+        ],
+    },
+    {
+        "external_id": "case-freelancer-payment",
+        "source_type": "case",
+        "title": "프리랜서 대금 미지급 사례",
+        "topic_main": "wage",
+        "metadata": {
+            "situation": "디자인 외주 작업을 납품했지만 검수 지연을 이유로 잔금이 3개월째 지급되지 않았다.",
+            "issues": ["검수 기준", "지연 이자", "근로자성 판단"],
+        },
+        "paragraphs": [
+            "상황: 계약서에 검수 기준과 기한이 없어 발주자가 잔금 지급을 계속 미뤘다.",
+            "판단: 업무 지시와 근태 관리가 있었던 점을 근거로 근로자성이 인정되어 임금 체불로 처리되었다.",
+        ],
+    },
+]
+
+
+def build_legal_rows() -> List[Dict[str, Any]]:
+    """LEGAL_DOCUMENTS → legal_chunks 행 목록 (embedding 제외)"""
+    rows = []
+    for doc in LEGAL_DOCUMENTS:
+        metadata = {"topic_main": doc["topic_main"], **doc.get("metadata", {})}
+        for chunk_index, paragraph in enumerate(doc["paragraphs"]):
+            rows.append({
+                "id": f"{doc['external_id']}-{chunk_index}",
+                "external_id": doc["external_id"],
+                "source_type": doc["source_type"],
+                "title": doc["title"],
+                "content": paragraph,
+                "chunk_index": chunk_index,
+                "file_path": f"{doc['source_type']}s/{doc['external_id']}.pdf",
+                "metadata": metadata,
+            })
+    return rows
+
+
+# ============================================================================
+# 계약서
+# ============================================================================
+
+CONTRACTS: List[Dict[str, Any]] = [
+    {
+        "contract_id": "bench-contract-startup",
+        "description": "스타트업 개발자 정규직 계약서인데 야근이 많다고 들었어요.",
+        "contract_type": "employment",
+        "user_role": "worker",
+        "risky_articles": [4, 5, 6, 7],  # issue recall 정답 조 번호 (수당 포기, 수습 해지, 영구 비밀유지, 경업금지)
+        "text": (
+            "근로계약서\n\n"
+            "제1조(근로계약기간) 근로계약기간은 2025년 3월 1일부터 기간의 정함이 없는 것으로 한다. 단, 최초 3개월은 수습기간으로 한다.\n"
+            "제2조(근무장소 및 업무) 근무장소는 서울시 강남구 본사로 하며, 업무의 내용은 웹 서비스 개발 및 회사가 지정하는 업무로 한다.\n"
+            "제3조(근로시간) 소정근로시간은 09시부터 18시까지로 하며, 휴게시간은 12시부터 13시까지로 한다. 회사 사정에 따라 필요시 연장근로를 할 수 있다.\n"
+            "제4조(임금) 월 급여는 3,000,000원으로 하며, 연장근로 수당은 월 급여에 포함된 것으로 본다. "
+            "근로자는 추가 수당을 사업주에게 청구하지 않기로 합의한다.\n"
+            "제5조(수습기간) 수습기간 중에는 급여의 80%를 지급하며, 회사는 수습기간 중 언제든지 계약을 해지할 수 있다.\n"
+            "제6조(비밀유지) 근로자는 재직 중 및 퇴직 후 영구히 회사의 영업비밀을 누설하여서는 아니 된다.\n"
+            "제7조(경업금지) 근로자는 퇴직 후 3년간 동종 업계에 취업할 수 없으며, 위반 시 손해배상 무제한 책임을 진다.\n"
+            "제8조(연차휴가) 연차유급휴가는 근로기준법에 따르되, 회사 사정에 따라 사용 시기를 조정할 수 있다.\n"
+            "제9조(기타) 본 계약에 정하지 않은 사항은 회사 취업규칙 및 관계 법령에 따른다.\n"
+        ),
+    },
+    {
+        "contract_id": "bench-contract-freelance",
+        "description": "프리랜서 외주 계약인데 대금 지급 조건이 걱정돼요.",
+        "contract_type": "freelance",
+        "user_role": "contractor",
+        "risky_articles": [3, 5, 6, 7],  # issue recall 정답 조 번호 (대금 지급, 지식재산권, 일방 해지, 손해배상)
+        "text": (
+            "용역 계약서\n\n"
+            "제1조(목적) 본 계약은 발주자가 수행자에게 모바일 앱 디자인 업무를 위탁하고 그 대가를 지급하는 데 필요한 사항을 정한다.\n"
+            "제2조(업무 범위) 수행자는 앱 화면 디자인 20종 및 발주자가 추후 결정하는 추가 작업을 수행한다.\n"
+            "제3조(대금 지급) 용역 대금은 총 5,000,000원으로 하며, 발주자의 최종 검수 완료 후 적절한 시기에 지급한다.\n"
+            "제4조(근무 형태) 수행자는 평일 10시부터 19시까지 발주자 사무실에 출근하여 발주자의 지시에 따라 업무를 수행한다.\n"
+            "제5조(지식재산권) 산출물에 대한 모든 지식재산권은 작업 착수와 동시에 발주자에게 귀속된다.\n"
+            "제6조(계약 해지) 발주자는 필요시 언제든지 계약을 해지할 수 있으며, 이 경우 기 수행 업무에 대한 대가는 지급하지 않는다.\n"
+            "제7조(손해배상) 수행자의 귀책으로 손해가 발생한 경우 수행자는 손해배상 무제한 책임을 진다.\n"
+        ),
+    },
+]
+
+
+# ============================================================================
+# 상황 설명
+# ============================================================================
+
+SITUATIONS: List[Dict[str, Any]] = [
+    {
+        "category_hint": "overtime",
+        "situation_text": "회사에서 매일 밤 10시까지 야근을 하는데 포괄임금제라서 야근 수당을 줄 수 없다고 합니다. 계약서에는 추가 수당을 청구하지 않는다는 문구가 있어요.",
+        "summary": "포괄임금제 야근 수당 미지급",
+        "employment_type": "regular",
+        "work_period": "1년 이상",
+        "weekly_hours": 60,
+        "is_probation": False,
+        "social_insurance": "all",
+    },
+    {
+        "category_hint": "probation",
+        "situation_text": "인턴 수습 2개월 차인데 팀장이 구두로 내일부터 나오지 말라고 했습니다. 서면 통지나 해고 예고는 없었어요.",
+        "summary": "수습 중 구두 해고 통보",
+        "employment_type": "intern",
+        "work_period": "3개월 미만",
+        "weekly_hours": 40,
+        "is_probation": True,
+        "social_insurance": "partial",
+    },
+    {
+        "category_hint": "freelancer",
+        "situation_text": "프리랜서로 디자인 작업을 납품했는데 검수가 끝나지 않았다며 잔금을 3개월째 안 주고 있습니다. 사실상 매일 사무실로 출근했어요.",
+        "summary": "프리랜서 잔금 미지급",
+        "employment_type": "freelancer",
+        "work_period": "6개월 미만",
+        "weekly_hours": 45,
+        "is_probation": False,
+        "social_insurance": "none",
+    },
+]
+
+
+# ============================================================================
+# 챗/검색 질의
+# ============================================================================
+
+CHAT_QUERIES: List[str] = [
+    "수습기간에는 최저임금보다 적게 받아도 되나요?",
+    "포괄임금제 계약인데 야근 수당을 따로 청구할 수 있나요?",
+    "퇴사할 때 퇴직금은 언제까지 받아야 하나요?",
+    "프리랜서인데 매일 출근하라고 하면 근로자로 볼 수 있나요?",
+]
+
+SEARCH_QUERIES: List[str] = [
+    "연장근로 수당 가산 지급",
+    "수습기간 해고 예고",
+    "프리랜서 대금 지급 지연",
+    "연차 유급휴가 일수",
+    "최저임금 감액 수습",
+]
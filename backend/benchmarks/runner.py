@@ -0,0 +1,220 @@
+"""
+벤치마크 실행기
+- 시나리오별 p50/p95/p99 지연, 동시성 단계별 처리량
+- 결과 JSON 저장 및 저장된 baseline과의 회귀 비교
+"""
+
+from typing import List, Dict, Any, Optional
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from pathlib import Path
+import asyncio
+import json
+import platform
+import statistics
+import time
+
+from benchmarks.scenarios import Scenario
+
+# 회귀 비교 대상 지표 (True: 클수록 나쁨)
+COMPARED_METRICS = {
+    "p50_ms": True,
+    "p95_ms": True,
+    "p99_ms": True,
+    "throughput_rps": False,
+    "recall": False,
+}
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """선형 보간 백분위수 (numpy 기본 방식과 동일)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100.0
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+@dataclass
+class ScenarioResult:
+    """시나리오 × 동시성 단계 하나의 측정 결과"""
+    scenario: str
+    concurrency: int
+    requests: int
+    errors: int
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    throughput_rps: float
+    recall: Optional[float] = None  # 시나리오에 score가 있을 때 응답 품질 평균 (0~1)
+    first_error: Optional[str] = None
+
+    @property
+    def key(self) -> str:
+        return f"{self.scenario}@c{self.concurrency}"
+
+
+async def run_scenario(
+    scenario: Scenario,
+    env: Any,
+    requests: int,
+    concurrency: int,
+    warmup: int = 2,
+) -> ScenarioResult:
+    """
+    시나리오 요청을 concurrency개 동시 실행하며 requests번 수행
+
+    Args:
+        scenario: 시나리오
+        env: offline_environment 결과
+        requests: 측정 요청 수
+        concurrency: 동시 실행 수
+        warmup: 측정 전 순차 실행 횟수 (캐시/지연 초기화 효과 제외)
+    """
+    request_fn = scenario.setup(env)
+    for i in range(warmup):
+        await request_fn(i)
+
+    latencies: List[float] = []
+    scores: List[float] = []
+    errors: List[str] = []
+    next_index = 0
+
+    async def worker():
+        nonlocal next_index
+        while next_index < requests:
+            i = next_index
+            next_index += 1
+            started = time.perf_counter()
+            try:
+                response = await request_fn(i)
+                latencies.append((time.perf_counter() - started) * 1000)
+                if scenario.score is not None:
+                    scores.append(scenario.score(i, response))
+            except Exception as e:
+                errors.append(f"{type(e).__name__}: {str(e)}")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return ScenarioResult(
+        scenario=scenario.name,
+        concurrency=concurrency,
+        requests=requests,
+        errors=len(errors),
+        mean_ms=round(statistics.mean(latencies), 3) if latencies else 0.0,
+        p50_ms=round(percentile(latencies, 50), 3),
+        p95_ms=round(percentile(latencies, 95), 3),
+        p99_ms=round(percentile(latencies, 99), 3),
+        max_ms=round(max(latencies), 3) if latencies else 0.0,
+        throughput_rps=round(len(latencies) / elapsed, 3) if elapsed > 0 else 0.0,
+        recall=round(statistics.mean(scores), 4) if scores else None,
+        first_error=errors[0] if errors else None,
+    )
+
+
+def build_report(results: List[ScenarioResult], config: Dict[str, Any]) -> Dict[str, Any]:
+    """결과 JSON (baseline으로 저장 가능한 형식)"""
+    return {
+        "created_at": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": config,
+        "results": {result.key: asdict(result) for result in results},
+    }
+
+
+def save_report(report: Dict[str, Any], path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+def load_report(path: Path) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare_to_baseline(
+    report: Dict[str, Any],
+    baseline: Dict[str, Any],
+    threshold: float = 0.15,
+    min_delta_ms: float = 2.0,
+) -> List[Dict[str, Any]]:
+    """
+    baseline 대비 지표 변화 비교
+
+    Args:
+        report: 이번 실행 결과 (build_report)
+        baseline: 저장된 baseline
+        threshold: 회귀로 판단할 상대 변화율 (0.15 = 15% 악화)
+        min_delta_ms: 지연 지표는 이보다 작은 절대 변화를 노이즈로 간주
+
+    Returns:
+        [{key, metric, baseline, current, change, regression}]
+        (두 결과에 모두 있는 시나리오×동시성만 비교)
+    """
+    if baseline.get("config") != report.get("config"):
+        print("⚠️  baseline과 실행 설정(config)이 다릅니다. 비교 결과 해석에 주의하세요.")
+
+    rows = []
+    for key, current in report["results"].items():
+        previous = baseline.get("results", {}).get(key)
+        if not previous:
+            continue
+        for metric, higher_is_worse in COMPARED_METRICS.items():
+            before, after = previous.get(metric), current.get(metric)
+            if before is None or after is None:
+                continue
+            change = (after - before) / before if before else 0.0
+            worse = change > threshold if higher_is_worse else change < -threshold
+            if worse and metric.endswith("_ms") and abs(after - before) < min_delta_ms:
+                worse = False
+            rows.append({
+                "key": key,
+                "metric": metric,
+                "baseline": before,
+                "current": after,
+                "change": round(change, 4),
+                "regression": worse,
+            })
+        if current.get("errors", 0) > previous.get("errors", 0):
+            rows.append({
+                "key": key,
+                "metric": "errors",
+                "baseline": previous.get("errors", 0),
+                "current": current["errors"],
+                "change": None,
+                "regression": True,
+            })
+    return rows
+
+
+def print_results(results: List[ScenarioResult]) -> None:
+    print(f"\n{'시나리오':<30}{'동시성':>6}{'요청':>6}{'오류':>6}{'p50':>10}{'p95':>10}{'p99':>10}{'req/s':>10}{'recall':>8}")
+    print("-" * 96)
+    for r in results:
+        recall = f"{r.recall:.2f}" if r.recall is not None else "-"
+        print(
+            f"{r.scenario:<30}{r.concurrency:>6}{r.requests:>6}{r.errors:>6}"
+            f"{r.p50_ms:>10.1f}{r.p95_ms:>10.1f}{r.p99_ms:>10.1f}{r.throughput_rps:>10.2f}{recall:>8}"
+        )
+        if r.first_error:
+            print(f"  ❌ 첫 오류: {r.first_error[:200]}")
+
+
+def print_comparison(rows: List[Dict[str, Any]]) -> None:
+    if not rows:
+        print("\nℹ️  baseline과 겹치는 시나리오가 없습니다.")
+        return
+    print(f"\n{'시나리오':<26}{'지표':<16}{'baseline':>12}{'현재':>12}{'변화':>10}")
+    print("-" * 80)
+    for row in rows:
+        change = f"{row['change'] * 100:+.1f}%" if row["change"] is not None else "-"
+        mark = "  ❌ 회귀" if row["regression"] else ""
+        print(f"{row['key']:<26}{row['metric']:<16}{row['baseline']:>12}{row['current']:>12}{change:>10}{mark}")
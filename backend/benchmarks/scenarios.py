@@ -0,0 +1,121 @@
+"""
+벤치마크 시나리오
+각 시나리오는 offline_environment 안에서 서비스를 한 번 준비(setup)하고,
+요청 번호 i를 받아 한 번의 요청을 수행하는 비동기 함수(run)를 반환합니다.
+"""
+
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from dataclasses import dataclass
+
+from benchmarks.fixtures import CONTRACTS, SITUATIONS, CHAT_QUERIES, SEARCH_QUERIES
+
+RequestFn = Callable[[int], Awaitable[Any]]
+ScoreFn = Callable[[int, Any], float]  # (요청 번호, 응답) → 0~1 품질 점수
+
+
+@dataclass
+class Scenario:
+    """벤치마크 시나리오 정의"""
+    name: str
+    description: str
+    setup: Callable[[Any], RequestFn]  # offline_environment 결과 → 요청 함수
+    score: Optional[ScoreFn] = None  # 있으면 응답마다 recall을 계산해 평균을 함께 보고
+
+
+def _setup_search(env) -> RequestFn:
+    from core.legal_rag_service import LegalRAGService
+    service = LegalRAGService()
+
+    async def run(i: int):
+        return await service._search_legal_chunks(
+            query=SEARCH_QUERIES[i % len(SEARCH_QUERIES)],
+            top_k=8,
+            category=None,
+            ensure_diversity=True,
+        )
+    return run
+
+
+def _analyze_contract_setup(analysis_mode: str) -> Callable[[Any], RequestFn]:
+    def setup(env) -> RequestFn:
+        from core.legal_rag_service import LegalRAGService
+        from core.clause_extractor import extract_clauses
+        service = LegalRAGService()
+        for contract in CONTRACTS:
+            env.store.index_contract(contract["contract_id"], contract["text"])
+
+        async def run(i: int):
+            contract = CONTRACTS[i % len(CONTRACTS)]
+            return await service.analyze_contract(
+                extracted_text=contract["text"],
+                description=contract["description"],
+                doc_id=contract["contract_id"],
+                clauses=extract_clauses(contract["text"]),
+                contract_type=contract["contract_type"],
+                user_role=contract["user_role"],
+                analysis_mode=analysis_mode,
+            )
+        return run
+    return setup
+
+
+def _score_contract_issue_recall(i: int, result: Any) -> float:
+    """정답 위험 조항(risky_articles) 중 이슈가 하나 이상 붙은 조항 비율"""
+    from core.clause_extractor import extract_clauses
+    contract = CONTRACTS[i % len(CONTRACTS)]
+    clauses = extract_clauses(contract["text"])
+    flagged = set()
+    for issue in result.issues:
+        for clause in clauses:
+            original = (issue.original_text or "").strip()
+            if issue.clause_id == clause["id"] or (original and original[:30] in clause["content"]):
+                flagged.add(clause["articleNumber"])
+    expected = contract["risky_articles"]
+    return sum(1 for article in expected if article in flagged) / len(expected)
+
+
+def _setup_analyze_situation(env) -> RequestFn:
+    from core.legal_rag_service import LegalRAGService
+    try:
+        from core.situation_workflow import LANGGRAPH_AVAILABLE
+    except ImportError:
+        LANGGRAPH_AVAILABLE = False
+    service = LegalRAGService()
+
+    async def run(i: int):
+        # API(/analyze-situation)와 같은 경로: langgraph가 있으면 워크플로우 사용
+        return await service.analyze_situation_detailed(
+            **SITUATIONS[i % len(SITUATIONS)],
+            use_workflow=LANGGRAPH_AVAILABLE,
+        )
+    return run
+
+
+def _setup_agent_chat(env) -> RequestFn:
+    from core.agent_chat_service import AgentChatService
+    service = AgentChatService()
+
+    async def run(i: int):
+        return await service.chat_plain(query=CHAT_QUERIES[i % len(CHAT_QUERIES)])
+    return run
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    scenario.name: scenario for scenario in [
+        Scenario("search", "법령/가이드/케이스 벡터 검색 (타입 다양성 포함)", _setup_search),
+        Scenario("analyze-contract", "계약서 Dual RAG 분석 (조항 추출 + 검색 + LLM 리스크 요약)",
+                 _analyze_contract_setup("monolithic"), _score_contract_issue_recall),
+        Scenario("analyze-contract-map-reduce", "계약서 조항 그룹별 병렬 분석 후 집계 (map-reduce 모드)",
+                 _analyze_contract_setup("map_reduce"), _score_contract_issue_recall),
+        Scenario("analyze-situation", "상황 상세 진단 (워크플로우 또는 단일 스텝)", _setup_analyze_situation),
+        Scenario("agent-chat", "Agent plain 모드 챗 (RAG 검색 + LLM 답변)", _setup_agent_chat),
+    ]
+}
+
+
+def get_scenarios(names: List[str]) -> List[Scenario]:
+    """이름 목록 → Scenario 목록 (알 수 없는 이름이면 ValueError)"""
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        raise ValueError(f"알 수 없는 시나리오: {', '.join(unknown)} (사용 가능: {', '.join(SCENARIOS)})")
+    return [SCENARIOS[name] for name in names]
@@ -0,0 +1,514 @@
+"""
+벤치마크용 로컬 대체 구현 (Supabase / 임베딩 / LLM)
+- InMemoryVectorStore: 서비스가 사용하는 SupabaseVectorStore 메서드를 메모리 행렬로 구현
+- FakeGenerator: 해시 n-gram 기반 결정적 임베딩 + FakeLLM 위임 (LLMGenerator 인터페이스)
+- FakeLLM: 지연 시간을 설정할 수 있는 llm_api.ask_groq_with_messages/stream_groq_with_messages 대체 (고정 JSON/마크다운 응답)
+- offline_environment: 위 구현을 서비스 모듈에 주입하는 컨텍스트 매니저
+"""
+
+from typing import List, Dict, Any, Optional, Callable
+from contextlib import ExitStack, contextmanager
+from types import SimpleNamespace
+from unittest import mock
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+import sys
+import threading
+import time
+
+import numpy as np
+
+from benchmarks.fixtures import build_legal_rows
+
+# 실제 bge-m3 임베딩과 같은 차원 (페이로드 크기/검색 비용을 맞추기 위함)
+EMBEDDING_DIM = 1024
+
+# 모든 벡터에 섞는 공통 성분 비율
+# 해시 n-gram 임베딩은 서로 관련 없는 문장의 유사도가 0 근처라서, 공통 성분을 섞어 서비스의
+# 최종 threshold(0.4) 위로 올려 실제 검색처럼 결과가 반환되게 함 (순위는 n-gram 유사도 그대로)
+COMMON_COMPONENT = 0.55
+
+# 계약서 조항 분할 ("제N조")
+_ARTICLE_RE = re.compile(r"^제(\d+)조", re.MULTILINE)
+
+
+def hash_embedding(text: str, dim: int = EMBEDDING_DIM) -> List[float]:
+    """
+    문자 3-gram 해싱 임베딩 (같은 텍스트 → 항상 같은 벡터, L2 정규화)
+
+    0번 차원은 공통 성분 전용, 나머지 차원에 n-gram을 부호 해싱
+    """
+    normalized = " ".join((text or "").split())
+    vec = np.zeros(dim, dtype=np.float32)
+    for i in range(max(1, len(normalized) - 2)):
+        digest = hashlib.md5(normalized[i:i + 3].encode("utf-8")).digest()
+        index = 1 + int.from_bytes(digest[:4], "little") % (dim - 1)
+        vec[index] += 1.0 if digest[4] & 1 else -1.0
+    norm = float(np.linalg.norm(vec))
+    if norm > 0:
+        vec *= math.sqrt(1.0 - COMMON_COMPONENT) / norm
+    vec[0] = math.sqrt(COMMON_COMPONENT)
+    return vec.tolist()
+
+
+def _sleep_ms(ms: float) -> None:
+    if ms > 0:
+        time.sleep(ms / 1000.0)
+
+
+class _LatencyModel:
+    """기본 지연 + 결정적 jitter (seed 고정, 스레드 안전)"""
+
+    def __init__(self, base_ms: float, jitter_ms: float = 0.0, seed: int = 42):
+        self.base_ms = base_ms
+        self.jitter_ms = jitter_ms
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def sample(self) -> float:
+        if self.jitter_ms <= 0:
+            return self.base_ms
+        with self._lock:
+            return max(0.0, self.base_ms + self._rng.uniform(-self.jitter_ms, self.jitter_ms))
+
+
+# ============================================================================
+# Vector store
+# ============================================================================
+
+class InMemoryVectorStore:
+    """
+    SupabaseVectorStore 대체 (legal_chunks / contract_chunks 메모리 검색)
+
+    RPC 왕복 지연은 latency_ms로 흉내 내며, 반환 형식은 match_legal_chunks RPC /
+    search_similar_contract_chunks와 같습니다.
+    """
+
+    def __init__(self, embed_fn: Callable[[str], List[float]] = hash_embedding, latency_ms: float = 0.0,
+                 jitter_ms: float = 0.0, seed: int = 42):
+        self._embed_fn = embed_fn
+        self._latency = _LatencyModel(latency_ms, jitter_ms, seed)
+        self._legal_rows: List[Dict[str, Any]] = []
+        self._legal_matrix = np.zeros((0, EMBEDDING_DIM), dtype=np.float32)
+        self._contract_rows: Dict[str, List[Dict[str, Any]]] = {}
+        self._contract_matrix: Dict[str, np.ndarray] = {}
+        self.calls: Dict[str, int] = {}
+
+    def _record(self, method: str) -> None:
+        self.calls[method] = self.calls.get(method, 0) + 1
+        _sleep_ms(self._latency.sample())
+
+    # ---------------------------------------------------------------- 적재
+
+    def load_legal_rows(self, rows: List[Dict[str, Any]]) -> None:
+        """legal_chunks 행 적재 (embedding이 없으면 embed_fn으로 생성)"""
+        self._legal_rows = [{k: v for k, v in row.items() if k != "embedding"} for row in rows]
+        self._legal_matrix = np.asarray(
+            [row.get("embedding") or self._embed_fn(row["content"]) for row in rows], dtype=np.float32
+        ).reshape(len(rows), EMBEDDING_DIM)
+
+    def index_contract(self, contract_id: str, text: str) -> int:
+        """계약서 원문을 조항("제N조") 단위 contract_chunks로 적재"""
+        starts = [m.start() for m in _ARTICLE_RE.finditer(text)] or [0]
+        rows = []
+        for chunk_index, start in enumerate(starts):
+            end = starts[chunk_index + 1] if chunk_index + 1 < len(starts) else len(text)
+            content = text[start:end].strip()
+            match = _ARTICLE_RE.match(content)
+            rows.append({
+                "id": f"{contract_id}-{chunk_index}",
+                "contract_id": contract_id,
+                "article_number": int(match.group(1)) if match else None,
+                "paragraph_index": None,
+                "content": content,
+                "chunk_index": chunk_index,
+                "metadata": {},
+            })
+        self._contract_rows[contract_id] = rows
+        self._contract_matrix[contract_id] = np.asarray(
+            [self._embed_fn(row["content"]) for row in rows], dtype=np.float32
+        )
+        return len(rows)
+
+    # ---------------------------------------------------------------- 검색
+
+    @staticmethod
+    def _scores(matrix: np.ndarray, query_embedding: List[float]) -> np.ndarray:
+        query = np.asarray(query_embedding, dtype=np.float32)
+        norm = float(np.linalg.norm(query))
+        if norm == 0 or matrix.shape[0] == 0:
+            return np.zeros(matrix.shape[0], dtype=np.float32)
+        return matrix @ (query / norm)
+
+    def search_similar_legal_chunks(
+        self,
+        query_embedding: List[float],
+        top_k: int = 5,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        self._record("search_similar_legal_chunks")
+        scores = self._scores(self._legal_matrix, query_embedding)
+        category = (filters or {}).get("topic_main")
+        source_type = (filters or {}).get("source_type")
+        candidates = []
+        for i in np.argsort(-scores):
+            if scores[i] < 0.3:  # match_legal_chunks RPC의 match_threshold
+                break
+            row = self._legal_rows[i]
+            if category and row["metadata"].get("topic_main") != category:
+                continue
+            if source_type and row["source_type"] != source_type:
+                continue
+            candidates.append({**row, "score": float(scores[i])})
+            if len(candidates) >= top_k:
+                break
+        return candidates
+
+    def search_similar_contract_chunks(
+        self,
+        contract_id: str,
+        query_embedding: List[float],
+        top_k: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+        boost_article: Optional[int] = None,
+        boost_factor: float = 1.5
+    ) -> List[Dict[str, Any]]:
+        self._record("search_similar_contract_chunks")
+        rows = self._contract_rows.get(contract_id, [])
+        if not rows:
+            return []
+        scores = self._scores(self._contract_matrix[contract_id], query_embedding)
+        article_filter = (filters or {}).get("article_number")
+        results = []
+        for row, score in zip(rows, scores.tolist()):
+            if article_filter is not None and row["article_number"] != article_filter:
+                continue
+            if boost_article is not None and row["article_number"] == boost_article:
+                score *= boost_factor
+            results.append({**row, "score": score})
+        results.sort(key=lambda r: r["score"], reverse=True)
+        return results[:top_k]
+
+    # ---------------------------------------------------------------- 조회
+
+    def get_case_metadata_batch(self, external_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        self._record("get_case_metadata_batch")
+        wanted = set(external_ids or [])
+        found: Dict[str, Dict[str, Any]] = {}
+        for row in self._legal_rows:
+            if row["source_type"] == "case" and row["external_id"] in wanted:
+                found.setdefault(row["external_id"], row["metadata"])
+        return {ext_id: found.get(ext_id, {}) for ext_id in wanted}
+
+    def clear_case_metadata_cache(self):
+        pass
+
+    def get_legal_chunk_by_title(self, title: str) -> Optional[Dict[str, Any]]:
+        self._record("get_legal_chunk_by_title")
+        if not title:
+            return None
+        for exact in (True, False):
+            for row in self._legal_rows:
+                if (row["title"] == title) if exact else (title in row["title"]):
+                    return {k: row[k] for k in ("external_id", "source_type", "title")}
+        return None
+
+    def get_legal_chunk_by_id(self, chunk_id: str) -> Optional[Dict[str, Any]]:
+        self._record("get_legal_chunk_by_id")
+        for row in self._legal_rows:
+            if row["id"] == chunk_id:
+                return dict(row)
+        return None
+
+    def check_legal_chunks_exist(self, external_id: str) -> bool:
+        return any(row["external_id"] == external_id for row in self._legal_rows)
+
+    def get_storage_file_url(self, *args, **kwargs) -> Optional[str]:
+        return None
+
+
+# ============================================================================
+# LLM
+# ============================================================================
+
+# 계약서 분석 / 상황 진단 / 워크플로우 노드가 읽는 키를 모두 포함한 고정 JSON 응답
+_ANALYSIS_RESPONSE = {
+    "risk_score": 72,
+    "risk_level": "high",
+    "one_line_summary": "연장근로 수당 포기 조항과 일방적 해지 조항이 있어 위험도가 높습니다.",
+    "summary": "법정 수당 청구권을 포기하게 하는 조항과 수습기간 중 일방적 해지 조항이 근로기준법에 위반될 소지가 있습니다.",
+    "classified_type": "overtime",
+    "issues": [
+        {
+            "issue_id": "issue-1",
+            "category": "wage",
+            "severity": "high",
+            "summary": "연장근로 수당 청구권 포기",
+            "original_text": "근로자는 추가 수당을 사업주에게 청구하지 않기로 합의한다.",
+            "reason": "법정 수당 청구권을 미리 포기하는 약정은 근로기준법 제56조에 위반되어 무효입니다.",
+            "legal_basis": ["근로기준법"],
+            "suggested_text": "연장근로에 대하여는 근로기준법에 따라 통상임금의 50%를 가산하여 지급한다.",
+            "suggested_questions": ["월 예상 연장근로시간은 얼마인가요?"],
+        },
+        {
+            "issue_id": "issue-2",
+            "category": "probation_termination",
+            "severity": "medium",
+            "summary": "수습기간 중 임의 해지",
+            "original_text": "회사는 수습기간 중 언제든지 계약을 해지할 수 있다.",
+            "reason": "수습기간이라도 정당한 이유와 서면 통지가 필요합니다.",
+            "legal_basis": ["근로기준법"],
+            "suggested_text": "수습기간 중 해지는 객관적 평가 기준에 따르며 사유를 서면으로 통지한다.",
+            "suggested_questions": ["수습 평가 기준이 있나요?"],
+        },
+    ],
+    "recommendations": [
+        "연장근로 수당 조항 삭제 또는 가산 지급으로 수정 요청",
+        "수습 평가 기준과 해지 절차 명시 요청",
+    ],
+    "negotiation_questions": ["포괄임금에 포함된 연장근로시간은 몇 시간인가요?"],
+    "criteria": [
+        {"name": "연장근로 수당 지급", "status": "violation", "reason": "법정 가산수당이 지급되지 않았습니다."},
+        {"name": "근로시간 한도", "status": "likely", "reason": "주 52시간을 초과할 가능성이 있습니다."},
+    ],
+    "findings": [
+        {"title": "연장근로 수당 미지급", "detail": "실제 근로시간 기록으로 청구할 수 있습니다.", "source": "근로기준법"},
+    ],
+    "action_plan": {
+        "steps": [
+            {"title": "증거 수집", "items": ["출퇴근 기록 캡처", "업무 지시 메신저 보관"]},
+            {"title": "상담 및 신고", "items": ["노동청 진정 접수", "노무사 상담"]},
+        ]
+    },
+    "scripts": {
+        "to_company": "실제 연장근로시간에 대한 가산수당 지급을 요청드립니다.",
+        "to_advisor": "포괄임금 약정이 있는데 초과 근로 수당을 청구할 수 있는지 상담받고 싶습니다.",
+    },
+    "organizations": [
+        {"name": "고용노동부", "description": "임금 체불 진정", "phone": "1350"},
+    ],
+}
+
+_CHAT_RESPONSE = (
+    "## 요약\n"
+    "근로기준법상 연장근로에는 통상임금의 50% 이상을 가산해 지급해야 하며, 이를 미리 포기하는 약정은 무효입니다.\n\n"
+    "## 근거\n"
+    "- 근로기준법 제56조(연장·야간 및 휴일 근로)\n"
+    "- 포괄임금제 및 연장근로 수당 안내\n\n"
+    "## 다음 단계\n"
+    "1. 출퇴근 기록과 업무 지시 내역을 보관하세요.\n"
+    "2. 회사에 서면으로 초과 근로 수당 지급을 요청하세요.\n"
+    "3. 지급되지 않으면 고용노동부(1350)에 진정할 수 있습니다.\n"
+)
+
+
+# 계약서 분석 프롬프트의 조항 블록: - [clause-N] 제목\n  "본문" (본문이 예산 밖이면 제목 줄만 있음)
+_PROMPT_CLAUSE_RE = re.compile(r'^- \[(clause-\d+)\] (.*)\n  "(.*)"$', re.MULTILINE)
+
+
+def _clause_analysis_response(prompt: str) -> Optional[Dict[str, Any]]:
+    """
+    조항 블록이 있는 계약서 분석 프롬프트 → 조항별 이슈 응답 (본문이 보이는 조항만 판단)
+
+    프롬프트에 본문이 실린 조항 중 위험 신호(위험/독소조항 키워드, 수당 포기 문구)가 있는 조항마다 이슈를 만듭니다.
+    본문이 잘리거나 빠진 조항은 놓치므로, 분석 모드별 issue recall이 프롬프트에 실제로 보인 조항 범위를 반영합니다.
+    """
+    from core.keyword_matcher import CONTRACT_KEYWORD_MATCHER
+    from core.prompt_budget import clause_risk_priority
+
+    blocks = _PROMPT_CLAUSE_RE.findall(prompt)
+    if not blocks:
+        return None
+    issues, clause_risks = [], []
+    for clause_id, title, body in blocks:
+        priority = clause_risk_priority({"title": title, "content": body})
+        if priority <= 0:
+            clause_risks.append({"clause_id": clause_id, "risk_score": 10, "section": None})
+            continue
+        hits = CONTRACT_KEYWORD_MATCHER.find_all(f"{title} {body}", tables=("category", "toxic"))
+        categories = [hit.category for hit in sorted(hits, key=lambda hit: hit.priority)]
+        severity = "high" if priority >= 40 else "medium"
+        issues.append({
+            "issue_id": f"issue-{len(issues) + 1}",
+            "clause_id": clause_id,
+            "category": categories[0] if categories else "other",
+            "severity": severity,
+            "summary": f"{title} 위험 조항",
+            "original_text": body.rstrip("."),
+            "reason": "근로자/수행자에게 일방적으로 불리한 조건이 포함되어 있습니다.",
+            "legal_basis": ["근로기준법"],
+            "suggested_text": f"{title} 조항의 조건을 구체적이고 상호 대등하게 수정한다.",
+            "suggested_questions": [f"{title} 조항을 수정할 수 있나요?"],
+        })
+        section = next((c for c in categories if c in ("working_hours", "wage", "probation_termination", "stock_option_ip")), None)
+        clause_risks.append({"clause_id": clause_id, "risk_score": min(100, int(priority) + 30), "section": section})
+    return {**_ANALYSIS_RESPONSE, "issues": issues, "clause_risks": clause_risks}
+
+
+class FakeLLM:
+    """
+    llm_api.ask_groq_with_messages / stream_groq_with_messages 대체
+
+    - 호출마다 latency_ms(± jitter_ms) 만큼 블로킹 대기 (실제 Groq 클라이언트도 동기 호출)
+    - 프롬프트에 "JSON"이 있으면 분석 JSON (조항 블록이 있으면 _clause_analysis_response, 없으면 고정 응답),
+      없으면 고정 마크다운 답변
+    - per_output_char_ms로 응답 길이에 비례한 생성 시간도 흉내 낼 수 있음
+    """
+
+    def __init__(self, latency_ms: float = 200.0, jitter_ms: float = 0.0, per_output_char_ms: float = 0.0,
+                 seed: int = 42):
+        self._latency = _LatencyModel(latency_ms, jitter_ms, seed)
+        self.per_output_char_ms = per_output_char_ms
+        self.calls = 0
+        self.prompt_chars = 0
+        self._lock = threading.Lock()
+        self._json_text = json.dumps(_ANALYSIS_RESPONSE, ensure_ascii=False, indent=2)
+
+    def _select(self, prompt: str) -> str:
+        text = _CHAT_RESPONSE
+        if "JSON" in prompt or "json" in prompt:
+            clause_response = _clause_analysis_response(prompt)
+            text = json.dumps(clause_response, ensure_ascii=False, indent=2) if clause_response else self._json_text
+        with self._lock:
+            self.calls += 1
+            self.prompt_chars += len(prompt)
+        return text
+
+    def respond(self, prompt: str) -> str:
+        """프롬프트 → 고정 응답 (지연 포함)"""
+        text = self._select(prompt)
+        _sleep_ms(self._latency.sample() + self.per_output_char_ms * len(text))
+        return text
+
+    def stream(self, prompt: str, chunk_chars: int = 64):
+        """respond의 스트리밍 버전: latency_ms 후 첫 조각, 이후 조각마다 per_output_char_ms × 길이만큼 대기"""
+        text = self._select(prompt)
+        _sleep_ms(self._latency.sample())
+        for start in range(0, len(text), chunk_chars):
+            chunk = text[start:start + chunk_chars]
+            _sleep_ms(self.per_output_char_ms * len(chunk))
+            yield chunk
+
+    def ask_groq_with_messages(self, messages: list, temperature: float = 0.5, model: str = "",
+                               max_tokens: int = 4096, **kwargs) -> str:
+        return self.respond("\n".join(str(m.get("content", "")) for m in messages))
+
+    def stream_groq_with_messages(self, messages: list, temperature: float = 0.5, model: str = "",
+                                  max_tokens: int = 4096, **kwargs):
+        return self.stream("\n".join(str(m.get("content", "")) for m in messages))
+
+
+class FakeGenerator:
+    """
+    LLMGenerator 대체 (Groq 경로로 동작하도록 플래그 설정)
+
+    - embed/embed_one: hash_embedding (배치당 embed_latency_ms 대기)
+    - generate/generate_content: FakeLLM 위임
+    """
+
+    def __init__(self, llm: FakeLLM, embed_latency_ms: float = 0.0):
+        self.llm = llm
+        self.embed_latency_ms = embed_latency_ms
+        self.disable_llm = False
+        self.use_groq = True
+        self.use_ollama = False
+        self.use_local_embedding = True
+        self.model = "fake-llm"
+        self.embed_calls = 0
+
+    def embed(self, texts: List[str], model_type: str = "doc") -> List[List[float]]:
+        if not texts:
+            return []
+        self.embed_calls += 1
+        _sleep_ms(self.embed_latency_ms)
+        return [hash_embedding(text) for text in texts]
+
+    def embed_one(self, text: str, model_type: str = "doc") -> List[float]:
+        return self.embed([text], model_type=model_type)[0]
+
+    def generate_content(self, messages: List[Dict[str, Any]], **kwargs):
+        text = self.llm.ask_groq_with_messages(messages)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=text, tool_calls=None))])
+
+    @staticmethod
+    def get_text(response) -> str:
+        return response.choices[0].message.content
+
+    async def generate(self, prompt: str, system_role: str = "너는 유능한 법률 AI야.",
+                       max_output_tokens: Optional[int] = None) -> str:
+        return await asyncio.to_thread(self.llm.respond, f"{system_role}\n{prompt}")
+
+
+# ============================================================================
+# 주입
+# ============================================================================
+
+# stand-in으로 교체할 클래스를 import하는 모듈 (미리 import해서 모듈 전역 참조까지 교체)
+SERVICE_MODULES = [
+    "core.legal_rag_service",
+    "core.agent_chat_service",
+    "core.situation_workflow",
+    "core.snippet_analyzer",
+]
+
+
+def _patch_references(stack: ExitStack, original: Any, replacement: Any) -> None:
+    """로드된 core/api 모듈에서 original을 가리키는 전역 이름을 모두 replacement로 교체"""
+    for name, module in list(sys.modules.items()):
+        if module is None or not (name == "llm_api" or name.startswith(("core.", "api."))):
+            continue
+        for attr, value in list(vars(module).items()):
+            if value is original:
+                stack.enter_context(mock.patch.object(module, attr, replacement))
+
+
+@contextmanager
+def offline_environment(
+    llm_latency_ms: float = 200.0,
+    llm_jitter_ms: float = 0.0,
+    embed_latency_ms: float = 0.0,
+    store_latency_ms: float = 0.0,
+    seed: int = 42,
+):
+    """
+    Supabase/임베딩/LLM을 로컬 대체 구현으로 바꾼 환경
+
+    블록 안에서 생성한 LegalRAGService/AgentChatService/SituationWorkflow는 모두 같은
+    InMemoryVectorStore와 FakeGenerator를 사용합니다.
+
+    Yields:
+        SimpleNamespace(store, generator, llm)
+    """
+    import importlib
+    import llm_api
+    from config import settings
+    from core.supabase_vector_store import SupabaseVectorStore
+    from core.generator_v2 import LLMGenerator
+
+    for module_name in SERVICE_MODULES:
+        try:
+            importlib.import_module(module_name)
+        except ImportError:
+            pass  # 선택 의존성(langgraph 등)이 없는 모듈은 건너뜀
+
+    llm = FakeLLM(latency_ms=llm_latency_ms, jitter_ms=llm_jitter_ms, seed=seed)
+    generator = FakeGenerator(llm, embed_latency_ms=embed_latency_ms)
+    store = InMemoryVectorStore(latency_ms=store_latency_ms, seed=seed)
+    store.load_legal_rows(build_legal_rows())
+
+    with ExitStack() as stack:
+        stack.enter_context(mock.patch.object(settings, "use_groq", True))
+        stack.enter_context(mock.patch.object(settings, "use_ollama", False))
+        stack.enter_context(mock.patch.object(settings, "disable_llm", False))
+        stack.enter_context(mock.patch.object(settings, "use_legal_local_index", False))
+        # 반복 쿼리가 검색 결과 캐시에 걸리지 않도록 (검색 파이프라인 자체를 측정)
+        stack.enter_context(mock.patch.object(settings, "legal_search_cache_enabled", False))
+        _patch_references(stack, SupabaseVectorStore, lambda *args, **kwargs: store)
+        _patch_references(stack, LLMGenerator, lambda *args, **kwargs: generator)
+        _patch_references(stack, llm_api.ask_groq_with_messages, llm.ask_groq_with_messages)
+        _patch_references(stack, llm_api.stream_groq_with_messages, llm.stream_groq_with_messages)
+        yield SimpleNamespace(store=store, generator=generator, llm=llm)
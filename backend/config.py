@@ -4,7 +4,7 @@ import os
 import logging
 from pathlib import Path
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import Optional
+from typing import Optional, Dict
 
 logger = logging.getLogger(__name__)
 
@@ -60,7 +60,94 @@ class Settings(BaseSettings):
     
     # Embedding Cache Settings
     embedding_cache_size: int = 100  # LRU 캐시 최대 크기 (기본값: 100)
-    
+
+    # Chat Session Cache Settings (Agent 챗 세션 컨텍스트 캐시)
+    chat_history_limit: int = 30  # LLM 컨텍스트에 사용할 최근 메시지 수
+    chat_session_cache_size: int = 500  # 메모리에 유지할 최대 세션 수
+    chat_session_cache_ttl: float = 1800.0  # 마지막 접근 후 세션 캐시 유지 시간 (초)
+
+    # Legal Local Index Settings (legal_chunks 인프로세스 벡터 인덱스, False면 match_legal_chunks RPC 사용)
+    use_legal_local_index: bool = False
+    legal_index_backend: str = "auto"  # "exact" | "hnsw" | "auto" (청크 수가 hnsw_min_size 이상이면 HNSW)
+    legal_index_hnsw_min_size: int = 20000
+    legal_index_refresh_interval: float = 300.0  # 코퍼스 버전 확인 주기 (초)
+    legal_index_snapshot_dir: Optional[str] = "./data/legal_index"  # 디스크 스냅샷 경로 (빈 값이면 저장 안 함)
+    legal_index_first_stage: str = "none"  # HNSW 미사용 시 2단계 검색 1차 축소: "none" | "pca" | "binary" (scripts/build_legal_reduced_index.py로 recall 확인)
+    legal_index_reduced_dims: int = 128  # pca 1차 검색 차원 수
+    legal_index_two_stage_min_size: int = 5000  # 2단계 검색을 사용할 최소 청크 수 (작으면 exact가 더 빠름)
+    legal_two_stage_candidates: int = 300  # 1차 검색 후보 수 (로컬 인덱스/match_legal_chunks_two_stage RPC 공용)
+    legal_search_two_stage: bool = False  # RPC 검색을 match_legal_chunks_two_stage(서버 binary 1차 + float32 재계산)로 (scripts/create_legal_two_stage_search.sql 필요)
+
+    # Legal Rerank Settings (bi-encoder 상위 후보를 cross-encoder로 재정렬, 현재 Agent plain 챗에서 사용)
+    legal_rerank_enabled: bool = False
+    legal_rerank_model: str = "cross-encoder/mmarco-mMiniLMv2-L12-H384-v1"  # 다국어 소형 cross-encoder (CPU 추론)
+    legal_rerank_candidates: int = 20  # 재정렬할 bi-encoder 상위 후보 수
+    legal_rerank_batch_size: int = 16  # CPU 배치 추론 크기
+    legal_rerank_max_length: int = 256  # (질문, 청크) 쌍 최대 토큰 길이
+    legal_rerank_budget_ms: float = 300.0  # 지연 예산 (초과하면 재정렬 생략, 0이면 제한 없음)
+    legal_rerank_max_concurrency: int = 2  # 동시 재정렬 수 (넘는 요청은 재정렬 생략)
+    legal_rerank_cache_size: int = 5000  # (쿼리 해시, 청크 id) 점수 LRU 캐시 크기
+    agent_plain_legal_top_k: int = 3  # Agent plain 챗 프롬프트에 넣을 법령 청크 수 (재정렬 사용 시 2로 줄여 프롬프트 단축 가능)
+
+    # Legal Search Cache Settings (_search_legal_chunks 결과 캐시, 코퍼스 버전이 바뀌면 삭제 - scripts/create_legal_corpus_version.sql)
+    legal_search_cache_enabled: bool = True
+    legal_search_cache_size: int = 1000  # 최대 캐시 항목 수 (쿼리 + 필터 + top_k 조합)
+    legal_search_cache_ttl: float = 3600.0  # 항목 유지 시간 (초)
+    legal_search_cache_version_interval: float = 30.0  # 코퍼스 버전 확인 주기 (초, 백그라운드)
+    legal_search_cache_semantic_threshold: float = 0.0  # 쿼리 임베딩 코사인이 이 값 이상이면 다른 쿼리의 결과 재사용 (0이면 끔, 예: 0.97)
+
+    # Team Local Index Settings (team_embeddings 인프로세스 벡터 인덱스, False면 match_team_embeddings RPC 우선)
+    use_team_local_index: bool = False
+    team_index_refresh_interval: float = 60.0  # updated_at 기준 증분 갱신 주기 (초)
+
+    # Situation Workflow Settings (LangGraph 상황분석 워크플로우)
+    situation_workflow_checkpoint: bool = False  # 노드 출력 체크포인트 (LLM 타임아웃 재시도 시 generate_all_fields부터 재개)
+    situation_workflow_retries: int = 1  # 체크포인트 재개 최대 횟수 (마지막 시도는 기본값으로 응답)
+
+    # Contract Analysis Settings (_llm_summarize_risk)
+    contract_analysis_stream: bool = True  # LLM 응답을 스트리밍 파싱하여 이슈가 완성되는 즉시 이슈별 법령 검색 시작 (False면 전체 응답 후 파싱)
+    contract_issue_reason_concurrency: int = 4  # 이슈별 법령 근거 reason 생성 LLM 동시 호출 수 (전체 이슈 공유)
+
+    # Contract Prompt Budget Settings (build_contract_analysis_prompt 섹션별 토큰 예산)
+    prompt_tokenizer_encoding: str = "cl100k_base"  # tiktoken 인코딩 (미설치/로드 실패 시 문자 수 기반 추정)
+    contract_prompt_max_tokens: int = 7000  # 계약서 분석 프롬프트 전체 입력 토큰 상한 (고정 템플릿 포함)
+    contract_prompt_legal_tokens: int = 1200  # 참고 법령 섹션 상한 (남는 예산은 조항 섹션으로)
+    contract_prompt_legal_chunk_tokens: int = 120  # 법령 청크당 상한
+    contract_prompt_clause_tokens: int = 300  # 위험 신호가 있는 조항의 본문 상한 (조항당)
+    contract_prompt_low_risk_clause_tokens: int = 40  # 위험 신호가 없는 조항의 본문 상한 (조항당, 0이면 제목만)
+
+    # Contract Map-Reduce Settings (analysis_mode="map_reduce": 조항 그룹별 병렬 분석 후 집계)
+    contract_analysis_mode: str = "monolithic"  # 기본 분석 모드: "monolithic" | "map_reduce" (요청별 analysis_mode로 오버라이드)
+    contract_map_group_tokens: int = 500  # 짧은 조항을 한 그룹으로 묶는 제목+본문 토큰 합 상한
+    contract_map_concurrency: int = 4  # 동시에 실행할 그룹 LLM 호출 수
+    contract_map_legal_top_k: int = 3  # 그룹별 검색할 법령 청크 수
+    contract_map_legal_tokens: int = 400  # 그룹 프롬프트의 참고 법령 섹션 상한
+    contract_map_max_tokens: int = 2048  # 그룹별 LLM 출력 토큰 상한
+
+    # Contract Comparison Settings (/compare-contracts 조항 정렬)
+    clause_align_min_similarity: float = 0.35  # 이보다 유사도가 낮은 조항 쌍은 수정이 아니라 삭제+추가로 판단
+
+    # Vector Transport Settings (임베딩 전송 형식, scripts/create_compact_vector_rpcs.sql 필요)
+    vector_transport: str = "base64"  # "base64": compact RPC로 바이너리 전송 (RPC가 없으면 자동으로 JSON) | "json": 항상 JSON float 배열
+    vector_transport_dtype: str = "float32"  # 클라이언트 → 서버 임베딩 dtype: "float32" | "float16" (float16은 전송량 절반, 정밀도 약 1e-3)
+
+    # Logging Settings
+    log_format: str = "text"  # "text" | "json" (둘 다 request_id 포함)
+    log_queue_enabled: bool = True  # 로그 I/O를 백그라운드 QueueListener 스레드에서 처리
+    log_module_levels: Dict[str, str] = {}  # 예: LOG_MODULE_LEVELS='{"core.situation_workflow": "WARNING"}'
+    log_sample_rates: Dict[str, float] = {}  # 모듈별 INFO 이하 샘플링 비율, 예: '{"core.generator_v2": 0.1}'
+
+    # Legal File Serving Settings (GET /api/v2/legal/file)
+    legal_file_serve_mode: str = "redirect"  # "redirect": Storage Public URL로 리다이렉트, "proxy": 로컬 디스크 캐시에서 서빙 (Private 버킷)
+    legal_file_max_age: int = 86400  # Cache-Control max-age (초)
+    legal_file_cache_dir: str = "./data/legal_file_cache"
+    legal_file_cache_max_mb: int = 512  # 디스크 캐시 최대 크기 (MB)
+    legal_file_cache_revalidate_interval: float = 600.0  # Storage ETag 신선도 확인 주기 (초)
+
+    # Snippet Analysis Settings (legal_snippet_analyses 사전 계산 결과 사용)
+    snippet_analysis_fill_mode: str = "background"  # 미스 시 "background": 기본값 응답 후 백그라운드 분석, "sync": 요청 중 분석, "off": 분석 안 함
+    snippet_analysis_cache_size: int = 2000  # 메모리 LRU 캐시 최대 개수
+
     # Server
     host: str = "0.0.0.0"
     port: int = 8000
@@ -42,11 +42,13 @@ class AgentChatService:
         """
         # RAG 검색 (legal_chunks가 없으면 자동 검색)
         if not legal_chunks:
+            from config import settings
             legal_chunks = await self.legal_service._search_legal_chunks(
                 query=query,
-                top_k=3,  # 극한 최적화: 5 → 3으로 감소 (프롬프트 1000자 이내 목표)
+                top_k=settings.agent_plain_legal_top_k,  # 극한 최적화: 5 → 3으로 감소 (프롬프트 1000자 이내 목표)
                 category=None,
                 ensure_diversity=True,
+                rerank=True,  # settings.legal_rerank_enabled일 때 cross-encoder 재정렬
             )
         
         # 프롬프트 구성
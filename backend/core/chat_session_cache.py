@@ -0,0 +1,173 @@
+"""
+Chat Session Cache - 챗 세션 컨텍스트 인메모리 캐시
+세션 정보, 최근 히스토리, 분석 리포트 스냅샷을 세션 단위로 보관 (write-through)
+"""
+
+from typing import Dict, Any, Optional, List, Tuple
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ChatSessionContext:
+    """세션 단위 캐시 항목"""
+    session_id: str
+    user_id: Optional[str]
+    session: Dict[str, Any]
+    history: deque
+    history_loaded: bool = False  # DB에서 최근 히스토리를 한 번이라도 불러왔는지
+    last_sequence: Optional[int] = None  # 마지막 메시지 sequence_number (알 수 없으면 None)
+    analyses: Dict[Tuple[str, str], Dict[str, Any]] = field(default_factory=dict)  # (context_type, analysis_id) -> 분석 결과
+    touched_at: float = field(default_factory=time.monotonic)
+
+
+class ChatSessionCache:
+    """
+    챗 세션 컨텍스트 LRU 캐시
+    - 세션 수를 max_sessions로 제한하고, ttl_seconds 동안 접근이 없으면 만료
+    - 히스토리는 history_limit 개수만 유지 (deque maxlen)
+    - 메시지 저장/세션 삭제 시 ContractStorageService가 write-through로 갱신
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = 500,
+        ttl_seconds: float = 1800.0,
+        history_limit: int = 30,
+    ):
+        """
+        Args:
+            max_sessions: 최대 캐시 세션 수
+            ttl_seconds: 마지막 접근 이후 캐시 유지 시간 (초)
+            history_limit: 세션별로 보관할 최근 메시지 수
+        """
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self.history_limit = history_limit
+        self._sessions: "OrderedDict[str, ChatSessionContext]" = OrderedDict()
+
+    def get(self, session_id: str, user_id: Optional[str] = None) -> Optional[ChatSessionContext]:
+        """세션 컨텍스트 조회 (만료/사용자 불일치 시 None)"""
+        ctx = self._sessions.get(session_id)
+        if ctx is None:
+            return None
+
+        now = time.monotonic()
+        if now - ctx.touched_at > self.ttl_seconds:
+            self._sessions.pop(session_id, None)
+            return None
+
+        # 다른 사용자의 세션은 캐시에서 반환하지 않음 (DB 조회로 권한 확인)
+        if user_id and ctx.user_id and ctx.user_id != user_id:
+            return None
+
+        ctx.touched_at = now
+        self._sessions.move_to_end(session_id)
+        return ctx
+
+    def put_session(
+        self,
+        session_id: str,
+        user_id: Optional[str],
+        session: Dict[str, Any],
+        is_new: bool = False,
+    ) -> ChatSessionContext:
+        """
+        세션 정보 저장
+
+        Args:
+            is_new: 방금 생성된 세션이면 True (히스토리가 비어있음이 확실하므로 DB 조회 생략)
+        """
+        ctx = self._sessions.get(session_id)
+        if ctx is not None and (not user_id or ctx.user_id == user_id):
+            ctx.session = session
+            ctx.touched_at = time.monotonic()
+            self._sessions.move_to_end(session_id)
+            return ctx
+
+        ctx = ChatSessionContext(
+            session_id=session_id,
+            user_id=user_id,
+            session=session,
+            history=deque(maxlen=self.history_limit),
+            history_loaded=is_new,
+            last_sequence=0 if is_new else None,
+        )
+        self._sessions[session_id] = ctx
+        self._sessions.move_to_end(session_id)
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+        return ctx
+
+    def get_history(self, session_id: str, user_id: Optional[str] = None) -> Optional[List[Dict[str, Any]]]:
+        """캐시된 최근 히스토리 (불러온 적이 없으면 None)"""
+        ctx = self.get(session_id, user_id)
+        if ctx is None or not ctx.history_loaded:
+            return None
+        return list(ctx.history)
+
+    def set_history(self, session_id: str, user_id: Optional[str], messages: List[Dict[str, Any]]) -> None:
+        """DB에서 불러온 최근 히스토리로 캐시 갱신 (sequence_number 오름차순)"""
+        ctx = self.get(session_id, user_id)
+        if ctx is None:
+            ctx = self.put_session(session_id, user_id, {"id": session_id, "user_id": user_id})
+        ctx.history.clear()
+        ctx.history.extend(messages)
+        ctx.history_loaded = True
+        ctx.last_sequence = messages[-1].get("sequence_number", 0) if messages else 0
+
+    def append_messages(self, session_id: str, messages: List[Dict[str, Any]]) -> None:
+        """저장된 메시지를 캐시에 반영 (write-through)"""
+        ctx = self._sessions.get(session_id)
+        if ctx is None:
+            return
+        if not ctx.history_loaded:
+            # 이전 히스토리를 모르는 상태에서는 부분 반영하지 않음
+            return
+        for msg in messages:
+            ctx.history.append(msg)
+            seq = msg.get("sequence_number")
+            if seq is not None and (ctx.last_sequence is None or seq > ctx.last_sequence):
+                ctx.last_sequence = seq
+        ctx.touched_at = time.monotonic()
+
+    def get_analysis(
+        self,
+        session_id: str,
+        context_type: str,
+        analysis_id: str,
+    ) -> Optional[Dict[str, Any]]:
+        """세션에 연결된 분석 리포트 스냅샷 조회"""
+        ctx = self._sessions.get(session_id)
+        if ctx is None:
+            return None
+        return ctx.analyses.get((context_type, analysis_id))
+
+    def set_analysis(
+        self,
+        session_id: str,
+        context_type: str,
+        analysis_id: str,
+        analysis: Dict[str, Any],
+    ) -> None:
+        """세션에 연결된 분석 리포트 스냅샷 저장"""
+        ctx = self._sessions.get(session_id)
+        if ctx is None:
+            return
+        ctx.analyses[(context_type, analysis_id)] = analysis
+
+    def invalidate(self, session_id: str) -> None:
+        """세션 캐시 삭제"""
+        self._sessions.pop(session_id, None)
+
+    def clear(self) -> None:
+        """캐시 전체 삭제"""
+        self._sessions.clear()
+
+    def size(self) -> int:
+        """현재 캐시된 세션 수"""
+        return len(self._sessions)
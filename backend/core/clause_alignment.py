@@ -0,0 +1,235 @@
+"""
+Clause Alignment - 계약서 버전 간 조항 정렬/비교 (/compare-contracts)
+조항 번호(clause-N)가 아니라 내용으로 이전/새 조항을 짝지어, 조항 하나가 추가되어도 뒤의 조항이 모두 수정으로 잡히지 않게 합니다.
+
+1. 정확 일치: 공백 정규화한 본문 해시가 같은 조항끼리 (계약서 순서대로) 매칭 → 변경 없음
+2. 유사도 매칭: 남은 조항끼리 본문 문자 3-gram Jaccard + 조항 제목 일치로 유사도 행렬을 만들고
+   헝가리안 알고리즘으로 유사도 합이 최대가 되는 1:1 매칭 (clause_align_min_similarity 미만은 매칭하지 않음)
+3. 매칭된 쌍 중 본문이 실제로 다른 쌍만 문자 단위 diff, 매칭되지 않은 조항은 추가/삭제
+"""
+
+from typing import List, Dict, Any, Optional, Tuple
+from difflib import SequenceMatcher
+import hashlib
+import logging
+import re
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# 유사도 = 본문 3-gram Jaccard × (1 - TITLE_WEIGHT) + 조항 제목(번호 제외) 일치 × TITLE_WEIGHT
+TITLE_WEIGHT = 0.15
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_ARTICLE_PREFIX_RE = re.compile(r"^\s*제\s*\d+\s*조(?:\s*의\s*\d+)?")
+_TITLE_STRIP_CHARS = " ()[]【】「」.:"
+
+
+def _normalize(text: Optional[str]) -> str:
+    return _WHITESPACE_RE.sub(" ", text or "").strip()
+
+
+def _title_label(title: Optional[str]) -> str:
+    """'제5조(수습기간)' → '수습기간' (번호가 바뀌어도 같은 조항으로 보기 위해)"""
+    return _WHITESPACE_RE.sub("", _ARTICLE_PREFIX_RE.sub("", title or "")).strip(_TITLE_STRIP_CHARS)
+
+
+def _shingles(text: str) -> frozenset:
+    compact = _WHITESPACE_RE.sub("", text)
+    if len(compact) < 3:
+        return frozenset([compact]) if compact else frozenset()
+    return frozenset(compact[i:i + 3] for i in range(len(compact) - 2))
+
+
+def clause_similarity(
+    old_shingles: frozenset,
+    new_shingles: frozenset,
+    old_label: str = "",
+    new_label: str = "",
+) -> float:
+    """두 조항의 유사도 (0~1)"""
+    union = len(old_shingles | new_shingles)
+    jaccard = len(old_shingles & new_shingles) / union if union else 0.0
+    title_match = 1.0 if old_label and old_label == new_label else 0.0
+    return jaccard * (1 - TITLE_WEIGHT) + title_match * TITLE_WEIGHT
+
+
+def max_weight_assignment(weights: List[List[float]]) -> List[Tuple[int, int]]:
+    """
+    유사도 합이 최대인 1:1 매칭 (헝가리안 알고리즘, O(n²m))
+
+    Args:
+        weights: n×m 유사도 행렬 (직사각형 가능)
+
+    Returns:
+        [(row, col)] 매칭 목록 (min(n, m)개)
+    """
+    if not weights or not weights[0]:
+        return []
+    transposed = len(weights) > len(weights[0])
+    if transposed:
+        weights = [list(col) for col in zip(*weights)]
+    n, m = len(weights), len(weights[0])
+    inf = float("inf")
+    # 비용 = -유사도, 1-indexed 포텐셜 (n ≤ m)
+    u = [0.0] * (n + 1)
+    v = [0.0] * (m + 1)
+    p = [0] * (m + 1)  # p[j] = 열 j에 배정된 행
+    way = [0] * (m + 1)
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        minv = [inf] * (m + 1)
+        used = [False] * (m + 1)
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            row = weights[i0 - 1]
+            delta = inf
+            j1 = 0
+            for j in range(1, m + 1):
+                if used[j]:
+                    continue
+                cur = -row[j - 1] - u[i0] - v[j]
+                if cur < minv[j]:
+                    minv[j] = cur
+                    way[j] = j0
+                if minv[j] < delta:
+                    delta = minv[j]
+                    j1 = j
+            for j in range(m + 1):
+                if used[j]:
+                    u[p[j]] += delta
+                    v[j] -= delta
+                else:
+                    minv[j] -= delta
+            j0 = j1
+            if p[j0] == 0:
+                break
+        while j0:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+    pairs = [(p[j] - 1, j - 1) for j in range(1, m + 1) if p[j]]
+    return [(col, row) for row, col in pairs] if transposed else pairs
+
+
+def char_diff(old_text: str, new_text: str) -> List[Dict[str, str]]:
+    """
+    문자 단위 diff
+
+    Returns:
+        [{"op": "equal" | "insert" | "delete" | "replace", "oldText", "newText"}]
+    """
+    matcher = SequenceMatcher(None, old_text, new_text, autojunk=False)
+    return [
+        {"op": op, "oldText": old_text[i1:i2], "newText": new_text[j1:j2]}
+        for op, i1, i2, j1, j2 in matcher.get_opcodes()
+    ]
+
+
+def compare_clauses(
+    old_clauses: List[Dict[str, Any]],
+    new_clauses: List[Dict[str, Any]],
+    min_similarity: Optional[float] = None,
+    stats: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    이전/새 계약서 조항 비교
+
+    Args:
+        old_clauses: 이전 계약서 clause 리스트 ({"id", "title", "content"})
+        new_clauses: 새 계약서 clause 리스트
+        min_similarity: 이 값 미만인 쌍은 수정이 아니라 삭제+추가로 봄 (None이면 settings.clause_align_min_similarity)
+        stats: 주어지면 변경 없음/이동/수정/추가/삭제 개수를 기록
+
+    Returns:
+        변경된 조항 목록 (수정·추가는 새 계약서 순서, 그 뒤에 삭제는 이전 계약서 순서)
+        - modified: clauseId(새 조항), oldClauseId, title, oldContent, newContent, similarity, diff
+        - added / removed: clauseId, title, content
+    """
+    if min_similarity is None:
+        min_similarity = settings.clause_align_min_similarity
+    old_texts = [_normalize(c.get("content")) for c in old_clauses]
+    new_texts = [_normalize(c.get("content")) for c in new_clauses]
+
+    # 1. 정확 일치 (본문 해시)
+    old_by_hash: Dict[str, List[int]] = {}
+    for i, text in enumerate(old_texts):
+        old_by_hash.setdefault(hashlib.sha1(text.encode("utf-8")).hexdigest(), []).append(i)
+    match_of_new: Dict[int, int] = {}
+    similarity_of_new: Dict[int, float] = {}
+    for j, text in enumerate(new_texts):
+        candidates = old_by_hash.get(hashlib.sha1(text.encode("utf-8")).hexdigest())
+        if candidates:
+            match_of_new[j] = candidates.pop(0)
+            similarity_of_new[j] = 1.0
+    exact = len(match_of_new)
+
+    # 2. 남은 조항 유사도 매칭
+    matched_old = set(match_of_new.values())
+    rest_old = [i for i in range(len(old_clauses)) if i not in matched_old]
+    rest_new = [j for j in range(len(new_clauses)) if j not in match_of_new]
+    if rest_old and rest_new:
+        old_features = [(_shingles(old_texts[i]), _title_label(old_clauses[i].get("title"))) for i in rest_old]
+        new_features = [(_shingles(new_texts[j]), _title_label(new_clauses[j].get("title"))) for j in rest_new]
+        weights = [
+            [clause_similarity(o_sh, n_sh, o_label, n_label) for n_sh, n_label in new_features]
+            for o_sh, o_label in old_features
+        ]
+        for row, col in max_weight_assignment(weights):
+            if weights[row][col] >= min_similarity:
+                match_of_new[rest_new[col]] = rest_old[row]
+                similarity_of_new[rest_new[col]] = weights[row][col]
+
+    # 3. 변경 목록
+    changed: List[Dict[str, Any]] = []
+    moved = modified = 0
+    for j, new_clause in enumerate(new_clauses):
+        i = match_of_new.get(j)
+        if i is None:
+            changed.append({
+                "type": "added",
+                "clauseId": new_clause.get("id"),
+                "title": new_clause.get("title"),
+                "content": new_clause.get("content"),
+            })
+            continue
+        old_clause = old_clauses[i]
+        if old_texts[i] == new_texts[j]:
+            if old_clause.get("id") != new_clause.get("id"):
+                moved += 1  # 번호만 바뀐 조항 (앞에 조항이 추가/삭제됨)
+            continue
+        modified += 1
+        changed.append({
+            "type": "modified",
+            "clauseId": new_clause.get("id"),
+            "oldClauseId": old_clause.get("id"),
+            "title": new_clause.get("title"),
+            "oldTitle": old_clause.get("title"),
+            "oldContent": old_clause.get("content"),
+            "newContent": new_clause.get("content"),
+            "similarity": round(similarity_of_new[j], 4),
+            "diff": char_diff(old_texts[i], new_texts[j]),
+        })
+    matched_old = set(match_of_new.values())
+    for i, old_clause in enumerate(old_clauses):
+        if i not in matched_old:
+            changed.append({
+                "type": "removed",
+                "clauseId": old_clause.get("id"),
+                "title": old_clause.get("title"),
+                "content": old_clause.get("content"),
+            })
+
+    if stats is not None:
+        stats.update({
+            "unchanged": len(match_of_new) - modified,
+            "moved": moved,
+            "exact_matches": exact,
+            "modified": modified,
+            "added": len(new_clauses) - len(match_of_new),
+            "removed": len(old_clauses) - len(matched_old),
+        })
+    return changed
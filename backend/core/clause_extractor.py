@@ -3,12 +3,91 @@ Clause Extractor - 계약서에서 canonical clause 리스트 추출
 LegalChunker 결과를 클라이언트/LLM/DB에서 공통으로 사용하는 형식으로 변환
 """
 
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
+from array import array
+from bisect import bisect_left
 import logging
+import re
 from .legal_chunker import LegalChunker
 
 logger = logging.getLogger(__name__)
 
+_WHITESPACE_RE = re.compile(r'\s+')
+_ARTICLE_NUMBER_RE = re.compile(r'제\s*(\d+)\s*조')
+
+
+def normalize_whitespace(text: str) -> str:
+    """연속 공백/줄바꿈을 공백 하나로 정규화"""
+    return _WHITESPACE_RE.sub(' ', text.strip())
+
+
+class NormalizedText:
+    """
+    공백 정규화 텍스트 + 원문 offset 매핑
+    
+    원문을 한 번만 정규화하고, 정규화 문자열의 각 위치가 원문의 어느 offset인지
+    int 배열(offsets)로 보관합니다. OCR 텍스트처럼 공백이 불규칙해도
+    정규화 문자열에서 str.find 한 번으로 찾고 원문 (start, end)로 되돌릴 수 있습니다.
+    clause_extractor / ClauseLabelingTool / HighlightTool에서 공통으로 사용합니다.
+    """
+    
+    def __init__(self, text: str):
+        self.text = text
+        parts: List[str] = []
+        offsets = array('i')
+        pos = 0
+        for m in _WHITESPACE_RE.finditer(text):
+            if m.start() > pos:
+                parts.append(text[pos:m.start()])
+                offsets.extend(range(pos, m.start()))
+            # 공백 구간은 첫 공백 문자 위치 하나로 매핑
+            parts.append(' ')
+            offsets.append(m.start())
+            pos = m.end()
+        if pos < len(text):
+            parts.append(text[pos:])
+            offsets.extend(range(pos, len(text)))
+        self.normalized = ''.join(parts)
+        self.offsets = offsets
+    
+    def to_normalized(self, original_offset: int) -> int:
+        """원문 offset → 정규화 문자열 위치 (해당 offset 이후 첫 문자)"""
+        return bisect_left(self.offsets, original_offset)
+    
+    def find(self, needle: str, start: int = 0) -> Optional[Tuple[int, int]]:
+        """
+        공백을 무시하고 needle 검색
+        
+        Args:
+            needle: 찾을 텍스트 (내부에서 공백 정규화)
+            start: 검색 시작 원문 offset
+        
+        Returns:
+            원문 기준 (start, end) 또는 None
+        """
+        needle_normalized = normalize_whitespace(needle)
+        if not needle_normalized:
+            return None
+        n_start = self.normalized.find(needle_normalized, self.to_normalized(start))
+        if n_start < 0:
+            return None
+        n_end = n_start + len(needle_normalized)
+        return self.offsets[n_start], self.offsets[n_end - 1] + 1
+    
+    def locate_all(self, needles: List[str], start: int = 0) -> List[Optional[Tuple[int, int]]]:
+        """
+        needles를 문서 순서대로 한 번의 전방 스캔으로 찾기
+        (찾은 위치 이후부터 다음 needle 검색, 못 찾으면 None이고 커서는 유지)
+        """
+        results: List[Optional[Tuple[int, int]]] = []
+        cursor = start
+        for needle in needles:
+            span = self.find(needle, cursor)
+            results.append(span)
+            if span:
+                cursor = span[1]
+        return results
+
 
 def extract_clauses(contract_text: str) -> List[Dict]:
     """
@@ -42,6 +121,7 @@ def extract_clauses(contract_text: str) -> List[Dict]:
     
     clauses: List[Dict] = []
     offset = 0
+    normalized_text: Optional[NormalizedText] = None
     
     for idx, section in enumerate(sections, start=1):
         body = (section.body or "").strip()
@@ -51,23 +131,15 @@ def extract_clauses(contract_text: str) -> List[Dict]:
         # startIndex / endIndex 계산
         # 1. 정확한 매칭 시도 (offset 이후부터)
         start_idx = contract_text.find(body, offset)
+        end_idx = start_idx + len(body) if start_idx >= 0 else -1
         
-        # 2. 정확히 못 찾으면 공백 정규화해서 검색
+        # 2. 정확히 못 찾으면 공백 정규화해서 검색 (원문 정규화/offset 매핑은 한 번만 생성)
         if start_idx == -1:
-            # body의 공백을 정규화 (연속 공백을 하나로)
-            import re
-            body_normalized = re.sub(r'\s+', ' ', body.strip())
-            contract_normalized = re.sub(r'\s+', ' ', contract_text[offset:])
-            normalized_start = contract_normalized.find(body_normalized)
-            if normalized_start >= 0:
-                # 원본 텍스트에서 실제 위치 찾기
-                # offset 이후의 정규화된 텍스트에서 찾았으므로, 원본에서도 찾기
-                search_text = contract_text[offset:]
-                # 부분 매칭으로 찾기
-                for i in range(len(search_text) - len(body_normalized) + 1):
-                    if re.sub(r'\s+', ' ', search_text[i:i+len(body_normalized)]) == body_normalized:
-                        start_idx = offset + i
-                        break
+            if normalized_text is None:
+                normalized_text = NormalizedText(contract_text)
+            span = normalized_text.find(body, offset)
+            if span:
+                start_idx, end_idx = span
         
         # 3. 그래도 못 찾으면 앞부분에서 검색 (body의 앞 100자)
         if start_idx == -1:
@@ -82,16 +154,16 @@ def extract_clauses(contract_text: str) -> List[Dict]:
             start_idx = offset
             logger.warning(f"[clause_extractor] clause-{idx} '{section.title[:30]}'의 본문을 찾지 못해 offset 위치({offset}) 사용")
         
-        # endIndex 계산: body의 실제 길이 사용
-        end_idx = start_idx + len(body)
+        # endIndex 계산: 정규화 매칭이면 원문 span 끝, 아니면 body의 실제 길이 사용
+        if end_idx <= start_idx:
+            end_idx = start_idx + len(body)
         
         # 다음 검색 시작 위치 업데이트 (겹치지 않도록)
         offset = max(end_idx, offset + 1)
         
         # article_number 추출 (제목에서 숫자 추출)
         article_number = idx
-        import re
-        article_match = re.search(r'제\s*(\d+)\s*조', section.title)
+        article_match = _ARTICLE_NUMBER_RE.search(section.title)
         if article_match:
             article_number = int(article_match.group(1))
         
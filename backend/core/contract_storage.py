@@ -3,9 +3,11 @@
 """
 
 from typing import Dict, Any, Optional, List
+import asyncio
 import os
 from supabase import create_client, Client
 from config import settings
+from core.chat_session_cache import ChatSessionCache
 import logging
 
 logger = logging.getLogger(__name__)
@@ -17,6 +19,16 @@ class ContractStorageService:
     def __init__(self):
         self.sb: Optional[Client] = None
         self._initialized = False
+        # 챗 세션 컨텍스트 캐시 (세션/최근 히스토리/분석 스냅샷, write-through)
+        self.session_cache = ChatSessionCache(
+            max_sessions=settings.chat_session_cache_size,
+            ttl_seconds=settings.chat_session_cache_ttl,
+            history_limit=settings.chat_history_limit,
+        )
+        # append_legal_chat_messages RPC 사용 가능 여부 (없으면 일괄 insert로 fallback)
+        self._append_rpc_available = True
+        # contract_analyses.issue_count 컬럼 존재 여부 (없으면 집계 쿼리로 fallback)
+        self._has_issue_count_column = True
     
     def _ensure_initialized(self):
         """Supabase 클라이언트 지연 초기화"""
@@ -365,7 +377,11 @@ class ContractStorageService:
             계약서 분석 결과 딕셔너리 또는 None
         """
         self._ensure_initialized()
-        
+        # PostgREST 호출은 블로킹이므로 스레드에서 실행 (여러 건을 asyncio.gather로 동시에 조회 가능)
+        return await asyncio.to_thread(self._fetch_contract_analysis, doc_id, user_id)
+    
+    def _fetch_contract_analysis(self, doc_id: str, user_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """get_contract_analysis 본체 (동기, 스레드에서 실행)"""
         try:
             # contract_analyses 테이블에서 조회
             # doc_id로 먼저 시도, 없으면 id로 시도 (기존 데이터 호환성)
@@ -541,11 +557,17 @@ class ContractStorageService:
                 logger.error(f"상황 분석 결과 저장 중 오류: {error_str}", exc_info=True)
                 raise
     
+    # 히스토리 목록에 필요한 요약 컬럼 (contract_text/clauses/retrieved_contexts 등 대용량 컬럼 제외)
+    CONTRACT_HISTORY_COLUMNS = "id, doc_id, title, original_filename, risk_score, risk_level, summary, created_at"
+    SITUATION_HISTORY_COLUMNS = "id, situation, category, risk_score, risk_level, created_at, summary:analysis->>summary"
+    
     async def get_user_contract_analyses(
         self,
         user_id: str,
         limit: int = 20,
         offset: int = 0,
+        before: Optional[str] = None,
+        before_id: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
         """
         사용자별 계약서 분석 히스토리 조회
@@ -553,7 +575,9 @@ class ContractStorageService:
         Args:
             user_id: 사용자 ID
             limit: 조회 개수
-            offset: 오프셋
+            offset: 오프셋 (before가 없을 때만 사용)
+            before: keyset 커서 - 이 created_at보다 이전 항목만 조회 (이전 페이지 마지막 항목의 created_at)
+            before_id: keyset 커서 보조키 - 이전 페이지 마지막 항목의 id (before와 함께 지정하면 created_at이 같은 항목도 id로 이어서 조회)
         
         Returns:
             계약서 분석 결과 리스트
@@ -561,49 +585,47 @@ class ContractStorageService:
         self._ensure_initialized()
         
         try:
-            result = (
-                self.sb.table("contract_analyses")
-                .select("*")
-                .eq("user_id", user_id)
-                .order("created_at", desc=True)
-                .limit(limit)
-                .offset(offset)
-                .execute()
-            )
+            rows = None
+            if self._has_issue_count_column:
+                try:
+                    rows = self._select_history_page(
+                        "contract_analyses",
+                        f"{self.CONTRACT_HISTORY_COLUMNS}, issue_count",
+                        user_id, limit, offset, before, before_id,
+                    )
+                except Exception as e:
+                    if "issue_count" not in str(e):
+                        raise
+                    # issue_count 컬럼 미배포 (scripts/add_issue_count_to_contract_analyses.sql)
+                    self._has_issue_count_column = False
+                    logger.warning(f"contract_analyses.issue_count 컬럼 없음, 집계 쿼리로 대체: {str(e)}")
+            
+            if rows is None:
+                rows = self._select_history_page(
+                    "contract_analyses",
+                    self.CONTRACT_HISTORY_COLUMNS,
+                    user_id, limit, offset, before, before_id,
+                )
+                issue_counts = self._count_issues_by_analysis([row["id"] for row in rows])
+                for row in rows:
+                    row["issue_count"] = issue_counts.get(row["id"], 0)
             
             analyses = []
-            if result.data:
-                for analysis in result.data:
-                    contract_analysis_id = analysis["id"]
-                    
-                    # 이슈 개수 조회 (contract_issues 테이블이 있는 경우에만)
-                    issue_count = 0
-                    try:
-                        issues_result = (
-                            self.sb.table("contract_issues")
-                            .select("id", count="exact")
-                            .eq("contract_analysis_id", contract_analysis_id)
-                            .execute()
-                        )
-                        issue_count = issues_result.count if hasattr(issues_result, 'count') else 0
-                    except Exception:
-                        # contract_issues 테이블이 없으면 0으로 설정
-                        issue_count = 0
-                    
-                    # doc_id가 없으면 id를 사용 (기존 데이터 호환성)
-                    doc_id_value = analysis.get("doc_id") or str(analysis["id"])
-                    
-                    analyses.append({
-                        "id": analysis["id"],
-                        "doc_id": doc_id_value,
-                        "title": analysis.get("title", ""),
-                        "original_filename": analysis.get("original_filename", ""),
-                        "risk_score": float(analysis.get("risk_score", 0)),
-                        "risk_level": analysis.get("risk_level", "medium"),
-                        "summary": analysis.get("summary", ""),
-                        "created_at": analysis.get("created_at", ""),
-                        "issue_count": issue_count,
-                    })
+            for analysis in rows:
+                # doc_id가 없으면 id를 사용 (기존 데이터 호환성)
+                doc_id_value = analysis.get("doc_id") or str(analysis["id"])
+                
+                analyses.append({
+                    "id": analysis["id"],
+                    "doc_id": doc_id_value,
+                    "title": analysis.get("title", ""),
+                    "original_filename": analysis.get("original_filename", ""),
+                    "risk_score": float(analysis.get("risk_score") or 0),
+                    "risk_level": analysis.get("risk_level", "medium"),
+                    "summary": analysis.get("summary", ""),
+                    "created_at": analysis.get("created_at", ""),
+                    "issue_count": analysis.get("issue_count") or 0,
+                })
             
             return analyses
             
@@ -611,11 +633,61 @@ class ContractStorageService:
             logger.error(f"사용자별 계약서 분석 조회 중 오류: {str(e)}", exc_info=True)
             return []
     
+    def _select_history_page(
+        self,
+        table: str,
+        columns: str,
+        user_id: str,
+        limit: int,
+        offset: int,
+        before: Optional[str],
+        before_id: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """히스토리 한 페이지 조회 (before가 있으면 (created_at, id) keyset, 없으면 offset)"""
+        query = (
+            self.sb.table(table)
+            .select(columns)
+            .eq("user_id", user_id)
+        )
+        if before and before_id:
+            # created_at이 같은 항목이 페이지 경계에 걸쳐도 빠지거나 중복되지 않도록 (created_at, id) 복합 커서 사용
+            # (before/before_id는 라우터의 parse_history_cursor에서 ISO-8601/UUID로 검증·정규화된 값)
+            query = query.or_(f'created_at.lt."{before}",and(created_at.eq."{before}",id.lt.{before_id})')
+        elif before:
+            query = query.lt("created_at", before)
+        query = query.order("created_at", desc=True).order("id", desc=True).limit(limit)
+        if not before and offset:
+            query = query.offset(offset)
+        result = query.execute()
+        return result.data or []
+    
+    def _count_issues_by_analysis(self, analysis_ids: List[str]) -> Dict[str, int]:
+        """여러 분석의 이슈 개수를 한 번의 쿼리로 집계 (issue_count 컬럼이 없을 때 사용)"""
+        if not analysis_ids:
+            return {}
+        counts: Dict[str, int] = {}
+        try:
+            result = (
+                self.sb.table("contract_issues")
+                .select("contract_analysis_id")
+                .in_("contract_analysis_id", analysis_ids)
+                .execute()
+            )
+            for row in result.data or []:
+                analysis_id = row.get("contract_analysis_id")
+                counts[analysis_id] = counts.get(analysis_id, 0) + 1
+        except Exception:
+            # contract_issues 테이블이 없으면 0으로 설정
+            return {}
+        return counts
+    
     async def get_user_situation_analyses(
         self,
         user_id: str,
         limit: int = 20,
         offset: int = 0,
+        before: Optional[str] = None,
+        before_id: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
         """
         사용자별 상황 분석 히스토리 조회
@@ -623,7 +695,9 @@ class ContractStorageService:
         Args:
             user_id: 사용자 ID
             limit: 조회 개수
-            offset: 오프셋
+            offset: 오프셋 (before가 없을 때만 사용)
+            before: keyset 커서 - 이 created_at보다 이전 항목만 조회 (이전 페이지 마지막 항목의 created_at)
+            before_id: keyset 커서 보조키 - 이전 페이지 마지막 항목의 id (before와 함께 지정하면 created_at이 같은 항목도 id로 이어서 조회)
         
         Returns:
             상황 분석 결과 리스트
@@ -631,34 +705,26 @@ class ContractStorageService:
         self._ensure_initialized()
         
         try:
-            result = (
-                self.sb.table("situation_analyses")
-                .select("*")
-                .eq("user_id", user_id)
-                .order("created_at", desc=True)
-                .limit(limit)
-                .offset(offset)
-                .execute()
+            # analysis JSONB 전체 대신 summary만 추출 (analysis->>summary)
+            rows = self._select_history_page(
+                "situation_analyses",
+                self.SITUATION_HISTORY_COLUMNS,
+                user_id, limit, offset, before, before_id,
             )
             
             analyses = []
-            if result.data:
-                for analysis in result.data:
-                    # analysis 필드에서 summary 추출
-                    analysis_data = analysis.get("analysis", {})
-                    summary = ""
-                    if isinstance(analysis_data, dict):
-                        summary = analysis_data.get("summary", "")
-                    
-                    analyses.append({
-                        "id": analysis["id"],
-                        "situation": analysis.get("situation", "")[:100],  # 미리보기용
-                        "category": analysis.get("category", "unknown"),
-                        "risk_score": int(analysis.get("risk_score", 0)),
-                        "risk_level": analysis.get("risk_level", "low"),
-                        "summary": summary[:200] if summary else "",  # 미리보기용
-                        "created_at": analysis.get("created_at"),
-                    })
+            for analysis in rows:
+                summary = analysis.get("summary") or ""
+                
+                analyses.append({
+                    "id": analysis["id"],
+                    "situation": (analysis.get("situation") or "")[:100],  # 미리보기용
+                    "category": analysis.get("category", "unknown"),
+                    "risk_score": int(analysis.get("risk_score") or 0),
+                    "risk_level": analysis.get("risk_level", "low"),
+                    "summary": summary[:200] if summary else "",  # 미리보기용
+                    "created_at": analysis.get("created_at"),
+                })
             
             return analyses
         except Exception as e:
@@ -1012,6 +1078,10 @@ class ContractStorageService:
         Returns:
             챗 세션 정보 또는 None
         """
+        cached = self.session_cache.get(session_id, user_id)
+        if cached is not None:
+            return cached.session
+        
         self._ensure_initialized()
         
         try:
@@ -1029,7 +1099,9 @@ class ContractStorageService:
             if not result.data or len(result.data) == 0:
                 return None
             
-            return result.data[0]
+            session = result.data[0]
+            self.session_cache.put_session(session_id, session.get("user_id") or user_id, session)
+            return session
         except Exception as e:
             logger.error(f"챗 세션 조회 중 오류: {str(e)}", exc_info=True)
             raise
@@ -1068,6 +1140,8 @@ class ContractStorageService:
                 .eq("user_id", user_id)
                 .execute()
             )
+            # 캐시된 세션 정보(제목 등)가 TTL 동안 남지 않도록 무효화 (다음 조회 시 DB에서 다시 로딩)
+            self.session_cache.invalidate(session_id)
             
             return True
         except Exception as e:
@@ -1093,6 +1167,7 @@ class ContractStorageService:
         
         try:
             self.sb.table("legal_chat_sessions").delete().eq("id", session_id).eq("user_id", user_id).execute()
+            self.session_cache.invalidate(session_id)
             logger.info(f"챗 세션 삭제 완료: session_id={session_id}")
             return True
         except Exception as e:
@@ -1138,6 +1213,8 @@ class ContractStorageService:
                 raise ValueError("채팅 세션 생성 실패")
             
             session_id = result.data[0]["id"]
+            # 새 세션은 히스토리가 비어있으므로 캐시에 바로 등록 (첫 턴의 히스토리 조회 생략)
+            self.session_cache.put_session(session_id, user_id, result.data[0], is_new=True)
             logger.info(f"채팅 세션 생성 완료: id={session_id}, context_type={initial_context_type}, context_id={initial_context_id}")
             return session_id
             
@@ -1196,6 +1273,7 @@ class ContractStorageService:
                 raise ValueError("채팅 메시지 저장 실패")
             
             message_id = result.data[0]["id"]
+            self.session_cache.append_messages(session_id, [self._format_chat_message(result.data[0])])
             logger.info(f"채팅 메시지 저장 완료: id={message_id}, session_id={session_id}, sender_type={sender_type}")
             return message_id
             
@@ -1233,27 +1311,221 @@ class ContractStorageService:
             
             result = query.execute()
             
-            messages = []
-            if result.data:
-                for msg in result.data:
-                    messages.append({
-                        "id": msg["id"],
-                        "session_id": msg["session_id"],
-                        "user_id": msg.get("user_id"),
-                        "message": msg["message"],
-                        "sender_type": msg["sender_type"],
-                        "sequence_number": msg["sequence_number"],
-                        "context_type": msg.get("context_type", "none"),
-                        "context_id": msg.get("context_id"),
-                        "metadata": msg.get("metadata"),
-                        "created_at": msg.get("created_at"),
-                    })
+            return [self._format_chat_message(msg) for msg in (result.data or [])]
+        except Exception as e:
+            logger.error(f"채팅 메시지 조회 중 오류: {str(e)}", exc_info=True)
+            raise
+    
+    @staticmethod
+    def _format_chat_message(msg: Dict[str, Any]) -> Dict[str, Any]:
+        """legal_chat_messages 행을 API 응답 형식으로 변환"""
+        return {
+            "id": msg["id"],
+            "session_id": msg["session_id"],
+            "user_id": msg.get("user_id"),
+            "message": msg["message"],
+            "sender_type": msg["sender_type"],
+            "sequence_number": msg["sequence_number"],
+            "context_type": msg.get("context_type", "none"),
+            "context_id": msg.get("context_id"),
+            "metadata": msg.get("metadata"),
+            "created_at": msg.get("created_at"),
+        }
+    
+    async def get_recent_chat_messages(
+        self,
+        session_id: str,
+        user_id: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        최근 채팅 메시지 조회 (세션 캐시 우선, 없으면 ORDER BY ... LIMIT 조회)
+        
+        Args:
+            session_id: 세션 ID
+            user_id: 사용자 ID (옵션, 권한 확인용)
+            limit: 조회할 최근 메시지 수 (기본값: settings.chat_history_limit)
+        
+        Returns:
+            최근 메시지 리스트 (sequence_number 오름차순)
+        """
+        limit = limit or self.session_cache.history_limit
+        
+        cached = self.session_cache.get_history(session_id, user_id)
+        if cached is not None and (limit <= self.session_cache.history_limit or len(cached) < self.session_cache.history_limit):
+            # 캐시는 최근 history_limit개(또는 세션 전체 히스토리)를 보관
+            return cached[-limit:]
+        
+        self._ensure_initialized()
+        
+        try:
+            query = (
+                self.sb.table("legal_chat_messages")
+                .select("id, session_id, user_id, message, sender_type, sequence_number, context_type, context_id, metadata, created_at")
+                .eq("session_id", session_id)
+            )
+            
+            if user_id:
+                query = query.eq("user_id", user_id)
+            
+            result = query.order("sequence_number", desc=True).limit(limit).execute()
             
+            messages = [self._format_chat_message(msg) for msg in reversed(result.data or [])]
+            if limit >= self.session_cache.history_limit:
+                self.session_cache.set_history(session_id, user_id, messages[-self.session_cache.history_limit:])
             return messages
         except Exception as e:
-            logger.error(f"채팅 메시지 조회 중 오류: {str(e)}", exc_info=True)
+            logger.error(f"최근 채팅 메시지 조회 중 오류: {str(e)}", exc_info=True)
             raise
     
+    async def save_chat_turn(
+        self,
+        session_id: str,
+        user_id: str,
+        messages: List[Dict[str, Any]],
+        context_type: str = "none",
+        context_id: Optional[str] = None,
+    ) -> List[str]:
+        """
+        한 턴의 채팅 메시지(user + assistant)를 한 번에 저장
+        
+        sequence_number는 append_legal_chat_messages RPC가 서버에서 할당하며,
+        RPC가 없으면 캐시된 마지막 sequence_number 기준으로 일괄 insert 합니다.
+        
+        Args:
+            session_id: 세션 ID
+            user_id: 사용자 ID
+            messages: [{"sender_type": "user", "message": "...", "metadata": {...}}, ...]
+            context_type: 컨텍스트 타입 ('none', 'situation', 'contract')
+            context_id: 컨텍스트 ID (옵션)
+        
+        Returns:
+            저장된 message_id 리스트
+        """
+        self._ensure_initialized()
+        
+        payload = []
+        for msg in messages:
+            payload.append({
+                "sender_type": msg["sender_type"],
+                "message": msg["message"],
+                "context_type": context_type,
+                "context_id": context_id,
+                "metadata": msg.get("metadata"),
+            })
+        
+        try:
+            rows = None
+            if self._append_rpc_available:
+                try:
+                    result = self.sb.rpc(
+                        "append_legal_chat_messages",
+                        {
+                            "p_session_id": session_id,
+                            "p_user_id": user_id,
+                            "p_messages": payload,
+                        },
+                    ).execute()
+                    rows = result.data or []
+                except Exception as rpc_error:
+                    error_str = str(rpc_error)
+                    error_code = getattr(rpc_error, "code", None)
+                    # 함수 미배포(PGRST202 / 42883)일 때만 전환 - 함수 내부 런타임 오류(유니크 위반, 타임아웃 등)는
+                    # 메시지에 함수 이름이 들어가도 일시적 실패이므로 그대로 올림
+                    if error_code in ("PGRST202", "42883") or "PGRST202" in error_str or "42883" in error_str:
+                        # RPC 미배포: 이후 요청부터 일괄 insert 사용
+                        self._append_rpc_available = False
+                        logger.warning(f"[챗 저장] append_legal_chat_messages RPC 없음, 일괄 insert로 전환: {error_str}")
+                    else:
+                        raise
+            
+            if rows is None:
+                rows = self._insert_chat_turn_rows(session_id, user_id, payload)
+            
+            if not rows:
+                raise ValueError("채팅 메시지 저장 실패")
+            
+            formatted = [self._format_chat_message(row) for row in sorted(rows, key=lambda r: r.get("sequence_number", 0))]
+            self.session_cache.append_messages(session_id, formatted)
+            logger.info(f"채팅 턴 저장 완료: session_id={session_id}, 메시지 {len(formatted)}개")
+            return [msg["id"] for msg in formatted]
+        except Exception as e:
+            logger.error(f"채팅 턴 저장 중 오류: {str(e)}", exc_info=True)
+            raise
+    
+    def _insert_chat_turn_rows(
+        self,
+        session_id: str,
+        user_id: str,
+        payload: List[Dict[str, Any]],
+    ) -> List[Dict[str, Any]]:
+        """RPC 없이 sequence_number를 계산해 한 번의 insert로 저장 (fallback)"""
+        ctx = self.session_cache.get(session_id, user_id)
+        last_seq = ctx.last_sequence if ctx is not None else None
+        if last_seq is None:
+            seq_result = (
+                self.sb.table("legal_chat_messages")
+                .select("sequence_number")
+                .eq("session_id", session_id)
+                .order("sequence_number", desc=True)
+                .limit(1)
+                .execute()
+            )
+            last_seq = seq_result.data[0]["sequence_number"] if seq_result.data else 0
+        
+        rows = []
+        for offset, item in enumerate(payload, start=1):
+            row = {
+                "session_id": session_id,
+                "user_id": user_id,
+                "sender_type": item["sender_type"],
+                "message": item["message"],
+                "sequence_number": last_seq + offset,
+                "context_type": item["context_type"],
+            }
+            if item.get("context_id"):
+                row["context_id"] = item["context_id"]
+            if item.get("metadata"):
+                row["metadata"] = item["metadata"]
+            rows.append(row)
+        
+        result = self.sb.table("legal_chat_messages").insert(rows).execute()
+        return result.data or []
+    
+    async def get_session_analysis(
+        self,
+        session_id: str,
+        context_type: str,
+        analysis_id: str,
+        user_id: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        세션에 연결된 분석 리포트 조회 (세션 캐시 스냅샷 우선)
+        
+        Args:
+            session_id: 세션 ID
+            context_type: 'contract' | 'situation'
+            analysis_id: 분석 ID
+            user_id: 사용자 ID (옵션)
+        
+        Returns:
+            get_contract_analysis / get_situation_analysis 결과 또는 None
+        """
+        cached = self.session_cache.get_analysis(session_id, context_type, analysis_id)
+        if cached is not None:
+            return cached
+        
+        if context_type == "contract":
+            analysis = await self.get_contract_analysis(analysis_id, user_id)
+        elif context_type == "situation":
+            analysis = await self.get_situation_analysis(analysis_id, user_id)
+        else:
+            return None
+        
+        if analysis:
+            self.session_cache.set_analysis(session_id, context_type, analysis_id, analysis)
+        return analysis
+    
     async def get_user_chat_sessions(
         self,
         user_id: str,
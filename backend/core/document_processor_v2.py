@@ -6,14 +6,19 @@ PDF → Text → Chunks 변환
 from typing import List, Dict, Any
 import re
 import os
+import logging
 from pathlib import Path
 from pydantic import BaseModel
 
+from core.logging_config import preview
+
 # langchain_text_splitters는 scipy/nltk 의존성으로 Windows에서 매우 느리므로
 # 기본적으로 SimpleTextSplitter를 사용하고, 필요시에만 lazy import
 LANGCHAIN_SPLITTER_AVAILABLE = False
 RecursiveCharacterTextSplitter = None
 
+logger = logging.getLogger(__name__)
+
 
 class Chunk(BaseModel):
     """청크 모델"""
@@ -466,21 +471,32 @@ class DocumentProcessor:
             max_article_length=int(os.getenv("CONTRACT_MAX_ARTICLE_LENGTH", "2000"))
         )
     
-    def _log(self, msg: str):
-        """verbose 모드일 때만 로그 출력"""
-        if self.verbose:
-            # Windows에서 이모티콘 인코딩 오류 방지
-            import sys
-            if sys.platform == "win32":
-                # 이모티콘을 ASCII 문자로 대체
-                safe_msg = msg.replace('⚠️', '[경고]').replace('✅', '[완료]')
-                try:
-                    print(safe_msg)
-                except UnicodeEncodeError:
-                    # 인코딩 오류 발생 시 errors='replace' 사용
-                    print(safe_msg.encode('utf-8', errors='replace').decode('utf-8', errors='replace'))
-            else:
-                print(msg)
+    def _log(self, msg: str, *args):
+        """
+        verbose 모드일 때만 로그 출력
+        
+        서버에서는 로깅 설정(큐 기반 백그라운드 핸들러)으로 보내고, 핸들러가 없는 스크립트 실행 시에는 print.
+        args가 있으면 msg % args 포맷팅은 실제로 출력될 때만 수행됩니다.
+        """
+        if not self.verbose:
+            return
+        if logging.getLogger().handlers:
+            logger.info(msg, *args)
+            return
+        if args:
+            msg = msg % args
+        # Windows에서 이모티콘 인코딩 오류 방지
+        import sys
+        if sys.platform == "win32":
+            # 이모티콘을 ASCII 문자로 대체
+            safe_msg = msg.replace('⚠️', '[경고]').replace('✅', '[완료]')
+            try:
+                print(safe_msg)
+            except UnicodeEncodeError:
+                # 인코딩 오류 발생 시 errors='replace' 사용
+                print(safe_msg.encode('utf-8', errors='replace').decode('utf-8', errors='replace'))
+        else:
+            print(msg)
     
     def pdf_to_text(
         self, 
@@ -615,7 +631,7 @@ class DocumentProcessor:
 
             if page_text.strip():
                 pages.append(page_text)
-                self._log(f"[PDF 처리] PyMuPDF 페이지 {i + 1}: {len(page_text)}자 추출")
+                self._log("[PDF 처리] PyMuPDF 페이지 %d: %d자 추출", i + 1, len(page_text))
 
         doc.close()
 
@@ -651,8 +667,9 @@ class DocumentProcessor:
                     page_text = page.extract_text() or ""
                     if page_text.strip():
                         text_parts.append(page_text)
-                        digit_count = sum(ch.isdigit() for ch in page_text)
-                        self._log(f"[PDF 처리] pdfplumber 페이지 {i + 1}: {len(page_text)}자, 숫자 {digit_count}개")
+                        if self.verbose:
+                            digit_count = sum(ch.isdigit() for ch in page_text)
+                            self._log("[PDF 처리] pdfplumber 페이지 %d: %d자, 숫자 %d개", i + 1, len(page_text), digit_count)
             
             if text_parts:
                 text = "\n".join(text_parts)
@@ -692,7 +709,7 @@ class DocumentProcessor:
                 page_text = page.extract_text() or ""
                 if page_text.strip():
                     pages.append(page_text)
-                    self._log(f"[PDF 처리] pypdf 페이지 {i + 1}: {len(page_text)}자 추출")
+                    self._log("[PDF 처리] pypdf 페이지 %d: %d자 추출", i + 1, len(page_text))
 
             if pages:
                 text = "\n".join(pages)
@@ -910,11 +927,14 @@ class DocumentProcessor:
                     continue
 
             if page_text and page_text.strip():
-                digit_count = sum(ch.isdigit() for ch in page_text)
-                korean_count = sum(1 for ch in page_text if '가' <= ch <= '힣')
-                preview = page_text[:100].replace('\n', ' ') if len(page_text) > 100 else page_text.replace('\n', ' ')
-                self._log(f"[PDF 처리] OCR 페이지 {i + 1}: {len(page_text)}자, 숫자 {digit_count}개, 한글 {korean_count}개")
-                self._log(f"[PDF 처리] OCR 미리보기: {preview}...")
+                if self.verbose:
+                    digit_count = sum(ch.isdigit() for ch in page_text)
+                    korean_count = sum(1 for ch in page_text if '가' <= ch <= '힣')
+                    self._log(
+                        "[PDF 처리] OCR 페이지 %d: %d자, 숫자 %d개, 한글 %d개",
+                        i + 1, len(page_text), digit_count, korean_count,
+                    )
+                    self._log("[PDF 처리] OCR 미리보기: %s", preview(page_text, 100))
                 text_parts.append(page_text)
 
         if not text_parts:
@@ -1417,6 +1437,41 @@ class DocumentProcessor:
         Returns:
             (text, chunks)
         """
+        text = self.extract_text(
+            file_path,
+            file_type=file_type,
+            mode=mode,
+            force_ocr=force_ocr,
+            prefer_ocr=prefer_ocr,
+        )
+        
+        # 텍스트 검증 후 여기에서 분기
+        if mode == "contract":
+            chunks = self.to_contract_chunks(text, base_meta)
+        else:
+            chunks = self.to_chunks(text, base_meta)
+        
+        return text, chunks
+    
+    def extract_text(
+        self,
+        file_path: str,
+        file_type: str = None,
+        mode: str = "normal",
+        force_ocr: bool = False,
+        prefer_ocr: bool = False
+    ) -> str:
+        """
+        파일 텍스트 추출 (청킹 없음)
+        
+        Args:
+            file_path: 파일 경로
+            file_type: 파일 타입 ('pdf', 'text', 'hwp', 'hwpx', 'html') - None이면 자동 감지
+            mode: 처리 모드 ("normal" 또는 "contract") - "contract"이면 PDF OCR 우선
+        
+        Returns:
+            정제된 텍스트
+        """
         # 파일 타입 자동 감지
         if file_type is None:
             suffix = Path(file_path).suffix.lower()
@@ -1478,11 +1533,5 @@ class DocumentProcessor:
         if not text_stripped:
             raise ValueError(f"추출된 텍스트가 비어있습니다: {file_path}")
         
-        # 텍스트 검증 후 여기에서 분기
-        if mode == "contract":
-            chunks = self.to_contract_chunks(text, base_meta)
-        else:
-            chunks = self.to_chunks(text, base_meta)
-        
-        return text, chunks
+        return text
 
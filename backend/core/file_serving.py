@@ -0,0 +1,412 @@
+"""
+File Serving - 법령 파일 HTTP 서빙 헬퍼
+- 로컬 파일: ETag/Last-Modified 조건부 GET(304), 단일 Range 요청(206), Cache-Control
+- 전체 파일 응답은 FileResponse 사용 (ASGI 서버가 pathsend를 지원하면 zero-copy 전송)
+- Storage 파일: 로컬 디스크 캐시 + Storage ETag(If-None-Match) 기반 신선도 확인, 공유 httpx 클라이언트
+"""
+
+from typing import AsyncIterator, List, Optional, Tuple, Dict, Any
+from contextlib import asynccontextmanager
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from urllib.parse import quote
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+
+from fastapi import Request
+from fastapi.responses import FileResponse, Response, StreamingResponse
+
+from config import settings
+from core.file_utils import LEGAL_SOURCES_BUCKET
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE_MAP = {
+    ".pdf": "application/pdf",
+    ".txt": "text/plain",
+    ".md": "text/markdown",
+    ".hwp": "application/x-hwp",
+    ".hwpx": "application/x-hwpx",
+}
+
+# Range 응답 스트리밍 청크 크기
+RANGE_CHUNK_SIZE = 64 * 1024
+
+# Storage 다운로드 스트리밍 청크 크기
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+
+
+def guess_content_type(path: str) -> str:
+    return CONTENT_TYPE_MAP.get(Path(path).suffix.lower(), "application/octet-stream")
+
+
+def content_disposition(filename: str, download: bool) -> str:
+    """한글 파일명도 헤더에 넣을 수 있도록 RFC 5987 filename* 사용"""
+    disposition = "attachment" if download else "inline"
+    ascii_name = filename.encode("ascii", "ignore").decode() or "file"
+    return f"{disposition}; filename=\"{ascii_name}\"; filename*=UTF-8''{quote(filename)}"
+
+
+def file_etag(stat_result: os.stat_result) -> str:
+    return f'"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"'
+
+
+def parse_range(range_header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    단일 바이트 Range 파싱
+
+    Returns:
+        (start, end) - end 포함, Range가 없거나 다중 Range면 None (전체 응답)
+
+    Raises:
+        ValueError: 만족할 수 없는 Range (416)
+    """
+    if not range_header or not range_header.startswith("bytes="):
+        return None
+    spec = range_header[len("bytes="):].strip()
+    if "," in spec:
+        return None
+    start_str, _, end_str = spec.partition("-")
+    try:
+        if start_str == "":
+            # 접미사 Range: 마지막 N바이트
+            length = int(end_str)
+            if length <= 0:
+                raise ValueError("빈 Range")
+            start, end = max(0, size - length), size - 1
+        else:
+            start = int(start_str)
+            end = int(end_str) if end_str else size - 1
+    except ValueError:
+        raise ValueError(f"잘못된 Range: {range_header}")
+    end = min(end, size - 1)
+    if start >= size or start > end:
+        raise ValueError(f"만족할 수 없는 Range: {range_header}")
+    return start, end
+
+
+def _not_modified(request: Request, etag: str, mtime: float) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [t.strip() for t in if_none_match.split(",")]
+        return "*" in tags or etag in tags or f"W/{etag}" in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def _iter_file_range(file_path: Path, start: int, end: int):
+    with open(file_path, "rb") as f:
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = f.read(min(RANGE_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def serve_local_file(
+    request: Request,
+    file_path: Path,
+    filename: Optional[str] = None,
+    download: bool = False,
+    content_type: Optional[str] = None,
+    max_age: Optional[int] = None,
+) -> Response:
+    """
+    로컬 파일 응답 (조건부 GET + Range + 캐시 헤더)
+
+    Args:
+        request: 요청 (If-None-Match, If-Modified-Since, Range, If-Range 확인)
+        file_path: 파일 경로
+        filename: Content-Disposition 파일명 (None이면 file_path.name)
+        download: True면 attachment, False면 inline
+        content_type: Content-Type (None이면 확장자로 추정)
+        max_age: Cache-Control max-age (None이면 설정값)
+
+    Returns:
+        200 FileResponse / 206 부분 응답 / 304 / 416
+    """
+    stat_result = file_path.stat()
+    size = stat_result.st_size
+    etag = file_etag(stat_result)
+    max_age = settings.legal_file_max_age if max_age is None else max_age
+    headers = {
+        "ETag": etag,
+        "Last-Modified": formatdate(stat_result.st_mtime, usegmt=True),
+        "Cache-Control": f"public, max-age={max_age}",
+        "Accept-Ranges": "bytes",
+    }
+
+    if _not_modified(request, etag, stat_result.st_mtime):
+        return Response(status_code=304, headers=headers)
+
+    headers["Content-Disposition"] = content_disposition(filename or file_path.name, download)
+    media_type = content_type or guess_content_type(str(file_path))
+
+    byte_range = None
+    if_range = request.headers.get("if-range")
+    if if_range is None or if_range.strip() == etag:
+        try:
+            byte_range = parse_range(request.headers.get("range"), size)
+        except ValueError:
+            headers["Content-Range"] = f"bytes */{size}"
+            return Response(status_code=416, headers=headers)
+
+    if byte_range is None or byte_range == (0, size - 1):
+        return FileResponse(file_path, media_type=media_type, headers=headers, stat_result=stat_result)
+
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(
+        _iter_file_range(file_path, start, end),
+        status_code=206,
+        media_type=media_type,
+        headers=headers,
+    )
+
+
+class LegalFileCache:
+    """
+    Storage 파일 로컬 디스크 캐시
+
+    - 캐시 파일 옆에 .json으로 Storage ETag와 마지막 확인 시각 저장
+    - revalidate_interval이 지나면 If-None-Match로 Storage에 확인 (304면 본문 전송 없음)
+    - 전체 크기가 max_bytes를 넘으면 마지막 접근(fetch)이 오래된 파일부터 삭제
+      (전송 중인 파일은 release() 전까지 삭제하지 않음, atime은 noatime 마운트에서 갱신되지 않으므로 직접 기록)
+    - 다운로드는 임시 파일로 스트리밍 (파일 I/O는 스레드에서 실행, 응답 전체를 메모리에 올리지 않음)
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        max_bytes: int = 512 * 1024 * 1024,
+        revalidate_interval: float = 600.0,
+        bucket_name: str = LEGAL_SOURCES_BUCKET,
+    ):
+        """
+        Args:
+            cache_dir: 캐시 디렉토리
+            max_bytes: 최대 캐시 크기 (바이트)
+            revalidate_interval: Storage 신선도 확인 주기 (초)
+            bucket_name: Storage 버킷 이름
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.revalidate_interval = revalidate_interval
+        self.bucket_name = bucket_name
+        self._client = None
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._lock_users: Dict[str, int] = {}  # 캐시 파일별 락 사용 중인 요청 수 (0이 되면 락 삭제)
+        self._readers: Dict[str, int] = {}  # 캐시 파일별 전송 중인 응답 수 (fetch에서 증가, release에서 감소)
+        self._last_access: Dict[str, float] = {}  # 캐시 파일별 마지막 fetch 시각 (없으면 mtime 사용)
+
+        supabase_url = os.getenv("SUPABASE_URL") or settings.supabase_url
+        self._service_key = os.getenv("SUPABASE_SERVICE_ROLE_KEY") or settings.supabase_service_role_key
+        self._object_base = (
+            f"{supabase_url.rstrip('/')}/storage/v1/object/authenticated/{bucket_name}/" if supabase_url else None
+        )
+
+    def _get_client(self):
+        """프로세스 공유 httpx 클라이언트 (연결 재사용)"""
+        if self._client is None:
+            import httpx
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(30.0, connect=5.0),
+                trust_env=False,  # supabase_vector_store와 동일하게 환경 변수 proxy 사용 안 함
+                headers={"Authorization": f"Bearer {self._service_key}", "apikey": self._service_key or ""},
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _paths(self, storage_path: str) -> Tuple[Path, Path]:
+        key = hashlib.sha1(storage_path.encode("utf-8")).hexdigest()
+        suffix = Path(storage_path).suffix.lower()
+        return self.cache_dir / f"{key}{suffix}", self.cache_dir / f"{key}.json"
+
+    @staticmethod
+    def _read_meta(meta_path: Path) -> Dict[str, Any]:
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    @staticmethod
+    def _write_meta(meta_path: Path, meta: Dict[str, Any]) -> None:
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+
+    @asynccontextmanager
+    async def _path_lock(self, key: str) -> AsyncIterator[None]:
+        """캐시 파일별 락 (같은 파일 동시 다운로드/삭제 방지, 대기 중인 요청이 없으면 락 삭제)"""
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        self._lock_users[key] = self._lock_users.get(key, 0) + 1
+        try:
+            async with lock:
+                yield
+        finally:
+            self._lock_users[key] -= 1
+            if self._lock_users[key] == 0:
+                del self._lock_users[key]
+                del self._locks[key]
+
+    def release(self, data_path: Path) -> None:
+        """fetch로 받은 캐시 파일의 전송이 끝났음을 알림 (이후 정리 대상이 됨)"""
+        key = data_path.name
+        count = self._readers.get(key, 0) - 1
+        if count > 0:
+            self._readers[key] = count
+        else:
+            self._readers.pop(key, None)
+
+    async def _download(self, response, data_path: Path) -> None:
+        """응답 본문을 임시 파일로 스트리밍한 뒤 data_path로 교체"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = data_path.with_suffix(data_path.suffix + ".tmp")
+        f = await asyncio.to_thread(open, tmp_path, "wb")
+        try:
+            async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                await asyncio.to_thread(f.write, chunk)
+            await asyncio.to_thread(f.close)
+            await asyncio.to_thread(os.replace, tmp_path, data_path)
+        except BaseException:
+            f.close()
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+    async def fetch(self, storage_path: str) -> Optional[Path]:
+        """
+        Storage 파일을 캐시에서 반환 (없거나 오래되면 Storage에서 확인/다운로드)
+
+        Returns:
+            캐시 파일 경로, Storage에 파일이 없으면 None
+            (경로를 받았으면 응답 전송 후 release(path)를 호출해야 정리 대상이 됨)
+        """
+        if not self._object_base or not self._service_key:
+            raise ValueError("SUPABASE_URL과 SUPABASE_SERVICE_ROLE_KEY가 필요합니다")
+
+        data_path, meta_path = self._paths(storage_path)
+        key = data_path.name
+        async with self._path_lock(key):
+            meta = await asyncio.to_thread(self._read_meta, meta_path) if data_path.exists() else {}
+            if meta and time.time() - meta.get("checked_at", 0) < self.revalidate_interval:
+                return self._acquire(data_path)
+
+            request_headers = {}
+            if meta.get("etag"):
+                request_headers["If-None-Match"] = meta["etag"]
+
+            async with self._get_client().stream(
+                "GET", f"{self._object_base}{quote(storage_path)}", headers=request_headers
+            ) as response:
+                if response.status_code == 304 and meta:
+                    meta["checked_at"] = time.time()
+                    await asyncio.to_thread(self._write_meta, meta_path, meta)
+                    return self._acquire(data_path)
+                if response.status_code in (400, 404):
+                    return None
+                response.raise_for_status()
+
+                await self._download(response, data_path)
+                await asyncio.to_thread(self._write_meta, meta_path, {
+                    "path": storage_path,
+                    "etag": response.headers.get("etag"),
+                    "content_type": response.headers.get("content-type"),
+                    "checked_at": time.time(),
+                })
+            self._acquire(data_path)
+
+        await self._evict()
+        return data_path
+
+    def _acquire(self, data_path: Path) -> Path:
+        """전송 중 표시 + 마지막 접근 시각 기록 (경로 락 안에서 호출)"""
+        key = data_path.name
+        self._readers[key] = self._readers.get(key, 0) + 1
+        self._last_access[key] = time.time()
+        return data_path
+
+    def _scan(self) -> List[Tuple[Path, int, float]]:
+        """캐시 파일 목록 [(경로, 크기, mtime)] (스레드에서 실행)"""
+        entries = []
+        for path in self.cache_dir.iterdir():
+            if path.suffix in (".json", ".tmp"):
+                continue
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((path, st.st_size, st.st_mtime))
+        return entries
+
+    async def _evict(self) -> None:
+        """최대 크기를 넘으면 마지막 접근이 오래된 파일부터 삭제 (전송 중이거나 락이 잡힌 파일은 건너뜀)"""
+        try:
+            entries = await asyncio.to_thread(self._scan)
+            total = sum(size for _, size, _ in entries)
+            if total <= self.max_bytes:
+                return
+            entries.sort(key=lambda item: self._last_access.get(item[0].name, item[2]))
+            for path, size, _ in entries:
+                if total <= self.max_bytes:
+                    break
+                key = path.name
+                if self._readers.get(key) or key in self._locks:
+                    continue
+                async with self._path_lock(key):
+                    if self._readers.get(key):
+                        continue
+                    await asyncio.to_thread(self._remove, path)
+                    self._last_access.pop(key, None)
+                total -= size
+        except OSError as e:
+            logger.warning(f"[FileCache] 캐시 정리 실패: {str(e)}")
+
+    @staticmethod
+    def _remove(path: Path) -> None:
+        path.unlink(missing_ok=True)
+        path.with_suffix(".json").unlink(missing_ok=True)
+
+
+_legal_file_cache: Optional[LegalFileCache] = None
+
+
+def get_legal_file_cache() -> LegalFileCache:
+    """
+    LegalFileCache 인스턴스 가져오기 (싱글톤)
+
+    Returns:
+        LegalFileCache 인스턴스
+    """
+    global _legal_file_cache
+    if _legal_file_cache is None:
+        _legal_file_cache = LegalFileCache(
+            cache_dir=settings.legal_file_cache_dir,
+            max_bytes=settings.legal_file_cache_max_mb * 1024 * 1024,
+            revalidate_interval=settings.legal_file_cache_revalidate_interval,
+        )
+    return _legal_file_cache
+
+
+async def close_legal_file_cache() -> None:
+    """LegalFileCache의 공유 httpx 클라이언트 종료 (서버 종료 시)"""
+    if _legal_file_cache is not None:
+        await _legal_file_cache.aclose()
@@ -3,8 +3,16 @@
 다른 API에서 문서 파일 경로를 확인하고 URL을 생성할 때 사용
 """
 
-from typing import Optional
-from core.supabase_vector_store import SupabaseVectorStore
+from typing import Optional, Dict, Any, Iterable, List, Tuple
+import os
+import logging
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# 모든 법률 자료(case, manual, law, standard_contract)가 저장된 Storage 버킷
+LEGAL_SOURCES_BUCKET = "legal-sources"
 
 
 def get_document_file_path(
@@ -69,15 +77,8 @@ def get_document_file_url(
         return None
     
     try:
-        vector_store = SupabaseVectorStore()
-        return vector_store.get_storage_file_url(
-            external_id=external_id,
-            source_type=source_type,
-            expires_in=expires_in
-        )
+        return get_storage_url_resolver().resolve(external_id, source_type)
     except Exception as e:
-        import logging
-        logger = logging.getLogger(__name__)
         logger.warning(f"파일 URL 생성 실패 (external_id={external_id}, source_type={source_type}): {str(e)}")
         return None
 
@@ -104,9 +105,6 @@ def get_document_api_url(
         >>> url = get_document_api_url("abc123", "law", download=True)
         >>> # "http://localhost:8000/api/v2/legal/file?path=laws/abc123.pdf&download=true"
     """
-    import os
-    from config import settings
-    
     if not backend_url:
         backend_url = os.getenv("BACKEND_URL") or os.getenv("NEXT_PUBLIC_BACKEND_API_URL") or "http://localhost:8000"
     
@@ -139,9 +137,6 @@ def get_document_public_url(
         >>> url = get_document_public_url("abc123", "law")
         >>> # "https://xxx.supabase.co/storage/v1/object/public/legal-sources/laws/abc123.pdf"
     """
-    import os
-    from config import settings
-    
     if not supabase_url:
         supabase_url = os.getenv("SUPABASE_URL") or settings.supabase_url
     
@@ -151,3 +146,116 @@ def get_document_public_url(
     file_path = get_document_file_path(source_type, external_id)
     return f"{supabase_url}/storage/v1/object/public/legal-sources/{file_path}"
 
+
+class StorageUrlResolver:
+    """
+    legal-sources 버킷 Public URL 리졸버
+    
+    Public URL은 "{supabase_url}/storage/v1/object/public/{bucket}/{path}" 형식이므로
+    SDK 호출 없이 캐시된 base URL + 메모이즈된 경로 테이블만으로 생성합니다.
+    검색 결과 후처리에서 행마다 환경 변수/SDK를 다시 읽지 않도록 프로세스당 하나만 사용합니다.
+    """
+    
+    # 메모이즈할 최대 (source_type, external_id) 개수 (법률 코퍼스 전체보다 충분히 큼)
+    MAX_CACHE_SIZE = 20000
+    
+    def __init__(
+        self,
+        supabase_url: Optional[str] = None,
+        bucket_name: str = LEGAL_SOURCES_BUCKET,
+    ):
+        """
+        Args:
+            supabase_url: Supabase URL (None이면 환경 변수/설정에서 한 번만 읽음)
+            bucket_name: Storage 버킷 이름
+        """
+        base_url = supabase_url or os.getenv("SUPABASE_URL") or settings.supabase_url
+        self.bucket_name = bucket_name
+        self._public_base = (
+            f"{base_url.rstrip('/')}/storage/v1/object/public/{bucket_name}/" if base_url else None
+        )
+        self._url_cache: Dict[Tuple[str, str], str] = {}
+        
+        if not self._public_base:
+            logger.warning("SUPABASE_URL이 설정되지 않아 Storage Public URL을 생성할 수 없습니다")
+    
+    def resolve(
+        self,
+        external_id: Optional[str],
+        source_type: Optional[str],
+        file_path_override: Optional[str] = None,
+    ) -> Optional[str]:
+        """
+        external_id/source_type에 해당하는 Public URL 반환
+        
+        Args:
+            external_id: 파일 ID (legal_chunks.external_id)
+            source_type: 소스 타입 ('law' | 'manual' | 'case' | 'standard_contract')
+            file_path_override: 버킷 내 경로 직접 지정 (예: "standard_contracts/abc.pdf")
+        
+        Returns:
+            Public URL 또는 None (external_id가 없거나 SUPABASE_URL 미설정 시)
+        """
+        if not external_id or not self._public_base:
+            return None
+        
+        if file_path_override:
+            return f"{self._public_base}{file_path_override}"
+        
+        key = (source_type or "law", external_id)
+        url = self._url_cache.get(key)
+        if url is None:
+            if len(self._url_cache) >= self.MAX_CACHE_SIZE:
+                self._url_cache.clear()
+            url = f"{self._public_base}{get_document_file_path(key[0], external_id)}"
+            self._url_cache[key] = url
+        return url
+    
+    def resolve_path(self, file_path: str) -> Optional[str]:
+        """버킷 내 경로(예: "laws/abc123.pdf")의 Public URL (SUPABASE_URL 미설정 시 None)"""
+        if not file_path or not self._public_base:
+            return None
+        return f"{self._public_base}{file_path}"
+    
+    def resolve_many(self, rows: Iterable[Dict[str, Any]]) -> List[Optional[str]]:
+        """
+        검색 결과 행(external_id, source_type 포함) 목록의 Public URL을 일괄 생성
+        
+        Returns:
+            rows와 같은 순서의 URL 리스트
+        """
+        return [
+            self.resolve(row.get("external_id"), row.get("source_type", "law"))
+            for row in rows
+        ]
+    
+    def preload(self, rows: Iterable[Dict[str, Any]]) -> int:
+        """
+        legal_chunks 스냅샷 등에서 (external_id, source_type) 목록을 받아 URL을 미리 계산
+        
+        Returns:
+            캐시된 URL 개수
+        """
+        for row in rows:
+            self.resolve(row.get("external_id"), row.get("source_type", "law"))
+        return len(self._url_cache)
+    
+    def clear(self) -> None:
+        """메모이즈된 URL 전체 삭제"""
+        self._url_cache.clear()
+
+
+_storage_url_resolver: Optional[StorageUrlResolver] = None
+
+
+def get_storage_url_resolver() -> StorageUrlResolver:
+    """
+    StorageUrlResolver 인스턴스 가져오기 (싱글톤)
+    
+    Returns:
+        StorageUrlResolver 인스턴스
+    """
+    global _storage_url_resolver
+    if _storage_url_resolver is None:
+        _storage_url_resolver = StorageUrlResolver()
+    return _storage_url_resolver
@@ -0,0 +1,218 @@
+"""
+Highlight Index - 계약서 하이라이트 위치 인덱스
+계약서마다 한 번만 문장 경계/공백 정규화 offset 매핑/문자 n-gram 인덱스를 만들고,
+이슈의 originalText를 원문 (start, end)와 신뢰도로 찾음
+"""
+
+from typing import List, Dict, Any, Optional, Tuple
+from collections import OrderedDict
+from dataclasses import dataclass
+from bisect import bisect_right
+import hashlib
+import re
+
+from .clause_extractor import NormalizedText, normalize_whitespace
+
+# 문장 경계: 마침표류 뒤 공백, 또는 줄바꿈
+_SENTENCE_BREAK_RE = re.compile(r'(?<=[.。!?])\s+|\n+')
+
+
+@dataclass
+class HighlightMatch:
+    """originalText 위치 검색 결과"""
+    start: int
+    end: int
+    text: str
+    confidence: float  # 0.0 ~ 1.0
+    method: str  # "exact" | "normalized" | "ngram"
+
+
+class HighlightIndex:
+    """
+    계약서 한 건의 하이라이트 인덱스
+
+    - exact: 원문 str.find
+    - normalized: 공백/줄바꿈 차이 무시 (NormalizedText offset 매핑)
+    - ngram: 정규화 문자열의 문자 n-gram posting에서 anchor 투표로 정렬 위치 추정 후 문장 경계로 확장
+    n-gram posting은 exact/normalized 매칭이 실패했을 때 처음 한 번만 생성합니다.
+    """
+
+    NGRAM = 3
+    MAX_ANCHORS = 32  # originalText에서 사용할 최대 anchor n-gram 수
+    MAX_POSTINGS = 200  # 이보다 흔한 n-gram은 anchor로 사용하지 않음
+    DIAGONAL_TOLERANCE = 4  # 삽입/삭제 허용 폭 (정규화 문자 수)
+
+    def __init__(self, contract_text: str, sentences: Optional[List[Tuple[int, int]]] = None):
+        """
+        Args:
+            contract_text: 계약서 원문
+            sentences: 저장된 문장 경계 (from_dict 복원용, None이면 새로 계산)
+        """
+        self.text = contract_text
+        self.text_hash = self.hash_text(contract_text)
+        self.normalized = NormalizedText(contract_text)
+        self.sentences = sentences if sentences is not None else self._split_sentences(contract_text)
+        self._sentence_starts = [s for s, _ in self.sentences]
+        self._postings: Optional[Dict[str, List[int]]] = None
+
+    @staticmethod
+    def hash_text(text: str) -> str:
+        return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _split_sentences(text: str) -> List[Tuple[int, int]]:
+        """원문 기준 문장 span 목록 (앞뒤 공백 제외)"""
+        spans: List[Tuple[int, int]] = []
+        pos = 0
+        for m in _SENTENCE_BREAK_RE.finditer(text):
+            spans.append((pos, m.start()))
+            pos = m.end()
+        spans.append((pos, len(text)))
+
+        result = []
+        for start, end in spans:
+            while start < end and text[start].isspace():
+                start += 1
+            while end > start and text[end - 1].isspace():
+                end -= 1
+            if end > start:
+                result.append((start, end))
+        return result
+
+    def to_dict(self) -> Dict[str, Any]:
+        """분석 결과와 함께 저장할 수 있는 직렬화 형식"""
+        return {"textHash": self.text_hash, "sentences": [list(s) for s in self.sentences]}
+
+    @classmethod
+    def from_dict(cls, contract_text: str, data: Optional[Dict[str, Any]]) -> "HighlightIndex":
+        """저장된 인덱스 복원 (원문 해시가 다르면 새로 생성)"""
+        if data and data.get("textHash") == cls.hash_text(contract_text):
+            sentences = [(int(s), int(e)) for s, e in data.get("sentences", [])]
+            return cls(contract_text, sentences=sentences)
+        return cls(contract_text)
+
+    # ------------------------------------------------------------------
+    # 검색
+    # ------------------------------------------------------------------
+
+    def locate(self, original_text: str, min_confidence: float = 0.3) -> Optional[HighlightMatch]:
+        """
+        originalText의 원문 위치 검색
+
+        Args:
+            original_text: 찾을 텍스트 (LLM이 인용한 조항 문구 등)
+            min_confidence: n-gram 매칭 최소 신뢰도
+
+        Returns:
+            HighlightMatch 또는 None
+        """
+        query = (original_text or "").strip()
+        if not query:
+            return None
+
+        start = self.text.find(query)
+        if start >= 0:
+            return HighlightMatch(start, start + len(query), query, 1.0, "exact")
+
+        span = self.normalized.find(query)
+        if span:
+            return HighlightMatch(span[0], span[1], self.text[span[0]:span[1]], 0.98, "normalized")
+
+        return self._locate_ngram(normalize_whitespace(query), min_confidence)
+
+    def _build_postings(self) -> Dict[str, List[int]]:
+        if self._postings is None:
+            postings: Dict[str, List[int]] = {}
+            normalized = self.normalized.normalized
+            n = self.NGRAM
+            for i in range(len(normalized) - n + 1):
+                postings.setdefault(normalized[i:i + n], []).append(i)
+            self._postings = postings
+        return self._postings
+
+    def _locate_ngram(self, query: str, min_confidence: float) -> Optional[HighlightMatch]:
+        n = self.NGRAM
+        if len(query) < n:
+            return None
+        postings = self._build_postings()
+
+        # anchor n-gram을 고르게 샘플링해서 정렬 위치(diagonal = 문서 위치 - 쿼리 위치)에 투표
+        gram_count = len(query) - n + 1
+        step = max(1, gram_count // self.MAX_ANCHORS)
+        votes: Dict[int, int] = {}
+        hits: List[Tuple[int, int]] = []  # (diagonal, 문서 위치)
+        anchors = 0
+        for q_off in range(0, gram_count, step):
+            anchors += 1
+            positions = postings.get(query[q_off:q_off + n])
+            if not positions or len(positions) > self.MAX_POSTINGS:
+                continue
+            for pos in positions:
+                diagonal = pos - q_off
+                votes[diagonal] = votes.get(diagonal, 0) + 1
+                hits.append((diagonal, pos))
+        if not votes:
+            return None
+
+        # 인접 diagonal(삽입/삭제)을 합쳐서 가장 많은 표를 받은 정렬 위치 선택
+        tol = self.DIAGONAL_TOLERANCE
+        best_diagonal, best_votes = None, 0
+        for diagonal in votes:
+            total = sum(votes.get(d, 0) for d in range(diagonal - tol, diagonal + tol + 1))
+            if total > best_votes or (total == best_votes and diagonal < best_diagonal):
+                best_diagonal, best_votes = diagonal, total
+        confidence = min(1.0, best_votes / anchors)
+        if confidence < min_confidence:
+            return None
+
+        # 선택된 정렬 위치 근처에서 실제로 일치한 anchor들이 덮는 구간
+        matched = [pos for diagonal, pos in hits if abs(diagonal - best_diagonal) <= tol]
+        n_start = min(matched)
+        n_end = max(matched) + n
+        start = self.normalized.offsets[n_start]
+        end = self.normalized.offsets[n_end - 1] + 1
+
+        start, end = self._expand_to_sentences(start, end)
+        return HighlightMatch(start, end, self.text[start:end], round(confidence, 3), "ngram")
+
+    def _expand_to_sentences(self, start: int, end: int) -> Tuple[int, int]:
+        """span을 포함하는 문장 경계까지 확장"""
+        if not self.sentences:
+            return start, end
+        first = bisect_right(self._sentence_starts, start) - 1
+        last = bisect_right(self._sentence_starts, max(start, end - 1)) - 1
+        if first >= 0 and self.sentences[first][1] > start:
+            start = self.sentences[first][0]
+        if last >= 0 and self.sentences[last][1] >= end - 1:
+            end = max(end, self.sentences[last][1])
+        return start, end
+
+
+class HighlightIndexCache:
+    """계약서 원문 해시 → HighlightIndex LRU 캐시"""
+
+    def __init__(self, max_size: int = 32):
+        self.max_size = max_size
+        self._cache: "OrderedDict[str, HighlightIndex]" = OrderedDict()
+
+    def get(self, contract_text: str, stored: Optional[Dict[str, Any]] = None) -> HighlightIndex:
+        """
+        캐시된 인덱스 반환 (없으면 저장된 직렬화 데이터 또는 원문으로 생성)
+
+        Args:
+            contract_text: 계약서 원문
+            stored: HighlightIndex.to_dict() 결과 (분석 결과에 저장된 값)
+        """
+        key = HighlightIndex.hash_text(contract_text)
+        index = self._cache.get(key)
+        if index is not None:
+            self._cache.move_to_end(key)
+            return index
+        index = HighlightIndex.from_dict(contract_text, stored)
+        self._cache[key] = index
+        while len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
+        return index
+
+    def clear(self) -> None:
+        self._cache.clear()
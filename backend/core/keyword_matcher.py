@@ -0,0 +1,234 @@
+"""
+Keyword Matcher - 계약서 키워드 다중 패턴 매칭
+위험/카테고리/독소조항/섹션 키워드 테이블을 import 시 Aho-Corasick 오토마톤 하나로 컴파일하고,
+텍스트를 한 번만 스캔해서 모든 키워드 hit(위치, 테이블, 카테고리)을 반환
+"""
+
+from typing import List, Dict, Optional, Tuple, Iterable
+from collections import deque
+from dataclasses import dataclass
+import re
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# 키워드 테이블
+# ============================================================================
+
+# 위험 키워드 및 점수 (RiskScoringTool 규칙 기반 점수)
+RISK_KEYWORDS = {
+    "illegal": {
+        "keywords": [
+            "일방적 해고", "임의 해고", "무조건 해고",
+            "손해배상 무제한", "비밀유지 영구", "경쟁금지 무기한",
+            "연장근로 수당 없음", "휴일근로 수당 없음"
+        ],
+        "score": 40
+    },
+    "ambiguous": {
+        "keywords": [
+            "적절한", "합리적인", "필요시", "가능한 범위 내",
+            "회사 사정에 따라", "추후 결정"
+        ],
+        "score": 20
+    },
+    "unfair": {
+        "keywords": [
+            "불리한 조건", "불공정", "일방적", "강제"
+        ],
+        "score": 30
+    }
+}
+
+# 조항 카테고리 키워드 (ClauseLabelingTool 카테고리 추정, 순서 = 우선순위)
+CLAUSE_CATEGORY_KEYWORDS = {
+    "working_hours": ["근로시간", "근무시간", "야근", "연장근로", "휴게시간", "휴일", "주휴일"],
+    "wage": ["임금", "급여", "수당", "보너스", "상여금", "연봉", "월급"],
+    "probation_termination": ["수습", "인턴", "해고", "계약해지", "퇴직", "사직", "퇴사"],
+    "stock_option_ip": ["스톡옵션", "지분", "지적재산권", "저작권", "특허", "발명"],
+    "vacation": ["휴가", "연차", "병가", "경조사", "출산"],
+    "overtime": ["야근", "연장근로", "휴일근로", "야간근로"],
+    "benefits": ["복리후생", "보험", "퇴직금", "퇴직연금"]
+}
+
+# 독소조항 신호 키워드 (계약서 분석 프롬프트의 [독소조항 탐지 기준], 프롬프트 토큰 예산의 조항 우선순위 산정)
+TOXIC_SIGNAL_KEYWORDS = {
+    "payment": ["검수 완료 후", "검수 후 지급", "지급을 보류", "지연손해금", "지연 이자"],
+    "penalty": ["위약금", "위약벌", "손해배상", "배상한다", "배상하여야"],
+    "termination": ["해지할 수 있다", "즉시 해지", "일방적으로 해지", "통보 없이"],
+    "non_compete": ["경쟁금지", "경업", "겸업", "동종 업계", "동종업계"],
+    "ip": ["저작권", "지식재산권", "지적재산권", "양도한다", "귀속된다", "포트폴리오"],
+    "confidentiality": ["비밀유지", "영업비밀", "기밀"],
+    "unilateral_change": ["일방적으로 변경", "임의로 변경", "변경할 수 있다"],
+}
+
+# 표준근로계약서 섹션 제목 키워드 (LegalChunker 줄바꿈 없는 텍스트 분할, 순서 = 같은 위치 우선순위)
+SECTION_TITLE_KEYWORDS = [
+    '근로계약기간', '근무 장소', '근무장소', '업무의 내용', '업무 내용',
+    '소정근로시간', '소정 근로시간', '휴게시간', '휴게 시간',
+    '근무일', '휴일', '주휴일', '주 휴일', '임금', '임 금',
+    '상여금', '기타급여', '기타 급여', '제수당', '식대',
+    '자기계발비', '자기 계발비', '임금지급일', '임금 지급일',
+    '지급방법', '지급 방법', '특약사항', '특약 사항',
+    '수습기간', '수습 기간', '계약해지', '계약 해지',
+    '연차유급휴가', '연차 유급 휴가', '사회보험 적용',
+    '근로계약서 교부', '근로계약 취업규칙', '기타'
+]
+
+# '법정 수당 청구권 포기'류 문구 (키워드가 아닌 패턴이므로 하나의 결합 정규식으로 컴파일)
+WAGE_WAIVER_PATTERNS = [
+    r"추가\s*수당[^\n]*청구하지\s+않기로\s+합의한다",
+    r"법에서\s*정한\s*수당[^\n]*청구하지\s+않기로",
+    r"연장.?야간.?휴일\s*근로\s*수당[^\n]*별도로\s*청구하지\s+않는다",
+    r"포괄임금[^\n]*추가[^\n]*수당[^\n]*청구하지\s+않",
+    r"실제\s*근로시간[^\n]*포괄임금[^\n]*초과[^\n]*추가\s*수당[^\n]*청구하지",
+    r"연장.?야간.?휴일\s*수당[^\n]*청구하지\s+않",
+    r"법정\s*수당[^\n]*청구하지\s+않",
+]
+
+
+# ============================================================================
+# Aho-Corasick 매처
+# ============================================================================
+
+@dataclass(frozen=True)
+class KeywordHit:
+    """키워드 매칭 결과"""
+    keyword: str
+    start: int
+    end: int
+    table: str  # "risk" | "category" | "toxic" | "section"
+    category: str  # 테이블 내 카테고리 (예: "illegal", "wage", "section")
+    priority: int  # 테이블 내 정의 순서 (작을수록 우선)
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick 다중 키워드 매처
+
+    - 키워드 수와 무관하게 텍스트 길이에 비례하는 한 번의 스캔
+    - 겹치는 hit도 모두 반환 (예: "일방적 해고"와 "일방적")
+    - 대소문자 무시 (문자 단위 lower, 원문 offset 유지)
+    """
+
+    def __init__(self, entries: Iterable[Tuple[str, str, str, int]]):
+        """
+        Args:
+            entries: (keyword, table, category, priority) 목록
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[Tuple[str, str, str, int]]] = [[]]
+
+        for keyword, table, category, priority in entries:
+            if not keyword:
+                continue
+            node = 0
+            for ch in keyword.lower():
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                node = nxt
+            self._output[node].append((keyword, table, category, priority))
+
+        self._build_fail_links()
+
+    def _build_fail_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._output[nxt] = self._output[nxt] + self._output[self._fail[nxt]]
+
+    def find_all(self, text: str, tables: Optional[Iterable[str]] = None) -> List[KeywordHit]:
+        """
+        텍스트의 모든 키워드 hit (end 오름차순)
+
+        Args:
+            text: 검색 대상 텍스트
+            tables: 반환할 테이블 이름 (None이면 전체)
+        """
+        if not text:
+            return []
+        table_filter = set(tables) if tables is not None else None
+        goto, fail, output = self._goto, self._fail, self._output
+        hits: List[KeywordHit] = []
+        node = 0
+        for i, ch in enumerate(text):
+            lowered = ch.lower()
+            if len(lowered) == 1:
+                ch = lowered
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if output[node]:
+                for keyword, table, category, priority in output[node]:
+                    if table_filter is not None and table not in table_filter:
+                        continue
+                    hits.append(KeywordHit(
+                        keyword=keyword,
+                        start=i + 1 - len(keyword),
+                        end=i + 1,
+                        table=table,
+                        category=category,
+                        priority=priority,
+                    ))
+        return hits
+
+    def categories(self, text: str, table: str) -> Dict[str, List[KeywordHit]]:
+        """테이블 하나의 hit을 카테고리별로 묶어서 반환"""
+        grouped: Dict[str, List[KeywordHit]] = {}
+        for hit in self.find_all(text, tables=(table,)):
+            grouped.setdefault(hit.category, []).append(hit)
+        return grouped
+
+
+def _build_entries() -> List[Tuple[str, str, str, int]]:
+    entries: List[Tuple[str, str, str, int]] = []
+    for risk_type, risk_info in RISK_KEYWORDS.items():
+        for i, keyword in enumerate(risk_info["keywords"]):
+            entries.append((keyword, "risk", risk_type, i))
+    for order, (category, keywords) in enumerate(CLAUSE_CATEGORY_KEYWORDS.items()):
+        for keyword in keywords:
+            entries.append((keyword, "category", category, order))
+    for order, (category, keywords) in enumerate(TOXIC_SIGNAL_KEYWORDS.items()):
+        for keyword in keywords:
+            entries.append((keyword, "toxic", category, order))
+    for i, keyword in enumerate(SECTION_TITLE_KEYWORDS):
+        entries.append((keyword, "section", "section", i))
+    return entries
+
+
+# import 시 한 번만 컴파일 (위험/카테고리/독소조항/섹션 키워드 공용)
+CONTRACT_KEYWORD_MATCHER = KeywordMatcher(_build_entries())
+
+WAGE_WAIVER_RE = re.compile(
+    "|".join(f"(?P<p{i}>{pattern})" for i, pattern in enumerate(WAGE_WAIVER_PATTERNS)),
+    re.IGNORECASE,
+)
+
+
+def find_wage_waiver_pattern(text: str) -> Optional[str]:
+    """
+    '법정 수당 청구권 포기'류 문구를 한 번의 스캔으로 감지
+
+    Returns:
+        감지된 패턴 문자열 또는 None
+    """
+    if not text:
+        return None
+    match = WAGE_WAIVER_RE.search(text)
+    if not match:
+        return None
+    return WAGE_WAIVER_PATTERNS[int(match.lastgroup[1:])]
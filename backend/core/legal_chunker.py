@@ -8,6 +8,8 @@ from typing import List, Dict, Any, Optional
 from pathlib import Path
 from dataclasses import dataclass
 
+from .keyword_matcher import CONTRACT_KEYWORD_MATCHER
+
 
 @dataclass
 class Section:
@@ -47,6 +49,36 @@ class LegalChunker:
         re.compile(r"^[가-힣]\.\s", re.MULTILINE),    # 가. 나. 다.
     ]
     
+    # 표준근로계약서 형식의 섹션 키워드
+    # 줄바꿈이 없어도 작동하도록 공백/줄바꿈 앞뒤로 인식
+    # (?:^|\s+) = 텍스트 시작 또는 공백/줄바꿈 앞
+    SECTION_KEYWORDS = [
+        r'(?:^|\s+)근로계약기간\s+',
+        r'(?:^|\s+)근무\s*장소\s+',
+        r'(?:^|\s+)업무의\s*내용\s+|(?:^|\s+)업무\s*내용\s+',
+        r'(?:^|\s+)소정\s*근로시간\s+|(?:^|\s+)소정근로시간\s+',
+        r'(?:^|\s+)휴게시간\s+|(?:^|\s+)휴게\s*시간\s+',
+        r'(?:^|\s+)근무일\s+|(?:^|\s+)휴일\s+',
+        r'(?:^|\s+)주\s*휴일\s+|(?:^|\s+)주휴일\s+',
+        r'(?:^|\s+)임\s*금\s+|(?:^|\s+)임금\s+',
+        r'(?:^|\s+)상여금\s+',
+        r'(?:^|\s+)기타\s*급여\s+|(?:^|\s+)기타급여\s+',
+        r'(?:^|\s+)제수당\s+',
+        r'(?:^|\s+)식대\s+',
+        r'(?:^|\s+)자기\s*계발비\s+|(?:^|\s+)자기계발비\s+',
+        r'(?:^|\s+)임금\s*지급일\s+|(?:^|\s+)임금지급일\s+',
+        r'(?:^|\s+)지급\s*방법\s+|(?:^|\s+)지급방법\s+',
+        r'(?:^|\s+)특약\s*사항\s+|(?:^|\s+)특약사항\s+',
+        r'(?:^|\s+)수습\s*기간\s+|(?:^|\s+)수습기간\s+',
+        r'(?:^|\s+)계약\s*해지\s+|(?:^|\s+)계약해지\s+',
+        r'(?:^|\s+)연차\s*유급\s*휴가\s+|(?:^|\s+)연차유급휴가\s+',
+        r'(?:^|\s+)사회보험\s*적용\s+',
+        r'(?:^|\s+)근로계약서\s*교부\s+',
+        r'(?:^|\s+)근로계약\s*취업규칙\s+',
+        r'(?:^|\s+)기\s*타\s+|(?:^|\s+)기타\s+',
+    ]
+    SECTION_KEYWORD_PATTERN = re.compile('|'.join(SECTION_KEYWORDS), re.IGNORECASE)
+    
     def __init__(self, max_chars: int = 1200, overlap: int = 200):
         """
         Args:
@@ -73,36 +105,7 @@ class LegalChunker:
         
         sections = []
         
-        # 표준근로계약서 형식의 섹션 키워드
-        # 줄바꿈이 없어도 작동하도록 공백/줄바꿈 앞뒤로 인식
-        # (?:^|\s+) = 텍스트 시작 또는 공백/줄바꿈 앞
-        SECTION_KEYWORDS = [
-            r'(?:^|\s+)근로계약기간\s+',
-            r'(?:^|\s+)근무\s*장소\s+',
-            r'(?:^|\s+)업무의\s*내용\s+|(?:^|\s+)업무\s*내용\s+',
-            r'(?:^|\s+)소정\s*근로시간\s+|(?:^|\s+)소정근로시간\s+',
-            r'(?:^|\s+)휴게시간\s+|(?:^|\s+)휴게\s*시간\s+',
-            r'(?:^|\s+)근무일\s+|(?:^|\s+)휴일\s+',
-            r'(?:^|\s+)주\s*휴일\s+|(?:^|\s+)주휴일\s+',
-            r'(?:^|\s+)임\s*금\s+|(?:^|\s+)임금\s+',
-            r'(?:^|\s+)상여금\s+',
-            r'(?:^|\s+)기타\s*급여\s+|(?:^|\s+)기타급여\s+',
-            r'(?:^|\s+)제수당\s+',
-            r'(?:^|\s+)식대\s+',
-            r'(?:^|\s+)자기\s*계발비\s+|(?:^|\s+)자기계발비\s+',
-            r'(?:^|\s+)임금\s*지급일\s+|(?:^|\s+)임금지급일\s+',
-            r'(?:^|\s+)지급\s*방법\s+|(?:^|\s+)지급방법\s+',
-            r'(?:^|\s+)특약\s*사항\s+|(?:^|\s+)특약사항\s+',
-            r'(?:^|\s+)수습\s*기간\s+|(?:^|\s+)수습기간\s+',
-            r'(?:^|\s+)계약\s*해지\s+|(?:^|\s+)계약해지\s+',
-            r'(?:^|\s+)연차\s*유급\s*휴가\s+|(?:^|\s+)연차유급휴가\s+',
-            r'(?:^|\s+)사회보험\s*적용\s+',
-            r'(?:^|\s+)근로계약서\s*교부\s+',
-            r'(?:^|\s+)근로계약\s*취업규칙\s+',
-            r'(?:^|\s+)기\s*타\s+|(?:^|\s+)기타\s+',
-        ]
-        
-        section_keyword_pattern = re.compile('|'.join(SECTION_KEYWORDS), re.IGNORECASE)
+        section_keyword_pattern = self.SECTION_KEYWORD_PATTERN
         
         # 줄바꿈이 있으면 줄 단위로, 없으면 전체 텍스트에서 직접 검색
         lines = text.split('\n')
@@ -110,38 +113,25 @@ class LegalChunker:
             # 줄바꿈이 없거나 거의 없는 경우: 전체 텍스트에서 직접 키워드 검색
             keyword_positions = []
             
-            # 간단한 키워드 리스트 (공백 무시하고 검색)
-            simple_keywords = [
-                '근로계약기간', '근무 장소', '근무장소', '업무의 내용', '업무 내용', 
-                '소정근로시간', '소정 근로시간', '휴게시간', '휴게 시간',
-                '근무일', '휴일', '주휴일', '주 휴일', '임금', '임 금',
-                '상여금', '기타급여', '기타 급여', '제수당', '식대',
-                '자기계발비', '자기 계발비', '임금지급일', '임금 지급일',
-                '지급방법', '지급 방법', '특약사항', '특약 사항',
-                '수습기간', '수습 기간', '계약해지', '계약 해지',
-                '연차유급휴가', '연차 유급 휴가', '사회보험 적용',
-                '근로계약서 교부', '근로계약 취업규칙', '기타'
-            ]
-            
-            # 각 키워드를 텍스트에서 찾기
-            for keyword in simple_keywords:
-                # 키워드 앞뒤에 공백이 있는지 확인
-                pattern = re.compile(r'(?:^|\s+)' + re.escape(keyword) + r'\s+', re.IGNORECASE)
-                for match in pattern.finditer(text):
-                    # 실제 키워드 시작 위치 (공백 제외)
-                    keyword_start = match.start()
-                    # 앞의 공백 제거
-                    while keyword_start < len(text) and text[keyword_start] in [' ', '\n', '\t']:
-                        keyword_start += 1
-                    
-                    keyword_positions.append({
-                        'start': keyword_start,
-                        'end': match.end(),
-                        'keyword': keyword
-                    })
+            # 섹션 제목 키워드(core.keyword_matcher.SECTION_TITLE_KEYWORDS)를 공용 오토마톤으로 한 번에 검색
+            # 키워드 앞은 텍스트 시작 또는 공백, 뒤는 공백이어야 함
+            for hit in CONTRACT_KEYWORD_MATCHER.find_all(text, tables=("section",)):
+                if hit.start > 0 and not text[hit.start - 1].isspace():
+                    continue
+                if hit.end >= len(text) or not text[hit.end].isspace():
+                    continue
+                keyword_end = hit.end
+                while keyword_end < len(text) and text[keyword_end].isspace():
+                    keyword_end += 1
+                keyword_positions.append({
+                    'start': hit.start,
+                    'end': keyword_end,
+                    'keyword': hit.keyword,
+                    'priority': hit.priority,
+                })
             
             # 위치 순으로 정렬 및 중복 제거
-            keyword_positions.sort(key=lambda x: x['start'])
+            keyword_positions.sort(key=lambda x: (x['start'], x['priority']))
             # 중복 제거 (같은 위치 근처의 키워드)
             unique_positions = []
             last_pos = -10
@@ -3,13 +3,15 @@ Legal RAG Service - 법률 도메인 RAG 서비스
 계약서 분석, 상황 분석, 케이스 검색 기능 제공
 """
 
-from typing import List, Optional, OrderedDict, Dict, Any
+from typing import List, Optional, OrderedDict, Dict, Any, Callable
 from pathlib import Path
 from collections import OrderedDict as OrderedDictType
 import asyncio
 import logging
 import json
 import re
+import threading
+import time
 import warnings
 
 # langchain-community의 Ollama Deprecated 경고 무시
@@ -25,10 +27,17 @@ from models.schemas import (
 from core.supabase_vector_store import SupabaseVectorStore
 from core.generator_v2 import LLMGenerator
 from core.document_processor_v2 import DocumentProcessor
+from core.file_utils import get_storage_url_resolver
+from core.keyword_matcher import CONTRACT_KEYWORD_MATCHER, find_wage_waiver_pattern
+from core.streaming_json import StreamingJSONParser
+from core.prompt_budget import get_token_counter, dedupe_legal_chunks
+from core.reranker import get_legal_reranker
+from core.legal_search_cache import get_legal_search_cache
 from core.prompts import (
     build_legal_chat_prompt,
     build_situation_chat_prompt,
     build_contract_analysis_prompt,
+    build_clause_group_analysis_prompt,
     build_situation_analysis_prompt,
     LEGAL_CHAT_SYSTEM_PROMPT,
 )
@@ -36,6 +45,23 @@ from core.prompts import (
 
 LEGAL_BASE_PATH = Path(__file__).resolve().parent.parent / "data" / "legal"
 
+# analyze_contract 분석 모드
+CONTRACT_ANALYSIS_MODES = ("monolithic", "map_reduce")
+
+# map-reduce 모드 reduce 단계: 응답 sections 키 (영역별 점수) / 이슈 심각도 → 조항 점수 (clause_risks 누락 시)
+CONTRACT_SECTION_KEYS = ("working_hours", "wage", "probation_termination", "stock_option_ip")
+SEVERITY_RANK = {"high": 3, "medium": 2, "low": 1}
+SEVERITY_CLAUSE_SCORE = {"high": 80, "medium": 50, "low": 25}
+
+# 법정 수당 청구권 포기 문구가 있을 때 LLM에 덧붙이는 힌트 (concerns 뒤에 추가)
+WAGE_WAIVER_HINT = (
+    "※ 시스템 힌트: 이 계약서에는 "
+    "'추가 수당을 사업주에게 청구하지 않기로 합의한다' 와 같이 "
+    "근로자가 법에서 정한 연장·야간·휴일근로 수당 등 법정 임금 청구권을 "
+    "미리 포기하는 취지의 문구가 포함되어 있습니다. "
+    "이 조항의 위법 가능성과 위험도를 반드시 별도의 이슈로 평가하세요."
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -106,6 +132,9 @@ class LegalRAGService:
         self.processor = DocumentProcessor()
         # LRU 캐시를 사용한 임베딩 캐시 (메모리 사용량 제한)
         self._embedding_cache = LRUEmbeddingCache(max_size=embedding_cache_size)
+        # 이슈별 법령 근거 reason 생성 LLM 동시 호출 제한 (모든 이슈 태스크가 공유)
+        from config import settings
+        self._reason_semaphore = asyncio.Semaphore(max(1, settings.contract_issue_reason_concurrency))
 
     # 1) 계약서 + 상황 설명 기반 분석
     async def analyze_contract(
@@ -117,6 +146,7 @@ class LegalRAGService:
         contract_type: Optional[str] = None,
         user_role: Optional[str] = None,
         field: Optional[str] = None,
+        analysis_mode: Optional[str] = None,
     ) -> LegalAnalysisResult:
         """
         계약서 분석 (Dual RAG 지원)
@@ -124,7 +154,24 @@ class LegalRAGService:
         - extracted_text: 업로드된 계약서 OCR/파싱 결과 텍스트
         - description: 사용자가 덧붙인 상황 설명
         - doc_id: 계약서 ID (있으면 contract_chunks도 검색)
+        - analysis_mode: "monolithic"(계약서 전체를 LLM 한 번으로 분석) | "map_reduce"(조항 그룹별 병렬 분석 후 집계),
+          None이면 settings.contract_analysis_mode (clauses가 없으면 항상 monolithic)
         """
+        from config import settings
+        analysis_mode = analysis_mode or settings.contract_analysis_mode
+        if analysis_mode not in CONTRACT_ANALYSIS_MODES:
+            raise ValueError(f"알 수 없는 analysis_mode: {analysis_mode} (사용 가능: {', '.join(CONTRACT_ANALYSIS_MODES)})")
+        if analysis_mode == "map_reduce" and clauses:
+            return await self._analyze_contract_map_reduce(
+                extracted_text=extracted_text,
+                description=description,
+                doc_id=doc_id,
+                clauses=clauses,
+                contract_type=contract_type,
+                user_role=user_role,
+                field=field,
+            )
+        
         # 1. 쿼리 문장 구성
         query = self._build_query_from_contract(extracted_text, description)
 
@@ -157,14 +204,7 @@ class LegalRAGService:
         # 3. 프리프로세싱: 법정 수당 청구권 포기 패턴 감지
         risk_hint = description
         if self._detect_wage_waiver_phrases(extracted_text):
-            risk_hint = (
-                f"{description or ''}\n\n"
-                "※ 시스템 힌트: 이 계약서에는 "
-                "'추가 수당을 사업주에게 청구하지 않기로 합의한다' 와 같이 "
-                "근로자가 법에서 정한 연장·야간·휴일근로 수당 등 법정 임금 청구권을 "
-                "미리 포기하는 취지의 문구가 포함되어 있습니다. "
-                "이 조항의 위법 가능성과 위험도를 반드시 별도의 이슈로 평가하세요."
-            ).strip()
+            risk_hint = f"{description or ''}\n\n{WAGE_WAIVER_HINT}".strip()
 
         # 4. LLM으로 리스크 요약/분류 (Dual RAG 컨텍스트 포함)
         result = await self._llm_summarize_risk(
@@ -180,6 +220,266 @@ class LegalRAGService:
         )
         return result
 
+    def _group_clauses(self, clauses: List[Dict]) -> List[List[Dict]]:
+        """
+        map 단계 조항 그룹 (계약서 순서 유지)
+        
+        짧은 조항은 제목+본문 토큰 합이 contract_map_group_tokens를 넘지 않을 때까지 한 그룹으로 묶고,
+        그보다 긴 조항은 단독 그룹이 됩니다.
+        """
+        from config import settings
+        counter = get_token_counter()
+        groups: List[List[Dict]] = []
+        current: List[Dict] = []
+        current_tokens = 0
+        for clause in clauses:
+            tokens = counter.count(f"{clause.get('title', '')} {clause.get('content', '')}")
+            if current and current_tokens + tokens > settings.contract_map_group_tokens:
+                groups.append(current)
+                current, current_tokens = [], 0
+            current.append(clause)
+            current_tokens += tokens
+        if current:
+            groups.append(current)
+        return groups
+
+    async def _analyze_contract_map_reduce(
+        self,
+        extracted_text: str,
+        description: Optional[str],
+        doc_id: Optional[str],
+        clauses: List[Dict],
+        contract_type: Optional[str] = None,
+        user_role: Optional[str] = None,
+        field: Optional[str] = None,
+    ) -> LegalAnalysisResult:
+        """
+        map-reduce 모드 계약서 분석
+        
+        - map: 조항 그룹마다 (그룹 조항으로 legal 검색 → 작은 LLM 호출)을 contract_map_concurrency개까지 동시 실행.
+          이슈는 monolithic과 같이 스트림에서 닫히는 즉시 이슈별 법령 검색을 시작합니다.
+        - reduce: LLM 없이 이슈 병합과 조항 점수 기반 risk_score/sections 계산 (_reduce_contract_analyses)
+        
+        한 그룹의 LLM 호출이나 JSON이 실패하면 그 그룹만 빠지고, 모든 그룹이 실패하면 monolithic으로 다시 분석합니다.
+        """
+        from config import settings
+        started = time.perf_counter()
+        groups = self._group_clauses(clauses)
+        semaphore = asyncio.Semaphore(max(1, settings.contract_map_concurrency))
+        logger.info(f"[계약서 분석 map-reduce] 조항 {len(clauses)}개 → {len(groups)}개 그룹, 동시 실행 {settings.contract_map_concurrency}개")
+
+        async def run_group(group_idx: int, group: List[Dict]) -> Dict[str, Any]:
+            async with semaphore:
+                group_started = time.perf_counter()
+                group_text = "\n".join(f"{c.get('title', '')} {c.get('content', '')}" for c in group)
+                try:
+                    legal_chunks = await self._search_legal_chunks(
+                        query=group_text[:1000],
+                        top_k=settings.contract_map_legal_top_k,
+                        category=None,
+                        ensure_diversity=False,  # 조항별 검색이므로 다양성 확보 불필요
+                    )
+                except Exception as search_err:
+                    logger.warning(f"[계약서 분석 map-reduce] 그룹 {group_idx + 1} legal 검색 실패 (계속 진행): {str(search_err)}")
+                    legal_chunks = []
+
+                concerns = description
+                if self._detect_wage_waiver_phrases(group_text):
+                    concerns = f"{description or ''}\n\n{WAGE_WAIVER_HINT}".strip()
+                prompt_metrics: Dict[str, Any] = {}
+                prompt = build_clause_group_analysis_prompt(
+                    clauses=group,
+                    grounding_chunks=legal_chunks,
+                    contract_type=contract_type,
+                    user_role=user_role,
+                    field=field,
+                    concerns=concerns,
+                    metrics=prompt_metrics,
+                )
+
+                issues: List[LegalIssue] = []
+                issue_tasks: List[asyncio.Task] = []
+                group_ids = [c.get("id") for c in group]
+
+                def on_issue(idx: int, issue_data: Any) -> None:
+                    issue_obj = self._build_issue_from_data(idx, issue_data, extracted_text)
+                    if issue_obj is None:
+                        return
+                    if issue_obj.clause_id not in group_ids and len(group_ids) == 1:
+                        issue_obj.clause_id = group_ids[0]  # 단독 조항 그룹이면 clause_id가 어긋나도 그 조항으로 지정
+                    issues.append(issue_obj)
+                    issue_tasks.append(asyncio.create_task(self._attach_issue_legal_basis(issue_obj)))
+
+                analysis = None
+                try:
+                    parser = await self._generate_contract_analysis(
+                        prompt, on_issue, max_tokens=settings.contract_map_max_tokens
+                    )
+                    analysis = parser.result() or parser.recover()
+                except Exception as group_err:
+                    logger.warning(f"[계약서 분석 map-reduce] 그룹 {group_idx + 1}/{len(groups)} LLM 분석 실패: {str(group_err)}")
+                if analysis is None:
+                    for task in issue_tasks:
+                        task.cancel()
+                    issues, issue_tasks = [], []
+                if issue_tasks:
+                    await asyncio.gather(*issue_tasks)
+                return {
+                    "ok": analysis is not None,
+                    "issues": issues,
+                    "clause_risks": (analysis or {}).get("clause_risks") or [],
+                    "legal_chunks": legal_chunks,
+                    "prompt_tokens": prompt_metrics.get("total_tokens", 0),
+                    "latency_ms": (time.perf_counter() - group_started) * 1000,
+                }
+
+        group_results = await asyncio.gather(*(run_group(i, group) for i, group in enumerate(groups)))
+        failed = sum(1 for r in group_results if not r["ok"])
+        if failed == len(group_results):
+            logger.error("[계약서 분석 map-reduce] 모든 그룹 분석 실패, monolithic 모드로 다시 분석합니다.")
+            return await self.analyze_contract(
+                extracted_text=extracted_text,
+                description=description,
+                doc_id=doc_id,
+                clauses=clauses,
+                contract_type=contract_type,
+                user_role=user_role,
+                field=field,
+                analysis_mode="monolithic",
+            )
+
+        result = self._reduce_contract_analyses(clauses, group_results, extracted_text)
+        total_ms = (time.perf_counter() - started) * 1000
+        group_tokens = [r["prompt_tokens"] for r in group_results]
+        result.prompt_metrics = {
+            "mode": "map_reduce",
+            "groups": len(groups),
+            "groups_failed": failed,
+            "total_tokens": sum(group_tokens),
+            "max_group_tokens": max(group_tokens) if group_tokens else 0,
+            "group_latency_ms": [round(r["latency_ms"], 1) for r in group_results],
+            "total_ms": round(total_ms, 1),
+        }
+        logger.info(
+            f"[계약서 분석 map-reduce] 완료: {total_ms:.0f}ms, 그룹 {len(groups)}개 (실패 {failed}개), "
+            f"입력 {sum(group_tokens)}토큰, 이슈 {len(result.issues)}개, risk_score={result.risk_score}, sections={result.sections}"
+        )
+        return result
+
+    def _reduce_contract_analyses(
+        self,
+        clauses: List[Dict],
+        group_results: List[Dict[str, Any]],
+        contract_text: str,
+    ) -> LegalAnalysisResult:
+        """
+        map 결과 집계 (LLM 호출 없음)
+        
+        - 이슈: 같은 (clause_id, category)는 심각도가 높은 것 하나만, 심각도 → 계약서 순서로 정렬 (최대 15개)
+        - 조항 점수: LLM clause_risks, 없으면 그 조항 이슈의 심각도 점수 (SEVERITY_CLAUSE_SCORE)
+        - risk_score: 최고 조항 점수 60% + 상위 3개 평균 40%
+        - sections: 영역별 최고 조항 점수 (영역은 LLM section, 없으면 조항 카테고리 키워드)
+        """
+        from models.schemas import RiskSummaryItem
+        order = {c.get("id"): i for i, c in enumerate(clauses)}
+
+        merged: Dict[Any, LegalIssue] = {}
+        for group_result in group_results:
+            for issue in group_result["issues"]:
+                key = (issue.clause_id, issue.category) if issue.clause_id else id(issue)
+                kept = merged.get(key)
+                if kept is None or SEVERITY_RANK.get(issue.severity, 0) > SEVERITY_RANK.get(kept.severity, 0):
+                    merged[key] = issue
+        issues = sorted(
+            merged.values(),
+            key=lambda issue: (-SEVERITY_RANK.get(issue.severity, 0), order.get(issue.clause_id, len(order))),
+        )[:15]
+        for idx, issue in enumerate(issues):
+            issue.name = f"issue-{idx + 1}"  # 그룹마다 issue-1부터 시작하므로 다시 번호 부여
+
+        # ① 규칙 기반 강제 이슈 추가 (법정 수당 청구권 포기 패턴)
+        try:
+            self._ensure_wage_waiver_issue(contract_text=contract_text or "", issues=issues)
+        except Exception as ensure_err:
+            logger.warning(f"[후처리] 법정 수당 청구권 포기 이슈 보정 중 오류: {str(ensure_err)}", exc_info=True)
+
+        clause_scores: Dict[str, float] = {}
+        clause_sections: Dict[str, str] = {}
+        for group_result in group_results:
+            for item in group_result["clause_risks"]:
+                if not isinstance(item, dict) or item.get("clause_id") not in order:
+                    continue
+                try:
+                    score = float(item.get("risk_score", 0))
+                except (TypeError, ValueError):
+                    continue
+                clause_scores[item["clause_id"]] = max(0.0, min(100.0, score))
+                if item.get("section") in CONTRACT_SECTION_KEYS:
+                    clause_sections[item["clause_id"]] = item["section"]
+        for issue in issues:
+            if issue.clause_id in order:
+                clause_scores[issue.clause_id] = max(
+                    clause_scores.get(issue.clause_id, 0.0), SEVERITY_CLAUSE_SCORE.get(issue.severity, 50)
+                )
+
+        sections = {key: 0 for key in CONTRACT_SECTION_KEYS}
+        for clause in clauses:
+            clause_id = clause.get("id")
+            if clause_id not in clause_scores:
+                continue
+            section = clause_sections.get(clause_id)
+            if section is None:
+                hits = CONTRACT_KEYWORD_MATCHER.find_all(
+                    f"{clause.get('title', '')} {clause.get('content', '')}", tables=("category",)
+                )
+                candidates = sorted((hit.priority, hit.category) for hit in hits if hit.category in CONTRACT_SECTION_KEYS)
+                section = candidates[0][1] if candidates else None
+            if section:
+                sections[section] = max(sections[section], int(round(clause_scores[clause_id])))
+
+        top_scores = sorted(clause_scores.values(), reverse=True)
+        risk_score = int(round(0.6 * top_scores[0] + 0.4 * sum(top_scores[:3]) / len(top_scores[:3]))) if top_scores else 0
+        risk_level = "low" if risk_score <= 30 else ("medium" if risk_score <= 60 else "high")
+
+        high_count = sum(1 for issue in issues if issue.severity == "high")
+        summary = f"조항 {len(clauses)}개를 조항별로 분석한 결과, 위험 이슈 {len(issues)}개(높음 {high_count}개)가 발견되었습니다."
+        if issues:
+            summary += " 주요 이슈: " + ", ".join((issue.summary or issue.description or "")[:40] for issue in issues[:3])
+        negotiation_questions = list(dict.fromkeys(
+            question for issue in issues for question in (issue.suggested_questions or []) if question
+        ))[:5]
+
+        return LegalAnalysisResult(
+            risk_score=risk_score,
+            risk_level=risk_level,
+            summary=summary,
+            issues=issues,
+            recommendations=[],
+            grounding=dedupe_legal_chunks([chunk for r in group_results for chunk in r["legal_chunks"]]),
+            one_line_summary=(
+                f"{issues[0].summary or issues[0].description} 등 {len(issues)}개 조항 이슈가 있습니다."
+                if issues else "조항별 분석에서 뚜렷한 위험 조항이 발견되지 않았습니다."
+            ),
+            risk_traffic_light={"low": "🟢", "medium": "🟡", "high": "🔴"}[risk_level],
+            top3_action_points=[
+                (issue.suggested_questions or [None])[0] or issue.summary or issue.description
+                for issue in issues[:3]
+            ],
+            risk_summary_table=[
+                RiskSummaryItem(
+                    item=issue.summary or issue.name,
+                    riskLevel=issue.severity,
+                    problemPoint=(issue.rationale or "")[:100],
+                    simpleExplanation=issue.description or "",
+                    revisionKeyword=issue.suggested_text or "",
+                )
+                for issue in issues
+            ],
+            toxic_clauses=[issue.toxic_clause_detail for issue in issues if issue.toxic_clause_detail],
+            negotiation_questions=negotiation_questions,
+            sections=sections,
+        )
+
     # 2) 텍스트 상황 설명 기반 분석 (레거시)
     async def analyze_situation(self, text: str) -> LegalAnalysisResult:
         query = text
@@ -231,8 +531,8 @@ class LegalRAGService:
         # LangGraph 워크플로우 사용
         if use_workflow:
             try:
-                from core.situation_workflow import SituationWorkflow
-                workflow = SituationWorkflow()
+                from core.situation_workflow import get_situation_workflow
+                workflow = get_situation_workflow(vector_store=self.vector_store, generator=self.generator)
                 initial_state = {
                     "situation_text": situation_text,
                     "category_hint": category_hint,
@@ -635,25 +935,10 @@ class LegalRAGService:
         Returns:
             패턴이 발견되면 True
         """
-        if not text:
-            return False
-        
-        import re
-        
-        patterns = [
-            r"추가\s*수당[^\n]*청구하지\s+않기로\s+합의한다",
-            r"법에서\s*정한\s*수당[^\n]*청구하지\s+않기로",
-            r"연장.?야간.?휴일\s*근로\s*수당[^\n]*별도로\s*청구하지\s+않는다",
-            r"포괄임금[^\n]*추가[^\n]*수당[^\n]*청구하지\s+않",
-            r"실제\s*근로시간[^\n]*포괄임금[^\n]*초과[^\n]*추가\s*수당[^\n]*청구하지",
-            r"연장.?야간.?휴일\s*수당[^\n]*청구하지\s+않",
-            r"법정\s*수당[^\n]*청구하지\s+않",
-        ]
-        
-        for pattern in patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                logger.info(f"[프리프로세싱] 법정 수당 청구권 포기 패턴 감지됨: {pattern}")
-                return True
+        pattern = find_wage_waiver_pattern(text)
+        if pattern:
+            logger.info(f"[프리프로세싱] 법정 수당 청구권 포기 패턴 감지됨: {pattern}")
+            return True
         
         return False
     
@@ -821,7 +1106,9 @@ class LegalRAGService:
                     {"role": "system", "content": "너는 유능한 법률 AI야. 한국어로만 답변해주세요."},
                     {"role": "user", "content": prompt}
                 ]
-                response_text = ask_groq_with_messages(
+                # 이슈별 검색과 겹쳐 실행되므로 동기 Groq 호출은 스레드에서 실행 (이벤트 루프 블로킹 방지)
+                response_text = await asyncio.to_thread(
+                    ask_groq_with_messages,
                     messages=messages,
                     temperature=0.3,  # reason 생성은 낮은 temperature 사용
                     model=settings.groq_model
@@ -839,7 +1126,7 @@ class LegalRAGService:
                 estimated_input_tokens = len(prompt) // 2.5
                 logger.info(f"[토큰 사용량] 입력 추정: 약 {int(estimated_input_tokens)}토큰 (프롬프트 길이: {len(prompt)}자)")
                 
-                response_text = llm.invoke(prompt)
+                response_text = await asyncio.to_thread(llm.invoke, prompt)
                 
                 # 대략적인 출력 토큰 추정
                 if response_text:
@@ -1034,6 +1321,7 @@ class LegalRAGService:
         top_k: int = 8,
         category: Optional[str] = None,
         ensure_diversity: bool = True,
+        rerank: bool = False,
     ) -> List[LegalGroundingChunk]:
         """
         벡터스토어 + 메타데이터로
@@ -1047,9 +1335,31 @@ class LegalRAGService:
             top_k: 반환할 최대 개수
             category: 이슈 카테고리 (필터링용, 예: "wage", "working_hours")
             ensure_diversity: 타입 다양성 확보 여부 (상위 20개에서 source_type별 quota 채워서 선정)
+            rerank: cross-encoder 재정렬 여부 (settings.legal_rerank_enabled일 때만, 상위 legal_rerank_candidates개 후보)
         """
+        from config import settings
+
+        use_rerank = rerank and settings.legal_rerank_enabled
+
+        # 검색 결과 캐시 (정규화된 쿼리 + 검색 조건, 코퍼스 버전이 바뀌면 무효화)
+        search_cache = get_legal_search_cache() if settings.legal_search_cache_enabled else None
+        cache_params = (category, top_k, ensure_diversity, use_rerank)
+        cache_version = None
+        if search_cache is not None:
+            cached = search_cache.get(query, cache_params)
+            if cached is not None:
+                return cached
+            # 검색 도중 코퍼스 버전이 바뀌면 이 결과는 캐시하지 않도록 시작 시점 버전 기록
+            cache_version = search_cache.version
+
         # 쿼리 임베딩 생성 (캐싱 지원)
         query_embedding = await self._get_embedding(query)
+
+        # semantic 모드: 임베딩이 충분히 가까운 이전 쿼리의 결과 재사용
+        if search_cache is not None and search_cache.semantic_enabled:
+            cached = search_cache.get_similar(query_embedding, cache_params)
+            if cached is not None:
+                return cached
         
         # 필터 구성 (category가 있으면 metadata에서 topic_main 필터링)
         filters = None
@@ -1061,6 +1371,8 @@ class LegalRAGService:
         
         # 타입 다양성을 위해 상위 20개를 먼저 가져옴 (RPC에서 더 많은 후보를 받아서 Python에서 다양성 확보)
         candidate_top_k = 20 if ensure_diversity else top_k
+        if use_rerank:
+            candidate_top_k = max(candidate_top_k, settings.legal_rerank_candidates)
         
         # 벡터 검색 (RPC 함수 사용)
         rows = self.vector_store.search_similar_legal_chunks(
@@ -1069,8 +1381,12 @@ class LegalRAGService:
             filters=filters
         )
 
+        # 스토리지 파일 URL 일괄 생성 (메모리 연산만 수행, SDK 호출 없음)
+        file_urls = get_storage_url_resolver().resolve_many(rows)
+        
         results: List[LegalGroundingChunk] = []
-        for r in rows:
+        contents: Dict[str, str] = {}  # 재정렬 입력 (snippet은 300자로 잘려 있으므로 원문 사용)
+        for r, file_url in zip(rows, file_urls):
             # 새 스키마에서 source_type은 직접 컬럼
             source_type = r.get("source_type", "law")
             title = r.get("title", "제목 없음")
@@ -1084,18 +1400,6 @@ class LegalRAGService:
             if not file_path and external_id:
                 file_path = self._build_file_path(source_type, external_id)
             
-            # 스토리지 파일 URL 생성
-            file_url = None
-            if external_id:
-                try:
-                    file_url = self.vector_store.get_storage_file_url(
-                        external_id=external_id,
-                        source_type=source_type,
-                        expires_in=3600  # 1시간
-                    )
-                except Exception as e:
-                    logger.warning(f"스토리지 URL 생성 실패 (external_id={external_id}): {str(e)}")
-            
             # metadata 추출
             metadata = r.get("metadata", {}) or {}
             
@@ -1114,24 +1418,52 @@ class LegalRAGService:
                     metadata=metadata,
                 )
             )
+            contents[results[-1].source_id] = f"{title}\n{content}"
         
         # threshold 체크: 상위 1개 스코어가 너무 낮으면 빈 리스트 반환
         if results and len(results) > 0:
             top_score = results[0].score
             if top_score < 0.4:  # threshold: 0.4
                 logger.info(f"[법령 검색] 상위 스코어가 너무 낮음 (score={top_score:.3f} < 0.4), 결과 없음으로 처리")
+                if search_cache is not None:
+                    search_cache.put(query, cache_params, [], cache_version, embedding=query_embedding)
                 return []  # threshold 미만이면 빈 리스트 반환
         
+        # cross-encoder 재정렬 (예산 초과/부하 시 None → bi-encoder 순서 유지)
+        rank_scores: Optional[Dict[str, float]] = None
+        rerank_skipped = False
+        if use_rerank and len(results) > 1:
+            rerank_stats: Dict[str, Any] = {}
+            rank_scores = await get_legal_reranker().rerank(
+                query,
+                [(chunk.source_id, contents[chunk.source_id]) for chunk in results],
+                stats=rerank_stats,
+            )
+            if rank_scores is not None:
+                results.sort(key=lambda chunk: rank_scores[chunk.source_id], reverse=True)
+            else:
+                rerank_skipped = True
+            logger.info(
+                f"[법령 검색] 재정렬 {rerank_stats.get('rerank')}: "
+                f"후보 {len(results)}개, 추론 {rerank_stats.get('rerank_pairs')}쌍, {rerank_stats.get('rerank_ms')}ms"
+            )
+        
         # 타입 다양성 확보: source_type별 quota 채워서 8개 선정
         if ensure_diversity and len(results) > top_k:
-            results = self._ensure_source_type_diversity(results, top_k)
+            results = self._ensure_source_type_diversity(results, top_k, rank_scores)
+        results = results[:top_k]
+
+        # 재정렬을 요청했는데 예산 초과/부하로 건너뛴 결과는 캐시하지 않음 (다음 요청에서 재정렬 기회)
+        if search_cache is not None and not rerank_skipped:
+            search_cache.put(query, cache_params, results, cache_version, embedding=query_embedding)
         
-        return results[:top_k]
+        return results
     
     def _ensure_source_type_diversity(
         self,
         candidates: List[LegalGroundingChunk],
         target_count: int = 8,
+        rank_scores: Optional[Dict[str, float]] = None,
     ) -> List[LegalGroundingChunk]:
         """
         source_type별 다양성을 확보하여 결과 선정
@@ -1144,6 +1476,7 @@ class LegalRAGService:
         Args:
             candidates: 후보 리스트 (이미 유사도 순으로 정렬됨)
             target_count: 최종 반환할 개수
+            rank_scores: cross-encoder 점수 (source_id → 점수, 있으면 유사도 대신 이 점수로 정렬)
         
         Returns:
             다양성을 확보한 결과 리스트
@@ -1203,11 +1536,352 @@ class LegalRAGService:
                 selected.append(chunk)
                 used_indices.add(idx)
         
-        # 유사도 순으로 재정렬 (다양성 확보 후에도 유사도 우선)
-        selected.sort(key=lambda x: x.score, reverse=True)
+        # 유사도 순으로 재정렬 (다양성 확보 후에도 유사도 우선, 재정렬했으면 cross-encoder 점수 순)
+        if rank_scores is not None:
+            selected.sort(key=lambda x: rank_scores[x.source_id], reverse=True)
+        else:
+            selected.sort(key=lambda x: x.score, reverse=True)
         
         return selected[:target_count]
 
+    def _create_ollama_llm(self, json_format: bool = False):
+        """
+        Ollama LLM 생성 (langchain-community 우선, think 파라미터 에러 시 fallback)
+        
+        Args:
+            json_format: True면 Ollama JSON 모드(format="json")로 유효한 JSON만 생성
+        """
+        from config import settings
+        extra = {"format": "json"} if json_format else {}
+        # langchain-community 우선 사용 (think 파라미터 에러 방지)
+        try:
+            from langchain_community.llms import Ollama
+            llm = Ollama(
+                base_url=settings.ollama_base_url,
+                model=settings.ollama_model,
+                **extra,
+            )
+            logger.info("[LLM 호출] langchain_community.llms.Ollama 사용")
+        except ImportError:
+            # 대안: langchain-ollama 사용 (think 파라미터 에러 가능)
+            try:
+                from langchain_ollama import OllamaLLM
+                llm = OllamaLLM(
+                    base_url=settings.ollama_base_url,
+                    model=settings.ollama_model,
+                    **extra,
+                )
+                logger.info("[LLM 호출] langchain_ollama.OllamaLLM 사용")
+            except Exception as e:
+                if "think" in str(e).lower():
+                    logger.warning("[LLM 호출] langchain-ollama에서 think 파라미터 에러 발생. langchain-community로 재시도...")
+                    from langchain_community.llms import Ollama
+                    llm = Ollama(
+                        base_url=settings.ollama_base_url,
+                        model=settings.ollama_model,
+                        **extra,
+                    )
+                    logger.info("[LLM 호출] langchain_community.llms.Ollama 사용 (fallback)")
+                else:
+                    raise
+        return llm
+
+    def _contract_analysis_chunks(self, prompt: str, stop: threading.Event, max_tokens: int = 8192):
+        """
+        계약서 분석 LLM 응답을 텍스트 조각으로 yield (동기 제너레이터, 워커 스레드에서 실행)
+        
+        - Groq: JSON 모드 + 스트리밍 (contract_analysis_stream=False면 한 번에 전체 응답)
+        - Ollama: format="json" + llm.stream
+        - stop이 설정되면 (최상위 JSON 객체 완성/요청 취소) 남은 스트림을 읽지 않고 종료
+        """
+        from config import settings
+        
+        if settings.use_groq:
+            from llm_api import ask_groq_with_messages, stream_groq_with_messages
+            
+            # 프롬프트를 메시지 형식으로 변환
+            messages = [
+                {"role": "system", "content": "너는 유능한 법률 AI야. 한국어로만 답변해주세요. JSON 형식으로 응답하세요."},
+                {"role": "user", "content": prompt}
+            ]
+            request = dict(
+                messages=messages,
+                temperature=settings.llm_temperature,
+                model=settings.groq_model,
+                max_tokens=max_tokens,  # 계약서 분석은 긴 JSON 응답이 필요하므로 토큰 수 증가 (기본 8192)
+                json_mode=True,
+            )
+            if not settings.contract_analysis_stream:
+                yield ask_groq_with_messages(**request)
+                return
+            for chunk in stream_groq_with_messages(**request):
+                if stop.is_set():
+                    return
+                yield chunk
+        # Ollama 사용 (레거시)
+        elif self.generator.use_ollama:
+            logger.info(f"[LLM 호출] Ollama 호출 시작: base_url={settings.ollama_base_url}, model={settings.ollama_model}")
+            llm = self._create_ollama_llm(json_format=True)
+            counter = get_token_counter()
+            logger.info(f"[토큰 사용량] 입력: {counter.count(prompt)}토큰 ({counter.name}, 프롬프트 길이: {len(prompt)}자)")
+            if not settings.contract_analysis_stream:
+                yield llm.invoke(prompt)
+                return
+            for chunk in llm.stream(prompt):
+                if stop.is_set():
+                    return
+                yield chunk
+        else:
+            # Groq와 Ollama 모두 사용 안 함
+            raise ValueError("LLM이 설정되지 않았습니다. use_groq 또는 use_ollama를 True로 설정하세요.")
+
+    async def _generate_contract_analysis(
+        self,
+        prompt: str,
+        on_issue: Callable[[int, Any], None],
+        max_tokens: int = 8192,
+    ) -> StreamingJSONParser:
+        """
+        계약서 분석 JSON을 생성하면서 점진적으로 파싱
+        
+        LLM 호출은 워커 스레드에서 실행하고(이벤트 루프 블로킹 방지), 받은 조각을 StreamingJSONParser에 넣어
+        issues 배열의 원소가 닫힐 때마다 on_issue(원소 인덱스, issue dict)를 이벤트 루프에서 호출합니다.
+        
+        Returns:
+            응답 전체를 받은 파서 (result()/recover()로 최종 분석 결과 획득)
+        
+        Raises:
+            LLM 호출이 응답을 하나도 받기 전에 실패하면 예외를 그대로 전파
+        """
+        parser = StreamingJSONParser(stream_key="issues")
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        stop = threading.Event()
+        end_of_stream = object()
+        started = time.perf_counter()
+        first_issue_ms: Optional[float] = None
+        error: Optional[BaseException] = None
+
+        def produce() -> None:
+            try:
+                for chunk in self._contract_analysis_chunks(prompt, stop, max_tokens):
+                    loop.call_soon_threadsafe(queue.put_nowait, chunk)
+            except BaseException as e:
+                loop.call_soon_threadsafe(queue.put_nowait, e)
+            finally:
+                loop.call_soon_threadsafe(queue.put_nowait, end_of_stream)
+
+        producer = loop.run_in_executor(None, produce)
+        try:
+            while True:
+                item = await queue.get()
+                if item is end_of_stream:
+                    break
+                if isinstance(item, BaseException):
+                    error = item
+                    continue
+                for issue_data in parser.feed(item):
+                    if first_issue_ms is None:
+                        first_issue_ms = (time.perf_counter() - started) * 1000
+                    on_issue(len(parser.items) - 1, issue_data)
+                if parser.done:
+                    stop.set()
+        finally:
+            stop.set()
+        await producer
+
+        if error is not None:
+            if not parser.text:
+                raise error
+            logger.warning(f"[LLM 호출] 응답 스트리밍 중단, 받은 부분까지 사용: {type(error).__name__}: {str(error)}")
+
+        logger.info(
+            f"[LLM 호출] 계약서 분석 생성 완료: {(time.perf_counter() - started) * 1000:.0f}ms, "
+            f"첫 이슈 {f'{first_issue_ms:.0f}ms' if first_issue_ms is not None else '-'}, 이슈 {len(parser.items)}개"
+        )
+        return parser
+
+    def _build_issue_from_data(
+        self,
+        idx: int,
+        issue_data: Any,
+        contract_text: Optional[str],
+    ) -> Optional[LegalIssue]:
+        """
+        LLM 응답의 issue dict → LegalIssue (새 스키마/레거시 스키마 모두 지원)
+        
+        Returns:
+            LegalIssue 또는 None (dict가 아니거나 생성 실패 시)
+        """
+        # issue_data가 dict가 아니면 건너뛰기
+        if not isinstance(issue_data, dict):
+            logger.warning(f"[DEBUG] issue[{idx}]가 dict가 아닙니다 (타입: {type(issue_data)}). 건너뜁니다.")
+            return None
+        
+        # 새로운 스키마: issue_id, clause_id, category, summary, reason 등
+        # 레거시 스키마: name, description, original_text 등
+        issue_id = issue_data.get("issue_id") or issue_data.get("name", f"issue-{idx+1}")
+        clause_id = issue_data.get("clause_id") or issue_data.get("clauseId")
+        category = issue_data.get("category", "unknown")
+        summary = issue_data.get("summary") or issue_data.get("description", "")
+        reason = issue_data.get("reason") or issue_data.get("rationale", "")
+        
+        # original_text는 clause_id 기반으로 나중에 채워지므로 여기서는 빈 문자열
+        # 레거시 호환성을 위해 original_text가 있으면 사용
+        original_text = issue_data.get("original_text", "")
+        
+        # description은 summary 또는 reason으로 대체
+        description = summary or reason
+        
+        # toxic_clause_detail 파싱
+        toxic_clause_detail = None
+        toxic_detail_data = issue_data.get("toxic_clause_detail")
+        if toxic_detail_data and isinstance(toxic_detail_data, dict):
+            try:
+                from models.schemas import ToxicClauseDetail
+                toxic_clause_detail = ToxicClauseDetail(
+                    clauseLocation=toxic_detail_data.get("clause_location", ""),
+                    contentSummary=toxic_detail_data.get("content_summary", ""),
+                    whyRisky=toxic_detail_data.get("why_risky", ""),
+                    realWorldProblems=toxic_detail_data.get("real_world_problems", ""),
+                    suggestedRevisionLight=toxic_detail_data.get("suggested_revision_light", ""),
+                    suggestedRevisionFormal=toxic_detail_data.get("suggested_revision_formal", ""),
+                )
+            except Exception as toxic_err:
+                logger.warning(f"[LLM 응답 파싱] issue[{idx}] toxic_clause_detail 변환 실패: {str(toxic_err)}")
+        
+        # 계약서 텍스트에서 해당 조항 위치 찾기
+        # 새로운 파이프라인에서는 clause_id 기반으로 original_text를 나중에 채우므로
+        # 여기서는 start_index/end_index를 None으로 설정
+        start_index = None
+        end_index = None
+        
+        # 레거시 호환성: original_text가 있고 contract_text가 있으면 위치 찾기 시도
+        if contract_text and original_text and isinstance(original_text, str):
+            try:
+                # original_text를 사용하여 정확한 위치 찾기
+                start_index = contract_text.find(original_text)
+                if start_index >= 0:
+                    end_index = start_index + len(original_text)
+                else:
+                    # 정확히 일치하지 않으면 부분 매칭 시도
+                    if len(original_text) > 100:
+                        # 1. 처음 100자로 검색
+                        start_index = contract_text.find(original_text[:100])
+                        if start_index >= 0:
+                            end_index = start_index + len(original_text)
+                    if start_index is None and len(original_text) > 50:
+                        # 2. 처음 50자로 검색
+                        start_index = contract_text.find(original_text[:50])
+                        if start_index >= 0:
+                            # 문장 단위로 확장
+                            end_pos = min(start_index + len(original_text), len(contract_text))
+                            while end_pos < len(contract_text) and contract_text[end_pos] not in ['\n', '。', '.']:
+                                end_pos += 1
+                            end_index = end_pos
+                    if start_index is None:
+                        logger.debug(f"[LLM 응답 파싱] originalText를 계약서에서 찾을 수 없음 (clause_id 기반으로 나중에 채워짐): {original_text[:50] if isinstance(original_text, str) else original_text}...")
+            except Exception as find_err:
+                logger.warning(f"[LLM 응답 파싱] originalText 위치 찾기 실패: {str(find_err)}")
+                # 에러가 나도 계속 진행 (clause_id 기반으로 나중에 채워짐)
+        
+        try:
+            issue_obj = LegalIssue(
+                name=issue_id,  # issue_id를 name 필드에 저장 (레거시 호환)
+                description=description,  # summary 또는 reason을 description에 저장
+                severity=issue_data.get("severity", "medium"),
+                legal_basis=issue_data.get("legal_basis", []),
+                start_index=start_index,
+                end_index=end_index,
+                suggested_text=issue_data.get("suggested_revision") or issue_data.get("suggested_text"),
+                rationale=reason or issue_data.get("rationale"),
+                suggested_questions=issue_data.get("suggested_questions", []),
+                original_text=original_text,  # original_text 필드 추가
+                clause_id=clause_id,  # clause_id 필드 추가 (새 스키마)
+                category=category,  # category 필드 추가 (새 스키마)
+                summary=summary,  # summary 필드 추가 (새 스키마)
+                toxic_clause_detail=toxic_clause_detail,  # toxic_clause_detail 추가
+            )
+            logger.debug(f"[LLM 응답 파싱] issue[{idx}]: name={issue_obj.name[:50]}, clause_id={clause_id}, severity={issue_obj.severity}, description 길이={len(description)}")
+            return issue_obj
+        except Exception as issue_create_err:
+            logger.error(f"[LLM 응답 파싱] issue[{idx}] LegalIssue 생성 실패: {str(issue_create_err)}", exc_info=True)
+            # 개별 issue 생성 실패해도 계속 진행
+            return None
+
+    async def _attach_issue_legal_basis(self, issue: LegalIssue) -> None:
+        """
+        이슈 하나에 대해 legal 검색(이슈 중심 쿼리) 후 legal_basis를 검색 결과로 보강
+        (근거별 reason 생성은 contract_issue_reason_concurrency개까지 동시에 실행, 실패해도 이슈는 그대로 유지)
+        """
+        try:
+            # 이슈 기반 쿼리 생성
+            issue_dict = {
+                "original_text": issue.original_text or "",
+                "clause_text": issue.original_text or "",
+                "rationale": issue.rationale or issue.description or "",
+                "category": issue.category or "",
+                "summary": issue.summary or issue.description or "",
+            }
+            issue_query = self._build_query_from_issue(issue_dict)
+            
+            # 이슈별 legal 검색 (category 필터 적용, boilerplate 제외)
+            issue_legal_chunks = await self._search_legal_chunks(
+                query=issue_query,
+                top_k=5,  # 이슈별로 5개만
+                category=issue.category,  # category 필터 적용
+                ensure_diversity=False,  # 이슈별 검색이므로 다양성 확보 불필요
+            )
+            if not issue_legal_chunks:
+                logger.debug(f"[법령 검색] 이슈 '{issue.name[:30]}' ({issue.category}): 법령 검색 결과 없음 (threshold 미만 또는 필터링됨)")
+                return
+            
+            # reason 생성 (선택적, LLM 사용)
+            async def build_reason(chunk: LegalGroundingChunk) -> Optional[str]:
+                try:
+                    async with self._reason_semaphore:
+                        return await self._build_reason(
+                            issue_summary=issue.summary or issue.description or "",
+                            clause_text=issue.original_text or "",
+                            basis_snippet=chunk.snippet,
+                        )
+                except Exception as reason_err:
+                    logger.debug(f"[법령 검색] reason 생성 실패 (계속 진행): {str(reason_err)}")
+                    return None
+            
+            reasons = await asyncio.gather(*(build_reason(chunk) for chunk in issue_legal_chunks))
+            
+            from models.schemas import LegalBasisItemV2
+            issue_legal_basis = []
+            for chunk, reason in zip(issue_legal_chunks, reasons):
+                # file_path가 없으면 external_id로 생성
+                file_path = chunk.file_path
+                if not file_path and chunk.external_id:
+                    file_path = self._build_file_path(chunk.source_type, chunk.external_id)
+                issue_legal_basis.append(
+                    LegalBasisItemV2(
+                        title=chunk.title,
+                        snippet=chunk.snippet,
+                        sourceType=chunk.source_type,
+                        status="unclear",  # LLM이 판단한 status가 있다면 사용
+                        filePath=file_path,  # 스토리지 키
+                        similarityScore=chunk.score,  # 벡터 유사도
+                        chunkIndex=chunk.chunk_index,  # 청크 인덱스
+                        externalId=chunk.external_id,  # external_id
+                        reason=reason,  # LLM으로 생성한 이유 설명
+                    )
+                )
+            # 기존 legal_basis가 있으면 병합 (이슈별 검색 결과 우선)
+            if issue.legal_basis:
+                issue.legal_basis = issue_legal_basis + list(issue.legal_basis)
+            else:
+                issue.legal_basis = issue_legal_basis
+            
+            logger.debug(f"[법령 검색] 이슈 '{issue.name[:30]}' ({issue.category}): {len(issue_legal_chunks)}개 법령 검색됨")
+        except Exception as issue_search_err:
+            # 이슈별 검색 실패해도 계속 진행
+            logger.warning(f"[법령 검색] 이슈 '{issue.name[:30]}' legal 검색 실패: {str(issue_search_err)}")
+
     async def _llm_summarize_risk(
         self,
         query: str,
@@ -1247,7 +1921,8 @@ class LegalRAGService:
                 grounding=grounding_chunks,
             )
         
-        # 프롬프트 템플릿 사용 (Dual RAG 지원)
+        # 프롬프트 템플릿 사용 (Dual RAG 지원, 섹션별 토큰 예산)
+        prompt_metrics: Dict[str, Any] = {}
         prompt = build_contract_analysis_prompt(
             contract_text=contract_text or "",
             grounding_chunks=grounding_chunks,
@@ -1258,516 +1933,69 @@ class LegalRAGService:
             user_role=user_role,
             field=field,
             concerns=concerns,
+            metrics=prompt_metrics,
         )
         
 
         try:
-            # Groq 사용 (우선)
-            from config import settings
-            import json
-            import re
+            # issue 객체가 스트림에서 닫히는 즉시 LegalIssue로 변환하고 이슈별 법령 검색을 시작
+            # (LLM이 나머지 이슈/추천을 생성하는 동안 검색·reason 생성이 함께 진행됨)
+            issues: List[LegalIssue] = []
+            issue_tasks: List[asyncio.Task] = []
             
-            if settings.use_groq:
-                from llm_api import ask_groq_with_messages
-                
-                # 프롬프트를 메시지 형식으로 변환
-                messages = [
-                    {"role": "system", "content": "너는 유능한 법률 AI야. 한국어로만 답변해주세요. JSON 형식으로 응답하세요."},
-                    {"role": "user", "content": prompt}
-                ]
-                
-                try:
-                    response_text = ask_groq_with_messages(
-                        messages=messages,
-                        temperature=settings.llm_temperature,
-                        model=settings.groq_model,
-                        max_tokens=8192  # 계약서 분석은 긴 JSON 응답이 필요하므로 토큰 수 증가
-                    )
-                    logger.info(f"[Groq 호출 성공] 응답 길이: {len(response_text) if response_text else 0}자")
-                except Exception as groq_error:
-                    logger.error(f"[Groq 호출 실패] {str(groq_error)}", exc_info=True)
-                    raise  # 상위 except로 전달
-            # Ollama 사용 (레거시)
-            elif self.generator.use_ollama:
-                logger.info(f"[LLM 호출] Ollama 호출 시작: base_url={settings.ollama_base_url}, model={settings.ollama_model}")
-                
-                # langchain-community 우선 사용 (think 파라미터 에러 방지)
-                try:
-                    from langchain_community.llms import Ollama
-                    llm = Ollama(
-                        base_url=settings.ollama_base_url,
-                        model=settings.ollama_model
-                    )
-                    logger.info("[LLM 호출] langchain_community.llms.Ollama 사용")
-                except ImportError:
-                    # 대안: langchain-ollama 사용 (think 파라미터 에러 가능)
-                    try:
-                        from langchain_ollama import OllamaLLM
-                        llm = OllamaLLM(
-                            base_url=settings.ollama_base_url,
-                            model=settings.ollama_model
-                        )
-                        logger.info("[LLM 호출] langchain_ollama.OllamaLLM 사용")
-                    except Exception as e:
-                        if "think" in str(e).lower():
-                            logger.warning("[LLM 호출] langchain-ollama에서 think 파라미터 에러 발생. langchain-community로 재시도...")
-                            from langchain_community.llms import Ollama
-                            llm = Ollama(
-                                base_url=settings.ollama_base_url,
-                                model=settings.ollama_model
-                            )
-                            logger.info("[LLM 호출] langchain_community.llms.Ollama 사용 (fallback)")
-                        else:
-                            raise
-                
-                logger.info(f"[LLM 호출] 프롬프트 길이: {len(prompt)}자, invoke 호출 중...")
-                logger.debug(f"[LLM 호출] 프롬프트 미리보기 (처음 500자): {prompt[:500]}")
-                # 대략적인 입력 토큰 추정 (한국어 기준: 1토큰 ≈ 2-3자)
-                estimated_input_tokens = len(prompt) // 2.5
-                logger.info(f"[토큰 사용량] 입력 추정: 약 {int(estimated_input_tokens)}토큰 (프롬프트 길이: {len(prompt)}자)")
-                
-                response_text = llm.invoke(prompt)
-                
-                # 대략적인 출력 토큰 추정
-                estimated_output_tokens = len(response_text) // 2.5 if response_text else 0
-                estimated_total_tokens = int(estimated_input_tokens) + int(estimated_output_tokens)
-                logger.info(f"[토큰 사용량] 출력 추정: 약 {int(estimated_output_tokens)}토큰, 총 추정: 약 {estimated_total_tokens}토큰 (모델: {settings.ollama_model})")
-            else:
-                # Groq와 Ollama 모두 사용 안 함
-                raise ValueError("LLM이 설정되지 않았습니다. use_groq 또는 use_ollama를 True로 설정하세요.")
+            def on_issue(idx: int, issue_data: Any) -> None:
+                issue_obj = self._build_issue_from_data(idx, issue_data, contract_text)
+                if issue_obj is None:
+                    return
+                issues.append(issue_obj)
+                issue_tasks.append(asyncio.create_task(self._attach_issue_legal_basis(issue_obj)))
+            
+            try:
+                parser = await self._generate_contract_analysis(prompt, on_issue)
+            except Exception:
+                for task in issue_tasks:
+                    task.cancel()
+                raise
+            response_text = parser.text
             
             # JSON 추출 및 파싱 (Groq와 Ollama 모두 공통)
-            logger.info(f"[LLM 호출] 응답 수신 완료, 응답 길이: {len(response_text) if response_text else 0}자")
-            # [DEBUG] Groq raw output 출력
-            logger.info(f"[DEBUG] Groq raw output (처음 500자): {response_text[:500] if response_text else 'None'}")
-            if response_text and len(response_text) > 1000:
-                logger.info(f"[DEBUG] Groq raw output (마지막 500자): ...{response_text[-500:]}")
-            logger.info(f"[LLM 호출] 응답 원문 (처음 1000자): {response_text[:1000] if response_text else 'None'}")
-            if response_text and len(response_text) > 1000:
-                logger.info(f"[LLM 호출] 응답 원문 (마지막 500자): ...{response_text[-500:]}")
+            logger.info(f"[LLM 호출] 응답 수신 완료, 응답 길이: {len(response_text)}자, 스트리밍 중 완성된 이슈: {len(parser.items)}개")
+            logger.debug(f"[LLM 호출] 응답 원문 (처음 1000자): {response_text[:1000]}")
+            if len(response_text) > 1000:
+                logger.debug(f"[LLM 호출] 응답 원문 (마지막 500자): ...{response_text[-500:]}")
             
-            # JSON 추출 (더 robust한 파싱)
             try:
-                # 1. 코드 블록 제거
-                response_clean = response_text.strip()
-                if response_clean.startswith("```json"):
-                    response_clean = response_clean[7:]
-                elif response_clean.startswith("```"):
-                    response_clean = response_clean[3:]
-                if response_clean.endswith("```"):
-                    response_clean = response_clean[:-3]
-                response_clean = response_clean.strip()
+                analysis = parser.result()
+                if analysis is not None:
+                    logger.info(f"[JSON 파싱] ✅ JSON 파싱 성공")
+                else:
+                    # 응답이 잘렸거나(max_tokens 초과) 깨진 경우: 완성된 최상위 필드 + 닫힌 이슈만으로 복구
+                    analysis = parser.recover()
+                    if analysis is not None:
+                        logger.warning(
+                            f"[JSON 파싱] 완전한 JSON이 아니어서 완성된 부분으로 복구: "
+                            f"필드 {list(analysis.keys())}, 이슈 {len(parser.items)}개"
+                        )
+                    else:
+                        # 복구도 실패하면 이슈를 쓰지 않으므로 이미 시작한 이슈별 법령 검색을 취소
+                        for task in issue_tasks:
+                            task.cancel()
+                        issue_tasks = []
                 
-                # 2. JSON 객체 찾기 (더 정확한 정규식)
-                json_match = re.search(r'\{[\s\S]*\}', response_clean, re.DOTALL)
-                if json_match:
-                    json_str = json_match.group()
-                    logger.debug(f"[JSON 파싱] 추출된 JSON 문자열 길이: {len(json_str)}자")
-                    logger.debug(f"[JSON 파싱] JSON 문자열 미리보기 (처음 500자): {json_str[:500]}")
-                    # 3. JSON 유효성 검사 및 파싱
-                    try:
-                        analysis = json.loads(json_str)
-                        logger.info(f"[JSON 파싱] ✅ JSON 파싱 성공")
-                    except json.JSONDecodeError as json_err:
-                        # JSON이 유효하지 않으면 수정 시도
-                        logger.warning(f"[JSON 파싱] ❌ JSON 파싱 실패: {str(json_err)}")
-                        logger.warning(f"[JSON 파싱] 에러 위치: line {json_err.lineno}, col {json_err.colno}")
-                        logger.warning(f"[JSON 파싱] 문제가 있는 부분: {json_str[max(0, json_err.pos-50):json_err.pos+50]}")
-                        
-                        # 더 robust한 JSON 복구 시도
-                        analysis = None
-                        recovery_attempted = False
-                        
-                        # 복구 방법 1: 중괄호와 대괄호를 모두 추적하여 완전한 구조 찾기 (에러 위치 이전까지)
-                        try:
-                            brace_count = 0
-                            bracket_count = 0
-                            in_string = False
-                            escape_next = False
-                            last_valid_pos = -1
-                            
-                            # 에러 위치 이전까지 전체 문자열 확인
-                            error_pos = min(json_err.pos, len(json_str))
-                            
-                            for i, char in enumerate(json_str[:error_pos]):
-                                if escape_next:
-                                    escape_next = False
-                                    continue
-                                
-                                if char == '\\':
-                                    escape_next = True
-                                    continue
-                                
-                                if char == '"' and not escape_next:
-                                    in_string = not in_string
-                                    continue
-                                
-                                if not in_string:
-                                    if char == '{':
-                                        brace_count += 1
-                                    elif char == '}':
-                                        brace_count -= 1
-                                        if brace_count == 0 and bracket_count == 0:
-                                            last_valid_pos = i + 1
-                                    elif char == '[':
-                                        bracket_count += 1
-                                    elif char == ']':
-                                        bracket_count -= 1
-                                        if brace_count == 0 and bracket_count == 0:
-                                            last_valid_pos = i + 1
-                            
-                            if last_valid_pos > 0:
-                                json_str_truncated = json_str[:last_valid_pos]
-                                try:
-                                    analysis = json.loads(json_str_truncated)
-                                    logger.warning(f"[JSON 파싱] ⚠️ 방법1: 중괄호/대괄호 매칭으로 복구 성공 (원본: {len(json_str)}자, 복구: {len(json_str_truncated)}자)")
-                                    recovery_attempted = True
-                                except Exception as parse_err:
-                                    logger.debug(f"[JSON 파싱] 방법1 복구 후 파싱 실패: {str(parse_err)}")
-                                    # 복구된 문자열이 여전히 유효하지 않으면 다음 방법 시도
-                                    pass
-                        except Exception as e:
-                            logger.debug(f"[JSON 파싱] 복구 방법1 실패: {str(e)}")
-                        
-                        # 복구 방법 2: 에러 위치 이전에서 완전한 issues 배열 찾기
-                        if analysis is None:
-                            try:
-                                # issues 배열의 시작 위치 찾기
-                                issues_start = json_str.find('"issues"')
-                                if issues_start != -1 and issues_start < json_err.pos:
-                                    # issues 배열 시작부터 에러 위치까지 추출
-                                    issues_section = json_str[issues_start:json_err.pos]
-                                    
-                                    # 완전한 issue 객체들을 찾기 (중괄호 매칭)
-                                    brace_count = 0
-                                    bracket_count = 0
-                                    in_string = False
-                                    escape_next = False
-                                    last_complete_issue_end = -1
-                                    
-                                    issue_start = issues_section.find('[')
-                                    if issue_start != -1:
-                                        bracket_count = 1
-                                        for i in range(issue_start + 1, len(issues_section)):
-                                            char = issues_section[i]
-                                            
-                                            if escape_next:
-                                                escape_next = False
-                                                continue
-                                            
-                                            if char == '\\':
-                                                escape_next = True
-                                                continue
-                                            
-                                            if char == '"' and not escape_next:
-                                                in_string = not in_string
-                                                continue
-                                            
-                                            if not in_string:
-                                                if char == '{':
-                                                    brace_count += 1
-                                                elif char == '}':
-                                                    brace_count -= 1
-                                                    if brace_count == 0:
-                                                        last_complete_issue_end = i + 1
-                                                elif char == '[':
-                                                    bracket_count += 1
-                                                elif char == ']':
-                                                    bracket_count -= 1
-                                        
-                                        if last_complete_issue_end > 0:
-                                            # issues 배열을 닫고 나머지 필드 추가
-                                            json_str_fixed = json_str[:issues_start + issue_start + last_complete_issue_end]
-                                            # 마지막 불완전한 객체 제거
-                                            json_str_fixed = re.sub(r',\s*\{[^}]*$', '', json_str_fixed)
-                                            json_str_fixed += '\n  ]\n}'
-                                            
-                                            try:
-                                                analysis = json.loads(json_str_fixed)
-                                                logger.warning(f"[JSON 파싱] ⚠️ 방법2: issues 배열 복구로 JSON 파싱 성공")
-                                                recovery_attempted = True
-                                            except:
-                                                pass
-                            except Exception as e:
-                                logger.debug(f"[JSON 파싱] 복구 방법2 실패: {str(e)}")
-                        
-                        # 복구 방법 3: 에러 위치 이전의 완전한 구조만 사용하고 나머지 필드 추가
-                        if analysis is None:
-                            try:
-                                # 에러 위치 이전에서 완전한 필드들만 추출
-                                error_pos = json_err.pos
-                                
-                                # 마지막 완전한 필드 찾기 (쉼표로 구분)
-                                last_comma = json_str.rfind(',', 0, error_pos)
-                                if last_comma > 0:
-                                    # 마지막 쉼표 이전까지가 완전한 구조
-                                    json_str_fixed = json_str[:last_comma]
-                                    
-                                    # issues 배열이 열려있으면 닫기
-                                    if '"issues"' in json_str_fixed:
-                                        issues_start = json_str_fixed.find('"issues"')
-                                        issues_array_start = json_str_fixed.find('[', issues_start)
-                                        if issues_array_start != -1:
-                                            # issues 배열 닫기
-                                            json_str_fixed = json_str_fixed[:issues_array_start]
-                                            # 완전한 issues 항목들 찾기
-                                            issues_match = re.search(r'"issues"\s*:\s*\[([\s\S]*?)\]', json_str[:error_pos])
-                                            if issues_match:
-                                                json_str_fixed += f'\n  "issues": [{issues_match.group(1)}]\n'
-                                            else:
-                                                json_str_fixed += '\n  "issues": []\n'
-                                    
-                                    json_str_fixed += '}'
-                                    
-                                    try:
-                                        analysis = json.loads(json_str_fixed)
-                                        logger.warning(f"[JSON 파싱] ⚠️ 방법3: 마지막 완전한 필드까지 복구 성공")
-                                        recovery_attempted = True
-                                    except:
-                                        pass
-                            except Exception as e:
-                                logger.debug(f"[JSON 파싱] 복구 방법3 실패: {str(e)}")
-                        
-                        # 복구 방법 4: 최소한의 필수 필드만 포함하여 복구
-                        if analysis is None:
-                            try:
-                                # 필수 필드만 추출
-                                risk_score_match = re.search(r'"risk_score"\s*:\s*(\d+)', json_str)
-                                risk_level_match = re.search(r'"risk_level"\s*:\s*"([^"]+)"', json_str)
-                                summary_match = re.search(r'"summary"\s*:\s*"([^"]*)"', json_str, re.DOTALL)
-                                
-                                if risk_score_match and risk_level_match and summary_match:
-                                    json_str_fixed = '{\n'
-                                    json_str_fixed += f'  "risk_score": {risk_score_match.group(1)},\n'
-                                    json_str_fixed += f'  "risk_level": "{risk_level_match.group(1)}",\n'
-                                    # summary는 이스케이프 처리
-                                    summary_text = summary_match.group(1).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
-                                    json_str_fixed += f'  "summary": "{summary_text}",\n'
-                                    json_str_fixed += '  "issues": []\n'
-                                    json_str_fixed += '}'
-                                    
-                                    try:
-                                        analysis = json.loads(json_str_fixed)
-                                        logger.warning(f"[JSON 파싱] ⚠️ 방법4: 필수 필드만 추출하여 복구 성공 (issues는 빈 배열)")
-                                        recovery_attempted = True
-                                    except:
-                                        pass
-                            except Exception as e:
-                                logger.debug(f"[JSON 파싱] 복구 방법4 실패: {str(e)}")
-                        
-                        # 모든 복구 시도 실패
-                        if analysis is None:
-                            logger.error(f"[JSON 파싱] ❌ 모든 JSON 복구 시도 실패")
-                            logger.error(f"[JSON 파싱] LLM 응답 원문 전체 길이: {len(response_text)}자")
-                            logger.error(f"[JSON 파싱] LLM 응답 원문 (처음 2000자): {response_text[:2000] if response_text else 'None'}")
-                            if response_text and len(response_text) > 2000:
-                                logger.error(f"[JSON 파싱] LLM 응답 원문 (마지막 1000자): ...{response_text[-1000:]}")
-                            
-                            # 발견된 JSON 객체 개수 확인 (디버깅용)
-                            json_objects = re.findall(r'\{[^{}]*\}', json_str)
-                            logger.error(f"[JSON 파싱] 발견된 JSON 객체 개수: {len(json_objects)}")
-                            if json_objects:
-                                logger.error(f"[JSON 파싱] 첫 번째 JSON 객체 (처음 500자): {json_objects[0][:500]}")
-                            
-                            raise json_err
+                if analysis is not None:
                     risk_score = analysis.get("risk_score", 50)
                     risk_level = analysis.get("risk_level", "medium")
                     summary = analysis.get("summary", "")
                     
                     logger.info(f"[LLM 응답 파싱] ✅ JSON 파싱 성공: risk_score={risk_score}, risk_level={risk_level}, summary 길이={len(summary)}")
-                    logger.info(f"[LLM 응답 파싱] issues 배열 길이: {len(analysis.get('issues', []))}")
-                    
-                    # [DEBUG] rawIssues 확인
-                    raw_issues = analysis.get("issues", [])
-                    logger.info(f"[DEBUG] rawIssues 개수: {len(raw_issues)}")
-                    if not raw_issues:
+                    if not parser.items:
                         logger.warning(f"[DEBUG] ⚠️ issues 배열이 비어있습니다!")
                         logger.warning(f"[DEBUG] analysis 키 목록: {list(analysis.keys())}")
-                        logger.warning(f"[DEBUG] analysis 전체 내용 (처음 1000자): {str(analysis)[:1000]}")
-                    else:
-                        logger.info(f"[DEBUG] rawIssues[0] 샘플: {raw_issues[0]}")
-                        logger.info(f"[DEBUG] rawIssues[0] 키 목록: {list(raw_issues[0].keys()) if isinstance(raw_issues[0], dict) else 'N/A'}")
-                    
-                    issues = []
-                    for idx, issue_data in enumerate(raw_issues):
-                        logger.debug(f"[DEBUG] issue[{idx}] 파싱 시작: {issue_data}, 타입: {type(issue_data)}")
-                        
-                        # issue_data가 dict가 아니면 건너뛰기
-                        if not isinstance(issue_data, dict):
-                            logger.warning(f"[DEBUG] issue[{idx}]가 dict가 아닙니다 (타입: {type(issue_data)}). 건너뜁니다.")
-                            continue
-                        
-                        # 새로운 스키마: issue_id, clause_id, category, summary, reason 등
-                        # 레거시 스키마: name, description, original_text 등
-                        issue_id = issue_data.get("issue_id") or issue_data.get("name", f"issue-{idx+1}")
-                        clause_id = issue_data.get("clause_id") or issue_data.get("clauseId")
-                        category = issue_data.get("category", "unknown")
-                        summary = issue_data.get("summary") or issue_data.get("description", "")
-                        reason = issue_data.get("reason") or issue_data.get("rationale", "")
-                        
-                        # original_text는 clause_id 기반으로 나중에 채워지므로 여기서는 빈 문자열
-                        # 레거시 호환성을 위해 original_text가 있으면 사용
-                        original_text = issue_data.get("original_text", "")
-                        
-                        # description은 summary 또는 reason으로 대체
-                        description = summary or reason
-                        
-                        # toxic_clause_detail 파싱
-                        toxic_clause_detail = None
-                        toxic_detail_data = issue_data.get("toxic_clause_detail")
-                        if toxic_detail_data and isinstance(toxic_detail_data, dict):
-                            try:
-                                from models.schemas import ToxicClauseDetail
-                                toxic_clause_detail = ToxicClauseDetail(
-                                    clauseLocation=toxic_detail_data.get("clause_location", ""),
-                                    contentSummary=toxic_detail_data.get("content_summary", ""),
-                                    whyRisky=toxic_detail_data.get("why_risky", ""),
-                                    realWorldProblems=toxic_detail_data.get("real_world_problems", ""),
-                                    suggestedRevisionLight=toxic_detail_data.get("suggested_revision_light", ""),
-                                    suggestedRevisionFormal=toxic_detail_data.get("suggested_revision_formal", ""),
-                                )
-                            except Exception as toxic_err:
-                                logger.warning(f"[LLM 응답 파싱] issue[{idx}] toxic_clause_detail 변환 실패: {str(toxic_err)}")
-                        
-                        logger.debug(f"[DEBUG] issue[{idx}] 추출된 필드: issue_id={issue_id}, clause_id={clause_id}, category={category}, summary 길이={len(summary)}")
-                        
-                        # 계약서 텍스트에서 해당 조항 위치 찾기
-                        # 새로운 파이프라인에서는 clause_id 기반으로 original_text를 나중에 채우므로
-                        # 여기서는 start_index/end_index를 None으로 설정
-                        start_index = None
-                        end_index = None
-                        
-                        # 레거시 호환성: original_text가 있고 contract_text가 있으면 위치 찾기 시도
-                        if contract_text and original_text and isinstance(original_text, str):
-                            try:
-                                # original_text를 사용하여 정확한 위치 찾기
-                                start_index = contract_text.find(original_text)
-                                if start_index >= 0:
-                                    end_index = start_index + len(original_text)
-                                else:
-                                    # 정확히 일치하지 않으면 부분 매칭 시도
-                                    if len(original_text) > 100:
-                                        # 1. 처음 100자로 검색
-                                        start_index = contract_text.find(original_text[:100])
-                                        if start_index >= 0:
-                                            end_index = start_index + len(original_text)
-                                    if start_index is None and len(original_text) > 50:
-                                        # 2. 처음 50자로 검색
-                                        start_index = contract_text.find(original_text[:50])
-                                        if start_index >= 0:
-                                            # 문장 단위로 확장
-                                            end_pos = min(start_index + len(original_text), len(contract_text))
-                                            while end_pos < len(contract_text) and contract_text[end_pos] not in ['\n', '。', '.']:
-                                                end_pos += 1
-                                            end_index = end_pos
-                                    if start_index is None:
-                                        logger.debug(f"[LLM 응답 파싱] originalText를 계약서에서 찾을 수 없음 (clause_id 기반으로 나중에 채워짐): {original_text[:50] if isinstance(original_text, str) else original_text}...")
-                            except Exception as find_err:
-                                logger.warning(f"[LLM 응답 파싱] originalText 위치 찾기 실패: {str(find_err)}")
-                                # 에러가 나도 계속 진행 (clause_id 기반으로 나중에 채워짐)
-                        
-                        try:
-                            issue_obj = LegalIssue(
-                                name=issue_id,  # issue_id를 name 필드에 저장 (레거시 호환)
-                                description=description,  # summary 또는 reason을 description에 저장
-                                severity=issue_data.get("severity", "medium"),
-                                legal_basis=issue_data.get("legal_basis", []),
-                                start_index=start_index,
-                                end_index=end_index,
-                                suggested_text=issue_data.get("suggested_revision") or issue_data.get("suggested_text"),
-                                rationale=reason or issue_data.get("rationale"),
-                                suggested_questions=issue_data.get("suggested_questions", []),
-                                original_text=original_text,  # original_text 필드 추가
-                                clause_id=clause_id,  # clause_id 필드 추가 (새 스키마)
-                                category=category,  # category 필드 추가 (새 스키마)
-                                summary=summary,  # summary 필드 추가 (새 스키마)
-                                toxic_clause_detail=toxic_clause_detail,  # toxic_clause_detail 추가
-                            )
-                            issues.append(issue_obj)
-                            logger.debug(f"[LLM 응답 파싱] issue[{len(issues)}]: name={issue_obj.name[:50]}, clause_id={clause_id}, severity={issue_obj.severity}, description 길이={len(description)}")
-                        except Exception as issue_create_err:
-                            logger.error(f"[LLM 응답 파싱] issue[{idx}] LegalIssue 생성 실패: {str(issue_create_err)}", exc_info=True)
-                            # 개별 issue 생성 실패해도 계속 진행
-                            continue
-                    
-                    # [DEBUG] normalizedDataIssues 확인 (이 단계에서는 아직 정규화 전이므로 rawIssues와 동일)
-                    logger.info(f"[DEBUG] normalizedDataIssues (rawIssues와 동일): {len(issues)}개")
-                    logger.info(f"[LLM 응답 파싱] 최종 이슈 개수: {len(issues)}개")
-                    
-                    # 각 이슈별로 legal 검색 수행 (이슈 중심 쿼리 사용)
-                    logger.info(f"[법령 검색] 이슈별 legal 검색 시작: {len(issues)}개 이슈")
-                    for issue in issues:
-                        try:
-                            # 이슈 기반 쿼리 생성
-                            issue_dict = {
-                                "original_text": issue.original_text or "",
-                                "clause_text": issue.original_text or "",
-                                "rationale": issue.rationale or issue.description or "",
-                                "category": issue.category or "",
-                                "summary": issue.summary or issue.description or "",
-                            }
-                            issue_query = self._build_query_from_issue(issue_dict)
-                            
-                            # 이슈별 legal 검색 (category 필터 적용, boilerplate 제외)
-                            issue_legal_chunks = await self._search_legal_chunks(
-                                query=issue_query,
-                                top_k=5,  # 이슈별로 5개만
-                                category=issue.category,  # category 필터 적용
-                                ensure_diversity=False,  # 이슈별 검색이므로 다양성 확보 불필요
-                            )
-                            
-                            # legal_basis를 이슈별 검색 결과로 업데이트
-                            if issue_legal_chunks:
-                                from models.schemas import LegalBasisItemV2
-                                issue_legal_basis = []
-                                for chunk in issue_legal_chunks:
-                                    # file_path가 없으면 external_id로 생성
-                                    file_path = chunk.file_path
-                                    if not file_path and chunk.external_id:
-                                        file_path = self._build_file_path(chunk.source_type, chunk.external_id)
-                                    
-                                    # reason 생성 (선택적, LLM 사용)
-                                    reason = None
-                                    try:
-                                        reason = await self._build_reason(
-                                            issue_summary=issue.summary or issue.description or "",
-                                            clause_text=issue.original_text or "",
-                                            basis_snippet=chunk.snippet,
-                                        )
-                                    except Exception as reason_err:
-                                        logger.debug(f"[법령 검색] reason 생성 실패 (계속 진행): {str(reason_err)}")
-                                    
-                                    issue_legal_basis.append(
-                                        LegalBasisItemV2(
-                                            title=chunk.title,
-                                            snippet=chunk.snippet,
-                                            sourceType=chunk.source_type,
-                                            status="unclear",  # LLM이 판단한 status가 있다면 사용
-                                            filePath=file_path,  # 스토리지 키
-                                            similarityScore=chunk.score,  # 벡터 유사도
-                                            chunkIndex=chunk.chunk_index,  # 청크 인덱스
-                                            externalId=chunk.external_id,  # external_id
-                                            reason=reason,  # LLM으로 생성한 이유 설명
-                                        )
-                                    )
-                                # 기존 legal_basis가 있으면 병합 (이슈별 검색 결과 우선)
-                                if issue.legal_basis:
-                                    # 기존 legal_basis가 문자열 배열이면 그대로 유지
-                                    if isinstance(issue.legal_basis[0], str):
-                                        issue.legal_basis = issue_legal_basis + issue.legal_basis
-                                    else:
-                                        issue.legal_basis = issue_legal_basis + list(issue.legal_basis)
-                                else:
-                                    issue.legal_basis = issue_legal_basis
-                                
-                                logger.debug(f"[법령 검색] 이슈 '{issue.name[:30]}' ({issue.category}): {len(issue_legal_chunks)}개 법령 검색됨")
-                            else:
-                                logger.debug(f"[법령 검색] 이슈 '{issue.name[:30]}' ({issue.category}): 법령 검색 결과 없음 (threshold 미만 또는 필터링됨)")
-                        except Exception as issue_search_err:
-                            logger.warning(f"[법령 검색] 이슈 '{issue.name[:30]}' legal 검색 실패: {str(issue_search_err)}")
-                            # 이슈별 검색 실패해도 계속 진행
-                            continue
+                    logger.info(f"[LLM 응답 파싱] 최종 이슈 개수: {len(issues)}개 (원본 {len(parser.items)}개)")
                     
+                    # 스트리밍 중 시작한 이슈별 legal 검색 마무리
+                    if issue_tasks:
+                        await asyncio.gather(*issue_tasks)
                     logger.info(f"[법령 검색] 이슈별 legal 검색 완료")
                     
                     recommendations = []
@@ -1843,6 +2071,7 @@ class LegalRAGService:
                         risk_summary_table=risk_summary_table,
                         toxic_clauses=toxic_clauses,
                         negotiation_questions=negotiation_questions,
+                        prompt_metrics=prompt_metrics,
                     )
                     
                     # [DEBUG] validIssues 확인 (이 단계에서는 issues와 동일)
@@ -1858,7 +2087,6 @@ class LegalRAGService:
                     
                     return result
                 else:
-                    # json_match가 None인 경우
                     raise ValueError("JSON 객체를 찾을 수 없습니다.")
             except Exception as e:
                 logger.error(f"[ERROR] ❌ LLM 응답 파싱 실패: {str(e)}", exc_info=True)
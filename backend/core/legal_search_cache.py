@@ -0,0 +1,249 @@
+"""
+Legal Search Cache - 법령 검색 결과 캐시
+_search_legal_chunks의 최종 결과(LegalGroundingChunk 리스트)를 (정규화된 쿼리, 필터, top_k, 다양성/재정렬 여부) 단위로 보관합니다.
+"최저임금 미지급", "수습기간 해고" 같은 반복 질문은 임베딩/match_legal_chunks RPC/후처리 없이 바로 반환합니다.
+
+- 무효화: 코퍼스 버전(legal_corpus_version 테이블, 인덱싱 스크립트가 bump_legal_corpus_version RPC로 올림)이 바뀌면 전체 삭제
+  테이블이 없으면 legal_chunks 행 수 + 최신 created_at을 버전으로 사용 (scripts/create_legal_corpus_version.sql)
+- 버전 확인은 version_check_interval마다 백그라운드 스레드에서 수행 (검색 경로에서 DB 조회 없음)
+- semantic 모드(semantic_threshold > 0): 정확히 같은 쿼리가 없어도 쿼리 임베딩 코사인 유사도가 임계값 이상인 캐시 항목을 재사용
+"""
+
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+from collections import OrderedDict
+from dataclasses import dataclass, field
+import logging
+import re
+import threading
+import time
+import unicodedata
+
+import numpy as np
+
+from config import settings
+from models.schemas import LegalGroundingChunk
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_TRAILING_PUNCT = " ?？.。!！~"
+
+
+def normalize_query(query: str) -> str:
+    """캐시 키용 쿼리 정규화 (NFKC, 공백 정리, 소문자, 끝 문장부호 제거)"""
+    normalized = unicodedata.normalize("NFKC", query or "")
+    normalized = _WHITESPACE_RE.sub(" ", normalized).strip().lower()
+    return normalized.rstrip(_TRAILING_PUNCT)
+
+
+@dataclass
+class _CacheEntry:
+    """캐시 항목"""
+    params: Hashable
+    chunks: List[LegalGroundingChunk]
+    version: Optional[str]
+    embedding: Optional[np.ndarray] = None  # 정규화된 쿼리 임베딩 (semantic 모드)
+    created_at: float = field(default_factory=time.monotonic)
+
+
+class LegalSearchCache:
+    """
+    법령 검색 결과 LRU 캐시
+
+    사용 예:
+        cache = get_legal_search_cache()
+        params = (category, top_k, ensure_diversity, rerank)
+        chunks = cache.get(query, params)
+        if chunks is None:
+            version = cache.version  # 검색 시작 시점의 코퍼스 버전
+            chunks = ...  # 검색
+            cache.put(query, params, chunks, version, embedding=query_embedding)
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1000,
+        ttl_seconds: float = 3600.0,
+        version_check_interval: float = 30.0,
+        semantic_threshold: float = 0.0,
+    ):
+        """
+        Args:
+            max_size: 최대 캐시 항목 수
+            ttl_seconds: 항목 유지 시간 (초, 코퍼스 버전을 확인할 수 없을 때의 안전장치)
+            version_check_interval: 코퍼스 버전 확인 주기 (초)
+            semantic_threshold: semantic 재사용 코사인 임계값 (0이면 끔, 예: 0.97)
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.version_check_interval = version_check_interval
+        self.semantic_threshold = semantic_threshold
+        self._entries: "OrderedDict[Tuple[str, Hashable], _CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._version: Optional[str] = None
+        self._last_check = 0.0
+        self._checking = False
+        self._vector_store = None
+        self._stats = {"hits": 0, "semantic_hits": 0, "misses": 0, "invalidations": 0}
+
+    @property
+    def version(self) -> Optional[str]:
+        return self._version
+
+    @property
+    def semantic_enabled(self) -> bool:
+        return self.semantic_threshold > 0
+
+    # ------------------------------------------------------------------
+    # 코퍼스 버전
+    # ------------------------------------------------------------------
+
+    def _fetch_version(self) -> None:
+        try:
+            if self._vector_store is None:
+                from core.supabase_vector_store import SupabaseVectorStore
+                self._vector_store = SupabaseVectorStore()
+            self.set_version(self._vector_store.get_legal_corpus_version())
+        except Exception as e:
+            logger.warning(f"[LegalSearchCache] 코퍼스 버전 확인 실패: {str(e)}")
+        finally:
+            self._checking = False
+
+    def ensure_fresh(self) -> None:
+        """version_check_interval이 지났으면 백그라운드에서 코퍼스 버전 확인"""
+        now = time.monotonic()
+        with self._lock:
+            if self._checking or now - self._last_check < self.version_check_interval:
+                return
+            self._checking = True
+            self._last_check = now
+        threading.Thread(target=self._fetch_version, name="legal-search-cache-version", daemon=True).start()
+
+    def set_version(self, version: Optional[str]) -> None:
+        """코퍼스 버전 갱신 (바뀌었으면 캐시 전체 삭제)"""
+        if version is None or version == self._version:
+            return
+        with self._lock:
+            previous = self._version
+            self._version = version
+            if previous is not None:
+                self._entries.clear()
+                self._stats["invalidations"] += 1
+        if previous is not None:
+            logger.info(f"[LegalSearchCache] 코퍼스 버전 변경 ({previous} → {version}), 검색 캐시 삭제")
+
+    def invalidate(self) -> None:
+        """캐시 전체 삭제 + 다음 검색 시 코퍼스 버전 재확인"""
+        with self._lock:
+            self._entries.clear()
+            self._last_check = 0.0
+            self._stats["invalidations"] += 1
+
+    # ------------------------------------------------------------------
+    # 조회 / 저장
+    # ------------------------------------------------------------------
+
+    def _valid(self, entry: _CacheEntry, now: float) -> bool:
+        return entry.version == self._version and now - entry.created_at <= self.ttl_seconds
+
+    def get(self, query: str, params: Hashable) -> Optional[List[LegalGroundingChunk]]:
+        """정규화된 쿼리 + params가 같은 캐시 결과 (없으면 None)"""
+        self.ensure_fresh()
+        key = (normalize_query(query), params)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and not self._valid(entry, now):
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                if not self.semantic_enabled:
+                    self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return [chunk.model_copy() for chunk in entry.chunks]
+
+    def get_similar(self, embedding: Sequence[float], params: Hashable) -> Optional[List[LegalGroundingChunk]]:
+        """semantic 모드: params가 같고 쿼리 임베딩 코사인 유사도가 semantic_threshold 이상인 가장 가까운 캐시 결과"""
+        if not self.semantic_enabled:
+            return None
+        query = _normalize_vector(embedding)
+        now = time.monotonic()
+        with self._lock:
+            keys = [
+                key for key, entry in self._entries.items()
+                if entry.params == params and entry.embedding is not None and self._valid(entry, now)
+            ]
+            if keys:
+                matrix = np.stack([self._entries[key].embedding for key in keys])
+                similarities = matrix @ query
+                best = int(np.argmax(similarities))
+                if similarities[best] >= self.semantic_threshold:
+                    self._entries.move_to_end(keys[best])
+                    self._stats["semantic_hits"] += 1
+                    logger.debug(
+                        f"[LegalSearchCache] semantic 재사용: '{keys[best][0]}' (cos={similarities[best]:.4f})"
+                    )
+                    return [chunk.model_copy() for chunk in self._entries[keys[best]].chunks]
+            self._stats["misses"] += 1
+        return None
+
+    def put(
+        self,
+        query: str,
+        params: Hashable,
+        chunks: List[LegalGroundingChunk],
+        version: Optional[str],
+        embedding: Optional[Sequence[float]] = None,
+    ) -> None:
+        """
+        검색 결과 저장 (semantic 모드면 쿼리 임베딩도 함께 저장)
+
+        version은 검색을 시작할 때의 cache.version - 검색 도중 코퍼스 버전이 바뀌었으면 이전 코퍼스의 결과이므로 저장하지 않음
+        """
+        key = (normalize_query(query), params)
+        entry = _CacheEntry(
+            params=params,
+            chunks=[chunk.model_copy() for chunk in chunks],
+            version=version,
+            embedding=_normalize_vector(embedding) if self.semantic_enabled and embedding is not None else None,
+        )
+        with self._lock:
+            if version != self._version:
+                return
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 통계 (hits, semantic_hits, misses, invalidations, size, version)"""
+        with self._lock:
+            return {**self._stats, "size": len(self._entries), "version": self._version}
+
+
+def _normalize_vector(vector: Sequence[float]) -> np.ndarray:
+    array = np.asarray(vector, dtype=np.float32)
+    return array / max(float(np.linalg.norm(array)), 1e-12)
+
+
+_legal_search_cache: Optional[LegalSearchCache] = None
+
+
+def get_legal_search_cache() -> LegalSearchCache:
+    """
+    LegalSearchCache 인스턴스 가져오기 (싱글톤)
+
+    Returns:
+        LegalSearchCache 인스턴스
+    """
+    global _legal_search_cache
+    if _legal_search_cache is None:
+        _legal_search_cache = LegalSearchCache(
+            max_size=settings.legal_search_cache_size,
+            ttl_seconds=settings.legal_search_cache_ttl,
+            version_check_interval=settings.legal_search_cache_version_interval,
+            semantic_threshold=settings.legal_search_cache_semantic_threshold,
+        )
+    return _legal_search_cache
@@ -0,0 +1,468 @@
+"""
+Legal Vector Index - legal_chunks 인프로세스 벡터 인덱스 (선택사항)
+match_legal_chunks RPC와 같은 필터/threshold 의미로 로컬에서 검색
+- 소규모 코퍼스: 정규화된 float32 행렬 exact 검색 (numpy)
+- 중규모 코퍼스: 2단계 검색 (PCA/binary 축소 벡터로 후보 추림 → float32 재계산, core.vector_reduction)
+- 대규모 코퍼스: hnswlib HNSW 인덱스 (설치된 경우)
+- 스냅샷을 디스크에 저장해 재시작 시 네트워크 로딩 생략, 코퍼스 버전이 바뀌면 백그라운드 재로딩
+"""
+
+from typing import List, Dict, Any, Optional, Tuple
+from dataclasses import dataclass, field
+from pathlib import Path
+import json
+import threading
+import time
+import logging
+
+import numpy as np
+
+from config import settings
+from core.vector_reduction import REDUCTION_KINDS, VectorReducer, two_stage_top_k
+from core.vector_codec import (
+    compact_rpc_enabled,
+    decode_vector,
+    disable_compact_rpc,
+    is_missing_rpc_error,
+    parse_vector,
+)
+
+logger = logging.getLogger(__name__)
+
+try:
+    import hnswlib
+    HNSWLIB_AVAILABLE = True
+except ImportError:
+    HNSWLIB_AVAILABLE = False
+
+# 검색 결과로 반환하는 컬럼 (match_legal_chunks RPC 반환 컬럼과 동일)
+ROW_COLUMNS = ["id", "external_id", "source_type", "title", "content", "chunk_index", "file_path", "metadata"]
+
+# 스냅샷 로딩 시 한 번에 가져올 행 수 (PostgREST 기본 max-rows)
+SNAPSHOT_PAGE_SIZE = 1000
+
+
+@dataclass
+class _IndexSnapshot:
+    """불변 인덱스 스냅샷 (교체는 참조 할당으로 원자적으로 수행)"""
+    version: str
+    rows: List[Dict[str, Any]]
+    matrix: np.ndarray  # (N, D) float32, 행 단위 L2 정규화
+    source_types: np.ndarray  # (N,) object
+    topics: np.ndarray  # (N,) object - metadata.topic_main
+    categories: np.ndarray  # (N,) object - metadata.category
+    hnsw: Any = None
+    reducer: Optional[VectorReducer] = None  # 2단계 검색 1차 축소 방식 (None이면 사용 안 함)
+    reduced: Optional[np.ndarray] = None  # reducer.transform(matrix)
+    _mask_cache: Dict[Tuple[Optional[str], Optional[str]], Optional[np.ndarray]] = field(default_factory=dict)
+
+    @property
+    def size(self) -> int:
+        return len(self.rows)
+
+    def filter_mask(self, category: Optional[str], source_type: Optional[str]) -> Optional[np.ndarray]:
+        """topic_main/category, source_type 필터 마스크 (필터 없으면 None)"""
+        key = (category, source_type)
+        if key in self._mask_cache:
+            return self._mask_cache[key]
+
+        mask = None
+        if category:
+            mask = (self.topics == category) | (self.categories == category)
+        if source_type:
+            st_mask = self.source_types == source_type
+            mask = st_mask if mask is None else (mask & st_mask)
+        self._mask_cache[key] = mask
+        return mask
+
+
+class LegalChunkIndex:
+    """
+    legal_chunks 로컬 벡터 인덱스
+
+    - 로딩 전/실패 시 search()는 None을 반환하고, 호출부는 match_legal_chunks RPC로 fallback
+    - 코퍼스 버전(행 수 + 최신 created_at)은 refresh_interval마다 백그라운드에서 확인
+    - 재인덱싱(bulk_upsert_legal_chunks) 시 mark_stale()로 즉시 재로딩 예약
+    """
+
+    def __init__(
+        self,
+        backend: str = "auto",
+        hnsw_min_size: int = 20000,
+        refresh_interval: float = 300.0,
+        snapshot_dir: Optional[str] = None,
+        first_stage: str = "none",
+        reduced_dims: int = 128,
+        two_stage_min_size: int = 5000,
+        two_stage_candidates: int = 300,
+    ):
+        """
+        Args:
+            backend: "exact" | "hnsw" | "auto" (auto: hnsw_min_size 이상이고 hnswlib가 있으면 HNSW)
+            hnsw_min_size: auto 모드에서 HNSW를 사용할 최소 청크 수
+            refresh_interval: 코퍼스 버전 확인 주기 (초)
+            snapshot_dir: 스냅샷 저장 디렉토리 (None이면 디스크 스냅샷 사용 안 함)
+            first_stage: HNSW를 쓰지 않을 때 2단계 검색 1차 축소 방식 "none" | "pca" | "binary"
+            reduced_dims: pca 차원 수
+            two_stage_min_size: 2단계 검색을 사용할 최소 청크 수 (작은 코퍼스는 exact가 더 빠름)
+            two_stage_candidates: 1차에서 float32 재계산으로 넘길 후보 수
+        """
+        self.backend = backend
+        self.hnsw_min_size = hnsw_min_size
+        self.first_stage = first_stage if first_stage in REDUCTION_KINDS else "none"
+        self.reduced_dims = reduced_dims
+        self.two_stage_min_size = two_stage_min_size
+        self.two_stage_candidates = two_stage_candidates
+        self.refresh_interval = refresh_interval
+        self.snapshot_dir = Path(snapshot_dir) if snapshot_dir else None
+        self._snapshot: Optional[_IndexSnapshot] = None
+        self._vector_store = None
+        self._lock = threading.Lock()
+        self._loading = False
+        self._stale = True
+        self._last_check = 0.0
+
+    @property
+    def ready(self) -> bool:
+        return self._snapshot is not None
+
+    @property
+    def version(self) -> Optional[str]:
+        return self._snapshot.version if self._snapshot else None
+
+    def _get_client(self):
+        if self._vector_store is None:
+            from core.supabase_vector_store import SupabaseVectorStore
+            self._vector_store = SupabaseVectorStore()
+        self._vector_store._ensure_initialized()
+        return self._vector_store.sb
+
+    # ------------------------------------------------------------------
+    # 로딩 / 갱신
+    # ------------------------------------------------------------------
+
+    def fetch_remote_version(self) -> str:
+        """코퍼스 버전 조회 (행 수 + 최신 created_at)"""
+        sb = self._get_client()
+        count_resp = sb.table("legal_chunks").select("id", count="exact").limit(1).execute()
+        latest_resp = sb.table("legal_chunks")\
+            .select("created_at")\
+            .order("created_at", desc=True)\
+            .limit(1)\
+            .execute()
+        latest = latest_resp.data[0].get("created_at") if latest_resp.data else ""
+        return f"{count_resp.count or 0}:{latest}"
+
+    def mark_stale(self) -> None:
+        """다음 검색 시 코퍼스 버전 확인/재로딩 예약"""
+        self._stale = True
+
+    def ensure_fresh(self, block: bool = False) -> None:
+        """
+        refresh_interval이 지났거나 stale이면 버전 확인 후 재로딩
+
+        Args:
+            block: True면 현재 스레드에서 로딩 (서버 시작 warm-up용)
+        """
+        now = time.monotonic()
+        if not self._stale and now - self._last_check < self.refresh_interval:
+            return
+
+        with self._lock:
+            if self._loading:
+                return
+            self._loading = True
+            self._last_check = now
+            self._stale = False
+
+        if block:
+            self._refresh()
+        else:
+            threading.Thread(target=self._refresh, name="legal-index-refresh", daemon=True).start()
+
+    def _refresh(self) -> None:
+        try:
+            version = self.fetch_remote_version()
+            if self._snapshot is not None and self._snapshot.version == version:
+                return
+
+            snapshot = self._load_snapshot_file(version)
+            if snapshot is None:
+                started = time.perf_counter()
+                rows, embeddings = self._fetch_rows()
+                snapshot = self._build_snapshot(version, rows, embeddings)
+                logger.info(
+                    f"[LegalIndex] legal_chunks 스냅샷 로딩 완료: {snapshot.size}개, "
+                    f"{time.perf_counter() - started:.2f}초 (version={version})"
+                )
+                self._save_snapshot_file(snapshot)
+
+            self._snapshot = snapshot
+        except Exception as e:
+            logger.warning(f"[LegalIndex] 인덱스 갱신 실패 (RPC 검색 유지): {str(e)}")
+        finally:
+            self._loading = False
+
+    def _fetch_rows(self) -> Tuple[List[Dict[str, Any]], np.ndarray]:
+        """legal_chunks 전체(boilerplate 제외)를 페이지 단위로 조회 (compact RPC가 있으면 임베딩을 base64로 받음)"""
+        if compact_rpc_enabled("legal_chunk_embeddings_b64"):
+            try:
+                return self._fetch_rows_compact()
+            except Exception as e:
+                if not is_missing_rpc_error(e, "legal_chunk_embeddings_b64"):
+                    raise
+                disable_compact_rpc("legal_chunk_embeddings_b64", e)
+
+        sb = self._get_client()
+        columns = ", ".join(ROW_COLUMNS + ["embedding", "is_boilerplate"])
+        rows: List[Dict[str, Any]] = []
+        vectors: List[np.ndarray] = []
+        start = 0
+        while True:
+            resp = sb.table("legal_chunks")\
+                .select(columns)\
+                .order("id")\
+                .range(start, start + SNAPSHOT_PAGE_SIZE - 1)\
+                .execute()
+            page = resp.data or []
+            for r in page:
+                if r.get("is_boilerplate"):
+                    continue
+                # PostgREST는 vector 컬럼을 "[0.1,0.2,...]" 문자열로 반환
+                vector = parse_vector(r.get("embedding"))
+                if vector is None:
+                    continue
+                vectors.append(vector)
+                rows.append({k: r.get(k) for k in ROW_COLUMNS})
+            if len(page) < SNAPSHOT_PAGE_SIZE:
+                break
+            start += SNAPSHOT_PAGE_SIZE
+
+        matrix = np.vstack(vectors) if vectors else np.zeros((0, 0), dtype=np.float32)
+        return rows, matrix
+
+    def _fetch_rows_compact(self) -> Tuple[List[Dict[str, Any]], np.ndarray]:
+        """legal_chunk_embeddings_b64 RPC로 id keyset 페이지 조회 (임베딩은 float32 base64)"""
+        sb = self._get_client()
+        rows: List[Dict[str, Any]] = []
+        vectors: List[np.ndarray] = []
+        after_id = None
+        while True:
+            resp = sb.rpc(
+                "legal_chunk_embeddings_b64",
+                {"after_id": after_id, "page_size": SNAPSHOT_PAGE_SIZE},
+            ).execute()
+            page = resp.data or []
+            for r in page:
+                if r.get("is_boilerplate") or not r.get("embedding_b64"):
+                    continue
+                vectors.append(decode_vector(r["embedding_b64"]))
+                rows.append({k: r.get(k) for k in ROW_COLUMNS})
+            if len(page) < SNAPSHOT_PAGE_SIZE:
+                break
+            after_id = page[-1]["id"]
+
+        matrix = np.vstack(vectors) if vectors else np.zeros((0, 0), dtype=np.float32)
+        return rows, matrix
+
+    def _build_snapshot(
+        self,
+        version: str,
+        rows: List[Dict[str, Any]],
+        embeddings: np.ndarray,
+        reducer: Optional[VectorReducer] = None,
+    ) -> _IndexSnapshot:
+        matrix = np.ascontiguousarray(embeddings, dtype=np.float32)
+        if matrix.size:
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            matrix = matrix / norms
+
+        metas = [r.get("metadata") or {} for r in rows]
+        snapshot = _IndexSnapshot(
+            version=version,
+            rows=rows,
+            matrix=matrix,
+            source_types=np.array([r.get("source_type") or "law" for r in rows], dtype=object),
+            topics=np.array([m.get("topic_main") for m in metas], dtype=object),
+            categories=np.array([m.get("category") for m in metas], dtype=object),
+        )
+
+        use_hnsw = self.backend == "hnsw" or (self.backend == "auto" and snapshot.size >= self.hnsw_min_size)
+        if use_hnsw and snapshot.size:
+            if HNSWLIB_AVAILABLE:
+                index = hnswlib.Index(space="cosine", dim=matrix.shape[1])
+                index.init_index(max_elements=snapshot.size, ef_construction=200, M=16)
+                index.add_items(matrix, np.arange(snapshot.size))
+                index.set_ef(128)
+                snapshot.hnsw = index
+            else:
+                logger.warning("[LegalIndex] hnswlib가 설치되지 않아 exact 검색을 사용합니다. pip install hnswlib")
+
+        if snapshot.hnsw is None and self.first_stage != "none" and snapshot.size >= self.two_stage_min_size:
+            if reducer is None or reducer.kind != self.first_stage or (
+                reducer.kind == "pca" and reducer.dims != self.reduced_dims
+            ):
+                started = time.perf_counter()
+                reducer = VectorReducer.fit(self.first_stage, matrix, dims=self.reduced_dims)
+                logger.info(f"[LegalIndex] 2단계 검색 축소 벡터 학습: {self.first_stage}, {time.perf_counter() - started:.2f}초")
+            snapshot.reducer = reducer
+            snapshot.reduced = reducer.transform(matrix)
+        return snapshot
+
+    def _snapshot_paths(self) -> Tuple[Path, Path]:
+        return self.snapshot_dir / "legal_chunks.npy", self.snapshot_dir / "legal_chunks.json"
+
+    def _reducer_path(self) -> Path:
+        return self.snapshot_dir / "legal_chunks.reducer.npz"
+
+    def _load_snapshot_file(self, version: str) -> Optional[_IndexSnapshot]:
+        """디스크 스냅샷이 같은 버전이면 로딩"""
+        if not self.snapshot_dir:
+            return None
+        npy_path, json_path = self._snapshot_paths()
+        if not npy_path.exists() or not json_path.exists():
+            return None
+        try:
+            with open(json_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != version:
+                return None
+            embeddings = np.load(npy_path)
+            reducer = None
+            if self.first_stage != "none" and self._reducer_path().exists():
+                with np.load(self._reducer_path()) as arrays:
+                    reducer = VectorReducer.from_arrays(arrays)
+            return self._build_snapshot(version, data["rows"], embeddings, reducer=reducer)
+        except Exception as e:
+            logger.warning(f"[LegalIndex] 디스크 스냅샷 로딩 실패: {str(e)}")
+            return None
+
+    def _save_snapshot_file(self, snapshot: _IndexSnapshot) -> None:
+        if not self.snapshot_dir:
+            return
+        try:
+            self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+            npy_path, json_path = self._snapshot_paths()
+            np.save(npy_path, snapshot.matrix)
+            with open(json_path, "w", encoding="utf-8") as f:
+                json.dump({"version": snapshot.version, "rows": snapshot.rows}, f, ensure_ascii=False)
+            if snapshot.reducer is not None:
+                np.savez(self._reducer_path(), **snapshot.reducer.to_arrays())
+        except Exception as e:
+            logger.warning(f"[LegalIndex] 디스크 스냅샷 저장 실패: {str(e)}")
+
+    # ------------------------------------------------------------------
+    # 검색
+    # ------------------------------------------------------------------
+
+    def search(
+        self,
+        query_embedding: List[float],
+        top_k: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+        match_threshold: float = 0.3,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        match_legal_chunks RPC와 같은 의미의 로컬 검색
+
+        - score = 1 - cosine distance, score >= match_threshold만 반환
+        - filters["topic_main"]: metadata.topic_main 또는 metadata.category 일치
+        - filters["source_type"]: source_type 일치
+
+        Returns:
+            score 내림차순 결과 (RPC 반환 형식과 동일), 인덱스가 준비되지 않았으면 None
+        """
+        self.ensure_fresh()
+        snapshot = self._snapshot
+        if snapshot is None:
+            return None
+        if snapshot.size == 0 or top_k <= 0:
+            return []
+
+        filters = filters or {}
+        mask = snapshot.filter_mask(filters.get("topic_main"), filters.get("source_type"))
+
+        query = np.asarray(query_embedding, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm == 0 or query.shape[0] != snapshot.matrix.shape[1]:
+            return []
+        query = query / norm
+
+        if snapshot.hnsw is not None:
+            idx, scores = self._search_hnsw(snapshot, query, top_k, mask)
+        elif snapshot.reducer is not None:
+            idx, scores = two_stage_top_k(
+                snapshot.matrix, snapshot.reducer, snapshot.reduced, query,
+                top_k=top_k, candidates=self.two_stage_candidates, mask=mask,
+            )
+        else:
+            idx, scores = self._search_exact(snapshot, query, top_k, mask)
+
+        results = []
+        for i, score in zip(idx, scores):
+            if score < match_threshold:
+                continue
+            row = dict(snapshot.rows[i])
+            row["score"] = float(score)
+            results.append(row)
+        return results
+
+    @staticmethod
+    def _search_exact(
+        snapshot: _IndexSnapshot,
+        query: np.ndarray,
+        top_k: int,
+        mask: Optional[np.ndarray],
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        scores = snapshot.matrix @ query
+        candidates = np.flatnonzero(mask) if mask is not None else np.arange(snapshot.size)
+        if candidates.size == 0:
+            return candidates, scores[:0]
+        cand_scores = scores[candidates]
+        k = min(top_k, candidates.size)
+        top = np.argpartition(-cand_scores, k - 1)[:k]
+        top = top[np.argsort(-cand_scores[top])]
+        return candidates[top], cand_scores[top]
+
+    @staticmethod
+    def _search_hnsw(
+        snapshot: _IndexSnapshot,
+        query: np.ndarray,
+        top_k: int,
+        mask: Optional[np.ndarray],
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        k = min(top_k, snapshot.size)
+        if mask is not None:
+            k = min(k, int(mask.sum()))
+            if k == 0:
+                return np.array([], dtype=np.int64), np.array([], dtype=np.float32)
+            labels, distances = snapshot.hnsw.knn_query(query, k=k, filter=lambda label: bool(mask[label]))
+        else:
+            labels, distances = snapshot.hnsw.knn_query(query, k=k)
+        return labels[0], 1.0 - distances[0]
+
+
+_legal_chunk_index: Optional[LegalChunkIndex] = None
+
+
+def get_legal_chunk_index() -> LegalChunkIndex:
+    """
+    LegalChunkIndex 인스턴스 가져오기 (싱글톤)
+
+    Returns:
+        LegalChunkIndex 인스턴스
+    """
+    global _legal_chunk_index
+    if _legal_chunk_index is None:
+        _legal_chunk_index = LegalChunkIndex(
+            backend=settings.legal_index_backend,
+            hnsw_min_size=settings.legal_index_hnsw_min_size,
+            refresh_interval=settings.legal_index_refresh_interval,
+            snapshot_dir=settings.legal_index_snapshot_dir or None,
+            first_stage=settings.legal_index_first_stage,
+            reduced_dims=settings.legal_index_reduced_dims,
+            two_stage_min_size=settings.legal_index_two_stage_min_size,
+            two_stage_candidates=settings.legal_two_stage_candidates,
+        )
+    return _legal_chunk_index
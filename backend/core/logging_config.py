@@ -1,12 +1,175 @@
 """
 로깅 설정 통합 모듈
+- QueueHandler → 백그라운드 QueueListener (파일/콘솔 I/O와 메시지 포맷팅을 요청 스레드에서 분리)
+- contextvars 기반 request_id로 한 요청의 워크플로우 단계 로그를 연결
+- text/JSON 포맷, 모듈별 레벨/샘플링, 지연 포맷팅 미리보기(preview)
 """
 
+import atexit
+import contextvars
+import json
 import logging
 import os
-from logging.handlers import RotatingFileHandler
+import queue
+import random
+import uuid
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 from datetime import datetime
 from pathlib import Path
+from typing import Dict, Optional
+
+
+# ============================================================================
+# 요청 컨텍스트 (request_id)
+# ============================================================================
+
+# asyncio 태스크/asyncio.to_thread는 컨텍스트를 복사하므로 워크플로우 노드까지 전달됨
+_request_id_var: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("request_id", default=None)
+
+
+def new_request_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+def get_request_id() -> Optional[str]:
+    """현재 컨텍스트의 request_id (요청 밖이면 None)"""
+    return _request_id_var.get()
+
+
+def set_request_id(request_id: Optional[str] = None) -> contextvars.Token:
+    """
+    현재 컨텍스트에 request_id 설정
+
+    Returns:
+        reset_request_id에 넘길 토큰
+    """
+    return _request_id_var.set(request_id or new_request_id())
+
+
+def reset_request_id(token: contextvars.Token) -> None:
+    _request_id_var.reset(token)
+
+
+class RequestContextFilter(logging.Filter):
+    """레코드에 request_id 주입 (로그를 남기는 스레드/태스크에서 실행되어야 함)"""
+    def filter(self, record):
+        if not hasattr(record, "request_id"):
+            record.request_id = _request_id_var.get() or "-"
+        return True
+
+
+# ============================================================================
+# 지연 포맷팅 미리보기
+# ============================================================================
+
+class LazyPreview:
+    """로그 인자용 텍스트 미리보기 (핸들러가 실제로 포맷할 때만 자르고 줄바꿈 정리)"""
+    __slots__ = ("text", "limit")
+
+    def __init__(self, text, limit: int = 100):
+        self.text = text
+        self.limit = limit
+
+    def __str__(self):
+        if not self.text:
+            return "(없음)"
+        text = str(self.text).replace("\n", " ")
+        return text if len(text) <= self.limit else text[:self.limit] + "..."
+
+    __repr__ = __str__
+
+
+def preview(text, limit: int = 100) -> LazyPreview:
+    """
+    지연 포맷팅 미리보기
+
+    Example:
+        >>> logger.debug("내용: %s", preview(chunk.snippet, 100))
+    """
+    return LazyPreview(text, limit)
+
+
+# ============================================================================
+# 샘플링 / 포맷터 / 큐 핸들러
+# ============================================================================
+
+class SamplingFilter(logging.Filter):
+    """
+    모듈별 INFO 이하 로그 샘플링 (WARNING 이상은 항상 기록)
+
+    rates: {"core.situation_workflow": 0.1} → 해당 로거(와 하위 로거) INFO/DEBUG 10%만 기록
+    가장 긴 prefix가 우선합니다.
+    """
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = sorted(rates.items(), key=lambda item: len(item[0]), reverse=True)
+        self._cache: Dict[str, float] = {}
+
+    def _rate(self, name: str) -> float:
+        rate = self._cache.get(name)
+        if rate is None:
+            rate = 1.0
+            for prefix, value in self.rates:
+                if name == prefix or name.startswith(prefix + "."):
+                    rate = value
+                    break
+            self._cache[name] = rate
+        return rate
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING or not self.rates:
+            return True
+        rate = self._rate(record.name)
+        return rate >= 1.0 or random.random() < rate
+
+
+# LogRecord 기본 속성 (JSON의 extra 필드에서 제외)
+_RESERVED_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "request_id"}
+
+
+class JsonFormatter(logging.Formatter):
+    """한 줄 JSON 로그 (logger.info(..., extra={...})의 extra 필드 포함)"""
+    def format(self, record):
+        payload = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "request_id": getattr(record, "request_id", "-"),
+            "msg": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_info:
+            payload["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            payload["exc"] = record.exc_text
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    포맷팅 없이 레코드만 큐에 넣는 QueueHandler
+
+    기본 QueueHandler.prepare()는 호출 스레드에서 메시지를 포맷하므로,
+    여기서는 레코드 복사만 하고 msg % args 포맷팅은 리스너 스레드의 핸들러가 수행합니다.
+    (프로세스 내부 큐이므로 args를 직렬화할 필요가 없음)
+    """
+    def prepare(self, record):
+        return record
+
+
+_queue_listener: Optional[QueueListener] = None
+
+
+def _stop_queue_listener():
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+
+atexit.register(_stop_queue_listener)
 
 
 class AccessLogFilter(logging.Filter):
@@ -32,6 +195,10 @@ def setup_logging(
     backup_count: int = 5,
     enable_file_logging: bool = True,
     enable_console_logging: bool = True,
+    json_format: bool = False,
+    use_queue: bool = True,
+    module_levels: Optional[Dict[str, str]] = None,
+    sample_rates: Optional[Dict[str, float]] = None,
 ) -> dict:
     """
     로깅 설정 초기화
@@ -43,10 +210,17 @@ def setup_logging(
         backup_count: 백업 파일 개수
         enable_file_logging: 파일 로깅 활성화 여부
         enable_console_logging: 콘솔 로깅 활성화 여부
+        json_format: True면 한 줄 JSON, False면 텍스트 (둘 다 request_id 포함)
+        use_queue: True면 핸들러 I/O를 백그라운드 QueueListener 스레드에서 수행
+        module_levels: 모듈별 로그 레벨 (예: {"core.situation_workflow": "WARNING"})
+        sample_rates: 모듈별 INFO 이하 샘플링 비율 (예: {"core.generator_v2": 0.1})
     
     Returns:
         uvicorn log_config 딕셔너리
     """
+    global _queue_listener
+    _stop_queue_listener()
+    
     # 로그 디렉토리 생성
     os.makedirs(log_dir, exist_ok=True)
     
@@ -62,10 +236,16 @@ def setup_logging(
         root_logger.removeHandler(handler)
     
     # 포매터 설정
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
+    if json_format:
+        formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter(
+            '%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s',
+            datefmt='%Y-%m-%d %H:%M:%S'
+        )
+    
+    # 실제 출력 핸들러 (use_queue면 리스너 스레드에서 실행)
+    output_handlers = []
     
     # 콘솔 핸들러
     if enable_console_logging:
@@ -80,7 +260,7 @@ def setup_logging(
         console_handler = logging.StreamHandler()
         console_handler.setLevel(log_level)
         console_handler.setFormatter(formatter)
-        root_logger.addHandler(console_handler)
+        output_handlers.append(console_handler)
     
     # 파일 핸들러 (로테이션)
     if enable_file_logging:
@@ -92,7 +272,28 @@ def setup_logging(
         )
         file_handler.setLevel(log_level)
         file_handler.setFormatter(formatter)
-        root_logger.addHandler(file_handler)
+        output_handlers.append(file_handler)
+    
+    # request_id 주입과 샘플링은 로그를 남기는 쪽(요청 컨텍스트)에서 수행
+    context_filter = RequestContextFilter()
+    sampling_filter = SamplingFilter(sample_rates or {})
+    if use_queue:
+        log_queue = queue.SimpleQueue()
+        queue_handler = DeferredQueueHandler(log_queue)
+        queue_handler.addFilter(context_filter)
+        queue_handler.addFilter(sampling_filter)
+        root_logger.addHandler(queue_handler)
+        _queue_listener = QueueListener(log_queue, *output_handlers, respect_handler_level=True)
+        _queue_listener.start()
+    else:
+        for handler in output_handlers:
+            handler.addFilter(context_filter)
+            handler.addFilter(sampling_filter)
+            root_logger.addHandler(handler)
+    
+    # 모듈별 레벨
+    for name, level in (module_levels or {}).items():
+        logging.getLogger(name).setLevel(level.upper() if isinstance(level, str) else level)
     
     # uvicorn 로거 설정 (propagate=False로 중복 로그 방지)
     uvicorn_logger = logging.getLogger("uvicorn")
@@ -4,6 +4,7 @@ Orchestrator v2 - 실전형 파이프라인
 """
 
 from typing import Dict, Any, Optional, List
+import threading
 from .document_processor_v2 import DocumentProcessor
 from .supabase_vector_store import SupabaseVectorStore
 from .generator_v2 import LLMGenerator
@@ -20,6 +21,31 @@ class Orchestrator:
         )
         self.store = SupabaseVectorStore()
         self.generator = LLMGenerator()
+        self._run_stats_lock = threading.Lock()
+        self.reset_run_stats()
+    
+    def reset_run_stats(self):
+        """실행 단위 인입 통계 초기화"""
+        with self._run_stats_lock:
+            self.run_stats = {
+                "processed": 0,            # process_announcement 호출 수
+                "changed": 0,              # 신규/변경 공고 (새 버전 저장)
+                "unchanged_skipped": 0,    # 동일 내용이라 전체 파이프라인 생략
+                "resumed": 0,              # 동일 내용이지만 이전 실행의 누락 단계만 재실행
+                "chunks_embedded": 0,      # 임베딩/저장한 청크 수
+                "embeddings_skipped": 0,   # 청크 임베딩/저장을 생략한 공고 수
+                "analyses_run": 0,         # LLM 분석 호출 수
+                "analyses_skipped": 0,     # LLM 분석을 생략한 공고 수
+            }
+    
+    def get_run_summary(self) -> Dict[str, int]:
+        """실행 단위 인입 통계 (생략된 단계 포함)"""
+        with self._run_stats_lock:
+            return dict(self.run_stats)
+    
+    def _count(self, key: str, amount: int = 1):
+        with self._run_stats_lock:
+            self.run_stats[key] += amount
     
     def process_announcement(
         self,
@@ -31,6 +57,7 @@ class Orchestrator:
         
         프로세스:
         1. 중복/버전 판별 (content_hash)
+           - 최신 버전과 내용이 같으면 3~7 단계 생략 (이전 실행에서 누락된 단계만 재실행)
         2. 메타데이터 및 본문 저장
         3. 텍스트 → 청크 분할
         4. 청크 → 임베딩 생성
@@ -55,6 +82,24 @@ class Orchestrator:
         Returns:
             announcement_id (uuid)
         """
+        return self.ingest_announcement(meta, text)["announcement_id"]
+    
+    def ingest_announcement(
+        self,
+        meta: Dict[str, Any],
+        text: str
+    ) -> Dict[str, Any]:
+        """
+        process_announcement와 동일하되 처리 상태를 함께 반환
+        
+        Returns:
+            {
+                announcement_id: str,
+                changed: bool,   # 새 버전이 저장됐는지
+                skipped: bool,   # 청크/임베딩/분석을 모두 생략했는지
+                chunks_count: int,  # 이번 실행에서 임베딩/저장한 청크 수 (생략 시 0)
+            }
+        """
         try:
             # 텍스트 유효성 검사
             if text is None:
@@ -68,55 +113,96 @@ class Orchestrator:
                 raise ValueError("공고 텍스트가 비어있습니다.")
             
             # 1) 중복/버전 판별 및 저장
-            announcement_id = self.store.upsert_announcement(meta, text)
-            
-            # 2) 텍스트 → 청크 분할
-            base_meta = {
-                "source": meta.get("source", "unknown"),
-                "external_id": meta.get("external_id", ""),
-                "title": meta.get("title", "")
-            }
-            
-            try:
-                chunks = self.processor.to_chunks(text, base_meta)
-            except Exception as chunk_error:
-                raise Exception(f"청크 생성 실패: {str(chunk_error)}")
-            
-            if not chunks:
-                raise Exception("청크 생성 실패: 청크 리스트가 비어있습니다.")
-            
-            # 3) 청크 → 임베딩 생성
-            chunk_texts = [chunk.content for chunk in chunks]
-            embeddings = self.generator.embed(chunk_texts)
+            announcement_id, changed = self.store.upsert_announcement_with_status(meta, text)
+            self._count("processed")
             
-            # 4) 벡터 저장 (pgvector)
-            chunk_payload = [
-                {
-                    "chunk_index": chunk.index,
-                    "content": chunk.content,
-                    "embedding": embeddings[i],
-                    "metadata": chunk.metadata
-                }
-                for i, chunk in enumerate(chunks)
-            ]
-            
-            self.store.bulk_upsert_chunks(announcement_id, chunk_payload)
-            
-            # 5) 정규식으로 초기 메타데이터 추출
-            seed_meta = self.processor.extract_structured_meta(text)
+            # 동일 내용: 이전 실행에서 청크/분석이 모두 저장됐으면 전체 생략,
+            # 중간에 실패해서 누락된 단계가 있으면 그 단계만 재실행 (중복 청크 방지)
+            need_chunks, need_analysis = True, True
+            if changed:
+                self._count("changed")
+            else:
+                state = self.store.get_announcement_ingest_state(announcement_id)
+                need_chunks = not state["has_chunks"]
+                need_analysis = not state["has_analysis"]
+                if not need_chunks and not need_analysis:
+                    self._count("unchanged_skipped")
+                    self._count("embeddings_skipped")
+                    self._count("analyses_skipped")
+                    return {"announcement_id": announcement_id, "changed": False, "skipped": True, "chunks_count": 0}
+                self._count("resumed")
             
-            # 6) LLM 구조화 분석
-            analysis_result = self.generator.analyze_announcement(text, seed_meta)
+            chunks_count = 0
+            if need_chunks:
+                chunks_count = self._index_chunks(announcement_id, meta, text)
+            else:
+                self._count("embeddings_skipped")
             
-            # 7) 분석 결과 저장
-            score = self._calculate_score(analysis_result)
-            self.store.save_analysis(announcement_id, analysis_result, score)
+            if need_analysis:
+                # 5) 정규식으로 초기 메타데이터 추출
+                seed_meta = self.processor.extract_structured_meta(text)
+                
+                # 6) LLM 구조화 분석
+                analysis_result = self.generator.analyze_announcement(text, seed_meta)
+                self._count("analyses_run")
+                
+                # 7) 분석 결과 저장
+                score = self._calculate_score(analysis_result)
+                self.store.save_analysis(announcement_id, analysis_result, score)
+            else:
+                self._count("analyses_skipped")
             
-            return announcement_id
+            return {
+                "announcement_id": announcement_id,
+                "changed": changed,
+                "skipped": False,
+                "chunks_count": chunks_count,
+            }
             
         except Exception as e:
             raise Exception(f"공고 처리 실패: {str(e)}")
     
+    def _index_chunks(
+        self,
+        announcement_id: str,
+        meta: Dict[str, Any],
+        text: str
+    ) -> int:
+        """텍스트 → 청크 분할 → 임베딩 → 벡터 저장 (저장한 청크 수 반환)"""
+        # 2) 텍스트 → 청크 분할
+        base_meta = {
+            "source": meta.get("source", "unknown"),
+            "external_id": meta.get("external_id", ""),
+            "title": meta.get("title", "")
+        }
+        
+        try:
+            chunks = self.processor.to_chunks(text, base_meta)
+        except Exception as chunk_error:
+            raise Exception(f"청크 생성 실패: {str(chunk_error)}")
+        
+        if not chunks:
+            raise Exception("청크 생성 실패: 청크 리스트가 비어있습니다.")
+        
+        # 3) 청크 → 임베딩 생성
+        chunk_texts = [chunk.content for chunk in chunks]
+        embeddings = self.generator.embed(chunk_texts)
+        
+        # 4) 벡터 저장 (pgvector)
+        chunk_payload = [
+            {
+                "chunk_index": chunk.index,
+                "content": chunk.content,
+                "embedding": embeddings[i],
+                "metadata": chunk.metadata
+            }
+            for i, chunk in enumerate(chunks)
+        ]
+        
+        self.store.bulk_upsert_chunks(announcement_id, chunk_payload)
+        self._count("chunks_embedded", len(chunks))
+        return len(chunks)
+    
     def process_file(
         self,
         file_path: str,
@@ -258,7 +344,8 @@ class Orchestrator:
     def match_teams_for_announcement(
         self,
         announcement_id: str,
-        top_k: int = 5
+        top_k: int = 5,
+        filters: Optional[Dict[str, Any]] = None
     ) -> List[Dict[str, Any]]:
         """
         공고에 맞는 팀 매칭
@@ -266,36 +353,14 @@ class Orchestrator:
         Args:
             announcement_id: 공고 ID
             top_k: 반환할 최대 팀 수
+            filters: 팀 meta 사전 필터 (예: {"specialty": ["웹개발"]})
         
         Returns:
             매칭된 팀 리스트 (유사도 순)
         """
         try:
-            # 1. 공고 분석 결과 조회
-            analysis = self.get_announcement_analysis(announcement_id)
-            
-            if not analysis:
-                # 분석 결과가 없으면 공고 본문으로 검색
-                text = self.store.get_announcement_body(announcement_id)
-                if not text:
-                    return []
-                
-                # 공고 본문 요약 (간단히 처음 500자 사용)
-                query_text = text[:500]
-            else:
-                # 분석 결과에서 요구사항 추출
-                result = analysis.get("result", {})
-                requirements = []
-                
-                if result.get("essential_skills"):
-                    requirements.extend(result["essential_skills"])
-                if result.get("preferred_skills"):
-                    requirements.extend(result["preferred_skills"])
-                if result.get("project_name"):
-                    requirements.append(result["project_name"])
-                
-                query_text = " ".join(requirements) if requirements else result.get("summary", "")
-            
+            # 1. 공고 요구사항 → 쿼리 텍스트
+            query_text = self._build_team_query_text(announcement_id)
             if not query_text:
                 return []
             
@@ -305,7 +370,8 @@ class Orchestrator:
             # 3. 유사 팀 검색
             matched_teams = self.store.search_similar_teams(
                 query_embedding=query_embedding,
-                top_k=top_k
+                top_k=top_k,
+                filters=filters
             )
             
             return matched_teams
@@ -313,4 +379,85 @@ class Orchestrator:
         except Exception as e:
             print(f"[팀 매칭] 오류: {str(e)}")
             return []
-
+    
+    def match_teams_for_announcements(
+        self,
+        announcement_ids: List[str],
+        top_k: int = 5,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        여러 공고의 팀 매칭 (배치 임베딩 + 로컬 팀 인덱스 행렬곱 한 번)
+        
+        Args:
+            announcement_ids: 공고 ID 목록
+            top_k: 공고당 반환할 최대 팀 수
+            filters: 팀 meta 사전 필터 (모든 공고에 공통 적용)
+        
+        Returns:
+            {announcement_id: 매칭된 팀 리스트 (유사도 순)}
+        """
+        from .team_vector_index import get_team_vector_index, TEAM_MATCH_THRESHOLD
+        
+        results: Dict[str, List[Dict[str, Any]]] = {aid: [] for aid in announcement_ids}
+        
+        query_ids: List[str] = []
+        query_texts: List[str] = []
+        for aid in announcement_ids:
+            try:
+                query_text = self._build_team_query_text(aid)
+            except Exception as e:
+                print(f"[팀 매칭] 공고 {aid} 조회 오류: {str(e)}")
+                continue
+            if query_text:
+                query_ids.append(aid)
+                query_texts.append(query_text)
+        
+        if not query_texts:
+            return results
+        
+        embeddings = self.generator.embed(query_texts)
+        
+        index = get_team_vector_index()
+        if not index.ready:
+            index.ensure_fresh(block=True)
+        batch = index.search_many(
+            embeddings, top_k=top_k, filters=filters, match_threshold=TEAM_MATCH_THRESHOLD
+        )
+        
+        if batch is None:
+            # 로컬 인덱스 로딩 실패 시 공고별 검색으로 fallback
+            batch = [
+                self.store.search_similar_teams(query_embedding=emb, top_k=top_k, filters=filters)
+                for emb in embeddings
+            ]
+        
+        for aid, matched in zip(query_ids, batch):
+            results[aid] = matched
+        return results
+    
+    def _build_team_query_text(self, announcement_id: str) -> str:
+        """공고 분석 결과(없으면 본문 앞부분)에서 팀 매칭용 쿼리 텍스트 생성"""
+        analysis = self.get_announcement_analysis(announcement_id)
+        
+        if not analysis:
+            # 분석 결과가 없으면 공고 본문으로 검색
+            text = self.store.get_announcement_body(announcement_id)
+            if not text:
+                return ""
+            
+            # 공고 본문 요약 (간단히 처음 500자 사용)
+            return text[:500]
+        
+        # 분석 결과에서 요구사항 추출
+        result = analysis.get("result", {})
+        requirements = []
+        
+        if result.get("essential_skills"):
+            requirements.extend(result["essential_skills"])
+        if result.get("preferred_skills"):
+            requirements.extend(result["preferred_skills"])
+        if result.get("project_name"):
+            requirements.append(result["project_name"])
+        
+        return " ".join(requirements) if requirements else result.get("summary", "")
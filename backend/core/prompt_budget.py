@@ -0,0 +1,273 @@
+"""
+Prompt Budget - 계약서 분석 프롬프트 섹션별 토큰 예산
+- 토크나이저 기반 토큰 수 계산/자르기 (tiktoken, 없으면 문자 수 기반 추정)
+- 조항 목록: 위험 신호(위험/독소조항 키워드, 수당 포기 문구, 사용자 고민) 순으로 본문 예산 배정
+- 참고 법령: 중복/겹치는 청크 제거 후 유사도 순으로 예산 안에서 채움
+"""
+
+from typing import List, Dict, Any, Optional, Iterable, Tuple
+import logging
+import math
+import re
+
+from config import settings
+from core.keyword_matcher import (
+    CONTRACT_KEYWORD_MATCHER,
+    RISK_KEYWORDS,
+    find_wage_waiver_pattern,
+)
+
+logger = logging.getLogger(__name__)
+
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+# 토크나이저가 없을 때 추정치 (한국어 기준: 1토큰 ≈ 2-3자, 기존 로그 추정과 동일)
+CHARS_PER_TOKEN = 2.5
+
+# 조항 우선순위 가중치
+TOXIC_SIGNAL_SCORE = 15.0  # 독소조항 신호 카테고리 1개당
+WAGE_WAIVER_SCORE = 50.0  # 법정 수당 청구권 포기 문구
+CONCERN_MATCH_SCORE = 10.0  # 사용자 고민 단어 포함
+
+# 참고 법령 중복 판단 (문자 3-gram Jaccard)
+LEGAL_DUPLICATE_SIMILARITY = 0.8
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_CONCERN_TERM_RE = re.compile(r"[가-힣A-Za-z0-9]{2,}")
+
+
+class TokenCounter:
+    """
+    프롬프트 토큰 수 계산기
+
+    tiktoken 인코딩(기본 cl100k_base)을 사용하고, 미설치이거나 인코딩 로드에 실패하면
+    CHARS_PER_TOKEN 기반 추정으로 동작합니다.
+    """
+
+    def __init__(self, encoding_name: str = "cl100k_base"):
+        self._encoding = None
+        self.name = "estimate"
+        if TIKTOKEN_AVAILABLE and encoding_name:
+            try:
+                self._encoding = tiktoken.get_encoding(encoding_name)
+                self.name = f"tiktoken:{encoding_name}"
+            except Exception as e:
+                logger.warning(f"[프롬프트 예산] tiktoken 인코딩 '{encoding_name}' 로드 실패, 문자 수 기반 추정 사용: {str(e)}")
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        if self._encoding is not None:
+            return len(self._encoding.encode(text, disallowed_special=()))
+        return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+    def truncate(self, text: str, max_tokens: int, suffix: str = "...") -> str:
+        """max_tokens 이하로 자르기 (잘린 경우 suffix 추가)"""
+        if not text or max_tokens <= 0:
+            return ""
+        if self._encoding is not None:
+            tokens = self._encoding.encode(text, disallowed_special=())
+            if len(tokens) <= max_tokens:
+                return text
+            return self._encoding.decode(tokens[:max_tokens]).rstrip("�") + suffix
+        max_chars = int(max_tokens * CHARS_PER_TOKEN)
+        if len(text) <= max_chars:
+            return text
+        return text[:max_chars] + suffix
+
+
+_token_counter: Optional[TokenCounter] = None
+
+
+def get_token_counter() -> TokenCounter:
+    """
+    TokenCounter 인스턴스 가져오기 (싱글톤)
+
+    Returns:
+        TokenCounter 인스턴스
+    """
+    global _token_counter
+    if _token_counter is None:
+        _token_counter = TokenCounter(settings.prompt_tokenizer_encoding)
+    return _token_counter
+
+
+def _field(item: Any, name: str, default: Any = None) -> Any:
+    """dict/객체 공용 필드 조회 (clause dict, LegalGroundingChunk 모두 지원)"""
+    if isinstance(item, dict):
+        return item.get(name, default)
+    return getattr(item, name, default)
+
+
+def _concern_terms(concerns: Optional[str]) -> List[str]:
+    return list(dict.fromkeys(_CONCERN_TERM_RE.findall(concerns or "")))
+
+
+def clause_risk_priority(clause: Dict[str, Any], concern_terms: Iterable[str] = ()) -> float:
+    """
+    조항 위험 신호 점수 (0이면 위험 신호 없음)
+
+    - 위험 키워드 (RISK_KEYWORDS 점수, 위험 유형별 1회)
+    - 독소조항 신호 키워드 (카테고리별 TOXIC_SIGNAL_SCORE)
+    - 법정 수당 청구권 포기 문구
+    - 사용자 고민(concerns) 단어 포함
+    """
+    text = f"{_field(clause, 'title', '')} {_field(clause, 'content', '')}"
+    score = 0.0
+    hits = CONTRACT_KEYWORD_MATCHER.find_all(text, tables=("risk", "toxic"))
+    for risk_type in {hit.category for hit in hits if hit.table == "risk"}:
+        score += RISK_KEYWORDS[risk_type]["score"]
+    score += TOXIC_SIGNAL_SCORE * len({hit.category for hit in hits if hit.table == "toxic"})
+    if find_wage_waiver_pattern(text):
+        score += WAGE_WAIVER_SCORE
+    if any(term in text for term in concern_terms):
+        score += CONCERN_MATCH_SCORE
+    return score
+
+
+def build_clause_context(
+    clauses: List[Dict[str, Any]],
+    budget_tokens: int,
+    concerns: Optional[str] = None,
+    counter: Optional[TokenCounter] = None,
+    stats: Optional[Dict[str, Any]] = None,
+) -> str:
+    """
+    [계약서 조항 목록] 섹션 구성
+
+    모든 조항의 clause_id/제목 줄은 항상 포함하고(LLM이 clause_id로 참조), 본문은 위험 신호 점수가
+    높은 조항부터 예산 안에서 배정합니다. 위험 신호가 있는 조항은 contract_prompt_clause_tokens,
+    없는 조항은 contract_prompt_low_risk_clause_tokens까지 본문을 넣고, 출력 순서는 계약서 순서를 유지합니다.
+
+    Args:
+        clauses: clause 리스트 ({"id", "title", "content"})
+        budget_tokens: 섹션 토큰 예산
+        concerns: 사용자 고민 (포함된 단어가 있는 조항 우선)
+        counter: TokenCounter (None이면 get_token_counter())
+        stats: 주어지면 조항 수/본문 포함·축약 수/토큰 수를 기록
+    """
+    counter = counter or get_token_counter()
+    terms = _concern_terms(concerns)
+
+    headers = []
+    for c in clauses:
+        headers.append(f'- [{_field(c, "id", "")}] {_field(c, "title", "")}')
+    used = sum(counter.count(header) + 1 for header in headers)
+
+    priorities = [clause_risk_priority(c, terms) for c in clauses]
+    bodies: Dict[int, str] = {}
+    full = trimmed = 0
+    for idx in sorted(range(len(clauses)), key=lambda i: (-priorities[i], i)):
+        content = _WHITESPACE_RE.sub(" ", _field(clauses[idx], "content", "") or "").strip()
+        if not content:
+            continue
+        cap = settings.contract_prompt_clause_tokens if priorities[idx] > 0 else settings.contract_prompt_low_risk_clause_tokens
+        remaining = budget_tokens - used
+        limit = min(cap, remaining - 3)  # 줄바꿈/들여쓰기/따옴표
+        if limit <= 0:
+            continue
+        body = counter.truncate(content, limit)
+        if body != content:
+            trimmed += 1
+        else:
+            full += 1
+        bodies[idx] = body
+        used += counter.count(body) + 3
+
+    lines = []
+    for idx, header in enumerate(headers):
+        lines.append(f'{header}\n  "{bodies[idx]}"' if idx in bodies else header)
+
+    if stats is not None:
+        stats.update({
+            "clauses_total": len(clauses),
+            "clauses_risky": sum(1 for p in priorities if p > 0),
+            "clauses_full": full,
+            "clauses_trimmed": trimmed,
+            "clauses_title_only": len(clauses) - len(bodies),
+        })
+    return "\n".join(lines)
+
+
+def _trigrams(text: str) -> set:
+    compact = _WHITESPACE_RE.sub("", text)
+    return {compact[i:i + 3] for i in range(max(len(compact) - 2, 1))}
+
+
+def dedupe_legal_chunks(chunks: List[Any]) -> List[Any]:
+    """
+    참고 법령 청크 중복 제거 (유사도 높은 청크 우선 유지)
+
+    - 같은 (source_type, external_id, chunk_index)
+    - 한 청크 본문이 다른 청크에 포함되거나 문자 3-gram Jaccard ≥ LEGAL_DUPLICATE_SIMILARITY (겹치는 청크)
+    """
+    ordered = sorted(chunks, key=lambda g: _field(g, "score", 0.0) or 0.0, reverse=True)
+    kept: List[Tuple[Any, str, set]] = []
+    seen_keys = set()
+    for g in ordered:
+        external_id = _field(g, "external_id")
+        if external_id:
+            key = (_field(g, "source_type"), external_id, _field(g, "chunk_index"))
+            if key in seen_keys:
+                continue
+            seen_keys.add(key)
+        text = _WHITESPACE_RE.sub(" ", _field(g, "snippet", None) or _field(g, "content", "") or "").strip()
+        grams = _trigrams(text)
+        duplicate = False
+        for _, kept_text, kept_grams in kept:
+            if text and (text in kept_text or kept_text in text):
+                duplicate = True
+                break
+            union = len(grams | kept_grams)
+            if union and len(grams & kept_grams) / union >= LEGAL_DUPLICATE_SIMILARITY:
+                duplicate = True
+                break
+        if not duplicate:
+            kept.append((g, text, grams))
+    return [g for g, _, _ in kept]
+
+
+def build_legal_context(
+    chunks: Optional[List[Any]],
+    budget_tokens: int,
+    counter: Optional[TokenCounter] = None,
+    stats: Optional[Dict[str, Any]] = None,
+) -> str:
+    """
+    [참고 법령/가이드라인] 섹션 구성 (중복 제거 → 유사도 순으로 청크당 contract_prompt_legal_chunk_tokens까지)
+
+    Args:
+        chunks: LegalGroundingChunk 리스트
+        budget_tokens: 섹션 토큰 예산
+        counter: TokenCounter (None이면 get_token_counter())
+        stats: 주어지면 입력/중복 제거 후/사용 청크 수를 기록
+    """
+    counter = counter or get_token_counter()
+    chunks = chunks or []
+    unique = dedupe_legal_chunks(chunks)
+
+    lines = []
+    used = 0
+    for g in unique:
+        source_type = _field(g, "source_type", "law")
+        title = _field(g, "title", "")
+        snippet = _WHITESPACE_RE.sub(" ", _field(g, "snippet", None) or _field(g, "content", "") or "").strip()
+        prefix = f"- ({source_type}) {title}: "
+        limit = min(settings.contract_prompt_legal_chunk_tokens, budget_tokens - used - counter.count(prefix) - 3)
+        if limit <= 0:
+            break
+        line = f'{prefix}"{counter.truncate(snippet, limit)}"'
+        lines.append(line)
+        used += counter.count(line) + 1
+
+    if stats is not None:
+        stats.update({
+            "legal_chunks_in": len(chunks),
+            "legal_chunks_unique": len(unique),
+            "legal_chunks_used": len(lines),
+        })
+    return "\n".join(lines)
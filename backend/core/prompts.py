@@ -5,6 +5,9 @@
 import logging
 from typing import Optional, List, Dict, Any
 
+from config import settings
+from core.prompt_budget import get_token_counter, build_clause_context, build_legal_context
+
 logger = logging.getLogger(__name__)
 
 # ============================================================================
@@ -845,6 +848,51 @@ CONTRACT_ANALYSIS_SYSTEM_PROMPT = """당신은 한국 노동법 전문가입니
 """
 
 
+def _format_contract_user_context(
+    contract_type: Optional[str] = None,
+    user_role: Optional[str] = None,
+    field: Optional[str] = None,
+    concerns: Optional[str] = None,
+) -> str:
+    """계약서 분석 프롬프트의 [사용자 컨텍스트] 섹션"""
+    user_context = []
+    if contract_type:
+        contract_type_map = {
+            "freelancer": "프리랜서",
+            "part_time": "알바/파트타임",
+            "regular": "정규직",
+            "service": "용역",
+            "other": "기타"
+        }
+        user_context.append(f"- 계약 종류: {contract_type_map.get(contract_type, contract_type)}")
+
+    if user_role:
+        role_map = {
+            "worker": "을(프리랜서/근로자)",
+            "employer": "갑(발주사/고용주)"
+        }
+        user_context.append(f"- 역할: {role_map.get(user_role, user_role)}")
+
+    if field:
+        field_map = {
+            "it_dev": "IT 개발",
+            "design": "디자인",
+            "marketing": "마케팅",
+            "other": "기타"
+        }
+        user_context.append(f"- 분야: {field_map.get(field, field)}")
+
+    if concerns:
+        user_context.append(f"- 우선 확인하고 싶은 고민: {concerns}")
+
+    return "\n".join(user_context) if user_context else "(사용자 컨텍스트 없음)"
+
+
+# build_contract_analysis_prompt 섹션 자리표시자 (템플릿 토큰 수 측정 후 예산에 맞춘 내용으로 치환)
+_CLAUSE_CONTEXT_SLOT = "\x00CLAUSE_CONTEXT\x00"
+_LEGAL_CONTEXT_SLOT = "\x00LEGAL_CONTEXT\x00"
+
+
 def build_contract_analysis_prompt(
     contract_text: str,
     clauses: list = None,
@@ -855,16 +903,21 @@ def build_contract_analysis_prompt(
     user_role: Optional[str] = None,
     field: Optional[str] = None,
     concerns: Optional[str] = None,
+    metrics: Optional[Dict[str, Any]] = None,
 ) -> str:
     """
     계약서 분석용 프롬프트 구성 (clause_id 기반)
     
+    조항 목록/참고 법령 섹션은 contract_prompt_max_tokens 예산 안에서 채웁니다.
+    (고정 템플릿 → 참고 법령(contract_prompt_legal_tokens 상한) → 남은 예산을 조항 본문에 위험 신호 순으로 배정)
+    
     Args:
         contract_text: 계약서 텍스트 (참고용)
         clauses: 추출된 clause 리스트 (필수)
         grounding_chunks: 관련 법령 청크 (legal_chunks)
         contract_chunks: 계약서 내부 청크 (contract_chunks, 레거시 호환)
         description: 추가 상황 설명
+        metrics: 주어지면 섹션별 토큰 수와 조항/법령 선택 결과를 기록
     
     Returns:
         완성된 프롬프트 문자열
@@ -882,7 +935,7 @@ def build_contract_analysis_prompt(
                 clauses.append({
                     "id": f"clause-{idx}",
                     "title": f"제{article_num}조",
-                    "content": content[:400]  # 처음 400자만
+                    "content": content  # 본문 길이는 토큰 예산에서 조정
                 })
         
         # 여전히 없으면 contract_text에서 간단히 생성
@@ -928,72 +981,15 @@ def build_contract_analysis_prompt(
             clauses = [{
                 "id": "clause-1",
                 "title": "계약서 내용",
-                "content": contract_text[:400] if contract_text else "계약서 내용을 확인할 수 없습니다."
+                "content": contract_text if contract_text else "계약서 내용을 확인할 수 없습니다."
             }]
     
-    # clause 컨텍스트 문자열 만들기
-    clause_lines = []
-    for c in clauses:
-        snippet = c.get("content", "")
-        if len(snippet) > 400:
-            snippet = snippet[:400] + "..."
-        clause_id = c.get("id", "")
-        title = c.get("title", "")
-        clause_lines.append(
-            f'- [{clause_id}] {title}\n  "{snippet}"'
-        )
-    clause_context = "\n".join(clause_lines)
-    
-    # 법령 컨텍스트 준비 (프롬프트 길이 최적화: 개수와 길이 제한)
-    legal_lines = []
-    if grounding_chunks:
-        # 검색된 legal_chunks 사용 (최대 10개로 제한하여 프롬프트 길이 및 응답 시간 단축)
-        max_legal_chunks = min(len(grounding_chunks), 10)
-        for g in grounding_chunks[:max_legal_chunks]:
-            # LegalGroundingChunk는 Pydantic 모델이므로 getattr 사용
-            source_type = getattr(g, 'source_type', 'law')
-            title = getattr(g, 'title', '')
-            snippet = getattr(g, 'snippet', getattr(g, 'content', ''))
-            # snippet 길이를 200자로 제한하여 프롬프트 길이 단축
-            if len(snippet) > 200:
-                snippet = snippet[:200] + "..."
-            legal_lines.append(
-                f'- ({source_type}) {title}: "{snippet}"'
-            )
-    legal_context = "\n".join(legal_lines) if legal_lines else "(참고 법령 없음)"
+    # 조항/법령 섹션은 고정 템플릿 토큰 수를 잰 뒤 남은 예산으로 채움 (아래에서 자리표시자 치환)
+    clause_context = _CLAUSE_CONTEXT_SLOT
+    legal_context = _LEGAL_CONTEXT_SLOT
     
     # 사용자 컨텍스트 정보 구성
-    user_context = []
-    if contract_type:
-        contract_type_map = {
-            "freelancer": "프리랜서",
-            "part_time": "알바/파트타임",
-            "regular": "정규직",
-            "service": "용역",
-            "other": "기타"
-        }
-        user_context.append(f"- 계약 종류: {contract_type_map.get(contract_type, contract_type)}")
-    
-    if user_role:
-        role_map = {
-            "worker": "을(프리랜서/근로자)",
-            "employer": "갑(발주사/고용주)"
-        }
-        user_context.append(f"- 역할: {role_map.get(user_role, user_role)}")
-    
-    if field:
-        field_map = {
-            "it_dev": "IT 개발",
-            "design": "디자인",
-            "marketing": "마케팅",
-            "other": "기타"
-        }
-        user_context.append(f"- 분야: {field_map.get(field, field)}")
-    
-    if concerns:
-        user_context.append(f"- 우선 확인하고 싶은 고민: {concerns}")
-    
-    user_context_str = "\n".join(user_context) if user_context else "(사용자 컨텍스트 없음)"
+    user_context_str = _format_contract_user_context(contract_type, user_role, field, concerns)
     
     system_prompt = """당신은 프리랜서/청년 근로자 관점에서 계약서를 점검하는 계약 분석 어시스턴트입니다.
 
@@ -1155,14 +1151,162 @@ def build_contract_analysis_prompt(
 - 독소조항은 toxic_clauses 배열에도 별도로 정리하세요.
 """
     
-    prompt = f"""{system_prompt}
+    template = f"""{system_prompt}
 
 {user_prompt}"""
     
-    # 실제 사용된 legal_chunks 개수 계산
-    used_legal_chunks = min(len(grounding_chunks), 15) if grounding_chunks else 0
-    logger.info(f"[프롬프트 생성] clause 기반 프롬프트 생성 완료: clauses={len(clauses)}개, legal_chunks={len(grounding_chunks) if grounding_chunks else 0}개 검색됨, {used_legal_chunks}개 프롬프트에 사용")
+    counter = get_token_counter()
+    stats: Dict[str, Any] = {}
+    template_tokens = counter.count(template.replace(_CLAUSE_CONTEXT_SLOT, "").replace(_LEGAL_CONTEXT_SLOT, ""))
+    available = max(settings.contract_prompt_max_tokens - template_tokens, 0)
+    
+    legal_context = build_legal_context(
+        grounding_chunks,
+        budget_tokens=min(settings.contract_prompt_legal_tokens, available),
+        counter=counter,
+        stats=stats,
+    ) or "(참고 법령 없음)"
+    legal_tokens = counter.count(legal_context)
+    clause_context = build_clause_context(
+        clauses,
+        budget_tokens=max(available - legal_tokens, 0),
+        concerns=concerns,
+        counter=counter,
+        stats=stats,
+    )
+    clause_tokens = counter.count(clause_context)
+    
+    prompt = template.replace(_CLAUSE_CONTEXT_SLOT, clause_context).replace(_LEGAL_CONTEXT_SLOT, legal_context)
+    
+    stats.update({
+        "tokenizer": counter.name,
+        "budget_tokens": settings.contract_prompt_max_tokens,
+        "template_tokens": template_tokens,
+        "clause_tokens": clause_tokens,
+        "legal_tokens": legal_tokens,
+        "total_tokens": template_tokens + clause_tokens + legal_tokens,
+    })
+    if metrics is not None:
+        metrics.update(stats)
+    logger.info(
+        f"[프롬프트 생성] clause 기반 프롬프트 생성 완료: 입력 {stats['total_tokens']}토큰 "
+        f"(템플릿 {template_tokens}, 조항 {clause_tokens}, 법령 {legal_tokens} / 예산 {settings.contract_prompt_max_tokens}, {counter.name}), "
+        f"조항 {stats['clauses_total']}개 중 위험 신호 {stats['clauses_risky']}개 (본문 {stats['clauses_full']}개, 축약 {stats['clauses_trimmed']}개, 제목만 {stats['clauses_title_only']}개), "
+        f"법령 {stats['legal_chunks_in']}개 → 중복 제거 {stats['legal_chunks_unique']}개 → 사용 {stats['legal_chunks_used']}개"
+    )
+    
+    return prompt
+
+
+def build_clause_group_analysis_prompt(
+    clauses: List[Dict[str, Any]],
+    grounding_chunks: list = None,
+    contract_type: Optional[str] = None,
+    user_role: Optional[str] = None,
+    field: Optional[str] = None,
+    concerns: Optional[str] = None,
+    metrics: Optional[Dict[str, Any]] = None,
+) -> str:
+    """
+    조항 그룹 분석용 프롬프트 구성 (map-reduce 모드의 map 단계)
+    
+    전체 계약서 대신 조항 몇 개와 그 조항으로 검색한 법령만 넣고, 이슈와 조항별 위험 점수만 요청합니다.
+    (요약/신호등/협상 질문 등 계약서 전체 필드는 reduce 단계에서 계산)
+    
+    Args:
+        clauses: 이 그룹의 clause 리스트 ({"id", "title", "content"})
+        grounding_chunks: 이 그룹 조항으로 검색한 법령 청크
+        metrics: 주어지면 섹션별 토큰 수를 기록
+    
+    Returns:
+        완성된 프롬프트 문자열
+    """
+    counter = get_token_counter()
+    clause_cap = max(settings.contract_map_group_tokens, settings.contract_prompt_clause_tokens)
+    clause_lines = []
+    for c in clauses:
+        content = " ".join((c.get("content", "") or "").split())
+        clause_lines.append(f'- [{c.get("id", "")}] {c.get("title", "")}\n  "{counter.truncate(content, clause_cap)}"')
+    clause_context = "\n".join(clause_lines)
+    stats: Dict[str, Any] = {}
+    legal_context = build_legal_context(
+        grounding_chunks,
+        budget_tokens=settings.contract_map_legal_tokens,
+        counter=counter,
+        stats=stats,
+    ) or "(참고 법령 없음)"
+    user_context_str = _format_contract_user_context(contract_type, user_role, field, concerns)
+    
+    prompt = f"""당신은 프리랜서/청년 근로자 관점에서 계약서 조항을 점검하는 계약 분석 어시스턴트입니다.
+을(프리랜서/근로자)의 권리를 보호하는 관점에서, 아래 조항들만 분석하세요. 모든 응답은 한국어로 작성합니다.
+
+[사용자 컨텍스트]
+
+{user_context_str}
+
+[분석할 조항]
+
+{clause_context}
+
+[참고 법령/가이드라인]
+
+{legal_context}
+
+[독소조항 탐지 기준]
+
+- 대금 지급: 검수 기준/기간 없이 "검수 완료 후 지급"
+- 위약금·손해배상: 을에게만 과도한 위약금, 무제한 손해배상
+- 일방적 해지권·일방적 변경 권한
+- 과도한 경쟁금지 (장기간, 업계 전반, 대가 없음)
+- IP 완전 양도, 포트폴리오 사용 금지
+- 법정 수당(연장·야간·휴일) 청구권을 미리 포기시키는 문구는 항상 high 이슈로 작성
+
+[출력 형식]
+
+JSON만 출력하세요. 문제가 없는 조항은 issues에 넣지 말고 clause_risks에만 낮은 점수로 표시합니다.
+
+{{
+  "issues": [
+    {{
+      "issue_id": "문자열, 예: issue-1",
+      "clause_id": "위 목록의 clause_id만 사용",
+      "category": "wage | working_hours | job_stability | dismissal | payment | ip | nda | non_compete | liability | dispute",
+      "severity": "low | medium | high",
+      "summary": "이슈를 한 줄로 요약",
+      "reason": "왜 문제가 되는지 구체적으로 설명",
+      "legal_basis": ["관련 법조항 또는 가이드라인"],
+      "suggested_revision": "더 안전한 문구 제안",
+      "suggested_questions": ["상대방에게 확인해볼 질문"],
+      "toxic_clause_detail": {{
+        "clause_location": "제○조(제목)",
+        "content_summary": "내용 요약",
+        "why_risky": "왜 위험한지",
+        "real_world_problems": "현실에서 생길 수 있는 문제",
+        "suggested_revision_light": "라이트 버전 수정 제안",
+        "suggested_revision_formal": "포멀 버전 수정 제안"
+      }}
+    }}
+  ],
+  "clause_risks": [
+    {{
+      "clause_id": "위 목록의 모든 clause_id",
+      "risk_score": 0-100,
+      "section": "working_hours | wage | probation_termination | stock_option_ip | other"
+    }}
+  ]
+}}
+
+- 'original_text' 필드는 생성하지 마세요.
+- toxic_clause_detail은 독소조항일 때만 채우고, 아니면 null로 두세요.
+- risk_score: 0-30(low), 31-60(medium), 61-100(high)
+"""
     
+    if metrics is not None:
+        metrics.update({
+            "clauses": len(clauses),
+            "legal_chunks_used": stats.get("legal_chunks_used", 0),
+            "total_tokens": counter.count(prompt),
+        })
     return prompt
 
 
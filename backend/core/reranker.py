@@ -0,0 +1,217 @@
+"""
+Legal Reranker - cross-encoder 재정렬
+bi-encoder(bge-m3) 코사인 상위 후보를 다국어 cross-encoder로 (질문, 청크) 쌍 단위로 다시 점수화해
+프롬프트에 넣는 상위 몇 개(chat_plain은 3개)의 정밀도를 높입니다.
+
+- CPU 배치 추론: 후보 전체를 batch_size 단위로 한 번에 predict (이벤트 루프 밖 스레드에서 실행)
+- 점수 캐시: (쿼리 해시, 청크 id) LRU - 같은 질문이 반복되면 모델 호출 없이 재정렬
+- 지연 예산: 동시 재정렬이 max_concurrency 이상이거나 budget_ms 안에 끝나지 않으면 재정렬을 건너뛰고
+  bi-encoder 순서를 그대로 사용 (시간 초과된 추론은 백그라운드에서 끝까지 실행되어 캐시만 채움)
+"""
+
+from typing import Dict, List, Optional, Tuple
+from collections import OrderedDict
+import asyncio
+import hashlib
+import logging
+import re
+import threading
+import time
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def query_key(query: str) -> str:
+    """캐시용 쿼리 해시 (공백 정규화 후 sha1)"""
+    normalized = _WHITESPACE_RE.sub(" ", query or "").strip()
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+
+class CrossEncoderReranker:
+    """
+    cross-encoder 재정렬기
+
+    사용 예:
+        scores = await get_legal_reranker().rerank(query, [(chunk_id, text), ...])
+        if scores is not None:  # None이면 재정렬 생략 (bi-encoder 순서 유지)
+            chunks.sort(key=lambda c: scores[c.source_id], reverse=True)
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        batch_size: int = 16,
+        max_length: int = 256,
+        budget_ms: float = 300.0,
+        max_concurrency: int = 2,
+        cache_size: int = 5000,
+    ):
+        """
+        Args:
+            model_name: sentence-transformers CrossEncoder 모델 이름
+            batch_size: 배치 추론 크기
+            max_length: (질문, 청크) 쌍 최대 토큰 길이 (넘으면 청크 쪽을 자름)
+            budget_ms: 재정렬 지연 예산 (ms, 0 이하면 제한 없음)
+            max_concurrency: 동시에 실행할 재정렬 수 (넘으면 건너뜀)
+            cache_size: (쿼리 해시, 청크 id) 점수 캐시 최대 항목 수
+        """
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.max_length = max_length
+        self.budget_ms = budget_ms
+        self.max_concurrency = max_concurrency
+        self.cache_size = cache_size
+        self._model = None
+        self._unavailable = False
+        self._model_lock = threading.Lock()
+        self._cache: "OrderedDict[Tuple[str, str], float]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._active = 0
+        self._active_lock = threading.Lock()
+
+    def load(self):
+        """모델 지연 로드 (실패하면 이후 재정렬을 건너뜀)"""
+        if self._model is not None or self._unavailable:
+            return self._model
+        with self._model_lock:
+            if self._model is None and not self._unavailable:
+                try:
+                    from sentence_transformers import CrossEncoder
+
+                    started = time.perf_counter()
+                    self._model = CrossEncoder(self.model_name, max_length=self.max_length, device="cpu")
+                    logger.info(
+                        f"[Reranker] cross-encoder 로드 완료: {self.model_name} "
+                        f"({time.perf_counter() - started:.1f}초)"
+                    )
+                except Exception as e:
+                    self._unavailable = True
+                    logger.warning(f"[Reranker] cross-encoder 로드 실패, 재정렬을 사용하지 않습니다: {self.model_name}: {str(e)}")
+        return self._model
+
+    def _cache_get(self, key: Tuple[str, str]) -> Optional[float]:
+        with self._cache_lock:
+            score = self._cache.get(key)
+            if score is not None:
+                self._cache.move_to_end(key)
+            return score
+
+    def _cache_put(self, key: Tuple[str, str], score: float) -> None:
+        with self._cache_lock:
+            self._cache[key] = score
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _score_pairs(self, qkey: str, query: str, items: List[Tuple[str, str]]) -> Dict[str, float]:
+        """배치 추론 후 캐시에 저장 (스레드에서 실행, 끝나면 동시 실행 수 반환)"""
+        try:
+            model = self.load()
+            if model is None:
+                return {}
+            scores = model.predict(
+                [(query, text) for _, text in items],
+                batch_size=self.batch_size,
+                convert_to_numpy=True,
+                show_progress_bar=False,
+            )
+            result = {chunk_id: float(score) for (chunk_id, _), score in zip(items, scores)}
+            for chunk_id, score in result.items():
+                self._cache_put((qkey, chunk_id), score)
+            return result
+        finally:
+            with self._active_lock:
+                self._active -= 1
+
+    async def rerank(
+        self,
+        query: str,
+        candidates: List[Tuple[str, str]],
+        stats: Optional[Dict[str, object]] = None,
+    ) -> Optional[Dict[str, float]]:
+        """
+        후보 재점수화
+
+        Args:
+            query: 사용자 질문
+            candidates: [(청크 id, 청크 텍스트)] bi-encoder 순서
+            stats: 지정하면 {"rerank": "cached"|"scored"|"busy"|"timeout"|"unavailable"|"error", "rerank_ms", "rerank_pairs"} 기록
+
+        Returns:
+            청크 id → cross-encoder 점수 (클수록 관련), 재정렬을 건너뛰면 None
+        """
+        started = time.perf_counter()
+        qkey = query_key(query)
+        scores: Dict[str, float] = {}
+        missing: List[Tuple[str, str]] = []
+        for chunk_id, text in candidates:
+            cached = self._cache_get((qkey, chunk_id))
+            if cached is None:
+                missing.append((chunk_id, text))
+            else:
+                scores[chunk_id] = cached
+
+        def finish(status: str, result: Optional[Dict[str, float]]) -> Optional[Dict[str, float]]:
+            if stats is not None:
+                stats.update({
+                    "rerank": status,
+                    "rerank_ms": round((time.perf_counter() - started) * 1000, 2),
+                    "rerank_pairs": len(missing),
+                })
+            return result
+
+        if not missing:
+            return finish("cached", scores)
+        if self._unavailable:
+            return finish("unavailable", None)
+
+        with self._active_lock:
+            if self._active >= self.max_concurrency:
+                logger.debug(f"[Reranker] 동시 재정렬 {self._active}개 실행 중, 재정렬 생략")
+                return finish("busy", None)
+            self._active += 1
+
+        future = asyncio.get_running_loop().run_in_executor(None, self._score_pairs, qkey, query, missing)
+        try:
+            if self.budget_ms > 0:
+                scored = await asyncio.wait_for(asyncio.shield(future), timeout=self.budget_ms / 1000)
+            else:
+                scored = await future
+        except asyncio.TimeoutError:
+            logger.info(f"[Reranker] 지연 예산 {self.budget_ms:.0f}ms 초과 (후보 {len(missing)}개), 재정렬 생략")
+            return finish("timeout", None)
+        except Exception as e:
+            logger.warning(f"[Reranker] 재정렬 실패, bi-encoder 순서 사용: {str(e)}")
+            return finish("error", None)
+
+        if not scored:
+            return finish("unavailable", None)
+        scores.update(scored)
+        return finish("scored", scores)
+
+
+_legal_reranker: Optional[CrossEncoderReranker] = None
+
+
+def get_legal_reranker() -> CrossEncoderReranker:
+    """
+    CrossEncoderReranker 인스턴스 가져오기 (싱글톤)
+
+    Returns:
+        CrossEncoderReranker 인스턴스
+    """
+    global _legal_reranker
+    if _legal_reranker is None:
+        _legal_reranker = CrossEncoderReranker(
+            model_name=settings.legal_rerank_model,
+            batch_size=settings.legal_rerank_batch_size,
+            max_length=settings.legal_rerank_max_length,
+            budget_ms=settings.legal_rerank_budget_ms,
+            max_concurrency=settings.legal_rerank_max_concurrency,
+            cache_size=settings.legal_rerank_cache_size,
+        )
+    return _legal_reranker
@@ -1,13 +1,18 @@
 """
 상황분석 LangGraph 워크플로우
 단일 스텝 → 멀티 스텝 모듈형 그래프 기반 실행
+- 컴파일된 그래프와 의존성(vector store, generator)은 프로세스당 한 번만 생성 (get_situation_workflow)
+- 요청별 상태는 SituationWorkflowState에만 보관
+- 체크포인트 사용 시 LLM 타임아웃 재시도는 마지막 완료 노드 다음부터 재개 (분류/검색 재실행 없음)
 """
 
 from typing import TypedDict, List, Optional, Dict, Any
+from contextvars import ContextVar
 import asyncio
 import logging
 import json
 import re
+import uuid
 import warnings
 
 # langchain-community의 Ollama Deprecated 경고 무시
@@ -22,9 +27,16 @@ except ImportError:
     LANGGRAPH_AVAILABLE = False
     logger.warning("LangGraph가 설치되지 않았습니다. pip install langgraph를 실행하세요.")
 
+try:
+    from langgraph.checkpoint.memory import MemorySaver
+except ImportError:
+    MemorySaver = None
+
 from models.schemas import LegalGroundingChunk, LegalCasePreview
 from core.supabase_vector_store import SupabaseVectorStore
 from core.generator_v2 import LLMGenerator
+from core.file_utils import get_document_file_path, get_storage_url_resolver
+from core.logging_config import preview
 from core.prompts import (
     build_situation_classify_prompt,
     build_situation_action_guide_prompt,
@@ -33,9 +45,25 @@ from core.prompts import (
     build_situation_scripts_prompt,
     build_situation_organizations_prompt,
 )
+from config import settings
 
 logger = logging.getLogger(__name__)
 
+# True면 generate_all_fields_node가 LLM 타임아웃을 기본값으로 대체하지 않고 예외로 올림
+# (체크포인트 재시도가 남아 있을 때만 run()에서 설정)
+_raise_llm_timeouts: ContextVar[bool] = ContextVar("situation_workflow_raise_llm_timeouts", default=False)
+
+
+class WorkflowLLMTimeout(Exception):
+    """체크포인트에서 재개할 수 있는 LLM 타임아웃"""
+
+
+def _is_timeout(error: BaseException) -> bool:
+    """asyncio/httpx/Groq 타임아웃 예외 판별"""
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError)):
+        return True
+    return "timeout" in type(error).__name__.lower() or "timed out" in str(error).lower()
+
 
 # ============================================================================
 # State 모델 정의
@@ -88,11 +116,27 @@ class SituationWorkflowState(TypedDict):
 class SituationWorkflow:
     """상황분석 LangGraph 워크플로우"""
     
-    def __init__(self):
+    def __init__(
+        self,
+        vector_store: Optional[SupabaseVectorStore] = None,
+        generator: Optional[LLMGenerator] = None,
+        checkpoint: Optional[bool] = None,
+    ):
+        """
+        Args:
+            vector_store: 공유할 SupabaseVectorStore (None이면 새로 생성)
+            generator: 공유할 LLMGenerator (None이면 새로 생성)
+            checkpoint: 노드 출력 체크포인트 사용 여부 (None이면 settings.situation_workflow_checkpoint)
+        """
         if not LANGGRAPH_AVAILABLE:
             raise ImportError("LangGraph가 필요합니다. pip install langgraph를 실행하세요.")
-        self.vector_store = SupabaseVectorStore()
-        self.generator = LLMGenerator()
+        self.vector_store = vector_store or SupabaseVectorStore()
+        self.generator = generator or LLMGenerator()
+        if checkpoint is None:
+            checkpoint = settings.situation_workflow_checkpoint
+        if checkpoint and MemorySaver is None:
+            logger.warning("[워크플로우] langgraph.checkpoint를 사용할 수 없어 체크포인트 없이 실행합니다.")
+        self.checkpointer = MemorySaver() if checkpoint and MemorySaver is not None else None
         self.graph = self._build_graph()
     
     def _build_graph(self) -> StateGraph:
@@ -119,7 +163,7 @@ class SituationWorkflow:
         workflow.add_edge("generate_all_fields", "merge_output")
         workflow.add_edge("merge_output", END)
         
-        return workflow.compile()
+        return workflow.compile(checkpointer=self.checkpointer)
     
     # ==================== 노드 함수들 ====================
     
@@ -215,12 +259,16 @@ class SituationWorkflow:
         )
         
         # RAG 검색 결과 로깅
-        logger.info(f"[워크플로우] RAG 검색 완료: 법령/가이드 {len(grounding_chunks)}개, 케이스 {len(related_cases)}개")
-        if grounding_chunks:
-            logger.info(f"[워크플로우] 검색된 법령/가이드 목록:")
+        logger.info(
+            "[워크플로우] RAG 검색 완료: 법령/가이드 %d개, 케이스 %d개",
+            len(grounding_chunks), len(related_cases),
+        )
+        if grounding_chunks and logger.isEnabledFor(logging.DEBUG):
             for idx, chunk in enumerate(grounding_chunks[:5], 1):  # 상위 5개만 로깅
-                logger.info(f"  {idx}. [{chunk.source_type}] {chunk.title} (score: {chunk.score:.3f})")
-                logger.info(f"     내용: {chunk.snippet[:100]}...")
+                logger.debug(
+                    "  %d. [%s] %s (score: %.3f) 내용: %s",
+                    idx, chunk.source_type, chunk.title, chunk.score, preview(chunk.snippet, 100),
+                )
         
         # legalBasis 구조 추출 (criteria 가공용)
         legal_basis = self._extract_legal_basis(grounding_chunks)
@@ -300,6 +348,15 @@ class SituationWorkflow:
         elapsed_time = asyncio.get_event_loop().time() - start_time
         logger.info(f"[워크플로우] 병렬 LLM 호출 완료 - 소요 시간: {elapsed_time:.2f}초")
         
+        # 체크포인트 재시도가 남아 있으면 타임아웃을 기본값으로 채우지 않고 재개 대상으로 올림
+        if _raise_llm_timeouts.get():
+            timeouts = [
+                r for r in (summary_result, findings_result, scripts_result, organizations_result)
+                if isinstance(r, BaseException) and _is_timeout(r)
+            ]
+            if timeouts:
+                raise WorkflowLLMTimeout(f"LLM 타임아웃 {len(timeouts)}건: {timeouts[0]}")
+        
         # 예외 처리
         if isinstance(summary_result, Exception):
             logger.error(f"[워크플로우] summary 생성 실패: {summary_result}", exc_info=summary_result)
@@ -872,8 +929,11 @@ class SituationWorkflow:
             filters=filters,
         )
         
+        # 스토리지 파일 URL 일괄 생성 (메모리 연산만 수행, SDK 호출 없음)
+        file_urls = get_storage_url_resolver().resolve_many(rows)
+        
         results: List[LegalGroundingChunk] = []
-        for r in rows:
+        for r, file_url in zip(rows, file_urls):
             source_type = r.get("source_type", "law")
             title = r.get("title", "제목 없음")
             content = r.get("content", "")
@@ -884,21 +944,7 @@ class SituationWorkflow:
             
             # file_path가 없으면 external_id로 생성
             if not file_path and external_id:
-                from core.legal_rag_service import LegalRAGService
-                service = LegalRAGService()
-                file_path = service._build_file_path(source_type, external_id)
-            
-            # 스토리지 파일 URL 생성
-            file_url = None
-            if external_id:
-                try:
-                    file_url = self.vector_store.get_storage_file_url(
-                        external_id=external_id,
-                        source_type=source_type,
-                        expires_in=3600  # 1시간
-                    )
-                except Exception as e:
-                    logger.warning(f"[워크플로우] 스토리지 URL 생성 실패 (external_id={external_id}, source_type={source_type}): {str(e)}")
+                file_path = get_document_file_path(source_type, external_id)
             
             results.append(
                 LegalGroundingChunk(
@@ -2248,6 +2294,9 @@ class SituationWorkflow:
                 logger.warning("[워크플로우] LLM 응답이 None")
                 
         except Exception as e:
+            # 체크포인트 재시도가 남아 있으면 타임아웃은 기본값 대신 그대로 올려 재개 대상으로 처리
+            if _raise_llm_timeouts.get() and _is_timeout(e):
+                raise
             logger.error(f"[워크플로우] summary LLM 호출 실패: {e}", exc_info=True)
             # LLM 호출 실패 시 기본 summary 반환 (4개 섹션 구조 유지)
             return "## 📊 상황 분석의 결과\n\n상황을 분석했습니다. 아래 법적 관점과 행동 가이드를 참고하세요.\n\n## ⚖️ 법적 관점에서 본 현재 상황\n\n관련 법령을 확인하는 중입니다.\n\n## 🎯 지금 당장 할 수 있는 행동\n\n- 상황을 다시 확인해주세요\n- 잠시 후 다시 시도해주세요\n\n## 💬 이렇게 말해보세요\n\n상담 기관에 문의하시기 바랍니다."
@@ -2380,11 +2429,10 @@ class SituationWorkflow:
         from config import settings
         
         # 프롬프트 정보 로깅
-        prompt_length = len(prompt)
-        logger.info(f"[워크플로우] LLM 호출 시작 - 프롬프트 길이: {prompt_length}자")
+        logger.info("[워크플로우] LLM 호출 시작 - 프롬프트 길이: %d자", len(prompt))
         
         if settings.use_groq:
-            logger.info(f"[워크플로우] Groq 사용 (모델: {settings.groq_model})")
+            logger.info("[워크플로우] Groq 사용 (모델: %s)", settings.groq_model)
             from llm_api import ask_groq_with_messages
             messages = [
                 {"role": "system", "content": "너는 유능한 법률 AI야. 한국어로만 답변해주세요."},
@@ -2401,13 +2449,13 @@ class SituationWorkflow:
                     ),
                     timeout=120.0  # 2분 타임아웃
                 )
-                logger.info(f"[워크플로우] Groq 응답 완료 - 응답 길이: {len(response)}자")
+                logger.info("[워크플로우] Groq 응답 완료 - 응답 길이: %d자", len(response))
                 return response
             except asyncio.TimeoutError:
                 logger.error("[워크플로우] Groq 호출 타임아웃 (2분 초과)")
                 raise TimeoutError("Groq LLM 호출이 타임아웃되었습니다 (2분 초과)")
         elif settings.use_ollama:
-            logger.info(f"[워크플로우] Ollama 사용 (모델: {settings.ollama_model}, URL: {settings.ollama_base_url})")
+            logger.info("[워크플로우] Ollama 사용 (모델: %s, URL: %s)", settings.ollama_model, settings.ollama_base_url)
             
             # Ollama 모델 존재 여부 확인 (비동기로 실행)
             async def check_ollama_model():
@@ -2548,7 +2596,12 @@ class SituationWorkflow:
     # ==================== 공개 메서드 ====================
     
     async def run(self, initial_state: Dict[str, Any]) -> Dict[str, Any]:
-        """워크플로우 실행"""
+        """
+        워크플로우 실행
+        
+        체크포인트를 사용하면 generate_all_fields의 LLM 타임아웃 시 같은 thread로
+        최대 settings.situation_workflow_retries번 재개 (prepare_query ~ retrieve_guides는 재실행 안 함)
+        """
         logger.info("[워크플로우] 실행 시작")
         
         # State로 변환
@@ -2577,8 +2630,61 @@ class SituationWorkflow:
         }
         
         # 그래프 실행
-        final_state = await self.graph.ainvoke(state)
+        if self.checkpointer is None:
+            final_state = await self.graph.ainvoke(state)
+        else:
+            final_state = await self._run_with_checkpoint(state)
         
         # 최종 출력 반환
         return final_state.get("final_output", {})
+    
+    async def _run_with_checkpoint(self, state: SituationWorkflowState) -> Dict[str, Any]:
+        """체크포인트 thread로 실행, LLM 타임아웃이면 마지막 체크포인트에서 재개"""
+        thread_id = str(uuid.uuid4())
+        config = {"configurable": {"thread_id": thread_id}}
+        retries = max(0, settings.situation_workflow_retries)
+        try:
+            for attempt in range(retries + 1):
+                token = _raise_llm_timeouts.set(attempt < retries)
+                try:
+                    # 재시도는 입력 None으로 호출해야 저장된 상태에서 이어서 실행됨
+                    return await self.graph.ainvoke(state if attempt == 0 else None, config)
+                except WorkflowLLMTimeout as e:
+                    logger.warning(f"[워크플로우] {str(e)} - 체크포인트에서 재개 ({attempt + 1}/{retries})")
+                finally:
+                    _raise_llm_timeouts.reset(token)
+        finally:
+            self._delete_checkpoint(thread_id)
+    
+    def _delete_checkpoint(self, thread_id: str) -> None:
+        """완료/실패한 요청의 체크포인트 정리 (MemorySaver 메모리 누적 방지)"""
+        try:
+            if hasattr(self.checkpointer, "delete_thread"):
+                self.checkpointer.delete_thread(thread_id)
+            else:
+                self.checkpointer.storage.pop(thread_id, None)
+        except Exception as e:
+            logger.debug("[워크플로우] 체크포인트 정리 실패: %s", e)
+
+
+_situation_workflow: Optional[SituationWorkflow] = None
+
+
+def get_situation_workflow(
+    vector_store: Optional[SupabaseVectorStore] = None,
+    generator: Optional[LLMGenerator] = None,
+) -> SituationWorkflow:
+    """
+    SituationWorkflow 인스턴스 가져오기 (싱글톤, 그래프는 처음 한 번만 컴파일)
+    
+    Args:
+        vector_store, generator: 처음 생성할 때 공유할 의존성 (이후 호출에서는 무시)
+    
+    Returns:
+        SituationWorkflow 인스턴스
+    """
+    global _situation_workflow
+    if _situation_workflow is None:
+        _situation_workflow = SituationWorkflow(vector_store=vector_store, generator=generator)
+    return _situation_workflow
 
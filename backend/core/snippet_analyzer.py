@@ -1,14 +1,18 @@
 """
 법률 문서 snippet 분석 모듈
 LLM을 사용하여 법률 문서의 snippet을 일반인이 이해하기 쉬운 형태로 변환
+- snippet은 legal_chunks.content 앞부분이라 재인덱싱 때만 바뀌므로, 인덱싱/백필 시 미리 분석해서
+  legal_snippet_analyses 테이블에 저장하고 요청 경로에서는 일괄 조회만 수행 (SnippetAnalysisStore)
 """
 
 import json
+import hashlib
 import logging
 import re
 import asyncio
 import warnings
-from typing import Dict, Any, Optional
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
 from config import settings
 
 # langchain-community의 Ollama Deprecated 경고 무시
@@ -16,6 +20,12 @@ warnings.filterwarnings("ignore", category=DeprecationWarning, module="langchain
 
 logger = logging.getLogger(__name__)
 
+# 검색 결과 snippet 길이 (LegalGroundingChunk.snippet = content[:300])
+SNIPPET_LENGTH = 300
+
+# SYSTEM_PROMPT/출력 형식을 바꾸면 올려서 저장된 분석 결과를 무효화
+SNIPPET_ANALYSIS_VERSION = "v1"
+
 SYSTEM_PROMPT = """
 너는 복잡한 법률 문서와 판례를 일반인도 이해하기 쉽게 설명해주는 'AI 법률 해석가'야.
 
@@ -181,6 +191,94 @@ async def _call_llm_for_snippet(messages: list, temperature: float = 0.3) -> str
         raise ValueError("LLM이 설정되지 않았습니다. LLM_PROVIDER 환경변수를 'groq' 또는 'ollama'로 설정하세요.")
 
 
+def fallback_analysis(snippet: str) -> Dict[str, Any]:
+    """LLM 분석 결과가 없을 때 사용하는 기본값 (원본 snippet 앞부분)"""
+    return {
+        "core_clause": "핵심 내용",
+        "easy_summary": snippet[:200] + "..." if len(snippet) > 200 else snippet,
+        "action_tip": ""
+    }
+
+
+def _parse_analysis(response: str, snippet: str) -> Dict[str, Any]:
+    """
+    LLM 응답에서 분석 JSON 추출
+
+    Raises:
+        json.JSONDecodeError / ValueError: 파싱 실패
+    """
+    # JSON 추출 (코드 블록 제거)
+    response_clean = response.strip()
+    response_clean = re.sub(r'```json\s*', '', response_clean, flags=re.IGNORECASE)
+    response_clean = re.sub(r'```\s*', '', response_clean)
+    response_clean = response_clean.strip()
+
+    # JSON 객체 추출 (중괄호 매칭)
+    json_match = re.search(r'\{.*\}', response_clean, re.DOTALL)
+    if json_match:
+        response_clean = json_match.group(0)
+        # 중괄호 매칭으로 유효한 JSON만 추출
+        brace_count = 0
+        last_valid_pos = -1
+        for i, char in enumerate(response_clean):
+            if char == '{':
+                brace_count += 1
+            elif char == '}':
+                brace_count -= 1
+                if brace_count == 0:
+                    last_valid_pos = i + 1
+                    break
+        if last_valid_pos > 0:
+            response_clean = response_clean[:last_valid_pos]
+
+    try:
+        result = json.loads(response_clean)
+    except json.JSONDecodeError:
+        logger.warning(f"snippet 분석 JSON 파싱 실패, 원본 응답: {response_clean[:200]}")
+        raise
+
+    # 필수 필드 검증
+    if not isinstance(result, dict):
+        raise ValueError("응답이 딕셔너리가 아닙니다")
+
+    # 필수 필드 확인 및 기본값 설정
+    default = fallback_analysis(snippet)
+    return {
+        "core_clause": result.get("core_clause", default["core_clause"]),
+        "easy_summary": result.get("easy_summary", default["easy_summary"]),
+        "action_tip": result.get("action_tip", "")
+    }
+
+
+async def _analyze_snippet_strict(snippet: str) -> Dict[str, Any]:
+    """
+    snippet LLM 분석 (실패하면 예외, 저장용 결과와 기본값을 구분하기 위해 사용)
+    """
+    user_prompt = f"""
+다음 법률 문서 스니펫을 분석하여 JSON 형식으로 변환해주세요:
+
+{snippet}
+
+위 스니펫을 읽고, 반드시 다음 JSON 형식으로만 출력해주세요:
+{{
+    "core_clause": "핵심 조항 번호나 제목",
+    "easy_summary": "초등학생도 이해할 수 있는 2~3문장의 친절한 설명",
+    "action_tip": "사용자가 주의해야 할 점 1줄 (선택사항, 없으면 빈 문자열)"
+}}
+
+JSON만 출력하고 다른 설명은 하지 마세요.
+"""
+
+    messages = [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": user_prompt}
+    ]
+
+    # LLM 호출 (Groq 또는 Ollama)
+    response = await _call_llm_for_snippet(messages, temperature=0.3)
+    return _parse_analysis(response, snippet)
+
+
 async def analyze_snippet(snippet: str) -> Optional[Dict[str, Any]]:
     """
     법률 문서 snippet을 분석하여 일반인이 이해하기 쉬운 형태로 변환
@@ -193,93 +291,20 @@ async def analyze_snippet(snippet: str) -> Optional[Dict[str, Any]]:
             "core_clause": "핵심 조항 번호나 제목",
             "easy_summary": "쉬운 설명",
             "action_tip": "주의사항 (선택사항)"
-        } 또는 None (실패 시)
+        } 또는 None (빈 snippet)
+        LLM 호출/파싱 실패 시 fallback_analysis(snippet)
     """
     if not snippet or not snippet.strip():
         return None
     
     try:
-        user_prompt = f"""
-다음 법률 문서 스니펫을 분석하여 JSON 형식으로 변환해주세요:
-
-{snippet}
-
-위 스니펫을 읽고, 반드시 다음 JSON 형식으로만 출력해주세요:
-{{
-    "core_clause": "핵심 조항 번호나 제목",
-    "easy_summary": "초등학생도 이해할 수 있는 2~3문장의 친절한 설명",
-    "action_tip": "사용자가 주의해야 할 점 1줄 (선택사항, 없으면 빈 문자열)"
-}}
-
-JSON만 출력하고 다른 설명은 하지 마세요.
-"""
-        
-        messages = [
-            {"role": "system", "content": SYSTEM_PROMPT},
-            {"role": "user", "content": user_prompt}
-        ]
-        
-        # LLM 호출 (Groq 또는 Ollama)
-        response = await _call_llm_for_snippet(messages, temperature=0.3)
-        
-        # JSON 추출 (코드 블록 제거)
-        response_clean = response.strip()
-        response_clean = re.sub(r'```json\s*', '', response_clean, flags=re.IGNORECASE)
-        response_clean = re.sub(r'```\s*', '', response_clean)
-        response_clean = response_clean.strip()
-        
-        # JSON 파싱
-        try:
-            # JSON 객체 추출 (중괄호 매칭)
-            json_match = re.search(r'\{.*\}', response_clean, re.DOTALL)
-            if json_match:
-                response_clean = json_match.group(0)
-                # 중괄호 매칭으로 유효한 JSON만 추출
-                brace_count = 0
-                last_valid_pos = -1
-                for i, char in enumerate(response_clean):
-                    if char == '{':
-                        brace_count += 1
-                    elif char == '}':
-                        brace_count -= 1
-                        if brace_count == 0:
-                            last_valid_pos = i + 1
-                            break
-                if last_valid_pos > 0:
-                    response_clean = response_clean[:last_valid_pos]
-            
-            result = json.loads(response_clean)
-            
-            # 필수 필드 검증
-            if not isinstance(result, dict):
-                raise ValueError("응답이 딕셔너리가 아닙니다")
-            
-            # 필수 필드 확인 및 기본값 설정
-            parsed_result = {
-                "core_clause": result.get("core_clause", "핵심 내용"),
-                "easy_summary": result.get("easy_summary", snippet[:200] + "..." if len(snippet) > 200 else snippet),
-                "action_tip": result.get("action_tip", "")
-            }
-            
-            return parsed_result
-            
-        except json.JSONDecodeError as e:
-            logger.warning(f"snippet 분석 JSON 파싱 실패: {str(e)}, 원본 응답: {response_clean[:200]}")
-            # JSON 파싱 실패 시 원본 snippet 반환
-            return {
-                "core_clause": "핵심 내용",
-                "easy_summary": snippet[:200] + "..." if len(snippet) > 200 else snippet,
-                "action_tip": ""
-            }
-            
+        return await _analyze_snippet_strict(snippet)
+    except (json.JSONDecodeError, ValueError) as e:
+        logger.warning(f"snippet 분석 결과 파싱 실패: {str(e)}")
+        return fallback_analysis(snippet)
     except Exception as e:
         logger.error(f"snippet 분석 실패: {str(e)}", exc_info=True)
-        # 실패 시 원본 snippet 반환
-        return {
-            "core_clause": "핵심 내용",
-            "easy_summary": snippet[:200] + "..." if len(snippet) > 200 else snippet,
-            "action_tip": ""
-        }
+        return fallback_analysis(snippet)
 
 
 async def analyze_snippets_batch(snippets: list[str], max_concurrent: int = 5) -> list[Optional[Dict[str, Any]]]:
@@ -293,8 +318,6 @@ async def analyze_snippets_batch(snippets: list[str], max_concurrent: int = 5) -
     Returns:
         분석 결과 리스트 (순서 보장)
     """
-    import asyncio
-    
     if not snippets:
         return []
     
@@ -320,3 +343,208 @@ async def analyze_snippets_batch(snippets: list[str], max_concurrent: int = 5) -
     
     return processed_results
 
+
+# ============================================================================
+# 사전 계산 결과 저장소 (legal_snippet_analyses)
+# ============================================================================
+
+def legal_chunk_snippet(content: str) -> str:
+    """legal_chunks.content → 검색 결과 snippet (LegalGroundingChunk.snippet과 동일한 앞부분)"""
+    return (content or "")[:SNIPPET_LENGTH]
+
+
+def snippet_hash(snippet: str) -> str:
+    """snippet 분석 캐시 키 (프롬프트 버전 포함, 재인덱싱으로 chunk id가 바뀌어도 유지)"""
+    key = f"{SNIPPET_ANALYSIS_VERSION}\n{(snippet or '').strip()}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+class SnippetAnalysisStore:
+    """
+    snippet 분석 결과 저장소
+
+    - 조회: 메모리 LRU → legal_snippet_analyses 테이블 (요청당 한 번의 일괄 조회)
+    - 저장: 인덱싱/백필 시 precompute(), 요청 중 미스는 fill_mode에 따라 처리
+    - LLM 실패로 만든 기본값은 저장하지 않음 (다음 백필/요청에서 다시 분석)
+    """
+
+    def __init__(self, cache_size: int = 2000, vector_store=None):
+        self.cache_size = cache_size
+        self._vector_store = vector_store
+        self._cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._pending: set = set()  # 백그라운드 분석 중인 snippet_hash
+        self._background_tasks: set = set()
+
+    @property
+    def vector_store(self):
+        if self._vector_store is None:
+            from core.supabase_vector_store import SupabaseVectorStore
+            self._vector_store = SupabaseVectorStore()
+        return self._vector_store
+
+    def _remember(self, key: str, analysis: Dict[str, Any]) -> None:
+        self._cache[key] = analysis
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    async def lookup(self, snippets: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """
+        저장된 분석 결과 조회 (네트워크 조회는 메모리 미스분만 한 번)
+
+        Returns:
+            snippet 순서대로 분석 결과 (없으면 None)
+        """
+        keys = [snippet_hash(s) if s and s.strip() else None for s in snippets]
+        missing = [k for k in dict.fromkeys(keys) if k and k not in self._cache]
+        if missing:
+            try:
+                found = await asyncio.to_thread(self.vector_store.get_snippet_analyses, missing)
+                for key, analysis in found.items():
+                    self._remember(key, analysis)
+            except Exception as e:
+                logger.warning(f"[snippet_analyzer] 저장된 분석 결과 조회 실패: {str(e)}")
+
+        results = []
+        for key in keys:
+            analysis = self._cache.get(key) if key else None
+            if analysis is not None:
+                self._cache.move_to_end(key)
+            results.append(analysis)
+        return results
+
+    async def precompute(
+        self,
+        snippets: List[str],
+        chunk_ids: Optional[List[Optional[str]]] = None,
+        max_concurrent: int = 5,
+        skip_existing: bool = True,
+    ) -> Dict[str, int]:
+        """
+        snippet 분석 후 저장 (인덱싱/백필용)
+
+        Args:
+            snippets: 분석할 snippet 목록 (legal_chunk_snippet 결과)
+            chunk_ids: snippet별 legal_chunks.id (참고용으로 함께 저장)
+            max_concurrent: LLM 동시 호출 수
+            skip_existing: 이미 저장된 snippet은 건너뜀
+
+        Returns:
+            {"analyzed": 저장한 수, "skipped": 기존 결과 재사용 수, "failed": 실패 수}
+        """
+        chunk_ids = chunk_ids or [None] * len(snippets)
+        targets: Dict[str, Tuple[str, Optional[str]]] = {}
+        for snippet, chunk_id in zip(snippets, chunk_ids):
+            if snippet and snippet.strip():
+                targets.setdefault(snippet_hash(snippet), (snippet, chunk_id))
+
+        skipped = 0
+        if skip_existing and targets:
+            existing = await self.lookup([snippet for snippet, _ in targets.values()])
+            for key, analysis in zip(list(targets), existing):
+                if analysis is not None:
+                    del targets[key]
+                    skipped += 1
+
+        semaphore = asyncio.Semaphore(max_concurrent)
+
+        async def analyze(item: Tuple[str, Optional[str]]):
+            async with semaphore:
+                try:
+                    return await _analyze_snippet_strict(item[0])
+                except Exception as e:
+                    logger.warning(f"[snippet_analyzer] 사전 분석 실패: {str(e)}")
+                    return None
+
+        items = list(targets.items())
+        analyses = await asyncio.gather(*(analyze(item) for _, item in items))
+
+        rows = []
+        for (key, (_, chunk_id)), analysis in zip(items, analyses):
+            if analysis is None:
+                continue
+            rows.append({
+                "snippet_hash": key,
+                "chunk_id": chunk_id,
+                "analysis": analysis,
+                "model": settings.groq_model if settings.use_groq else settings.ollama_model,
+            })
+        if rows:
+            await asyncio.to_thread(self.vector_store.upsert_snippet_analyses, rows)
+            for row in rows:
+                self._remember(row["snippet_hash"], row["analysis"])
+
+        return {"analyzed": len(rows), "skipped": skipped, "failed": len(items) - len(rows)}
+
+    def _schedule_fill(self, snippets: List[str]) -> None:
+        """미스난 snippet을 백그라운드에서 분석/저장 (같은 snippet 중복 예약 방지)"""
+        new = []
+        for snippet in snippets:
+            key = snippet_hash(snippet)
+            if key not in self._pending:
+                self._pending.add(key)
+                new.append((key, snippet))
+        if not new:
+            return
+
+        async def fill():
+            try:
+                await self.precompute([snippet for _, snippet in new], skip_existing=False)
+            finally:
+                for key, _ in new:
+                    self._pending.discard(key)
+
+        task = asyncio.create_task(fill())
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def get_many(
+        self,
+        snippets: List[str],
+        fill_mode: Optional[str] = None,
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        응답용 snippet 분석 결과 (요청 경로에서 사용)
+
+        Args:
+            snippets: 검색 결과 snippet 목록
+            fill_mode: 미스 처리 방식 (None이면 settings.snippet_analysis_fill_mode)
+                - "background": 기본값으로 응답하고 백그라운드에서 분석/저장
+                - "sync": 요청 중 일괄 분석/저장 후 응답
+                - "off": 기본값으로 응답
+
+        Returns:
+            snippet 순서대로 분석 결과 (빈 snippet은 None)
+        """
+        fill_mode = fill_mode or settings.snippet_analysis_fill_mode
+        results = await self.lookup(snippets)
+        missing = list(dict.fromkeys(
+            s for s, r in zip(snippets, results) if r is None and s and s.strip()
+        ))
+
+        if missing and fill_mode == "sync":
+            await self.precompute(missing, skip_existing=False)
+            results = await self.lookup(snippets)
+        elif missing and fill_mode == "background":
+            self._schedule_fill(missing)
+
+        return [
+            r if r is not None else (fallback_analysis(s) if s and s.strip() else None)
+            for s, r in zip(snippets, results)
+        ]
+
+
+_snippet_analysis_store: Optional[SnippetAnalysisStore] = None
+
+
+def get_snippet_analysis_store() -> SnippetAnalysisStore:
+    """
+    SnippetAnalysisStore 인스턴스 가져오기 (싱글톤)
+
+    Returns:
+        SnippetAnalysisStore 인스턴스
+    """
+    global _snippet_analysis_store
+    if _snippet_analysis_store is None:
+        _snippet_analysis_store = SnippetAnalysisStore(cache_size=settings.snippet_analysis_cache_size)
+    return _snippet_analysis_store
@@ -0,0 +1,187 @@
+"""
+스트리밍 JSON 파서
+LLM이 토큰 단위로 내보내는 JSON 객체 응답을 조각(chunk)마다 받아서
+
+- 지정한 배열(예: "issues")의 원소 객체가 닫히는 즉시 꺼내주고
+- 완성된 최상위 필드(risk_score, summary 등)를 모아두어
+- 응답이 중간에 잘려도(max_tokens 초과 등) 완성된 부분만으로 결과를 복구합니다.
+
+응답 앞뒤의 코드 블록(```json ... ```)이나 설명 문장은 첫 '{' 이전/최상위 객체 종료 이후이므로 무시됩니다.
+"""
+
+from typing import Any, Dict, List, Optional
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class StreamingJSONParser:
+    """
+    최상위 JSON 객체 하나를 점진적으로 파싱
+
+    사용 예:
+        parser = StreamingJSONParser(stream_key="issues")
+        for chunk in llm_stream:
+            for issue in parser.feed(chunk):
+                ...  # 닫힌 issue 객체(dict)를 바로 처리
+        analysis = parser.result() or parser.recover()
+    """
+
+    def __init__(self, stream_key: str = "issues"):
+        self.stream_key = stream_key
+        self.members: Dict[str, Any] = {}  # 완성된 최상위 필드
+        self.items: List[Any] = []  # stream_key 배열에서 꺼낸 원소 (순서 유지)
+        self.done = False  # 최상위 객체가 닫혔는지
+
+        self._pos = 0  # 지금까지 스캔한 문자 수 (= _text 길이)
+        self._text = ""
+        self._started = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._brackets: List[str] = []  # depth 2 이상에서 열린 괄호 종류 (stream_key 값이 배열인지 구분용)
+
+        # 최상위 객체(depth 1) 상태: "key" → "colon" → "value" → "in_value" → ("," 이후) "key"
+        self._expect = "key"
+        self._key_start = -1
+        self._current_key: Optional[str] = None
+        self._value_start = -1
+
+        self._item_start = -1  # stream_key 배열 원소 객체 시작 위치
+        self._start = -1  # 최상위 '{' 위치
+        self._end = -1  # 최상위 '}' 다음 위치
+
+    def feed(self, chunk: str) -> List[Any]:
+        """
+        텍스트 조각 추가
+
+        Returns:
+            이번 조각으로 새로 완성된 stream_key 배열 원소 목록
+        """
+        if not chunk or self.done:
+            return []
+        self._text += chunk
+        emitted: List[Any] = []
+        text = self._text
+
+        for i in range(self._pos, len(text)):
+            ch = text[i]
+
+            if not self._started:
+                if ch == "{":
+                    self._started = True
+                    self._start = i
+                    self._depth = 1
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._expect == "key_string":
+                        self._current_key = self._loads(text[self._key_start:i + 1])
+                        self._expect = "colon"
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                if self._depth == 1 and self._expect == "key":
+                    self._key_start = i
+                    self._expect = "key_string"
+                elif self._depth == 1 and self._expect == "value":
+                    self._value_start = i
+                    self._expect = "in_value"
+                continue
+
+            if ch in " \t\r\n":
+                continue
+
+            if self._depth == 1:
+                if ch == ":" and self._expect == "colon":
+                    self._expect = "value"
+                    continue
+                if ch == ",":
+                    self._finish_member(text, i)
+                    self._expect = "key"
+                    continue
+                if ch == "}":
+                    self._finish_member(text, i)
+                    self._depth = 0
+                    self._end = i + 1
+                    self.done = True
+                    break
+                if self._expect == "value":
+                    self._value_start = i
+                    self._expect = "in_value"
+
+            if ch in "{[":
+                self._depth += 1
+                if (
+                    ch == "{"
+                    and self._depth == 3
+                    and self._current_key == self.stream_key
+                    and self._brackets == ["["]
+                ):
+                    self._item_start = i
+                self._brackets.append(ch)
+            elif ch in "}]":
+                if self._brackets:
+                    self._brackets.pop()
+                self._depth -= 1
+                if ch == "}" and self._depth == 2 and self._item_start >= 0:
+                    item = self._loads(text[self._item_start:i + 1])
+                    self._item_start = -1
+                    if item is not None:
+                        self.items.append(item)
+                        emitted.append(item)
+
+        self._pos = len(text) if not self.done else self._end
+        return emitted
+
+    def _finish_member(self, text: str, end: int) -> None:
+        """depth 1에서 ',' 또는 '}'를 만났을 때 진행 중인 key: value를 members에 저장"""
+        if self._expect == "in_value" and self._current_key is not None and self._value_start >= 0:
+            value = self._loads(text[self._value_start:end].strip())
+            if value is not None or text[self._value_start:end].strip() == "null":
+                self.members[self._current_key] = value
+        self._current_key = None
+        self._value_start = -1
+
+    @staticmethod
+    def _loads(fragment: str) -> Any:
+        try:
+            return json.loads(fragment)
+        except (json.JSONDecodeError, ValueError):
+            return None
+
+    @property
+    def text(self) -> str:
+        """지금까지 받은 전체 응답 텍스트"""
+        return self._text
+
+    def result(self) -> Optional[Dict[str, Any]]:
+        """최상위 객체가 완성되었으면 전체를 json.loads한 결과, 아니면 None"""
+        if not self.done:
+            return None
+        parsed = self._loads(self._text[self._start:self._end])
+        return parsed if isinstance(parsed, dict) else None
+
+    def recover(self) -> Optional[Dict[str, Any]]:
+        """
+        잘린/깨진 응답 복구: 완성된 최상위 필드 + 지금까지 닫힌 stream_key 원소
+
+        Returns:
+            복구한 dict (최상위 객체가 시작도 안 했거나 복구된 내용이 없으면 None)
+        """
+        if not self._started:
+            return None
+        recovered = dict(self.members)
+        if self.items or self.stream_key not in recovered:
+            recovered[self.stream_key] = list(self.items)
+        if not recovered.get(self.stream_key) and len(recovered) <= 1:
+            return None
+        return recovered
@@ -3,11 +3,25 @@ Supabase Vector Store 어댑터
 pgvector 기반 벡터 저장 및 검색
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+from collections import OrderedDict
 import hashlib
 import os
+
+import numpy as np
 from supabase import create_client, Client
 from config import settings
+from core.vector_codec import (
+    compact_rpc_enabled,
+    disable_compact_rpc,
+    encode_vector,
+    is_missing_rpc_error,
+    parse_vector,
+    transport_dtype,
+)
+
+# 케이스 카드용 metadata 캐시 최대 항목 수 (LRU)
+CASE_METADATA_CACHE_SIZE = 2000
 
 
 class SupabaseVectorStore:
@@ -16,6 +30,11 @@ class SupabaseVectorStore:
     def __init__(self):
         self.sb: Optional[Client] = None
         self._initialized = False
+        # 케이스 카드용 metadata LRU 캐시 (external_id -> metadata, legal 코퍼스 버전이 바뀌면 비움)
+        self._case_metadata_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._case_metadata_version: Optional[str] = None
+        # legal_corpus_version 테이블 사용 가능 여부 (조회 실패 시 행 수 기준 버전으로 전환)
+        self._corpus_version_table = True
     
     def _ensure_initialized(self):
         """Supabase 클라이언트 지연 초기화"""
@@ -68,6 +87,31 @@ class SupabaseVectorStore:
         self.sb = None
         self._ensure_initialized()
     
+    def _insert_chunk_rows(self, table: str, rpc_name: str, payload: List[Dict[str, Any]]):
+        """
+        청크 행 일괄 삽입 (payload의 embedding은 list[float])
+        
+        compact RPC(rpc_name)가 있으면 임베딩을 base64로 보내 서버에서 디코드하고,
+        없으면 기존처럼 JSON float 배열로 table에 insert합니다.
+        """
+        if compact_rpc_enabled(rpc_name):
+            dtype = transport_dtype()
+            rows = []
+            for p in payload:
+                row = {k: v for k, v in p.items() if k != "embedding"}
+                row["embedding_b64"] = encode_vector(p["embedding"], dtype)
+                rows.append(row)
+            try:
+                self.sb.rpc(rpc_name, {"rows": rows, "dtype": dtype}).execute()
+                return
+            except Exception as e:
+                if not is_missing_rpc_error(e, rpc_name):
+                    raise
+                disable_compact_rpc(rpc_name, e)
+        self.sb.table(table)\
+            .insert(payload)\
+            .execute()
+    
     @staticmethod
     def content_hash(text: str) -> str:
         """텍스트 해시 생성 (중복 감지용)"""
@@ -81,6 +125,20 @@ class SupabaseVectorStore:
         """
         공고 메타데이터 및 본문 저장 (중복/버전 관리)
         
+        Returns:
+            announcement_id (uuid)
+        """
+        announcement_id, _ = self.upsert_announcement_with_status(meta, text)
+        return announcement_id
+    
+    def upsert_announcement_with_status(
+        self,
+        meta: Dict[str, Any],
+        text: str
+    ) -> Tuple[str, bool]:
+        """
+        공고 메타데이터 및 본문 저장 (중복/버전 관리) + 내용 변경 여부
+        
         Args:
             meta: {
                 source: str,
@@ -96,7 +154,8 @@ class SupabaseVectorStore:
             text: 공고 본문 텍스트
         
         Returns:
-            announcement_id (uuid)
+            (announcement_id, changed)
+            changed=False이면 최신 버전과 content_hash가 같아 아무것도 저장하지 않은 것
         """
         self._ensure_initialized()
         content_hash = self.content_hash(text)
@@ -115,7 +174,7 @@ class SupabaseVectorStore:
             prev_hash = existing.data[0].get("content_hash")
             if prev_hash == content_hash:
                 # 동일 내용이면 기존 ID 반환
-                return existing.data[0]["id"]
+                return existing.data[0]["id"], False
             version = existing.data[0]["version"] + 1
         else:
             version = 1
@@ -193,7 +252,30 @@ class SupabaseVectorStore:
             })\
             .execute()
         
-        return announcement_id
+        return announcement_id, True
+    
+    def get_announcement_ingest_state(self, announcement_id: str) -> Dict[str, bool]:
+        """
+        공고의 인덱싱/분석 산출물 존재 여부 (이전 실행이 중간에 실패했는지 확인용)
+        
+        Returns:
+            {"has_chunks": bool, "has_analysis": bool}
+        """
+        self._ensure_initialized()
+        chunks = self.sb.table("announcement_chunks")\
+            .select("announcement_id")\
+            .eq("announcement_id", announcement_id)\
+            .limit(1)\
+            .execute()
+        analysis = self.sb.table("announcement_analysis")\
+            .select("announcement_id")\
+            .eq("announcement_id", announcement_id)\
+            .limit(1)\
+            .execute()
+        return {
+            "has_chunks": bool(chunks.data),
+            "has_analysis": bool(analysis.data),
+        }
     
     def bulk_upsert_chunks(
         self,
@@ -357,8 +439,98 @@ class SupabaseVectorStore:
             .upsert(payload, on_conflict="team_id")\
             .execute()
         
+        self._mark_team_index_stale()
         return True
     
+    def get_team_summary_hashes(
+        self,
+        team_ids: Optional[List[int]] = None,
+        page_size: int = 1000
+    ) -> Dict[int, str]:
+        """
+        저장된 팀 임베딩의 summary 해시 조회 (embedding 컬럼은 가져오지 않음)
+        
+        Args:
+            team_ids: 조회할 팀 ID (None이면 전체)
+            page_size: 페이지 크기
+        
+        Returns:
+            {team_id: content_hash(summary)}
+        """
+        self._ensure_initialized()
+        hashes: Dict[int, str] = {}
+        
+        if team_ids is not None:
+            # in_ 필터는 URL 길이 제한이 있으므로 나눠서 조회
+            ids = list(team_ids)
+            for i in range(0, len(ids), 200):
+                result = self.sb.table("team_embeddings")\
+                    .select("team_id, summary")\
+                    .in_("team_id", ids[i:i + 200])\
+                    .execute()
+                for row in result.data or []:
+                    hashes[row["team_id"]] = self.content_hash(row.get("summary") or "")
+            return hashes
+        
+        offset = 0
+        while True:
+            result = self.sb.table("team_embeddings")\
+                .select("team_id, summary")\
+                .order("team_id")\
+                .range(offset, offset + page_size - 1)\
+                .execute()
+            rows = result.data or []
+            for row in rows:
+                hashes[row["team_id"]] = self.content_hash(row.get("summary") or "")
+            if len(rows) < page_size:
+                break
+            offset += page_size
+        return hashes
+    
+    def bulk_upsert_team_embeddings(
+        self,
+        rows: List[Dict[str, Any]],
+        page_size: int = 200
+    ) -> int:
+        """
+        팀 임베딩 일괄 저장/업데이트 (페이지 단위 upsert)
+        
+        Args:
+            rows: [{team_id: int, summary: str, meta: Dict, embedding: List[float]}]
+            page_size: 한 번에 upsert할 행 수
+        
+        Returns:
+            저장한 행 수
+        """
+        self._ensure_initialized()
+        if not rows:
+            return 0
+        
+        payload = [
+            {
+                "team_id": r["team_id"],
+                "summary": r["summary"],
+                "meta": r.get("meta") or {},
+                "embedding": r["embedding"],
+                "updated_at": "now()"
+            }
+            for r in rows
+        ]
+        
+        for i in range(0, len(payload), page_size):
+            self.sb.table("team_embeddings")\
+                .upsert(payload[i:i + page_size], on_conflict="team_id")\
+                .execute()
+        
+        self._mark_team_index_stale()
+        return len(payload)
+    
+    @staticmethod
+    def _mark_team_index_stale():
+        """로컬 팀 인덱스 증분 갱신 예약"""
+        from core.team_vector_index import get_team_vector_index
+        get_team_vector_index().mark_stale()
+    
     def search_similar_teams(
         self,
         query_embedding: List[float],
@@ -381,13 +553,29 @@ class SupabaseVectorStore:
                 meta: Dict
             }]
         """
+        from core.team_vector_index import get_team_vector_index, TEAM_MATCH_THRESHOLD
+        
+        # 로컬 인덱스 사용 시 네트워크 왕복 없이 검색 (준비 전/실패 시 RPC로 fallback)
+        if settings.use_team_local_index:
+            try:
+                local_rows = get_team_vector_index().search(
+                    query_embedding=query_embedding,
+                    top_k=top_k,
+                    filters=filters,
+                    match_threshold=TEAM_MATCH_THRESHOLD,
+                )
+                if local_rows is not None:
+                    return local_rows
+            except Exception as e:
+                print(f"[경고] 로컬 팀 인덱스 검색 실패, RPC로 전환: {str(e)}")
+        
         self._ensure_initialized()
         
         # Supabase RPC 함수 사용 (있으면)
         try:
             rpc_params = {
                 "query_embedding": query_embedding,
-                "match_threshold": 0.7,
+                "match_threshold": TEAM_MATCH_THRESHOLD,
                 "match_count": top_k,
                 "filters": filters or {}
             }
@@ -399,43 +587,20 @@ class SupabaseVectorStore:
             
             return result.data if result.data else []
         except Exception as e:
-            # RPC 함수가 없으면 직접 SQL 쿼리 (간단한 버전)
+            # RPC 함수가 없으면 전체 팀 임베딩을 메모리 인덱스로 로딩해서 검색
             print(f"[경고] 팀 벡터 검색 RPC 함수가 없습니다: {str(e)}")
-            print("[팁] Supabase에 'match_team_embeddings' RPC 함수를 생성하거나 직접 쿼리를 구현하세요.")
+            print("[팁] Supabase에 'match_team_embeddings' RPC 함수를 생성하세요. 로컬 팀 인덱스로 검색합니다.")
             
-            # 기본 검색 (모든 팀 조회 후 클라이언트 사이드에서 필터링)
-            # 실제로는 RPC 함수를 사용하는 것이 권장됩니다
-            result = self.sb.table("team_embeddings")\
-                .select("team_id, summary, meta, embedding")\
-                .limit(100)\
-                .execute()
-            
-            if not result.data:
-                return []
-            
-            # 간단한 유사도 계산 (코사인 유사도)
-            import numpy as np
-            
-            query_vec = np.array(query_embedding)
-            similarities = []
-            
-            for team in result.data:
-                if team.get("embedding"):
-                    team_vec = np.array(team["embedding"])
-                    # 코사인 유사도
-                    similarity = np.dot(query_vec, team_vec) / (
-                        np.linalg.norm(query_vec) * np.linalg.norm(team_vec)
-                    )
-                    similarities.append({
-                        "team_id": team["team_id"],
-                        "summary": team["summary"],
-                        "similarity": float(similarity),
-                        "meta": team.get("meta", {})
-                    })
-            
-            # 유사도 순으로 정렬하고 top_k 반환
-            similarities.sort(key=lambda x: x["similarity"], reverse=True)
-            return similarities[:top_k]
+            index = get_team_vector_index()
+            if not index.ready:
+                index.ensure_fresh(block=True)
+            local_rows = index.search(
+                query_embedding=query_embedding,
+                top_k=top_k,
+                filters=filters,
+                match_threshold=TEAM_MATCH_THRESHOLD
+            )
+            return local_rows or []
     
     def get_team_embedding(self, team_id: int) -> Optional[Dict[str, Any]]:
         """팀 임베딩 조회"""
@@ -666,6 +831,220 @@ class SupabaseVectorStore:
             logger.warning(f"legal_chunk title 조회 실패 (title={title}): {str(e)}")
             return None
     
+    def get_case_metadata_batch(self, external_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        case 타입 legal_chunks의 metadata를 external_id 목록으로 일괄 조회 (메모리 캐시 사용)
+        
+        캐시에 없는 external_id만 한 번의 in_ 쿼리로 조회하며,
+        DB에 없는 external_id도 빈 dict로 캐시하여 반복 조회를 막습니다.
+        캐시는 CASE_METADATA_CACHE_SIZE개까지 LRU로 유지하고, 인덱싱 스크립트가 legal 코퍼스 버전을
+        올리면(bump_legal_corpus_version) 검색 캐시의 버전 확인 결과를 따라 비웁니다.
+        
+        Args:
+            external_ids: 케이스 external_id 목록
+            
+        Returns:
+            {external_id: metadata(dict)}
+        """
+        self._sync_case_metadata_version()
+        ids = [ext_id for ext_id in dict.fromkeys(external_ids) if ext_id]
+        missing = [ext_id for ext_id in ids if ext_id not in self._case_metadata_cache]
+        
+        if missing:
+            self._ensure_initialized()
+            try:
+                result = self.sb.table("legal_chunks")\
+                    .select("external_id, metadata")\
+                    .in_("external_id", missing)\
+                    .eq("source_type", "case")\
+                    .order("chunk_index")\
+                    .execute()
+                
+                fetched: Dict[str, Dict[str, Any]] = {}
+                for row in result.data or []:
+                    ext_id = row.get("external_id")
+                    metadata = row.get("metadata") or {}
+                    if isinstance(metadata, str):
+                        try:
+                            import json
+                            metadata = json.loads(metadata)
+                        except ValueError:
+                            metadata = {}
+                    # 청크별로 metadata가 중복 저장되므로 첫 번째 non-empty 값을 사용
+                    if ext_id and metadata and ext_id not in fetched:
+                        fetched[ext_id] = metadata
+                
+                for ext_id in missing:
+                    self._case_metadata_cache[ext_id] = fetched.get(ext_id, {})
+                while len(self._case_metadata_cache) > CASE_METADATA_CACHE_SIZE:
+                    self._case_metadata_cache.popitem(last=False)
+            except Exception as e:
+                import logging
+                logger = logging.getLogger(__name__)
+                logger.warning(f"케이스 metadata 일괄 조회 실패 (external_ids={len(missing)}개): {str(e)}")
+        
+        for ext_id in ids:
+            if ext_id in self._case_metadata_cache:
+                self._case_metadata_cache.move_to_end(ext_id)
+        return {ext_id: self._case_metadata_cache.get(ext_id, {}) for ext_id in ids}
+    
+    def _sync_case_metadata_version(self):
+        """legal 코퍼스 버전이 바뀌었으면 케이스 metadata 캐시 초기화 (버전 확인은 검색 캐시가 백그라운드로 수행)"""
+        from core.legal_search_cache import get_legal_search_cache
+        
+        search_cache = get_legal_search_cache()
+        search_cache.ensure_fresh()
+        if search_cache.version != self._case_metadata_version:
+            self._case_metadata_cache.clear()
+            self._case_metadata_version = search_cache.version
+    
+    def clear_case_metadata_cache(self):
+        """케이스 metadata 캐시 초기화 (케이스 재인덱싱 후 호출)"""
+        self._case_metadata_cache.clear()
+
+    def iter_legal_chunk_pages(
+        self,
+        columns: str = "id, content",
+        page_size: int = 1000,
+        source_type: Optional[str] = None
+    ):
+        """
+        legal_chunks를 페이지 단위로 순회 (embedding 등 큰 컬럼은 columns에서 제외)
+
+        Yields:
+            행 목록 (페이지당 최대 page_size개)
+        """
+        self._ensure_initialized()
+        offset = 0
+        while True:
+            query = self.sb.table("legal_chunks").select(columns)
+            if source_type:
+                query = query.eq("source_type", source_type)
+            result = query.order("id")\
+                .range(offset, offset + page_size - 1)\
+                .execute()
+            rows = result.data or []
+            if rows:
+                yield rows
+            if len(rows) < page_size:
+                break
+            offset += page_size
+
+    def get_legal_corpus_version(self) -> str:
+        """
+        legal_chunks 코퍼스 버전 (검색 결과 캐시 무효화용)
+
+        legal_corpus_version 테이블(scripts/create_legal_corpus_version.sql)이 있으면 그 번호,
+        없으면 행 수 + 최신 created_at
+
+        Raises:
+            Exception: 테이블 미생성 외의 조회 실패 (호출 측은 이번 확인만 건너뜀)
+        """
+        self._ensure_initialized()
+        if self._corpus_version_table:
+            try:
+                result = self.sb.table("legal_corpus_version")\
+                    .select("version")\
+                    .eq("id", 1)\
+                    .limit(1)\
+                    .execute()
+                if result.data:
+                    return f"v{result.data[0]['version']}"
+            except Exception as e:
+                error_str = str(e)
+                # 테이블 미생성(42P01 / PGRST205)일 때만 행 수 기준 버전으로 전환
+                # 일시적 오류는 그대로 올려 이번 확인만 건너뜀 (버전 형식이 바뀌면 캐시가 불필요하게 비워짐)
+                if not ("42P01" in error_str or "PGRST205" in error_str or "does not exist" in error_str):
+                    raise
+                self._corpus_version_table = False
+                print(f"[경고] legal_corpus_version 테이블 없음, 행 수 기준 버전 사용: {error_str}")
+
+        count_resp = self.sb.table("legal_chunks").select("id", count="exact").limit(1).execute()
+        latest_resp = self.sb.table("legal_chunks")\
+            .select("created_at")\
+            .order("created_at", desc=True)\
+            .limit(1)\
+            .execute()
+        latest = latest_resp.data[0].get("created_at") if latest_resp.data else ""
+        return f"{count_resp.count or 0}:{latest}"
+
+    def bump_legal_corpus_version(self) -> Optional[int]:
+        """
+        legal_chunks 코퍼스 버전 올리기 (인덱싱 스크립트가 작업 후 호출, 서버 검색 캐시가 다음 버전 확인 때 비워짐)
+
+        Returns:
+            새 버전 번호 (RPC가 없으면 None)
+        """
+        self._ensure_initialized()
+        try:
+            result = self.sb.rpc("bump_legal_corpus_version", {}).execute()
+            return result.data
+        except Exception as e:
+            print(
+                f"[경고] bump_legal_corpus_version RPC 실패 "
+                f"(backend/scripts/create_legal_corpus_version.sql 실행 필요): {str(e)}"
+            )
+            return None
+
+    def get_snippet_analyses(self, snippet_hashes: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        사전 계산된 snippet 분석 결과 일괄 조회
+
+        Args:
+            snippet_hashes: snippet_analyzer.snippet_hash() 값 목록
+
+        Returns:
+            {snippet_hash: {core_clause, easy_summary, action_tip}} (저장된 것만)
+        """
+        self._ensure_initialized()
+        hashes = list(dict.fromkeys(h for h in snippet_hashes if h))
+        found: Dict[str, Dict[str, Any]] = {}
+        # in_ 필터는 URL 길이 제한이 있으므로 나눠서 조회
+        for i in range(0, len(hashes), 200):
+            result = self.sb.table("legal_snippet_analyses")\
+                .select("snippet_hash, analysis")\
+                .in_("snippet_hash", hashes[i:i + 200])\
+                .execute()
+            for row in result.data or []:
+                if row.get("analysis"):
+                    found[row["snippet_hash"]] = row["analysis"]
+        return found
+
+    def upsert_snippet_analyses(
+        self,
+        rows: List[Dict[str, Any]],
+        page_size: int = 200
+    ) -> int:
+        """
+        snippet 분석 결과 일괄 저장 (snippet_hash 기준 upsert)
+
+        Args:
+            rows: [{snippet_hash: str, chunk_id: Optional[str], analysis: Dict, model: str}]
+            page_size: 한 번에 upsert할 행 수
+
+        Returns:
+            저장한 행 수
+        """
+        self._ensure_initialized()
+        if not rows:
+            return 0
+
+        payload = [
+            {
+                "snippet_hash": r["snippet_hash"],
+                "chunk_id": r.get("chunk_id"),
+                "analysis": r["analysis"],
+                "model": r.get("model"),
+                "updated_at": "now()",
+            }
+            for r in rows
+        ]
+        for i in range(0, len(payload), page_size):
+            self.sb.table("legal_snippet_analyses")\
+                .upsert(payload[i:i + page_size], on_conflict="snippet_hash")\
+                .execute()
+        return len(payload)
+
     def bulk_upsert_legal_chunks(
         self,
         chunks: List[Dict[str, Any]]
@@ -737,17 +1116,22 @@ class SupabaseVectorStore:
                             print(f"[경고] 기존 청크 삭제 실패: {str(e)}")
             
             # 새 청크 삽입
-            self.sb.table("legal_chunks")\
-                .insert(payload)\
-                .execute()
+            self._insert_chunk_rows("legal_chunks", "insert_legal_chunks_b64", payload)
+            
+            # 재인덱싱된 문서의 케이스 metadata 캐시 무효화
+            for p in payload:
+                self._case_metadata_cache.pop(p["external_id"], None)
+            
+            # 로컬 legal 인덱스 재로딩 예약
+            if settings.use_legal_local_index:
+                from core.legal_vector_index import get_legal_chunk_index
+                get_legal_chunk_index().mark_stale()
         except Exception as e:
             error_msg = str(e)
             if "Could not find the table" in error_msg or "PGRST205" in error_msg:
                 print(f"[경고] 스키마 캐시 문제 감지, 클라이언트 재초기화 중...")
                 self._reinitialize_client()
-                self.sb.table("legal_chunks")\
-                    .insert(payload)\
-                    .execute()
+                self._insert_chunk_rows("legal_chunks", "insert_legal_chunks_b64", payload)
             else:
                 raise
     
@@ -762,11 +1146,12 @@ class SupabaseVectorStore:
         
         DB에서 벡터 연산 + 정렬 + top_k까지 한 방에 처리하여 성능 최적화.
         Python에서는 결과만 받아서 사용.
+        settings.use_legal_local_index가 켜져 있으면 로컬 인덱스(core.legal_vector_index)를 먼저 사용.
         
         Args:
             query_embedding: 쿼리 임베딩 벡터 (1024차원, list[float])
             top_k: 반환할 최대 개수
-            filters: 필터 (예: {"topic_main": "wage"})
+            filters: 필터 (예: {"topic_main": "wage"}, 로컬 인덱스는 {"source_type": "case"}도 적용)
         
         Returns:
             [{
@@ -781,6 +1166,25 @@ class SupabaseVectorStore:
                 score: float (similarity, 이미 정렬됨)
             }]
         """
+        # match_threshold 설정
+        # Python에서 최종 threshold(0.4) 체크를 하므로, RPC에서는 낮게 설정하여 후보를 더 받음
+        match_threshold = 0.3
+        
+        # 로컬 인덱스 사용 시 네트워크 왕복 없이 검색 (준비 전/실패 시 RPC로 fallback)
+        if settings.use_legal_local_index:
+            try:
+                from core.legal_vector_index import get_legal_chunk_index
+                local_rows = get_legal_chunk_index().search(
+                    query_embedding=query_embedding,
+                    top_k=top_k,
+                    filters=filters,
+                    match_threshold=match_threshold,
+                )
+                if local_rows is not None:
+                    return local_rows
+            except Exception as e:
+                print(f"[경고] 로컬 legal 인덱스 검색 실패, RPC로 전환: {str(e)}")
+        
         self._ensure_initialized()
         
         try:
@@ -789,9 +1193,46 @@ class SupabaseVectorStore:
             if filters and "topic_main" in filters:
                 category = filters["topic_main"]
             
-            # match_threshold 설정
-            # Python에서 최종 threshold(0.4) 체크를 하므로, RPC에서는 낮게 설정하여 후보를 더 받음
-            match_threshold = 0.3
+            # 2단계 검색: 서버에서 binary 해밍 거리로 후보를 추린 뒤 float32로 재계산
+            if settings.legal_search_two_stage and compact_rpc_enabled("match_legal_chunks_two_stage"):
+                dtype = transport_dtype()
+                try:
+                    response = self.sb.rpc(
+                        "match_legal_chunks_two_stage",
+                        {
+                            "query_embedding_b64": encode_vector(query_embedding, dtype),
+                            "match_threshold": match_threshold,
+                            "match_count": top_k,
+                            "category": category,
+                            "candidate_count": settings.legal_two_stage_candidates,
+                            "dtype": dtype,
+                        }
+                    ).execute()
+                    return response.data if response.data else []
+                except Exception as e:
+                    if not is_missing_rpc_error(e, "match_legal_chunks_two_stage"):
+                        raise
+                    disable_compact_rpc("match_legal_chunks_two_stage", e)
+            
+            # compact 전송: 쿼리 임베딩을 base64로 보내고 서버에서 디코드
+            if compact_rpc_enabled("match_legal_chunks_b64"):
+                dtype = transport_dtype()
+                try:
+                    response = self.sb.rpc(
+                        "match_legal_chunks_b64",
+                        {
+                            "query_embedding_b64": encode_vector(query_embedding, dtype),
+                            "match_threshold": match_threshold,
+                            "match_count": top_k,
+                            "category": category,
+                            "dtype": dtype,
+                        }
+                    ).execute()
+                    return response.data if response.data else []
+                except Exception as e:
+                    if not is_missing_rpc_error(e, "match_legal_chunks_b64"):
+                        raise
+                    disable_compact_rpc("match_legal_chunks_b64", e)
             
             # RPC 함수 호출 - DB에서 벡터 연산 + 정렬 + top_k 처리
             response = self.sb.rpc(
@@ -842,59 +1283,21 @@ class SupabaseVectorStore:
         Returns:
             Public URL 또는 None (파일이 없거나 오류 발생 시)
         """
-        self._ensure_initialized()
-        
         if not external_id:
             return None
         
-        # 모든 자료(case, manual, law, standard_contract)는 legal-sources 버킷에 있음
-        # 버킷 이름을 legal-sources로 고정
-        bucket_name = "legal-sources"
-        
-        # file_path_override가 있으면 직접 사용
-        if file_path_override:
-            file_path = file_path_override
-        else:
-            # source_type에 따른 버킷 경로 매핑
-            bucket_map = {
-                'law': 'laws',
-                'manual': 'manuals',
-                'case': 'cases',
-                'standard_contract': 'standard_contracts',
-            }
-            bucket_folder = bucket_map.get(source_type, 'laws')
-            # external_id에 이미 .pdf가 포함되어 있으면 추가하지 않음
-            if external_id.lower().endswith('.pdf'):
-                file_path = f"{bucket_folder}/{external_id}"
-            else:
-                file_path = f"{bucket_folder}/{external_id}.pdf"
-        
+        # SDK 호출 없이 캐시된 base URL + 경로 테이블로 생성 (core.file_utils.StorageUrlResolver)
         try:
-            # 방법 1: Supabase Python SDK의 get_public_url 메서드 사용 시도
-            try:
-                public_url = self.sb.storage.from_(bucket_name).get_public_url(file_path)
-                if public_url:
-                    return public_url
-            except (AttributeError, Exception) as sdk_error:
-                # get_public_url 메서드가 없거나 실패한 경우 직접 URL 조합
-                pass
-            
-            # 방법 2: 직접 Public URL 조합
-            supabase_url = os.getenv("SUPABASE_URL") or settings.supabase_url
-            if not supabase_url:
-                import logging
-                logger = logging.getLogger(__name__)
-                logger.warning(f"SUPABASE_URL이 설정되지 않아 Public URL 생성 실패")
-                return None
-            
-            # Public URL 형식: {supabase_url}/storage/v1/object/public/{bucket}/{path}
-            public_url = f"{supabase_url.rstrip('/')}/storage/v1/object/public/{bucket_name}/{file_path}"
-            return public_url
-            
+            from core.file_utils import get_storage_url_resolver
+            return get_storage_url_resolver().resolve(
+                external_id=external_id,
+                source_type=source_type,
+                file_path_override=file_path_override,
+            )
         except Exception as e:
             import logging
             logger = logging.getLogger(__name__)
-            logger.warning(f"스토리지 Public URL 생성 실패 (external_id={external_id}, source_type={source_type}, bucket={bucket_name}): {str(e)}")
+            logger.warning(f"스토리지 Public URL 생성 실패 (external_id={external_id}, source_type={source_type}): {str(e)}")
             return None
     
     def search_similar_contract_chunks(
@@ -932,103 +1335,55 @@ class SupabaseVectorStore:
         self._ensure_initialized()
         
         try:
-            # 필터 조건 구성
-            query = self.sb.table("contract_chunks")\
-                .select("id, contract_id, article_number, paragraph_index, content, chunk_index, metadata, embedding")\
-                .eq("contract_id", contract_id)
-            
-            # article_number 필터
-            if filters and "article_number" in filters:
-                query = query.eq("article_number", filters["article_number"])
-            
-            # 모든 청크 조회
-            result = query.limit(1000).execute()
-            
-            if not result.data:
-                return []
-            
-            # 벡터 유사도 계산
-            import numpy as np
-            import json
-            
-            # query_embedding을 numpy 배열로 변환
+            query_vec = parse_vector(query_embedding)
+        except Exception as e:
+            print(f"[경고] 쿼리 임베딩 변환 실패: {str(e)}")
+            return []
+        if query_vec is None or query_vec.size == 0:
+            print(f"[경고] 쿼리 임베딩이 비어있습니다.")
+            return []
+        
+        # compact 전송: DB에서 유사도 계산 (청크 임베딩을 내려받지 않음)
+        if compact_rpc_enabled("match_contract_chunks_b64"):
+            dtype = transport_dtype()
+            # 최소 유사도(0.5)는 boosting 적용 후 기준이므로, 가점 대상 조항이 걸러지지 않게 RPC threshold를 낮춤
+            rpc_threshold = 0.5 / boost_factor if boost_article is not None and boost_factor > 1 else 0.5
             try:
-                if isinstance(query_embedding, str):
-                    try:
-                        query_embedding = json.loads(query_embedding)
-                    except json.JSONDecodeError:
-                        try:
-                            import ast
-                            query_embedding = ast.literal_eval(query_embedding)
-                        except:
-                            print(f"[경고] 쿼리 임베딩 파싱 실패")
-                            return []
-                
-                if not isinstance(query_embedding, (list, np.ndarray)):
-                    print(f"[경고] 쿼리 임베딩이 리스트가 아닙니다: {type(query_embedding)}")
-                    return []
-                
-                query_vec = np.array(query_embedding, dtype=np.float32)
-                
-                if len(query_vec) == 0:
-                    print(f"[경고] 쿼리 임베딩이 비어있습니다.")
-                    return []
-                
+                response = self.sb.rpc(
+                    "match_contract_chunks_b64",
+                    {
+                        "contract_id_param": contract_id,
+                        "query_embedding_b64": encode_vector(query_vec, dtype),
+                        "match_threshold": rpc_threshold,
+                        "match_count": top_k,
+                        "article_number_filter": (filters or {}).get("article_number"),
+                        "boost_article": boost_article,
+                        "boost_factor": boost_factor,
+                        "dtype": dtype,
+                    }
+                ).execute()
+                return [
+                    {
+                        "id": row.get("id"),
+                        "contract_id": row.get("contract_id"),
+                        "article_number": row.get("article_number"),
+                        "paragraph_index": row.get("paragraph_index"),
+                        "content": row.get("content", ""),
+                        "chunk_index": row.get("chunk_index", 0),
+                        "metadata": row.get("metadata", {}),
+                        "score": float(row.get("similarity", 0.0)),
+                    }
+                    for row in (response.data or [])
+                    if float(row.get("similarity", 0.0)) > 0.5
+                ]
             except Exception as e:
-                print(f"[경고] 쿼리 임베딩 변환 실패: {str(e)}")
-                return []
-            
-            # 각 청크와의 유사도 계산
-            results = []
-            for chunk in result.data:
-                if not chunk.get("embedding"):
-                    continue
-                
-                try:
-                    chunk_embedding = chunk["embedding"]
-                    if isinstance(chunk_embedding, str):
-                        chunk_embedding = json.loads(chunk_embedding)
-                    
-                    chunk_vec = np.array(chunk_embedding, dtype=np.float32)
-                    
-                    # 코사인 유사도 계산
-                    dot_product = np.dot(query_vec, chunk_vec)
-                    norm_query = np.linalg.norm(query_vec)
-                    norm_chunk = np.linalg.norm(chunk_vec)
-                    
-                    if norm_query == 0 or norm_chunk == 0:
-                        continue
-                    
-                    similarity = float(dot_product / (norm_query * norm_chunk))
-                    
-                    # Issue 기반 boosting: 같은 조항이면 가점
-                    if boost_article is not None:
-                        chunk_article = chunk.get("article_number")
-                        if chunk_article == boost_article:
-                            similarity *= boost_factor
-                    
-                    # 최소 유사도 임계값 (0.5)
-                    if similarity > 0.5:
-                        results.append({
-                            "id": chunk.get("id"),
-                            "contract_id": chunk.get("contract_id"),
-                            "article_number": chunk.get("article_number"),
-                            "paragraph_index": chunk.get("paragraph_index"),
-                            "content": chunk.get("content", ""),
-                            "chunk_index": chunk.get("chunk_index", 0),
-                            "metadata": chunk.get("metadata", {}),
-                            "score": similarity
-                        })
-                
-                except Exception as e:
-                    print(f"[경고] 청크 유사도 계산 실패: {str(e)}")
-                    continue
-            
-            # 유사도 순 정렬
-            results.sort(key=lambda x: x["score"], reverse=True)
-            
-            return results[:top_k]
+                if is_missing_rpc_error(e, "match_contract_chunks_b64"):
+                    disable_compact_rpc("match_contract_chunks_b64", e)
+                else:
+                    print(f"[경고] match_contract_chunks_b64 검색 실패, 청크 직접 조회로 전환: {str(e)}")
         
+        try:
+            return self._scan_contract_chunks(contract_id, query_vec, top_k, filters, boost_article, boost_factor)
         except Exception as e:
             error_msg = str(e)
             # 테이블이 없는 경우 재시도
@@ -1036,94 +1391,7 @@ class SupabaseVectorStore:
                 print(f"[경고] contract_chunks 테이블을 찾을 수 없습니다. 스키마 캐시 갱신 중...")
                 self._reinitialize_client()
                 try:
-                    # 재시도
-                    query = self.sb.table("contract_chunks")\
-                        .select("id, contract_id, article_number, paragraph_index, content, chunk_index, metadata, embedding")\
-                        .eq("contract_id", contract_id)
-                    
-                    if filters and "article_number" in filters:
-                        query = query.eq("article_number", filters["article_number"])
-                    
-                    result = query.limit(1000).execute()
-                    
-                    if not result.data:
-                        return []
-                    
-                    # 벡터 유사도 계산 (위의 로직과 동일)
-                    import numpy as np
-                    import json
-                    
-                    try:
-                        if isinstance(query_embedding, str):
-                            try:
-                                query_embedding = json.loads(query_embedding)
-                            except json.JSONDecodeError:
-                                try:
-                                    import ast
-                                    query_embedding = ast.literal_eval(query_embedding)
-                                except:
-                                    print(f"[경고] 쿼리 임베딩 파싱 실패")
-                                    return []
-                        
-                        if not isinstance(query_embedding, (list, np.ndarray)):
-                            print(f"[경고] 쿼리 임베딩이 리스트가 아닙니다: {type(query_embedding)}")
-                            return []
-                        
-                        query_vec = np.array(query_embedding, dtype=np.float32)
-                        
-                        if len(query_vec) == 0:
-                            print(f"[경고] 쿼리 임베딩이 비어있습니다.")
-                            return []
-                        
-                    except Exception as e2:
-                        print(f"[경고] 쿼리 임베딩 변환 실패: {str(e2)}")
-                        return []
-                    
-                    results = []
-                    for chunk in result.data:
-                        if not chunk.get("embedding"):
-                            continue
-                        
-                        try:
-                            chunk_embedding = chunk["embedding"]
-                            if isinstance(chunk_embedding, str):
-                                chunk_embedding = json.loads(chunk_embedding)
-                            
-                            chunk_vec = np.array(chunk_embedding, dtype=np.float32)
-                            
-                            dot_product = np.dot(query_vec, chunk_vec)
-                            norm_query = np.linalg.norm(query_vec)
-                            norm_chunk = np.linalg.norm(chunk_vec)
-                            
-                            if norm_query == 0 or norm_chunk == 0:
-                                continue
-                            
-                            similarity = float(dot_product / (norm_query * norm_chunk))
-                            
-                            if boost_article is not None:
-                                chunk_article = chunk.get("article_number")
-                                if chunk_article == boost_article:
-                                    similarity *= boost_factor
-                            
-                            if similarity > 0.5:
-                                results.append({
-                                    "id": chunk.get("id"),
-                                    "contract_id": chunk.get("contract_id"),
-                                    "article_number": chunk.get("article_number"),
-                                    "paragraph_index": chunk.get("paragraph_index"),
-                                    "content": chunk.get("content", ""),
-                                    "chunk_index": chunk.get("chunk_index", 0),
-                                    "metadata": chunk.get("metadata", {}),
-                                    "score": similarity
-                                })
-                        
-                        except Exception as e2:
-                            print(f"[경고] 청크 유사도 계산 실패: {str(e2)}")
-                            continue
-                    
-                    results.sort(key=lambda x: x["score"], reverse=True)
-                    return results[:top_k]
-                    
+                    return self._scan_contract_chunks(contract_id, query_vec, top_k, filters, boost_article, boost_factor)
                 except Exception as e2:
                     print(f"[경고] 계약서 청크 검색 재시도 실패: {str(e2)}")
                     print(f"[해결] contract_chunks 테이블이 생성되어 있는지 확인하세요.")
@@ -1133,6 +1401,79 @@ class SupabaseVectorStore:
                 print(f"[경고] 계약서 청크 검색 오류: {error_msg}")
                 return []
     
+    def _scan_contract_chunks(
+        self,
+        contract_id: str,
+        query_vec: np.ndarray,
+        top_k: int,
+        filters: Optional[Dict[str, Any]],
+        boost_article: Optional[int],
+        boost_factor: float,
+    ) -> List[Dict[str, Any]]:
+        """
+        계약서 청크를 임베딩과 함께 조회해 클라이언트에서 코사인 유사도 계산
+        (match_contract_chunks_b64 RPC가 없을 때 사용)
+        """
+        query = self.sb.table("contract_chunks")\
+            .select("id, contract_id, article_number, paragraph_index, content, chunk_index, metadata, embedding")\
+            .eq("contract_id", contract_id)
+        
+        # article_number 필터
+        if filters and "article_number" in filters:
+            query = query.eq("article_number", filters["article_number"])
+        
+        # 모든 청크 조회
+        result = query.limit(1000).execute()
+        if not result.data:
+            return []
+        
+        norm_query = np.linalg.norm(query_vec)
+        if norm_query == 0:
+            return []
+        
+        chunks, vectors = [], []
+        for chunk in result.data:
+            try:
+                chunk_vec = parse_vector(chunk.get("embedding"))
+            except Exception as e:
+                print(f"[경고] 청크 임베딩 파싱 실패: {str(e)}")
+                continue
+            if chunk_vec is None or chunk_vec.shape != query_vec.shape:
+                continue
+            chunks.append(chunk)
+            vectors.append(chunk_vec)
+        if not vectors:
+            return []
+        
+        # 코사인 유사도 (행렬 한 번에 계산)
+        matrix = np.vstack(vectors)
+        norms = np.linalg.norm(matrix, axis=1)
+        norms[norms == 0] = np.inf
+        similarities = (matrix @ query_vec) / (norms * norm_query)
+        
+        results = []
+        for chunk, similarity in zip(chunks, similarities.tolist()):
+            # Issue 기반 boosting: 같은 조항이면 가점
+            if boost_article is not None and chunk.get("article_number") == boost_article:
+                similarity *= boost_factor
+            
+            # 최소 유사도 임계값 (0.5)
+            if similarity > 0.5:
+                results.append({
+                    "id": chunk.get("id"),
+                    "contract_id": chunk.get("contract_id"),
+                    "article_number": chunk.get("article_number"),
+                    "paragraph_index": chunk.get("paragraph_index"),
+                    "content": chunk.get("content", ""),
+                    "chunk_index": chunk.get("chunk_index", 0),
+                    "metadata": chunk.get("metadata", {}),
+                    "score": similarity
+                })
+        
+        # 유사도 순 정렬
+        results.sort(key=lambda x: x["score"], reverse=True)
+        return results[:top_k]
+    
     def bulk_upsert_contract_chunks(
         self,
         contract_id: str,
@@ -1193,9 +1534,7 @@ class SupabaseVectorStore:
             })
         
         try:
-            self.sb.table("contract_chunks")\
-                .insert(payload)\
-                .execute()
+            self._insert_chunk_rows("contract_chunks", "insert_contract_chunks_b64", payload)
         except Exception as e:
             error_msg = str(e)
             if "Could not find the table" in error_msg or "PGRST205" in error_msg:
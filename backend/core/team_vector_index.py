@@ -0,0 +1,371 @@
+"""
+Team Vector Index - team_embeddings 인프로세스 벡터 인덱스
+모든 팀 임베딩을 정규화된 float32 행렬로 메모리에 유지하고 (updated_at 기준 증분 갱신),
+meta 사전 필터(전문 분야) + 벡터화된 top-k로 공고-팀 매칭
+- search: 공고 1건
+- search_many: 공고 여러 건을 한 번의 행렬곱으로 매칭
+"""
+
+from typing import List, Dict, Any, Optional, Tuple, Iterable
+from dataclasses import dataclass, field
+import json
+import threading
+import time
+import logging
+
+import numpy as np
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# 검색 결과로 반환하는 컬럼 (match_team_embeddings RPC 반환 컬럼과 동일)
+ROW_COLUMNS = ["team_id", "summary", "meta"]
+
+# 한 번에 가져올 행 수 (PostgREST 기본 max-rows)
+PAGE_SIZE = 1000
+
+# 팀 매칭 최소 코사인 유사도 (match_team_embeddings RPC 호출 값과 동일)
+TEAM_MATCH_THRESHOLD = 0.7
+
+
+def _as_list(value: Any) -> List[Any]:
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple, set)):
+        return [v for v in value if v is not None]
+    return [value]
+
+
+def _parse_embedding(emb: Any) -> Optional[np.ndarray]:
+    if not emb:
+        return None
+    # PostgREST는 vector 컬럼을 "[0.1,0.2,...]" 문자열로 반환
+    if isinstance(emb, str):
+        emb = json.loads(emb)
+    return np.asarray(emb, dtype=np.float32)
+
+
+@dataclass
+class _TeamSnapshot:
+    """불변 팀 인덱스 스냅샷 (교체는 참조 할당으로 원자적으로 수행)"""
+    rows: List[Dict[str, Any]]
+    matrix: np.ndarray  # (N, D) float32, 행 단위 L2 정규화
+    max_updated_at: Optional[str]
+    positions: Dict[int, int] = field(default_factory=dict)  # team_id -> 행 번호
+    specialty_postings: Dict[str, np.ndarray] = field(default_factory=dict)  # 전문 분야 -> 행 번호
+    _mask_cache: Dict[Tuple, Optional[np.ndarray]] = field(default_factory=dict)
+
+    @property
+    def size(self) -> int:
+        return len(self.rows)
+
+    @classmethod
+    def build(cls, rows: List[Dict[str, Any]], vectors: List[np.ndarray], max_updated_at: Optional[str]) -> "_TeamSnapshot":
+        matrix = np.vstack(vectors).astype(np.float32, copy=False) if vectors else np.zeros((0, 0), dtype=np.float32)
+        if matrix.size:
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            matrix = np.ascontiguousarray(matrix / norms)
+
+        postings: Dict[str, List[int]] = {}
+        for i, row in enumerate(rows):
+            meta = row.get("meta") or {}
+            for specialty in set(_as_list(meta.get("specialty")) + _as_list(meta.get("sub_specialty"))):
+                postings.setdefault(str(specialty), []).append(i)
+
+        return cls(
+            rows=rows,
+            matrix=matrix,
+            max_updated_at=max_updated_at,
+            positions={row["team_id"]: i for i, row in enumerate(rows)},
+            specialty_postings={k: np.asarray(v, dtype=np.int64) for k, v in postings.items()},
+        )
+
+    def filter_mask(self, filters: Optional[Dict[str, Any]]) -> Optional[np.ndarray]:
+        """
+        meta 사전 필터 마스크 (필터 없으면 None)
+
+        - specialty: 값 중 하나라도 meta.specialty/sub_specialty에 있으면 통과
+          (meta는 sync_team_embeddings.generate_team_summary가 teams 컬럼으로 채움: specialty, sub_specialty, prefered)
+        """
+        if not filters:
+            return None
+        specialties = tuple(sorted(str(s) for s in _as_list(filters.get("specialty"))))
+        key = (specialties,)
+        if key in self._mask_cache:
+            return self._mask_cache[key]
+
+        mask = None
+        if specialties:
+            mask = np.zeros(self.size, dtype=bool)
+            for specialty in specialties:
+                posting = self.specialty_postings.get(specialty)
+                if posting is not None:
+                    mask[posting] = True
+
+        self._mask_cache[key] = mask
+        return mask
+
+
+class TeamVectorIndex:
+    """
+    team_embeddings 로컬 벡터 인덱스
+
+    - 첫 로딩은 전체 조회, 이후 refresh_interval마다 updated_at이 바뀐 행만 조회해서 병합
+    - 원격 행 수가 병합 결과와 다르면 (팀 삭제 등) 전체 재로딩
+    - 로딩 전/실패 시 search()는 None을 반환하고, 호출부는 match_team_embeddings RPC로 fallback
+    """
+
+    def __init__(self, refresh_interval: float = 60.0):
+        """
+        Args:
+            refresh_interval: 증분 갱신 주기 (초)
+        """
+        self.refresh_interval = refresh_interval
+        self._snapshot: Optional[_TeamSnapshot] = None
+        self._vector_store = None
+        self._lock = threading.Lock()
+        self._loading = False
+        self._stale = True
+        self._last_check = 0.0
+
+    @property
+    def ready(self) -> bool:
+        return self._snapshot is not None
+
+    @property
+    def size(self) -> int:
+        return self._snapshot.size if self._snapshot else 0
+
+    def _get_client(self):
+        if self._vector_store is None:
+            from core.supabase_vector_store import SupabaseVectorStore
+            self._vector_store = SupabaseVectorStore()
+        self._vector_store._ensure_initialized()
+        return self._vector_store.sb
+
+    # ------------------------------------------------------------------
+    # 로딩 / 갱신
+    # ------------------------------------------------------------------
+
+    def mark_stale(self) -> None:
+        """다음 검색 시 증분 갱신 예약 (팀 임베딩 저장 후 호출)"""
+        self._stale = True
+
+    def ensure_fresh(self, block: bool = False) -> None:
+        """
+        refresh_interval이 지났거나 stale이면 증분 갱신
+
+        Args:
+            block: True면 현재 스레드에서 갱신 (첫 로딩/배치 매칭용)
+        """
+        now = time.monotonic()
+        if not self._stale and now - self._last_check < self.refresh_interval:
+            return
+
+        with self._lock:
+            if self._loading:
+                return
+            self._loading = True
+            self._last_check = now
+            self._stale = False
+
+        if block:
+            self._refresh()
+        else:
+            threading.Thread(target=self._refresh, name="team-index-refresh", daemon=True).start()
+
+    def _refresh(self) -> None:
+        try:
+            started = time.perf_counter()
+            snapshot = self._snapshot
+            if snapshot is None or snapshot.max_updated_at is None:
+                self._snapshot = self._load_full()
+                logger.info(
+                    f"[TeamIndex] team_embeddings 로딩 완료: {self._snapshot.size}개, "
+                    f"{time.perf_counter() - started:.2f}초"
+                )
+                return
+
+            changed_rows, changed_vectors, max_updated_at = self._fetch_rows(since=snapshot.max_updated_at)
+            remote_count = self._fetch_remote_count()
+            if not changed_rows and remote_count == snapshot.size:
+                return
+
+            merged = self._merge(snapshot, changed_rows, changed_vectors, max_updated_at)
+            if merged.size != remote_count:
+                # 삭제된 팀이 있으면 증분 병합으로는 알 수 없으므로 전체 재로딩
+                merged = self._load_full()
+            self._snapshot = merged
+            logger.info(
+                f"[TeamIndex] 증분 갱신: 변경 {len(changed_rows)}개, 전체 {merged.size}개, "
+                f"{time.perf_counter() - started:.2f}초"
+            )
+        except Exception as e:
+            logger.warning(f"[TeamIndex] 인덱스 갱신 실패: {str(e)}")
+        finally:
+            self._loading = False
+
+    def _fetch_remote_count(self) -> int:
+        """임베딩이 있는 team_embeddings 행 수 (_fetch_rows가 건너뛰는 null 임베딩은 제외해야 스냅샷 크기와 비교 가능)"""
+        sb = self._get_client()
+        resp = sb.table("team_embeddings")\
+            .select("team_id", count="exact")\
+            .not_.is_("embedding", "null")\
+            .limit(1)\
+            .execute()
+        return resp.count or 0
+
+    def _fetch_rows(
+        self,
+        since: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], List[np.ndarray], Optional[str]]:
+        """team_embeddings 조회 (since가 있으면 updated_at > since인 행만)"""
+        sb = self._get_client()
+        columns = ", ".join(ROW_COLUMNS + ["embedding", "updated_at"])
+        rows: List[Dict[str, Any]] = []
+        vectors: List[np.ndarray] = []
+        max_updated_at = since
+        start = 0
+        while True:
+            query = sb.table("team_embeddings").select(columns)
+            if since:
+                query = query.gt("updated_at", since)
+            resp = query.order("team_id").range(start, start + PAGE_SIZE - 1).execute()
+            page = resp.data or []
+            for r in page:
+                updated_at = r.get("updated_at")
+                if updated_at and (max_updated_at is None or updated_at > max_updated_at):
+                    max_updated_at = updated_at
+                vector = _parse_embedding(r.get("embedding"))
+                if vector is None:
+                    continue
+                vectors.append(vector)
+                rows.append({k: r.get(k) for k in ROW_COLUMNS})
+            if len(page) < PAGE_SIZE:
+                break
+            start += PAGE_SIZE
+        return rows, vectors, max_updated_at
+
+    def _load_full(self) -> _TeamSnapshot:
+        rows, vectors, max_updated_at = self._fetch_rows()
+        return _TeamSnapshot.build(rows, vectors, max_updated_at)
+
+    @staticmethod
+    def _merge(
+        snapshot: _TeamSnapshot,
+        changed_rows: List[Dict[str, Any]],
+        changed_vectors: List[np.ndarray],
+        max_updated_at: Optional[str]
+    ) -> _TeamSnapshot:
+        """기존 스냅샷에 변경 행을 덮어쓰기/추가한 새 스냅샷 (기존 스냅샷은 수정하지 않음)"""
+        rows = list(snapshot.rows)
+        vectors = list(snapshot.matrix) if snapshot.size else []
+        for row, vector in zip(changed_rows, changed_vectors):
+            pos = snapshot.positions.get(row["team_id"])
+            if pos is None:
+                rows.append(row)
+                vectors.append(vector)
+            else:
+                rows[pos] = row
+                vectors[pos] = vector
+        return _TeamSnapshot.build(rows, vectors, max_updated_at)
+
+    # ------------------------------------------------------------------
+    # 검색
+    # ------------------------------------------------------------------
+
+    def search(
+        self,
+        query_embedding: List[float],
+        top_k: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+        match_threshold: float = 0.0,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        공고 1건 → 유사 팀 top-k
+
+        Returns:
+            [{team_id, summary, meta, similarity}] (similarity 내림차순),
+            인덱스가 준비되지 않았으면 None
+        """
+        results = self.search_many([query_embedding], top_k=top_k, filters=filters, match_threshold=match_threshold)
+        return results[0] if results is not None else None
+
+    def search_many(
+        self,
+        query_embeddings: Iterable[List[float]],
+        top_k: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+        match_threshold: float = 0.0,
+    ) -> Optional[List[List[Dict[str, Any]]]]:
+        """
+        공고 여러 건 → 유사 팀 top-k (한 번의 행렬곱)
+
+        Args:
+            query_embeddings: 공고 쿼리 임베딩 목록
+            top_k: 공고당 반환할 최대 팀 수
+            filters: meta 사전 필터 (모든 공고에 공통 적용)
+            match_threshold: 최소 코사인 유사도
+
+        Returns:
+            공고 순서대로 결과 리스트, 인덱스가 준비되지 않았으면 None
+        """
+        self.ensure_fresh()
+        snapshot = self._snapshot
+        if snapshot is None:
+            return None
+
+        queries = np.asarray(list(query_embeddings), dtype=np.float32)
+        if queries.ndim != 2 or queries.shape[0] == 0:
+            return []
+        if snapshot.size == 0 or top_k <= 0 or queries.shape[1] != snapshot.matrix.shape[1]:
+            return [[] for _ in range(queries.shape[0])]
+
+        norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        queries = queries / norms
+
+        mask = snapshot.filter_mask(filters)
+        candidates = np.flatnonzero(mask) if mask is not None else None
+        if candidates is not None and candidates.size == 0:
+            return [[] for _ in range(queries.shape[0])]
+
+        matrix = snapshot.matrix if candidates is None else snapshot.matrix[candidates]
+        scores = queries @ matrix.T  # (M, C)
+        k = min(top_k, scores.shape[1])
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+        results: List[List[Dict[str, Any]]] = []
+        for row_idx, row_scores in zip(top, top_scores):
+            matches = []
+            for i, score in zip(row_idx, row_scores):
+                if score < match_threshold:
+                    continue
+                pos = int(candidates[i]) if candidates is not None else int(i)
+                row = dict(snapshot.rows[pos])
+                row["similarity"] = float(score)
+                matches.append(row)
+            results.append(matches)
+        return results
+
+
+_team_vector_index: Optional[TeamVectorIndex] = None
+
+
+def get_team_vector_index() -> TeamVectorIndex:
+    """
+    TeamVectorIndex 인스턴스 가져오기 (싱글톤)
+
+    Returns:
+        TeamVectorIndex 인스턴스
+    """
+    global _team_vector_index
+    if _team_vector_index is None:
+        _team_vector_index = TeamVectorIndex(refresh_interval=settings.team_index_refresh_interval)
+    return _team_vector_index
@@ -11,6 +11,8 @@ from difflib import SequenceMatcher
 
 from .base_tool import BaseTool
 from ..legal_chunker import LegalChunker, Section
+from ..clause_extractor import NormalizedText
+from ..keyword_matcher import CONTRACT_KEYWORD_MATCHER
 
 logger = logging.getLogger(__name__)
 
@@ -127,6 +129,7 @@ class ClauseLabelingTool(BaseTool):
         """
         sections = self.chunker.split_by_article(text)
         clauses = []
+        normalized_text: Optional[NormalizedText] = None
         
         for i, section in enumerate(sections):
             # 조 번호 추출
@@ -137,13 +140,19 @@ class ClauseLabelingTool(BaseTool):
             search_start = clauses[-1].end_index if clauses else 0
             full_text = section.title + "\n" + section.body
             
-            # 이전 조항 이후부터 검색하여 중복 제목 문제 해결
-            search_text = text[search_start:]
-            relative_start = search_text.find(section.title)
+            # 이전 조항 이후부터 검색하여 중복 제목 문제 해결 (슬라이스 복사 없이 검색)
+            start_index = text.find(section.title, search_start)
+            span = None
+            if start_index < 0:
+                # 공백/줄바꿈이 다른 경우 정규화 매칭 (원문 정규화/offset 매핑은 한 번만 생성)
+                if normalized_text is None:
+                    normalized_text = NormalizedText(text)
+                span = normalized_text.find(full_text, search_start)
             
-            if relative_start >= 0:
-                start_index = search_start + relative_start
+            if start_index >= 0:
                 end_index = start_index + len(full_text)
+            elif span:
+                start_index, end_index = span
             else:
                 # 찾지 못한 경우 전체 텍스트에서 검색 (fallback)
                 start_index = text.find(section.title)
@@ -184,25 +193,12 @@ class ClauseLabelingTool(BaseTool):
         return None
     
     def _infer_category(self, title: str, content: str) -> Optional[str]:
-        """카테고리 추정 (키워드 기반)"""
-        text = (title + " " + content).lower()
-        
-        # 키워드 매핑
-        category_keywords = {
-            "working_hours": ["근로시간", "근무시간", "야근", "연장근로", "휴게시간", "휴일", "주휴일"],
-            "wage": ["임금", "급여", "수당", "보너스", "상여금", "연봉", "월급"],
-            "probation_termination": ["수습", "인턴", "해고", "계약해지", "퇴직", "사직", "퇴사"],
-            "stock_option_ip": ["스톡옵션", "지분", "지적재산권", "저작권", "특허", "발명"],
-            "vacation": ["휴가", "연차", "병가", "경조사", "출산"],
-            "overtime": ["야근", "연장근로", "휴일근로", "야간근로"],
-            "benefits": ["복리후생", "보험", "퇴직금", "퇴직연금"]
-        }
-        
-        for category, keywords in category_keywords.items():
-            if any(keyword in text for keyword in keywords):
-                return category
-        
-        return None
+        """카테고리 추정 (키워드 기반, 공용 키워드 오토마톤으로 한 번만 스캔)"""
+        hits = CONTRACT_KEYWORD_MATCHER.find_all(f"{title} {content}", tables=("category",))
+        if not hits:
+            return None
+        # 카테고리 정의 순서가 빠른 것 우선 (core.keyword_matcher.CLAUSE_CATEGORY_KEYWORDS)
+        return min(hits, key=lambda h: h.priority).category
     
     def _map_issues_to_clauses(
         self,
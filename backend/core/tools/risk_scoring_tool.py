@@ -5,10 +5,15 @@ RiskScoringTool - 위험도 산정 도구
 
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
+import asyncio
+import json
 import logging
+import re
+import time
 
 from .base_tool import BaseTool
 from ..generator_v2 import LLMGenerator
+from ..keyword_matcher import CONTRACT_KEYWORD_MATCHER, RISK_KEYWORDS, KeywordHit
 
 # Provision과 MatchedProvision은 dict 형태로 받아서 처리
 
@@ -23,35 +28,14 @@ class ProvisionRisk:
     issue_type: str  # "missing" | "excessive" | "illegal" | "ambiguous" | "normal"
     severity: str  # "low" | "medium" | "high"
     reasons: List[str]  # 위험 사유
+    llm_latency_ms: Optional[float] = None  # LLM 평가 지연 (배치 지연을 배치 내 조항 수로 나눈 값, 미사용 시 None)
 
 
 class RiskScoringTool(BaseTool):
     """위험도 산정 도구 - 조항별 및 전체 위험도 계산"""
     
-    # 위험 키워드 및 점수
-    RISK_KEYWORDS = {
-        "illegal": {
-            "keywords": [
-                "일방적 해고", "임의 해고", "무조건 해고",
-                "손해배상 무제한", "비밀유지 영구", "경쟁금지 무기한",
-                "연장근로 수당 없음", "휴일근로 수당 없음"
-            ],
-            "score": 40
-        },
-        "ambiguous": {
-            "keywords": [
-                "적절한", "합리적인", "필요시", "가능한 범위 내",
-                "회사 사정에 따라", "추후 결정"
-            ],
-            "score": 20
-        },
-        "unfair": {
-            "keywords": [
-                "불리한 조건", "불공정", "일방적", "강제"
-            ],
-            "score": 30
-        }
-    }
+    # 위험 키워드 및 점수 (core.keyword_matcher 공용 테이블, 오토마톤은 import 시 컴파일)
+    RISK_KEYWORDS = RISK_KEYWORDS
     
     # 카테고리별 가중치
     CATEGORY_WEIGHTS = {
@@ -61,6 +45,11 @@ class RiskScoringTool(BaseTool):
         "stock_option_ip": 0.20
     }
     
+    # LLM 배치 평가 설정
+    LLM_BATCH_SIZE = 8  # 한 프롬프트에 넣을 조항 수
+    LLM_MAX_CONCURRENCY = 3  # 동시에 실행할 배치 수
+    LLM_SKIP_RULE_SCORE = 15.0  # 규칙 기반 점수가 이 값 미만이면 (위험 키워드 없음 + 표준 조항과 매칭) LLM 생략
+    
     def __init__(self):
         """도구 초기화"""
         self.generator = LLMGenerator()
@@ -80,6 +69,8 @@ class RiskScoringTool(BaseTool):
         legal_contexts: Optional[List[Dict[str, Any]]] = None,
         contract_type: str = "employment",
         use_llm: bool = True,
+        llm_batch_size: Optional[int] = None,
+        llm_concurrency: Optional[int] = None,
         **kwargs
     ) -> Dict[str, Any]:
         """
@@ -91,6 +82,8 @@ class RiskScoringTool(BaseTool):
             legal_contexts: 관련 법령 검색 결과
             contract_type: 계약서 타입
             use_llm: LLM 기반 평가 사용 여부
+            llm_batch_size: 한 번의 LLM 호출로 평가할 조항 수 (기본값: LLM_BATCH_SIZE)
+            llm_concurrency: 동시에 실행할 LLM 배치 수 (기본값: LLM_MAX_CONCURRENCY)
             **kwargs: 추가 옵션
         
         Returns:
@@ -99,7 +92,8 @@ class RiskScoringTool(BaseTool):
                 "overall_risk_score": float,
                 "risk_level": str,
                 "risk_breakdown": Dict[str, float],
-                "critical_issues": List[str]
+                "critical_issues": List[str],
+                "scoring_metrics": Dict[str, Any]  # LLM 배치/조항별 지연 시간
             }
         """
         self.log_execution(
@@ -112,11 +106,15 @@ class RiskScoringTool(BaseTool):
         
         try:
             # 1. 조항별 위험도 산정
+            scoring_metrics: Dict[str, Any] = {}
             provision_risks = await self._score_provisions(
                 provisions=provisions,
                 matched_provisions=matched_provisions or [],
                 legal_contexts=legal_contexts or [],
-                use_llm=use_llm
+                use_llm=use_llm,
+                batch_size=llm_batch_size or self.LLM_BATCH_SIZE,
+                concurrency=llm_concurrency or self.LLM_MAX_CONCURRENCY,
+                metrics=scoring_metrics
             )
             
             # 2. 전체 위험 스코어 계산
@@ -138,14 +136,16 @@ class RiskScoringTool(BaseTool):
                         "risk_score": pr.risk_score,
                         "issue_type": pr.issue_type,
                         "severity": pr.severity,
-                        "reasons": pr.reasons
+                        "reasons": pr.reasons,
+                        "llm_latency_ms": pr.llm_latency_ms
                     }
                     for pr in provision_risks
                 ],
                 "overall_risk_score": overall_risk_score,
                 "risk_level": risk_level,
                 "risk_breakdown": risk_breakdown,
-                "critical_issues": critical_issues
+                "critical_issues": critical_issues,
+                "scoring_metrics": scoring_metrics
             }
             
             self.log_result(result)
@@ -160,9 +160,19 @@ class RiskScoringTool(BaseTool):
         provisions: List[Any],  # Provision 객체 리스트
         matched_provisions: List[Any],  # MatchedProvision 객체 리스트
         legal_contexts: List[Dict[str, Any]],
-        use_llm: bool
+        use_llm: bool,
+        batch_size: int = LLM_BATCH_SIZE,
+        concurrency: int = LLM_MAX_CONCURRENCY,
+        metrics: Optional[Dict[str, Any]] = None
     ) -> List[ProvisionRisk]:
-        """조항별 위험도 산정"""
+        """
+        조항별 위험도 산정
+        
+        1) 모든 조항의 규칙 기반 점수를 먼저 계산
+        2) 규칙 기반으로 명백히 안전한 조항은 LLM 생략
+        3) 나머지는 batch_size개씩 묶어 한 프롬프트(법령 컨텍스트 1회 포함)로 평가, 배치는 concurrency개까지 동시 실행
+        """
+        started = time.perf_counter()
         provision_risks = []
         
         # 매칭 결과를 딕셔너리로 변환 (빠른 조회)
@@ -182,6 +192,8 @@ class RiskScoringTool(BaseTool):
             if prov_id:
                 matched_dict[prov_id] = mp
         
+        # 1. 규칙 기반 점수 (50%)
+        scored = []
         for provision in provisions:
             # Provision을 dict로 변환
             if isinstance(provision, dict):
@@ -195,20 +207,48 @@ class RiskScoringTool(BaseTool):
                     "category": getattr(provision, "category", None)
                 }
             
-            # 1. 규칙 기반 점수 (50%)
-            rule_score = self._rule_based_score(prov_dict, matched_dict)
-            
-            # 2. LLM 기반 점수 (50%, 선택적)
+            # 조항 텍스트의 위험 키워드는 한 번만 스캔해서 점수/분류에 공유
+            risk_hits = self._scan_risk_keywords(prov_dict)
+            rule_score = self._rule_based_score(prov_dict, matched_dict, risk_hits)
+            scored.append((prov_dict, risk_hits, rule_score))
+        
+        # 2. LLM 기반 점수 (50%, 선택적) - 규칙 기반으로 안전한 조항은 생략하고 배치 평가
+        llm_results: Dict[int, tuple] = {}
+        batch_latencies: List[float] = []
+        if use_llm and not self.generator.disable_llm:
+            candidates = [i for i, (_, _, rule_score) in enumerate(scored) if rule_score >= self.LLM_SKIP_RULE_SCORE]
+            if candidates:
+                context_summary = self._summarize_legal_contexts(legal_contexts)
+                semaphore = asyncio.Semaphore(max(1, concurrency))
+                batches = [candidates[i:i + max(1, batch_size)] for i in range(0, len(candidates), max(1, batch_size))]
+                
+                async def run_batch(batch_indices: List[int]) -> None:
+                    async with semaphore:
+                        batch_started = time.perf_counter()
+                        try:
+                            scores = await self._llm_score_batch(
+                                provisions=[scored[i][0] for i in batch_indices],
+                                context_summary=context_summary
+                            )
+                        except Exception as e:
+                            logger.warning(f"LLM 기반 점수 계산 실패 (배치 {len(batch_indices)}개): {str(e)}")
+                            scores = {}
+                        batch_ms = (time.perf_counter() - batch_started) * 1000
+                        batch_latencies.append(batch_ms)
+                        per_provision_ms = batch_ms / len(batch_indices)
+                        for pos, i in enumerate(batch_indices):
+                            llm_results[i] = (scores.get(pos), per_provision_ms)
+                
+                await asyncio.gather(*(run_batch(batch) for batch in batches))
+        
+        for i, (prov_dict, risk_hits, rule_score) in enumerate(scored):
             llm_score = 0.0
+            llm_latency_ms = None
             if use_llm and not self.generator.disable_llm:
-                try:
-                    llm_score = await self._llm_based_score(
-                        provision=prov_dict,
-                        legal_contexts=legal_contexts
-                    )
-                except Exception as e:
-                    logger.warning(f"LLM 기반 점수 계산 실패: {str(e)}")
-                    llm_score = rule_score  # 실패 시 규칙 기반 점수 사용
+                llm_score, llm_latency_ms = llm_results.get(i, (None, None))
+                if llm_score is None:
+                    # LLM 생략(안전 조항) 또는 실패 시 규칙 기반 점수 사용
+                    llm_score = rule_score
             
             # 최종 점수 (가중 평균)
             final_score = (rule_score * 0.5) + (llm_score * 0.5)
@@ -217,7 +257,8 @@ class RiskScoringTool(BaseTool):
             issue_type, severity, reasons = self._classify_issue(
                 provision=prov_dict,
                 score=final_score,
-                matched_dict=matched_dict
+                matched_dict=matched_dict,
+                risk_hits=risk_hits
             )
             
             provision_risks.append(ProvisionRisk(
@@ -225,15 +266,40 @@ class RiskScoringTool(BaseTool):
                 risk_score=final_score,
                 issue_type=issue_type,
                 severity=severity,
-                reasons=reasons
+                reasons=reasons,
+                llm_latency_ms=llm_latency_ms
             ))
         
+        total_ms = (time.perf_counter() - started) * 1000
+        llm_scored = sum(1 for score, _ in llm_results.values() if score is not None)
+        if metrics is not None:
+            metrics.update({
+                "provisions": len(scored),
+                "llm_candidates": len(llm_results),
+                "llm_scored": llm_scored,
+                "llm_skipped": len(scored) - len(llm_results),
+                "llm_batches": len(batch_latencies),
+                "batch_latency_ms": [round(ms, 1) for ms in batch_latencies],
+                "avg_provision_latency_ms": round(sum(batch_latencies) / len(llm_results), 1) if llm_results else 0.0,
+                "total_ms": round(total_ms, 1),
+            })
+        logger.info(
+            f"[{self.name}] 조항 {len(scored)}개 위험도 산정: LLM 평가 {llm_scored}/{len(llm_results)}개 "
+            f"(배치 {len(batch_latencies)}개), 생략 {len(scored) - len(llm_results)}개, {total_ms:.0f}ms"
+        )
+        
         return provision_risks
     
+    def _scan_risk_keywords(self, provision: Dict[str, Any]) -> Dict[str, List[KeywordHit]]:
+        """조항 제목+본문의 위험 키워드 hit (위험 유형별, 한 번의 스캔)"""
+        prov_text = f"{provision.get('title', '')} {provision.get('content', '')}"
+        return CONTRACT_KEYWORD_MATCHER.categories(prov_text, "risk")
+    
     def _rule_based_score(
         self,
         provision: Dict[str, Any],  # Provision dict
-        matched_dict: Dict[str, Any]  # MatchedProvision dict
+        matched_dict: Dict[str, Any],  # MatchedProvision dict
+        risk_hits: Optional[Dict[str, List[KeywordHit]]] = None
     ) -> float:
         """
         규칙 기반 위험도 점수 (0-100)
@@ -245,17 +311,14 @@ class RiskScoringTool(BaseTool):
         - 표준과 불일치: +15점
         """
         score = 0.0
-        prov_title = provision.get("title", "")
-        prov_content = provision.get("content", "")
         prov_id = provision.get("id", "")
-        prov_text = f"{prov_title} {prov_content}".lower()
+        if risk_hits is None:
+            risk_hits = self._scan_risk_keywords(provision)
         
         # 1. 불법 조항 체크
         for risk_type, risk_info in self.RISK_KEYWORDS.items():
-            for keyword in risk_info["keywords"]:
-                if keyword.lower() in prov_text:
-                    score += risk_info["score"]
-                    break
+            if risk_hits.get(risk_type):
+                score += risk_info["score"]
         
         # 2. 표준 계약서와의 불일치
         if prov_id not in matched_dict:
@@ -272,41 +335,64 @@ class RiskScoringTool(BaseTool):
                 score += 10.0  # 낮은 유사도
         
         # 3. 모호한 표현 체크
-        ambiguous_count = sum(
-            1 for keyword in self.RISK_KEYWORDS["ambiguous"]["keywords"]
-            if keyword in prov_text
-        )
-        if ambiguous_count > 0:
+        if risk_hits.get("ambiguous"):
             score += 20.0
         
         # 점수는 0-100 범위로 제한
         return min(100.0, score)
     
+    def _summarize_legal_contexts(self, legal_contexts: List[Dict[str, Any]]) -> str:
+        """법령 컨텍스트 요약 (배치 프롬프트마다 한 번만 포함)"""
+        return "\n".join([
+            f"[{ctx.get('source_type', 'law')}] {ctx.get('title', '')}\n{ctx.get('content', '')[:200]}"
+            for ctx in legal_contexts[:3]
+        ])
+    
     async def _llm_based_score(
         self,
         provision: Dict[str, Any],  # Provision dict
         legal_contexts: List[Dict[str, Any]]
     ) -> float:
         """
-        LLM 기반 위험도 평가
+        LLM 기반 위험도 평가 (단일 조항)
         
         법령 컨텍스트를 바탕으로 조항의 법적 적합성 판단
         """
         if self.generator.disable_llm:
             return 0.0
         
-        # 법령 컨텍스트 요약
-        context_summary = "\n".join([
-            f"[{ctx.get('source_type', 'law')}] {ctx.get('title', '')}\n{ctx.get('content', '')[:200]}"
-            for ctx in legal_contexts[:3]
-        ])
+        try:
+            scores = await self._llm_score_batch(
+                provisions=[provision],
+                context_summary=self._summarize_legal_contexts(legal_contexts)
+            )
+            if 0 in scores:
+                return scores[0]
+        except Exception as e:
+            logger.warning(f"LLM 점수 계산 실패: {str(e)}")
         
-        prov_text = f"{provision.get('title', '')}\n{provision.get('content', '')}"
+        return 0.0
+    
+    async def _llm_score_batch(
+        self,
+        provisions: List[Dict[str, Any]],  # Provision dict 리스트
+        context_summary: str
+    ) -> Dict[int, float]:
+        """
+        여러 조항을 한 번의 LLM 호출로 평가
         
-        prompt = f"""당신은 법률 전문가입니다. 다음 계약서 조항의 법적 위험도를 0-100 점수로 평가해주세요.
+        Returns:
+            {배치 내 조항 순번: 점수(0-100)} (응답에서 찾지 못한 조항은 제외)
+        """
+        provision_blocks = "\n\n".join(
+            f"[조항 {pos + 1}] {prov.get('title', '')}\n{prov.get('content', '')}"
+            for pos, prov in enumerate(provisions)
+        )
+        
+        prompt = f"""당신은 법률 전문가입니다. 다음 계약서 조항 {len(provisions)}개의 법적 위험도를 각각 0-100 점수로 평가해주세요.
 
 계약서 조항:
-{prov_text}
+{provision_blocks}
 
 관련 법령:
 {context_summary}
@@ -317,64 +403,74 @@ class RiskScoringTool(BaseTool):
 - 61-80: 위험 (법적 문제 가능성)
 - 81-100: 매우 위험 (명백한 불법 또는 매우 불리한 조항)
 
-점수만 숫자로 반환하세요 (예: 45)"""
+JSON 배열만 반환하세요 (예: [{{"index": 1, "score": 45}}, {{"index": 2, "score": 10}}])"""
         
-        try:
-            if self.generator.use_ollama:
-                from config import settings
-                try:
-                    from langchain_ollama import OllamaLLM
-                    llm = OllamaLLM(
-                        base_url=settings.ollama_base_url,
-                        model=settings.ollama_model
-                    )
-                except ImportError:
-                    from langchain_community.llms import Ollama
-                    llm = Ollama(
-                        base_url=settings.ollama_base_url,
-                        model=settings.ollama_model
-                    )
-                
-                response = llm.invoke(prompt)
-                
-                # 숫자 추출
-                import re
-                numbers = re.findall(r'\d+', response)
-                if numbers:
-                    score = float(numbers[0])
-                    return min(100.0, max(0.0, score))
-        except Exception as e:
-            logger.warning(f"LLM 점수 계산 실패: {str(e)}")
+        if self.generator.use_ollama:
+            response = await self.generator.generate(prompt, system_role="")
+        else:
+            # Groq 클라이언트는 동기 호출이므로 스레드에서 실행 (배치 동시 실행)
+            response = await asyncio.to_thread(
+                lambda: self.generator.get_text(
+                    self.generator.generate_content(messages=[{"role": "user", "content": prompt}])
+                )
+            )
         
-        return 0.0
+        return self._parse_batch_scores(response or "", len(provisions))
+    
+    @staticmethod
+    def _parse_batch_scores(response: str, count: int) -> Dict[int, float]:
+        """배치 평가 응답 파싱 ([{"index": n, "score": s}] 또는 줄 단위 숫자)"""
+        scores: Dict[int, float] = {}
+        
+        array_match = re.search(r"\[.*\]", response, re.DOTALL)
+        if array_match:
+            try:
+                for item in json.loads(array_match.group(0)):
+                    if isinstance(item, dict):
+                        pos = int(item.get("index", 0)) - 1
+                        value = item.get("score")
+                    else:
+                        pos, value = len(scores), item
+                    if 0 <= pos < count and value is not None:
+                        scores[pos] = min(100.0, max(0.0, float(value)))
+                return scores
+            except (ValueError, TypeError):
+                pass
+        
+        # JSON이 아니면 숫자를 조항 순서대로 사용 (단일 조항 "45" 응답 호환)
+        numbers = re.findall(r"\d+(?:\.\d+)?", response)
+        if len(numbers) == count:
+            for pos, value in enumerate(numbers):
+                scores[pos] = min(100.0, max(0.0, float(value)))
+        return scores
     
     def _classify_issue(
         self,
         provision: Dict[str, Any],  # Provision dict
         score: float,
-        matched_dict: Dict[str, Any]  # MatchedProvision dict
+        matched_dict: Dict[str, Any],  # MatchedProvision dict
+        risk_hits: Optional[Dict[str, List[KeywordHit]]] = None
     ) -> tuple[str, str, List[str]]:
         """이슈 타입 및 심각도 분류"""
         issue_type = "normal"
         severity = "low"
         reasons = []
         
-        prov_title = provision.get("title", "")
-        prov_content = provision.get("content", "")
         prov_id = provision.get("id", "")
-        prov_text = f"{prov_title} {prov_content}".lower()
+        if risk_hits is None:
+            risk_hits = self._scan_risk_keywords(provision)
         
         # 이슈 타입 결정
         if prov_id not in matched_dict:
             issue_type = "missing"
             reasons.append("표준 계약서와 매칭되지 않음")
-        elif any(keyword in prov_text for keyword in self.RISK_KEYWORDS["illegal"]["keywords"]):
+        elif risk_hits.get("illegal"):
             issue_type = "illegal"
             reasons.append("불법 조항 포함 가능성")
-        elif any(keyword in prov_text for keyword in self.RISK_KEYWORDS["ambiguous"]["keywords"]):
+        elif risk_hits.get("ambiguous"):
             issue_type = "ambiguous"
             reasons.append("모호한 표현 포함")
-        elif any(keyword in prov_text for keyword in self.RISK_KEYWORDS["unfair"]["keywords"]):
+        elif risk_hits.get("unfair"):
             issue_type = "excessive"
             reasons.append("불공정한 조항 포함")
         
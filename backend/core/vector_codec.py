@@ -0,0 +1,91 @@
+"""
+Vector Codec - 임베딩 compact 전송 (base64 바이너리)
+1024차원 임베딩을 JSON float 배열(약 20KB 텍스트) 대신 big-endian float32/float16 바이트의 base64(약 5.5KB/2.7KB)로 주고받습니다.
+서버 측 디코드/인코드는 scripts/create_compact_vector_rpcs.sql의 decode_vector_b64 / encode_vector_b64 함수가 담당합니다.
+
+- 바이트 순서: big-endian (Postgres float4send와 같은 네트워크 바이트 순서)
+- compact RPC가 아직 설치되지 않은 DB에서는 RPC 이름별로 한 번 실패를 기록하고 JSON 경로로 동작합니다.
+"""
+
+from typing import Any, Optional, Sequence, Set
+import base64
+import json
+import logging
+import threading
+
+import numpy as np
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# 전송 dtype → numpy dtype (big-endian)
+VECTOR_TRANSPORT_DTYPES = {
+    "float32": ">f4",
+    "float16": ">f2",
+}
+
+# 설치되지 않은 것으로 확인된 compact RPC (프로세스 수명 동안 JSON 경로 사용)
+_UNAVAILABLE_RPCS: Set[str] = set()
+_UNAVAILABLE_LOCK = threading.Lock()
+
+
+def transport_dtype() -> str:
+    """클라이언트 → 서버 전송 dtype (settings.vector_transport_dtype, 알 수 없는 값이면 float32)"""
+    dtype = settings.vector_transport_dtype
+    return dtype if dtype in VECTOR_TRANSPORT_DTYPES else "float32"
+
+
+def encode_vector(vector: Sequence[float], dtype: str = "float32") -> str:
+    """임베딩 → base64 문자열"""
+    array = np.asarray(vector, dtype=VECTOR_TRANSPORT_DTYPES[dtype])
+    return base64.b64encode(array.tobytes()).decode("ascii")
+
+
+def decode_vector(data: str, dtype: str = "float32") -> np.ndarray:
+    """base64 문자열 → float32 numpy 배열 (encode 결과 또는 서버 encode_vector_b64 결과)"""
+    raw = base64.b64decode(data)
+    return np.frombuffer(raw, dtype=VECTOR_TRANSPORT_DTYPES[dtype]).astype(np.float32)
+
+
+def parse_vector(value: Any) -> Optional[np.ndarray]:
+    """
+    PostgREST vector 컬럼 값 → float32 numpy 배열
+
+    PostgREST는 vector 컬럼을 "[0.1,0.2,...]" 문자열로 반환하므로 json.loads 대신 numpy로 바로 파싱합니다.
+    """
+    if value is None or (isinstance(value, (str, list, tuple)) and len(value) == 0):
+        return None
+    if isinstance(value, str):
+        parsed = np.fromstring(value.strip().strip("[]"), dtype=np.float32, sep=",")
+        if parsed.size == 0:
+            parsed = np.asarray(json.loads(value), dtype=np.float32)
+        return parsed
+    return np.asarray(value, dtype=np.float32)
+
+
+def compact_rpc_enabled(name: str) -> bool:
+    """settings.vector_transport가 "base64"이고 해당 compact RPC가 실패 기록이 없으면 True"""
+    return settings.vector_transport == "base64" and name not in _UNAVAILABLE_RPCS
+
+
+def is_missing_rpc_error(error: Exception, name: str) -> bool:
+    """RPC 함수가 DB에 없어서 난 오류인지 (PostgREST PGRST202 / Postgres 42883)"""
+    message = str(error)
+    return (
+        "PGRST202" in message
+        or "42883" in message
+        or (name in message and ("does not exist" in message.lower() or "Could not find the function" in message))
+    )
+
+
+def disable_compact_rpc(name: str, error: Exception) -> None:
+    """compact RPC 미설치 기록 (이후 JSON 경로 사용)"""
+    with _UNAVAILABLE_LOCK:
+        if name in _UNAVAILABLE_RPCS:
+            return
+        _UNAVAILABLE_RPCS.add(name)
+    logger.warning(
+        f"[벡터 전송] {name} RPC가 없어 JSON 전송으로 동작합니다. "
+        f"backend/scripts/create_compact_vector_rpcs.sql을 실행하세요: {str(error)}"
+    )
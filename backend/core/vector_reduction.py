@@ -0,0 +1,136 @@
+"""
+Vector Reduction - 2단계 검색(first stage)용 축소 벡터
+legal_chunks 임베딩(1024차원 float32)에서 1차 후보 검색용 축소 표현을 만들고, 후보만 float32로 재계산합니다.
+
+- pca: 평균 제거 후 상위 주성분 dims개로 투영 (float32, 내적 점수)
+- binary: 평균 제거 후 부호 1비트 양자화 (np.packbits, 해밍 거리 점수, 1024차원 → 128바이트)
+
+bge-m3는 Matryoshka 학습 모델이 아니므로 앞쪽 차원 자르기 대신 PCA를 사용합니다.
+"""
+
+from typing import Any, Dict, Optional
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+REDUCTION_KINDS = ("pca", "binary")
+
+# PCA 학습에 사용할 최대 샘플 수 (전체 코퍼스 SVD 비용 제한)
+PCA_FIT_SAMPLE = 5000
+
+# uint16 단위 popcount 테이블 (uint8 테이블보다 조회 횟수가 절반)
+_POPCOUNT16 = np.array([bin(i).count("1") for i in range(1 << 16)], dtype=np.uint8)
+
+
+class VectorReducer:
+    """
+    축소 표현 학습/변환
+
+    사용 예:
+        reducer = VectorReducer.fit("pca", matrix, dims=128)
+        reduced = reducer.transform(matrix)
+        scores = reducer.scores(reduced, reducer.transform(query[None, :])[0])  # 클수록 유사
+    """
+
+    def __init__(self, kind: str, mean: np.ndarray, components: Optional[np.ndarray] = None):
+        if kind not in REDUCTION_KINDS:
+            raise ValueError(f"알 수 없는 축소 방식: {kind} (사용 가능: {', '.join(REDUCTION_KINDS)})")
+        self.kind = kind
+        self.mean = mean.astype(np.float32)
+        self.components = components.astype(np.float32) if components is not None else None  # (D, dims)
+
+    @classmethod
+    def fit(cls, kind: str, matrix: np.ndarray, dims: int = 128, seed: int = 0) -> "VectorReducer":
+        """
+        Args:
+            kind: "pca" | "binary"
+            matrix: (N, D) 행 단위 L2 정규화된 임베딩
+            dims: pca 차원 수 (binary는 무시)
+        """
+        sample = matrix
+        if matrix.shape[0] > PCA_FIT_SAMPLE:
+            rng = np.random.default_rng(seed)
+            sample = matrix[rng.choice(matrix.shape[0], PCA_FIT_SAMPLE, replace=False)]
+        mean = sample.mean(axis=0)
+        if kind == "binary":
+            return cls(kind, mean)
+        dims = max(1, min(dims, sample.shape[0], sample.shape[1]))
+        _, _, vt = np.linalg.svd(sample - mean, full_matrices=False)
+        return cls(kind, mean, vt[:dims].T)
+
+    @property
+    def dims(self) -> int:
+        return self.components.shape[1] if self.components is not None else self.mean.shape[0]
+
+    def transform(self, matrix: np.ndarray) -> np.ndarray:
+        """(N, D) → pca: (N, dims) float32 / binary: (N, D/8) uint8 (D가 16의 배수가 아니면 0비트로 패딩)"""
+        centered = np.asarray(matrix, dtype=np.float32) - self.mean
+        if self.kind == "pca":
+            return np.ascontiguousarray(centered @ self.components)
+        packed = np.packbits(centered > 0, axis=1)
+        if packed.shape[1] % 2:
+            packed = np.pad(packed, ((0, 0), (0, 1)))
+        return np.ascontiguousarray(packed)
+
+    def scores(self, reduced: np.ndarray, query: np.ndarray) -> np.ndarray:
+        """1차 점수 (클수록 유사): pca는 내적, binary는 -해밍 거리"""
+        if self.kind == "pca":
+            return reduced @ query
+        distances = _POPCOUNT16[reduced.view(np.uint16) ^ query.view(np.uint16)].sum(axis=1, dtype=np.int32)
+        return -distances
+
+    def to_arrays(self) -> Dict[str, Any]:
+        """np.savez 저장용"""
+        arrays = {"kind": np.array(self.kind), "mean": self.mean}
+        if self.components is not None:
+            arrays["components"] = self.components
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays: Any) -> "VectorReducer":
+        components = arrays["components"] if "components" in arrays else None
+        return cls(str(arrays["kind"]), arrays["mean"], components)
+
+
+def two_stage_top_k(
+    matrix: np.ndarray,
+    reducer: VectorReducer,
+    reduced: np.ndarray,
+    query: np.ndarray,
+    top_k: int,
+    candidates: int,
+    mask: Optional[np.ndarray] = None,
+):
+    """
+    축소 표현으로 candidates개 후보 → float32 내적 재계산으로 top_k
+
+    Args:
+        matrix: (N, D) 정규화된 float32 임베딩
+        reduced: reducer.transform(matrix)
+        query: (D,) 정규화된 쿼리
+        mask: 필터 마스크 (None이면 전체)
+
+    Returns:
+        (행 번호, 코사인 점수) 점수 내림차순
+    """
+    pool = np.flatnonzero(mask) if mask is not None else None
+    size = pool.size if pool is not None else matrix.shape[0]
+    if size == 0 or top_k <= 0:
+        return np.array([], dtype=np.int64), np.array([], dtype=np.float32)
+
+    query_reduced = reducer.transform(query[None, :])[0]
+    first = reducer.scores(reduced if pool is None else reduced[pool], query_reduced)
+    n_candidates = min(max(candidates, top_k), size)
+    if n_candidates < size:
+        chosen = np.argpartition(-first, n_candidates - 1)[:n_candidates]
+    else:
+        chosen = np.arange(size)
+    rows = chosen if pool is None else pool[chosen]
+
+    exact = matrix[rows] @ query
+    k = min(top_k, rows.size)
+    top = np.argpartition(-exact, k - 1)[:k]
+    top = top[np.argsort(-exact[top])]
+    return rows[top], exact[top]
@@ -80,7 +80,7 @@ def ask_groq(user_input: str, system_role: str = "너는 유능한 법률 AI야.
         return f"에러가 발생했습니다: {str(e)}"
 
 
-def ask_groq_with_messages(messages: list, temperature: float = 0.5, model: str = "llama-3.3-70b-versatile", max_tokens: int = 4096) -> str:
+def ask_groq_with_messages(messages: list, temperature: float = 0.5, model: str = "llama-3.3-70b-versatile", max_tokens: int = 4096, json_mode: bool = False) -> str:
     """
     메시지 리스트를 받아서 Groq에게 물어보고 답을 리턴합니다.
     
@@ -89,6 +89,8 @@ def ask_groq_with_messages(messages: list, temperature: float = 0.5, model: str
         temperature: 온도 설정 (기본값: 0.5)
         model: 사용할 모델 (기본값: "llama-3.3-70b-versatile")
         max_tokens: 최대 토큰 수 (기본값: 4096, 응답 시간 단축을 위해 제한)
+        json_mode: True면 JSON 모드(response_format=json_object)로 유효한 JSON 객체만 생성
+                   (메시지에 "JSON"이라는 단어가 있어야 함)
     
     Returns:
         LLM 응답 텍스트
@@ -111,6 +113,7 @@ def ask_groq_with_messages(messages: list, temperature: float = 0.5, model: str
             messages=messages,
             temperature=temperature,
             max_tokens=max_tokens,  # 응답 길이 제한으로 생성 시간 단축
+            **({"response_format": {"type": "json_object"}} if json_mode else {}),
         )
         # 결과 텍스트만 깔끔하게 뽑아서 돌려줌
         response_content = completion.choices[0].message.content
@@ -134,3 +137,72 @@ def ask_groq_with_messages(messages: list, temperature: float = 0.5, model: str
         logger.error(f"Groq API 호출 실패: {str(e)}", exc_info=True)
         raise
 
+
+
+# JSON 모드 스트리밍을 거부한 모델 (다음 호출부터는 바로 response_format 없이 스트리밍)
+_JSON_STREAM_UNSUPPORTED_MODELS = set()
+
+
+def stream_groq_with_messages(messages: list, temperature: float = 0.5, model: str = "llama-3.3-70b-versatile", max_tokens: int = 4096, json_mode: bool = False):
+    """
+    ask_groq_with_messages의 스트리밍 버전: 생성되는 텍스트 조각을 순서대로 yield합니다.
+    (동기 제너레이터이므로 비동기 코드에서는 스레드에서 소비해야 함)
+    
+    Args:
+        messages, temperature, model, max_tokens: ask_groq_with_messages와 동일
+        json_mode: True면 JSON 모드로 스트리밍 시도 (모델이 지원하지 않으면 JSON 모드 없이 재시도)
+    
+    Yields:
+        응답 텍스트 조각
+    
+    Raises:
+        Exception: Groq API 호출 실패 시 예외를 그대로 전파
+    """
+    if not CLIENT:
+        raise ValueError("Groq API 키가 설정되지 않았습니다. 환경변수 GROQ_API_KEY를 설정하세요.")
+    
+    request = dict(
+        model=model,
+        messages=messages,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        stream=True,
+    )
+    try:
+        if json_mode and model not in _JSON_STREAM_UNSUPPORTED_MODELS:
+            try:
+                stream = CLIENT.chat.completions.create(response_format={"type": "json_object"}, **request)
+            except Exception as e:
+                # 스트리밍 + JSON 모드 조합을 지원하지 않는 모델은 요청 단계에서 400 에러
+                if "response_format" not in str(e) and "json" not in str(e).lower():
+                    raise
+                logger.warning(f"[llm_api] {model}: JSON 모드 스트리밍 미지원, JSON 모드 없이 스트리밍합니다: {str(e)}")
+                _JSON_STREAM_UNSUPPORTED_MODELS.add(model)
+                stream = CLIENT.chat.completions.create(**request)
+        else:
+            stream = CLIENT.chat.completions.create(**request)
+        
+        received = 0
+        usage = None
+        for chunk in stream:
+            if chunk.choices:
+                content = chunk.choices[0].delta.content
+                if content:
+                    received += len(content)
+                    yield content
+            # Groq는 마지막 청크의 x_groq.usage에 토큰 사용량을 담아 보냄
+            x_groq = getattr(chunk, "x_groq", None)
+            if x_groq is not None and getattr(x_groq, "usage", None):
+                usage = x_groq.usage
+        
+        if not received:
+            raise ValueError("Groq API가 빈 응답을 반환했습니다.")
+        if usage:
+            logger.info(
+                f"[토큰 사용량] 입력: {getattr(usage, 'prompt_tokens', 0)}토큰, "
+                f"출력: {getattr(usage, 'completion_tokens', 0)}토큰, 총: {getattr(usage, 'total_tokens', 0)}토큰 "
+                f"(모델: {model}, 스트리밍)"
+            )
+    except Exception as e:
+        logger.error(f"Groq API 스트리밍 호출 실패: {str(e)}", exc_info=True)
+        raise
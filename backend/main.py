@@ -1,6 +1,6 @@
 # backend/main.py
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from api.routes_v2 import router, router_v2  # v2 라우터 사용
 from api.routes_legal import router_legal  # 법률 RAG 라우터
@@ -10,9 +10,10 @@ from config import settings
 import uvicorn
 import os
 import logging
+import threading
 
 # 로깅 설정 통합
-from core.logging_config import setup_logging
+from core.logging_config import setup_logging, new_request_id, set_request_id, reset_request_id
 
 # 에러 핸들러 설정
 from core.error_handler import setup_error_handlers
@@ -23,6 +24,10 @@ log_config = setup_logging(
     log_level=logging.INFO if os.getenv("LOG_LEVEL", "INFO").upper() == "INFO" else logging.DEBUG,
     enable_file_logging=True,
     enable_console_logging=True,
+    json_format=settings.log_format == "json",
+    use_queue=settings.log_queue_enabled,
+    module_levels=settings.log_module_levels,
+    sample_rates=settings.log_sample_rates,
 )
 
 # FastAPI 앱 생성
@@ -44,6 +49,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.middleware("http")
+async def request_id_middleware(request: Request, call_next):
+    """요청마다 request_id를 컨텍스트에 설정 (X-Request-ID 헤더가 있으면 재사용)"""
+    request_id = request.headers.get("x-request-id") or new_request_id()
+    token = set_request_id(request_id)
+    try:
+        response = await call_next(request)
+        response.headers["X-Request-ID"] = request_id
+        return response
+    finally:
+        reset_request_id(token)
+
 # 라우터 등록
 # 중요: 더 구체적인 경로를 가진 라우터를 먼저 등록해야 함
 app.include_router(router)
@@ -53,6 +71,29 @@ app.include_router(router_legal)  # 법률 RAG 엔드포인트 (v1)
 app.include_router(router_v2)  # v2 엔드포인트 - 나중에 등록 (덜 구체적)
 
 
+@app.on_event("startup")
+async def warm_up_legal_index():
+    """로컬 legal 인덱스 사용 시 서버 시작과 함께 스냅샷 로딩 (백그라운드)"""
+    if settings.use_legal_local_index:
+        from core.legal_vector_index import get_legal_chunk_index
+        get_legal_chunk_index().ensure_fresh()
+
+
+@app.on_event("startup")
+async def warm_up_legal_reranker():
+    """cross-encoder 재정렬 사용 시 첫 요청이 지연 예산을 넘지 않도록 모델을 백그라운드 로딩"""
+    if settings.legal_rerank_enabled:
+        from core.reranker import get_legal_reranker
+        threading.Thread(target=get_legal_reranker().load, daemon=True).start()
+
+
+@app.on_event("shutdown")
+async def close_file_cache_client():
+    """법령 파일 캐시의 공유 httpx 클라이언트 종료"""
+    from core.file_serving import close_legal_file_cache
+    await close_legal_file_cache()
+
+
 @app.get("/")
 async def root():
     return {
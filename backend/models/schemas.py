@@ -112,6 +112,8 @@ class LegalAnalysisResult(BaseModel):
     risk_summary_table: Optional[List["RiskSummaryItem"]] = Field(None, description="리스크 요약 테이블")
     toxic_clauses: Optional[List["ToxicClauseDetail"]] = Field(None, description="독소조항 상세 목록")
     negotiation_questions: Optional[List[str]] = Field(None, description="협상 시 질문 리스트")
+    prompt_metrics: Optional[Dict[str, Any]] = Field(None, description="분석 프롬프트 토큰 구성 (섹션별 토큰 수, 조항/법령 선택 결과)")
+    sections: Optional[Dict[str, int]] = Field(None, description="영역별 위험 점수 (map-reduce 모드에서 조항 점수로 계산)")
 
 
 class LegalAnalyzeContractRequest(BaseModel):
@@ -0,0 +1,53 @@
+-- contract_analyses 테이블에 issue_count 비정규화 컬럼 추가
+-- 히스토리 목록(/contracts/history)에서 분석별 contract_issues count 쿼리(N+1)를 제거하기 위해 사용
+
+-- 1. 컬럼 추가
+ALTER TABLE IF EXISTS public.contract_analyses
+ADD COLUMN IF NOT EXISTS issue_count integer NOT NULL DEFAULT 0;
+
+-- 2. 기존 데이터 백필 (한 번의 집계 쿼리)
+UPDATE public.contract_analyses AS ca
+SET issue_count = ic.cnt
+FROM (
+    SELECT contract_analysis_id, COUNT(*)::integer AS cnt
+    FROM public.contract_issues
+    GROUP BY contract_analysis_id
+) AS ic
+WHERE ic.contract_analysis_id = ca.id;
+
+-- 3. contract_issues 변경 시 issue_count 자동 갱신 트리거
+CREATE OR REPLACE FUNCTION public.sync_contract_analyses_issue_count()
+RETURNS TRIGGER
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE public.contract_analyses
+        SET issue_count = issue_count + 1
+        WHERE id = NEW.contract_analysis_id;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE public.contract_analyses
+        SET issue_count = GREATEST(issue_count - 1, 0)
+        WHERE id = OLD.contract_analysis_id;
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_contract_issues_issue_count ON public.contract_issues;
+CREATE TRIGGER trg_contract_issues_issue_count
+AFTER INSERT OR DELETE ON public.contract_issues
+FOR EACH ROW EXECUTE FUNCTION public.sync_contract_analyses_issue_count();
+
+-- 4. 히스토리 keyset 페이지네이션용 복합 인덱스 (user_id, created_at DESC, id DESC)
+CREATE INDEX IF NOT EXISTS idx_contract_analyses_user_created_id
+    ON public.contract_analyses(user_id, created_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_situation_analyses_user_created_id
+    ON public.situation_analyses(user_id, created_at DESC, id DESC);
+
+-- 완료 메시지
+DO $$
+BEGIN
+    RAISE NOTICE 'contract_analyses.issue_count 컬럼이 추가되었습니다!';
+    RAISE NOTICE 'contract_issues insert/delete 시 issue_count가 자동 갱신됩니다.';
+END $$;
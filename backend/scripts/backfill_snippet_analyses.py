@@ -0,0 +1,110 @@
+"""
+legal_chunks snippet 분석 백필 스크립트
+legal_chunks를 페이지 단위로 읽어서 아직 분석 결과가 없는 snippet만 LLM으로 분석하고
+legal_snippet_analyses 테이블에 저장합니다. (테이블: scripts/create_legal_snippet_analyses_table.sql)
+
+사용법:
+    # 전체 백필 (이미 분석된 snippet은 건너뜀)
+    python scripts/backfill_snippet_analyses.py
+
+    # 특정 source_type만, 동시 LLM 호출 수 조정
+    python scripts/backfill_snippet_analyses.py --source-type law --concurrency 8
+
+    # 분석 대상 수만 확인
+    python scripts/backfill_snippet_analyses.py --dry-run
+"""
+
+import sys
+import argparse
+import asyncio
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+backend_root = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_root))
+
+from core.supabase_vector_store import SupabaseVectorStore
+from core.snippet_analyzer import SnippetAnalysisStore, legal_chunk_snippet
+
+
+async def backfill(
+    source_type: str = None,
+    page_size: int = 500,
+    concurrency: int = 5,
+    limit: int = None,
+    dry_run: bool = False,
+) -> dict:
+    """
+    snippet 분석 백필
+
+    Args:
+        source_type: 이 source_type의 청크만 처리 (None이면 전체)
+        page_size: legal_chunks 페이지 크기 (페이지마다 조회 → 분석 → 저장)
+        concurrency: LLM 동시 호출 수
+        limit: 최대 처리 청크 수
+        dry_run: 분석/저장 없이 미분석 snippet 수만 집계
+
+    Returns:
+        {"chunks", "analyzed", "skipped", "failed"}
+    """
+    vector_store = SupabaseVectorStore()
+    analysis_store = SnippetAnalysisStore(cache_size=page_size * 2, vector_store=vector_store)
+    totals = {"chunks": 0, "analyzed": 0, "skipped": 0, "failed": 0}
+
+    for rows in vector_store.iter_legal_chunk_pages("id, content", page_size=page_size, source_type=source_type):
+        if limit is not None:
+            rows = rows[:max(0, limit - totals["chunks"])]
+            if not rows:
+                break
+        totals["chunks"] += len(rows)
+        snippets = [legal_chunk_snippet(row.get("content")) for row in rows]
+
+        if dry_run:
+            existing = await analysis_store.lookup(snippets)
+            missing = {s for s, analysis in zip(snippets, existing) if analysis is None and s.strip()}
+            totals["analyzed"] += len(missing)
+            totals["skipped"] += sum(1 for analysis in existing if analysis is not None)
+        else:
+            stats = await analysis_store.precompute(
+                snippets,
+                chunk_ids=[row.get("id") for row in rows],
+                max_concurrent=concurrency,
+            )
+            for key, value in stats.items():
+                totals[key] += value
+
+        print(
+            f"  [{totals['chunks']}개 청크] 분석{' 대상' if dry_run else ''}: {totals['analyzed']}개, "
+            f"기존 결과: {totals['skipped']}개, 실패: {totals['failed']}개"
+        )
+
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description="legal_chunks snippet 분석 백필")
+    parser.add_argument("--source-type", type=str, default=None, help="처리할 source_type (law, manual, case, standard_contract)")
+    parser.add_argument("--page-size", type=int, default=500, help="legal_chunks 페이지 크기 (기본값: 500)")
+    parser.add_argument("--concurrency", type=int, default=5, help="LLM 동시 호출 수 (기본값: 5)")
+    parser.add_argument("--limit", type=int, default=None, help="최대 처리 청크 수")
+    parser.add_argument("--dry-run", action="store_true", help="분석 대상 수만 출력")
+    args = parser.parse_args()
+
+    print("📋 snippet 분석 백필 시작")
+    totals = asyncio.run(backfill(
+        source_type=args.source_type,
+        page_size=args.page_size,
+        concurrency=args.concurrency,
+        limit=args.limit,
+        dry_run=args.dry_run,
+    ))
+
+    print(f"\n{'='*50}")
+    print(f"📊 청크: {totals['chunks']}개")
+    print(f"✅ 분석{' 대상' if args.dry_run else ''}: {totals['analyzed']}개")
+    print(f"⏭️  기존 결과 재사용: {totals['skipped']}개")
+    print(f"❌ 실패: {totals['failed']}개")
+
+
+if __name__ == "__main__":
+    main()
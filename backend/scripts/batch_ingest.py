@@ -191,20 +191,12 @@ class BatchIngester:
             else:
                 file_type = None  # 자동 감지
             
-            # 1. 원본 파일 처리 (텍스트 추출)
-            process_result = self.orchestrator.processor.process_file(
+            # 1. 원본 파일 텍스트 추출 (청킹은 변경된 공고만 ingest_announcement에서 수행)
+            text = self.orchestrator.processor.extract_text(
                 file_path=str(file_path),
                 file_type=file_type
             )
             
-            # process_file은 (text, chunks) 튜플 반환
-            if isinstance(process_result, tuple):
-                text, chunks = process_result
-            else:
-                # 호환성을 위해
-                text = process_result
-                chunks = []
-            
             # 2. processed/ 폴더에 저장 (텍스트 + 메타데이터) - 선택사항
             processed_file = None
             if self.processed_dir.exists():
@@ -214,35 +206,25 @@ class BatchIngester:
                     meta=meta
                 )
             
-            # 3. 벡터 인덱싱 (RAG 파이프라인)
-            announcement_id = self.orchestrator.process_announcement(meta, text)
-            
-            # 4. 청크 임베딩 저장
-            chunk_texts = [chunk.content for chunk in chunks]
-            embeddings = self.orchestrator.generator.embed(chunk_texts)
-            
-            chunk_payload = [
-                {
-                    "chunk_index": chunk.index,
-                    "content": chunk.content,
-                    "embedding": embeddings[i],
-                    "metadata": chunk.metadata
-                }
-                for i, chunk in enumerate(chunks)
-            ]
-            
-            self.store.bulk_upsert_chunks(announcement_id, chunk_payload)
+            # 3. 벡터 인덱싱 (RAG 파이프라인: 청크 분할/임베딩/저장은 orchestrator가 수행,
+            #    동일 내용으로 생략된 공고는 이미 저장되어 있음)
+            ingest = self.orchestrator.ingest_announcement(meta, text)
+            announcement_id = ingest["announcement_id"]
             
             result.update({
                 "status": "success",
                 "announcement_id": announcement_id,
+                "unchanged": ingest["skipped"],
                 "processed_file": str(processed_file) if processed_file else None,
-                "chunks_count": len(chunks),
+                "chunks_count": ingest["chunks_count"],
                 "completed_at": datetime.now().isoformat(),
             })
             
             if verbose:
-                print(f"[완료] {file_path.name} → {announcement_id} ({len(chunks)}개 청크)")
+                if ingest["skipped"]:
+                    print(f"[생략] {file_path.name} → {announcement_id} (변경 없음)")
+                else:
+                    print(f"[완료] {file_path.name} → {announcement_id} ({ingest['chunks_count']}개 청크)")
         
         except Exception as e:
             result.update({
@@ -511,7 +493,7 @@ class BatchIngester:
             else:
                 file_type = None
             
-            text, _ = processor.process_file(str(file_path), file_type)
+            text = processor.extract_text(str(file_path), file_type)
             
             # 2. Legal Chunker로 청크 생성
             chunker = LegalChunker(max_chars=1200, overlap=200)
@@ -759,6 +741,8 @@ class BatchIngester:
                 results["failed"] += winners_result["failed"]
                 results["results"].extend(winners_result["results"])
             
+            results["ingest_stats"] = self.orchestrator.get_run_summary()
+            
             # 결과 출력
             if verbose:
                 print(f"\n{'='*50}")
@@ -767,6 +751,7 @@ class BatchIngester:
                 print(f"   입찰: {results['bids']['success']}/{results['bids']['total']}개 성공")
                 print(f"   낙찰: {results['winners']['success']}/{results['winners']['total']}개 성공")
                 print(f"   실패: {results['failed']}개")
+                self._print_ingest_stats(results["ingest_stats"])
                 print(f"{'='*50}")
             
             results["processed_at"] = datetime.now().isoformat()
@@ -841,6 +826,7 @@ class BatchIngester:
             "success": success_count,
             "failed": failed_count,
             "results": results,
+            "ingest_stats": self.orchestrator.get_run_summary(),
             "processed_at": datetime.now().isoformat(),
         }
         
@@ -850,10 +836,20 @@ class BatchIngester:
         print(f"   전체: {summary['total']}개")
         print(f"   성공: {summary['success']}개")
         print(f"   실패: {summary['failed']}개")
+        self._print_ingest_stats(summary["ingest_stats"])
         print(f"{'='*50}")
         
         return summary
     
+    def _print_ingest_stats(self, stats: Dict[str, int]):
+        """공고 인입 통계 출력 (변경 없음으로 생략된 단계 포함)"""
+        if not stats.get("processed"):
+            return
+        print(f"   공고 인입: {stats['processed']}건 (신규/변경 {stats['changed']}건, "
+              f"변경 없음 생략 {stats['unchanged_skipped']}건, 누락 단계 재실행 {stats['resumed']}건)")
+        print(f"   임베딩: {stats['chunks_embedded']}개 청크 (생략 {stats['embeddings_skipped']}건), "
+              f"LLM 분석: {stats['analyses_run']}회 (생략 {stats['analyses_skipped']}건)")
+    
     def save_report(self, summary: Dict[str, Any], output_path: str = None):
         """
         처리 결과 리포트 저장
@@ -937,6 +933,12 @@ def main():
         mode=args.mode
     )
     
+    # 법률 문서를 인입했으면 서버 법령 검색 결과 캐시 무효화 (코퍼스 버전 증가)
+    if args.mode == "legal" and summary.get("success", 0) > 0:
+        corpus_version = ingester.store.bump_legal_corpus_version()
+        if corpus_version is not None and not args.quiet:
+            print(f"[완료] legal_chunks 코퍼스 버전: {corpus_version} (검색 캐시 무효화)")
+    
     # 리포트 저장
     if args.report or not args.quiet:
         ingester.save_report(summary, args.report)
@@ -0,0 +1,148 @@
+"""
+clause_extractor offset 매핑 벤치마크
+100페이지 분량의 OCR 스타일(불규칙 공백) 계약서로 조항 위치 찾기 성능 비교
+
+- legacy: 남은 원문을 정규화한 뒤 문자 위치마다 re.sub으로 윈도우를 정규화하는 기존 방식 (O(n·m))
+- offset map: NormalizedText로 원문을 한 번만 정규화하고 전방 스캔 (O(n))
+
+사용법:
+    python scripts/benchmark_clause_extractor.py --pages 100 --legacy-clauses 5
+"""
+
+import argparse
+import random
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.clause_extractor import NormalizedText, extract_clauses
+
+SECTION_TITLES = [
+    "근로계약기간", "근무장소", "업무의 내용", "소정근로시간", "휴게시간", "근무일",
+    "주휴일", "임금", "상여금", "기타급여", "임금지급일", "지급방법", "연차유급휴가",
+    "사회보험 적용", "수습기간", "계약해지", "특약사항",
+]
+
+SENTENCES = [
+    "사용자는 근로자에게 매월 정해진 날짜에 임금을 지급한다.",
+    "근로자는 회사의 취업규칙 및 제반 규정을 준수하여야 한다.",
+    "연장근로가 발생하는 경우 근로기준법에 따른 가산수당을 지급한다.",
+    "수습기간 중에도 최저임금 이상의 임금을 보장한다.",
+    "본 계약에 정하지 않은 사항은 관계 법령에 따른다.",
+    "휴게시간은 근로시간 도중에 부여하며 자유롭게 이용할 수 있다.",
+]
+
+# 한 페이지 분량 (약 1,800자)
+PAGE_CHARS = 1800
+
+
+def _ocr_whitespace(rng: random.Random) -> str:
+    """OCR 결과처럼 불규칙한 공백"""
+    return rng.choice([" ", " ", " ", "  ", "\n", " \n ", "\t", "   "])
+
+
+def build_contract(pages: int, seed: int = 42) -> Tuple[str, List[str]]:
+    """
+    불규칙 공백 계약서와 (공백이 정규화된) 조항 본문 목록 생성
+
+    Returns:
+        (contract_text, clause_bodies)
+    """
+    rng = random.Random(seed)
+    target_len = pages * PAGE_CHARS
+    parts: List[str] = []
+    bodies: List[str] = []
+    length = 0
+    while length < target_len:
+        title = rng.choice(SECTION_TITLES)
+        words = " ".join(rng.choice(SENTENCES) for _ in range(rng.randint(4, 10))).split(" ")
+        ocr_body = "".join(w + _ocr_whitespace(rng) for w in words).strip()
+        section = f"\n{title} {ocr_body}\n"
+        parts.append(section)
+        bodies.append(" ".join(words))
+        length += len(section)
+    return "".join(parts), bodies
+
+
+def legacy_locate(contract_text: str, bodies: List[str]) -> List[int]:
+    """기존 extract_clauses의 공백 정규화 fallback (문자 위치마다 re.sub)"""
+    positions = []
+    offset = 0
+    for body in bodies:
+        start_idx = -1
+        body_normalized = re.sub(r'\s+', ' ', body.strip())
+        contract_normalized = re.sub(r'\s+', ' ', contract_text[offset:])
+        if contract_normalized.find(body_normalized) >= 0:
+            search_text = contract_text[offset:]
+            for i in range(len(search_text) - len(body_normalized) + 1):
+                if re.sub(r'\s+', ' ', search_text[i:i + len(body_normalized)]) == body_normalized:
+                    start_idx = offset + i
+                    break
+        positions.append(start_idx)
+        if start_idx >= 0:
+            offset = start_idx + len(body)
+    return positions
+
+
+def offset_map_locate(contract_text: str, bodies: List[str]) -> List[int]:
+    """NormalizedText 한 번 생성 + 전방 스캔"""
+    normalized = NormalizedText(contract_text)
+    return [span[0] if span else -1 for span in normalized.locate_all(bodies)]
+
+
+def _timeit(fn, repeat: int) -> List[float]:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="clause_extractor offset 매핑 벤치마크")
+    parser.add_argument("--pages", type=int, default=100, help="계약서 페이지 수 (기본값: 100)")
+    parser.add_argument("--repeat", type=int, default=5, help="반복 횟수 (기본값: 5)")
+    parser.add_argument(
+        "--legacy-clauses", type=int, default=5,
+        help="legacy 방식으로 측정할 조항 수 (전체는 매우 느림, 0이면 건너뜀)",
+    )
+    args = parser.parse_args()
+
+    contract_text, bodies = build_contract(args.pages)
+    print(f"[벤치마크] 계약서 길이: {len(contract_text):,}자 ({args.pages}페이지), 조항 {len(bodies)}개")
+
+    timings = _timeit(lambda: offset_map_locate(contract_text, bodies), args.repeat)
+    located = offset_map_locate(contract_text, bodies)
+    print(
+        f"[offset map] 전체 {len(bodies)}개 조항: 평균 {statistics.mean(timings):.2f}ms, "
+        f"찾음 {sum(1 for p in located if p >= 0)}/{len(bodies)}"
+    )
+
+    if args.legacy_clauses > 0:
+        subset = bodies[:args.legacy_clauses]
+        started = time.perf_counter()
+        legacy_positions = legacy_locate(contract_text, subset)
+        legacy_timings = [(time.perf_counter() - started) * 1000]
+        new_timings = _timeit(lambda: offset_map_locate(contract_text, subset), args.repeat)
+        # legacy는 윈도우 길이를 정규화 길이로 고정하므로 공백이 늘어난 조항은 찾지 못함
+        legacy_found = sum(1 for p in legacy_positions if p >= 0)
+        new_found = sum(1 for p in offset_map_locate(contract_text, subset) if p >= 0)
+        print(
+            f"[비교] 앞 {len(subset)}개 조항: legacy {legacy_timings[0]:.2f}ms (찾음 {legacy_found}), "
+            f"offset map {statistics.mean(new_timings):.2f}ms (찾음 {new_found}) "
+            f"(x{legacy_timings[0] / max(statistics.mean(new_timings), 1e-6):.0f})"
+        )
+
+    extract_timings = _timeit(lambda: extract_clauses(contract_text), args.repeat)
+    print(f"[extract_clauses] 평균 {statistics.mean(extract_timings):.2f}ms, 최대 {max(extract_timings):.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
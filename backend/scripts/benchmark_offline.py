@@ -0,0 +1,104 @@
+"""
+오프라인 벤치마크 (Supabase/LLM 없이 재현 가능한 성능 측정)
+benchmarks/ 의 로컬 대체 구현(InMemoryVectorStore, FakeLLM)으로 주요 시나리오를 실행하고
+p50/p95/p99 지연과 동시성별 처리량을 측정합니다. CI에서 baseline과 비교해 회귀를 잡는 용도.
+
+사용법:
+    # 전체 시나리오 실행 후 baseline 저장
+    python scripts/benchmark_offline.py --save-baseline benchmarks/baseline.json
+
+    # baseline과 비교 (회귀가 있으면 종료 코드 1)
+    python scripts/benchmark_offline.py --compare benchmarks/baseline.json
+
+    # 특정 시나리오, LLM 지연 없이 코드 경로만 측정
+    python scripts/benchmark_offline.py --scenarios search,agent-chat --llm-latency-ms 0
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.runner import (
+    build_report,
+    compare_to_baseline,
+    load_report,
+    print_comparison,
+    print_results,
+    run_scenario,
+    save_report,
+)
+from benchmarks.scenarios import SCENARIOS, get_scenarios
+from benchmarks.stand_ins import offline_environment
+
+
+async def run_all(args) -> list:
+    scenarios = get_scenarios([name.strip() for name in args.scenarios.split(",") if name.strip()])
+    levels = [int(level) for level in args.concurrency.split(",")]
+    results = []
+    with offline_environment(
+        llm_latency_ms=args.llm_latency_ms,
+        llm_jitter_ms=args.llm_jitter_ms,
+        embed_latency_ms=args.embed_latency_ms,
+        store_latency_ms=args.store_latency_ms,
+        seed=args.seed,
+    ) as env:
+        for scenario in scenarios:
+            for concurrency in levels:
+                print(f"▶ {scenario.name} (동시성 {concurrency}, 요청 {args.requests}개) - {scenario.description}")
+                results.append(await run_scenario(
+                    scenario, env, requests=args.requests, concurrency=concurrency, warmup=args.warmup
+                ))
+        print(f"ℹ️  LLM 호출 {env.llm.calls}회, 임베딩 호출 {env.generator.embed_calls}회, 벡터스토어 호출 {env.store.calls}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="오프라인 벤치마크")
+    parser.add_argument("--scenarios", type=str, default=",".join(SCENARIOS),
+                        help=f"실행할 시나리오 (쉼표 구분, 기본값: {','.join(SCENARIOS)})")
+    parser.add_argument("--requests", type=int, default=30, help="동시성 단계별 측정 요청 수 (기본값: 30)")
+    parser.add_argument("--concurrency", type=str, default="1,8", help="동시성 단계 (쉼표 구분, 기본값: 1,8)")
+    parser.add_argument("--warmup", type=int, default=2, help="측정 전 워밍업 요청 수 (기본값: 2)")
+    parser.add_argument("--llm-latency-ms", type=float, default=200.0, help="LLM 호출당 지연 (기본값: 200)")
+    parser.add_argument("--llm-jitter-ms", type=float, default=0.0, help="LLM 지연 jitter (기본값: 0)")
+    parser.add_argument("--embed-latency-ms", type=float, default=5.0, help="임베딩 배치당 지연 (기본값: 5)")
+    parser.add_argument("--store-latency-ms", type=float, default=20.0, help="벡터스토어 호출당 지연 (기본값: 20)")
+    parser.add_argument("--seed", type=int, default=42, help="jitter 난수 seed (기본값: 42)")
+    parser.add_argument("--output", type=str, default=None, help="결과 JSON 저장 경로")
+    parser.add_argument("--save-baseline", type=str, default=None, help="결과를 baseline으로 저장할 경로")
+    parser.add_argument("--compare", type=str, default=None, help="비교할 baseline JSON 경로")
+    parser.add_argument("--threshold", type=float, default=0.15, help="회귀 판단 상대 변화율 (기본값: 0.15)")
+    args = parser.parse_args()
+
+    results = asyncio.run(run_all(args))
+    print_results(results)
+
+    config = {
+        key: getattr(args, key)
+        for key in ("scenarios", "requests", "concurrency", "warmup", "llm_latency_ms",
+                    "llm_jitter_ms", "embed_latency_ms", "store_latency_ms", "seed")
+    }
+    report = build_report(results, config)
+    if args.output:
+        save_report(report, Path(args.output))
+        print(f"\n💾 결과 저장: {args.output}")
+    if args.save_baseline:
+        save_report(report, Path(args.save_baseline))
+        print(f"\n💾 baseline 저장: {args.save_baseline}")
+
+    if args.compare:
+        rows = compare_to_baseline(report, load_report(Path(args.compare)), threshold=args.threshold)
+        print_comparison(rows)
+        regressions = [row for row in rows if row["regression"]]
+        if regressions:
+            print(f"\n❌ 회귀 {len(regressions)}건 (threshold {args.threshold * 100:.0f}%)")
+            sys.exit(1)
+        print("\n✅ 회귀 없음")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+legal_chunks 2단계 검색 축소 벡터 빌드 + recall@k 리포트
+legal_chunks 임베딩으로 PCA/binary 축소 표현을 만들고, exact(float32 전체) 검색 대비
+2단계 검색(축소 벡터 1차 후보 → float32 재계산)의 recall@k와 지연을 측정합니다.
+--save를 주면 설정된 방식(LEGAL_INDEX_FIRST_STAGE)의 축소 표현을 로컬 인덱스 디스크 스냅샷에 함께 저장합니다.
+
+쿼리는 코퍼스 청크 임베딩 샘플(자기 자신 제외)과 --query-file의 질문(한 줄에 하나, 임베딩 모델로 변환)을 사용합니다.
+
+사용법:
+    # pca 64/128/256, binary를 후보 수 100/300/1000으로 비교
+    python scripts/build_legal_reduced_index.py
+
+    # 실제 질문 파일 포함, 결과 JSON 저장
+    python scripts/build_legal_reduced_index.py --query-file queries.txt --output reduced_report.json
+
+    # 설정값(LEGAL_INDEX_FIRST_STAGE=pca 등)으로 축소 표현을 만들어 스냅샷에 저장
+    python scripts/build_legal_reduced_index.py --save
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import settings
+from core.legal_vector_index import LegalChunkIndex
+from core.vector_reduction import VectorReducer, two_stage_top_k
+
+
+def load_queries(matrix: np.ndarray, sample: int, query_file: str = None, seed: int = 42):
+    """(쿼리 행렬, 제외할 행 번호 또는 -1) - 코퍼스 샘플은 자기 자신을 정답에서 제외"""
+    rng = np.random.default_rng(seed)
+    rows = rng.choice(matrix.shape[0], min(sample, matrix.shape[0]), replace=False)
+    queries = [matrix[rows]]
+    exclude = list(rows)
+    if query_file:
+        from core.generator_v2 import LLMGenerator
+        texts = [line.strip() for line in open(query_file, encoding="utf-8") if line.strip()]
+        embedded = np.asarray(LLMGenerator().embed(texts), dtype=np.float32)
+        embedded /= np.maximum(np.linalg.norm(embedded, axis=1, keepdims=True), 1e-12)
+        queries.append(embedded)
+        exclude.extend([-1] * len(texts))
+    return np.vstack(queries), exclude
+
+
+def exact_top_k(matrix: np.ndarray, query: np.ndarray, k: int, exclude: int) -> np.ndarray:
+    scores = matrix @ query
+    if exclude >= 0:
+        scores[exclude] = -np.inf
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top])]
+
+
+def evaluate(matrix, queries, exclude, reducer, reduced, candidates, ks):
+    """recall@k (exact top-k 중 2단계 top-k에 포함된 비율 평균)과 쿼리당 지연"""
+    max_k = max(ks)
+    hits = {k: 0.0 for k in ks}
+    elapsed = 0.0
+    for query, skip in zip(queries, exclude):
+        truth = exact_top_k(matrix, query, max_k, skip)
+        started = time.perf_counter()
+        found, _ = two_stage_top_k(matrix, reducer, reduced, query, top_k=max_k + 1, candidates=candidates)
+        elapsed += time.perf_counter() - started
+        found = [i for i in found if i != skip][:max_k]
+        for k in ks:
+            hits[k] += len(set(truth[:k]) & set(found[:k])) / k
+    return {f"recall@{k}": round(hits[k] / len(queries), 4) for k in ks}, elapsed / len(queries) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="legal_chunks 2단계 검색 축소 벡터 빌드 + recall 리포트")
+    parser.add_argument("--kinds", type=str, default="pca,binary", help="축소 방식 (쉼표 구분, 기본값: pca,binary)")
+    parser.add_argument("--dims", type=str, default="64,128,256", help="pca 차원 수 (쉼표 구분, 기본값: 64,128,256)")
+    parser.add_argument("--candidates", type=str, default="100,300,1000", help="1차 후보 수 (쉼표 구분, 기본값: 100,300,1000)")
+    parser.add_argument("--k", type=str, default="3,8,20", help="recall@k의 k (쉼표 구분, 기본값: 3,8,20)")
+    parser.add_argument("--queries", type=int, default=200, help="코퍼스에서 샘플링할 쿼리 수 (기본값: 200)")
+    parser.add_argument("--query-file", type=str, default=None, help="실제 질문 파일 (한 줄에 하나)")
+    parser.add_argument("--output", type=str, default=None, help="리포트 JSON 저장 경로")
+    parser.add_argument("--save", action="store_true", help="설정값 방식의 축소 표현을 로컬 인덱스 스냅샷에 저장")
+    args = parser.parse_args()
+
+    index = LegalChunkIndex(
+        backend="exact",
+        snapshot_dir=settings.legal_index_snapshot_dir or None,
+        first_stage=settings.legal_index_first_stage,
+        reduced_dims=settings.legal_index_reduced_dims,
+        two_stage_min_size=0,
+        two_stage_candidates=settings.legal_two_stage_candidates,
+    )
+    started = time.perf_counter()
+    rows, embeddings = index._fetch_rows()
+    matrix = np.ascontiguousarray(embeddings, dtype=np.float32)
+    if not matrix.size:
+        print("❌ legal_chunks 임베딩이 없습니다.")
+        sys.exit(1)
+    matrix /= np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+    print(f"📦 legal_chunks {matrix.shape[0]}개 × {matrix.shape[1]}차원 로딩 ({time.perf_counter() - started:.1f}초)")
+
+    ks = [int(k) for k in args.k.split(",")]
+    queries, exclude = load_queries(matrix, args.queries, args.query_file)
+
+    exact_started = time.perf_counter()
+    for query, skip in zip(queries, exclude):
+        exact_top_k(matrix, query, max(ks), skip)
+    exact_ms = (time.perf_counter() - exact_started) / len(queries) * 1000
+    print(f"🎯 exact 검색: {exact_ms:.2f}ms/쿼리 (쿼리 {len(queries)}개)\n")
+
+    report = {"chunks": int(matrix.shape[0]), "queries": len(queries), "exact_ms": round(exact_ms, 3), "results": []}
+    print(f"{'방식':<14}{'후보':>8}{'ms/쿼리':>10}{'메모리':>10}  recall")
+    print("-" * 72)
+    for kind in [k.strip() for k in args.kinds.split(",") if k.strip()]:
+        dims_list = [int(d) for d in args.dims.split(",")] if kind == "pca" else [matrix.shape[1]]
+        for dims in dims_list:
+            reducer = VectorReducer.fit(kind, matrix, dims=dims)
+            reduced = reducer.transform(matrix)
+            label = f"{kind}-{dims}" if kind == "pca" else kind
+            for candidates in [int(c) for c in args.candidates.split(",")]:
+                recalls, ms = evaluate(matrix, queries, exclude, reducer, reduced, candidates, ks)
+                memory_mb = reduced.nbytes / 1024 / 1024
+                report["results"].append({
+                    "kind": kind, "dims": dims, "candidates": candidates,
+                    "ms_per_query": round(ms, 3), "reduced_mb": round(memory_mb, 2), **recalls,
+                })
+                recall_str = "  ".join(f"{name}={value:.3f}" for name, value in recalls.items())
+                print(f"{label:<14}{candidates:>8}{ms:>10.2f}{memory_mb:>9.1f}M  {recall_str}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 리포트 저장: {args.output}")
+
+    if args.save:
+        if index.first_stage == "none" or not index.snapshot_dir:
+            print("\n⚠️  LEGAL_INDEX_FIRST_STAGE(pca|binary)와 LEGAL_INDEX_SNAPSHOT_DIR을 설정해야 저장할 수 있습니다.")
+            sys.exit(1)
+        snapshot = index._build_snapshot(index.fetch_remote_version(), rows, embeddings)
+        index._save_snapshot_file(snapshot)
+        print(f"\n💾 {index.first_stage} 축소 표현 스냅샷 저장: {index.snapshot_dir} (version={snapshot.version})")
+
+
+if __name__ == "__main__":
+    main()
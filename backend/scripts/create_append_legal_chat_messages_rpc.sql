@@ -0,0 +1,69 @@
+-- legal_chat_messages 일괄 저장 RPC 함수 생성
+-- Agent 챗 한 턴(user + assistant 메시지)을 한 번의 호출로 저장하고
+-- sequence_number를 서버에서 할당 (클라이언트 max+1 계산 제거)
+
+-- 1. 기존 함수가 있으면 삭제
+DROP FUNCTION IF EXISTS append_legal_chat_messages(uuid, uuid, jsonb);
+
+-- 2. RPC 함수 생성
+-- p_messages: [{"sender_type": "user", "message": "...", "context_type": "none", "context_id": null, "metadata": null}, ...]
+CREATE OR REPLACE FUNCTION append_legal_chat_messages(
+  p_session_id uuid,
+  p_user_id uuid,
+  p_messages jsonb
+)
+RETURNS SETOF legal_chat_messages
+LANGUAGE plpgsql AS $$
+DECLARE
+  v_last_seq integer;
+BEGIN
+  -- 같은 세션에 대한 동시 저장 직렬화 (세션 행 잠금)
+  PERFORM 1 FROM legal_chat_sessions WHERE id = p_session_id FOR UPDATE;
+
+  SELECT COALESCE(MAX(sequence_number), 0)
+    INTO v_last_seq
+    FROM legal_chat_messages
+   WHERE session_id = p_session_id;
+
+  RETURN QUERY
+  INSERT INTO legal_chat_messages (
+    session_id,
+    user_id,
+    sender_type,
+    message,
+    sequence_number,
+    context_type,
+    context_id,
+    metadata
+  )
+  SELECT
+    p_session_id,
+    p_user_id,
+    m.value->>'sender_type',
+    m.value->>'message',
+    v_last_seq + m.ordinality::integer,
+    COALESCE(m.value->>'context_type', 'none'),
+    NULLIF(m.value->>'context_id', '')::uuid,
+    CASE WHEN jsonb_typeof(m.value->'metadata') = 'object' THEN m.value->'metadata' ELSE NULL END
+  FROM jsonb_array_elements(p_messages) WITH ORDINALITY AS m(value, ordinality)
+  ORDER BY m.ordinality
+  RETURNING *;
+
+  UPDATE legal_chat_sessions SET updated_at = now() WHERE id = p_session_id;
+END;
+$$;
+
+-- 3. 함수 설명 추가
+COMMENT ON FUNCTION append_legal_chat_messages IS
+'legal_chat_messages 일괄 저장 함수 (sequence_number 서버 할당)';
+
+-- 4. 최근 히스토리 조회용 인덱스 (ORDER BY sequence_number DESC LIMIT n)
+CREATE INDEX IF NOT EXISTS idx_legal_chat_messages_session_sequence
+ON legal_chat_messages(session_id, sequence_number DESC);
+
+-- 완료 메시지
+DO $$
+BEGIN
+    RAISE NOTICE 'append_legal_chat_messages RPC 함수가 생성되었습니다!';
+    RAISE NOTICE 'idx_legal_chat_messages_session_sequence 인덱스가 생성되었습니다.';
+END $$;
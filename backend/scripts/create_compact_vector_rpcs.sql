@@ -0,0 +1,197 @@
+-- 임베딩 compact 전송용 함수/RPC (core/vector_codec.py)
+-- JSON float 배열(1024차원 약 20KB) 대신 big-endian float32/float16 바이트의 base64로 임베딩을 주고받습니다.
+-- create_legal_tables.sql, create_contract_chunks_table.sql, create_match_legal_chunks_rpc.sql 실행 후
+-- Supabase SQL Editor에서 실행하세요. (없으면 백엔드는 기존 JSON 전송으로 동작)
+
+-- 1. base64 → vector 디코드 (dtype: 'float32' | 'float16', big-endian)
+CREATE OR REPLACE FUNCTION decode_vector_b64(data text, dtype text DEFAULT 'float32')
+RETURNS vector
+LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE AS $$
+  WITH raw AS (
+    SELECT decode(data, 'base64') AS b,
+           CASE WHEN dtype = 'float16' THEN 2 ELSE 4 END AS w
+  ),
+  bits AS (
+    SELECT
+      i,
+      w,
+      CASE WHEN w = 4 THEN
+        (get_byte(b, i * 4)::bigint << 24) | (get_byte(b, i * 4 + 1) << 16)
+          | (get_byte(b, i * 4 + 2) << 8) | get_byte(b, i * 4 + 3)
+      ELSE
+        (get_byte(b, i * 2)::bigint << 8) | get_byte(b, i * 2 + 1)
+      END AS v
+    FROM raw, generate_series(0, length(b) / w - 1) AS i
+  )
+  SELECT array_agg(
+    CASE WHEN w = 4 THEN
+      (CASE WHEN v >> 31 = 1 THEN -1.0 ELSE 1.0 END)::float8 *
+      CASE WHEN (v >> 23) & 255 = 0
+        THEN (v & 8388607)::float8 * 2.0::float8 ^ (-149)
+        ELSE (1.0::float8 + (v & 8388607)::float8 / 8388608.0) * 2.0::float8 ^ (((v >> 23) & 255) - 127)
+      END
+    ELSE
+      (CASE WHEN v >> 15 = 1 THEN -1.0 ELSE 1.0 END)::float8 *
+      CASE WHEN (v >> 10) & 31 = 0
+        THEN (v & 1023)::float8 * 2.0::float8 ^ (-24)
+        ELSE (1.0::float8 + (v & 1023)::float8 / 1024.0) * 2.0::float8 ^ (((v >> 10) & 31) - 15)
+      END
+    END
+    ORDER BY i
+  )::real[]::vector
+  FROM bits;
+$$;
+
+-- 2. vector → base64 인코드 (float32 big-endian, float4send 바이트 그대로)
+CREATE OR REPLACE FUNCTION encode_vector_b64(v vector)
+RETURNS text
+LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE AS $$
+  SELECT translate(encode(string_agg(float4send(x), ''::bytea ORDER BY ord), 'base64'), E'\n', '')
+  FROM unnest(v::real[]) WITH ORDINALITY AS t(x, ord);
+$$;
+
+-- 3. legal_chunks 일괄 삽입 (rows: [{external_id, source_type, title, content, chunk_index, file_path, metadata, embedding_b64}])
+CREATE OR REPLACE FUNCTION insert_legal_chunks_b64(rows jsonb, dtype text DEFAULT 'float32')
+RETURNS integer
+LANGUAGE sql AS $$
+  WITH inserted AS (
+    INSERT INTO legal_chunks (external_id, source_type, title, content, chunk_index, file_path, metadata, embedding)
+    SELECT
+      r->>'external_id',
+      r->>'source_type',
+      r->>'title',
+      r->>'content',
+      (r->>'chunk_index')::integer,
+      r->>'file_path',
+      COALESCE(r->'metadata', '{}'::jsonb),
+      decode_vector_b64(r->>'embedding_b64', dtype)
+    FROM jsonb_array_elements(rows) AS r
+    RETURNING 1
+  )
+  SELECT count(*)::integer FROM inserted;
+$$;
+
+-- 4. contract_chunks 일괄 삽입 (rows: [{contract_id, article_number, paragraph_index, content, chunk_index, chunk_type, metadata, embedding_b64}])
+CREATE OR REPLACE FUNCTION insert_contract_chunks_b64(rows jsonb, dtype text DEFAULT 'float32')
+RETURNS integer
+LANGUAGE sql AS $$
+  WITH inserted AS (
+    INSERT INTO contract_chunks (contract_id, article_number, paragraph_index, content, chunk_index, chunk_type, metadata, embedding)
+    SELECT
+      r->>'contract_id',
+      (r->>'article_number')::integer,
+      (r->>'paragraph_index')::integer,
+      r->>'content',
+      (r->>'chunk_index')::integer,
+      r->>'chunk_type',
+      COALESCE(r->'metadata', '{}'::jsonb),
+      decode_vector_b64(r->>'embedding_b64', dtype)
+    FROM jsonb_array_elements(rows) AS r
+    RETURNING 1
+  )
+  SELECT count(*)::integer FROM inserted;
+$$;
+
+-- 5. legal_chunks 벡터 검색 (match_legal_chunks와 같은 결과, 쿼리 임베딩만 base64)
+CREATE OR REPLACE FUNCTION match_legal_chunks_b64(
+  query_embedding_b64 text,
+  match_threshold float DEFAULT 0.5,
+  match_count int DEFAULT 8,
+  category text DEFAULT NULL,
+  dtype text DEFAULT 'float32'
+)
+RETURNS TABLE(
+  id uuid,
+  external_id text,
+  source_type text,
+  title text,
+  content text,
+  chunk_index integer,
+  file_path text,
+  metadata jsonb,
+  score float
+)
+LANGUAGE sql STABLE AS $$
+  SELECT *
+  FROM match_legal_chunks(decode_vector_b64(query_embedding_b64, dtype), match_threshold, match_count, category);
+$$;
+
+-- 6. contract_chunks 벡터 검색 (match_contract_chunks와 같은 결과, 임베딩을 클라이언트로 내려받지 않음)
+CREATE OR REPLACE FUNCTION match_contract_chunks_b64(
+  contract_id_param text,
+  query_embedding_b64 text,
+  match_threshold float DEFAULT 0.5,
+  match_count int DEFAULT 5,
+  article_number_filter integer DEFAULT NULL,
+  boost_article integer DEFAULT NULL,
+  boost_factor float DEFAULT 1.5,
+  dtype text DEFAULT 'float32'
+)
+RETURNS TABLE (
+  id uuid,
+  contract_id text,
+  article_number integer,
+  paragraph_index integer,
+  content text,
+  chunk_index integer,
+  chunk_type text,
+  similarity float,
+  metadata jsonb
+)
+LANGUAGE sql STABLE AS $$
+  SELECT *
+  FROM match_contract_chunks(
+    contract_id_param,
+    decode_vector_b64(query_embedding_b64, dtype),
+    match_threshold,
+    match_count,
+    article_number_filter,
+    boost_article,
+    boost_factor
+  );
+$$;
+
+-- 7. legal_chunks 임베딩 페이지 조회 (로컬 legal 인덱스 스냅샷 로딩, id 기준 keyset 페이지네이션)
+CREATE OR REPLACE FUNCTION legal_chunk_embeddings_b64(
+  after_id uuid DEFAULT NULL,
+  page_size int DEFAULT 1000
+)
+RETURNS TABLE(
+  id uuid,
+  external_id text,
+  source_type text,
+  title text,
+  content text,
+  chunk_index integer,
+  file_path text,
+  metadata jsonb,
+  is_boilerplate boolean,
+  embedding_b64 text
+)
+LANGUAGE sql STABLE AS $$
+  SELECT
+    lc.id,
+    lc.external_id,
+    lc.source_type,
+    lc.title,
+    lc.content,
+    lc.chunk_index,
+    lc.file_path,
+    lc.metadata,
+    lc.is_boilerplate,
+    encode_vector_b64(lc.embedding)
+  FROM legal_chunks AS lc
+  WHERE (after_id IS NULL OR lc.id > after_id)
+    AND lc.embedding IS NOT NULL
+  ORDER BY lc.id
+  LIMIT page_size;
+$$;
+
+-- 완료 메시지
+DO $$
+BEGIN
+    RAISE NOTICE 'compact 벡터 전송 함수가 생성되었습니다!';
+    RAISE NOTICE '- decode_vector_b64 / encode_vector_b64';
+    RAISE NOTICE '- insert_legal_chunks_b64 / insert_contract_chunks_b64';
+    RAISE NOTICE '- match_legal_chunks_b64 / match_contract_chunks_b64 / legal_chunk_embeddings_b64';
+END $$;
@@ -0,0 +1,37 @@
+-- legal_chunks 코퍼스 버전 (법령 검색 결과 캐시 무효화, core/legal_search_cache.py)
+-- 인덱싱 스크립트(ingest_legal.py, batch_ingest.py --mode legal)가 작업 후 bump_legal_corpus_version()을 호출하면
+-- 서버는 LEGAL_SEARCH_CACHE_VERSION_INTERVAL초 안에 버전 변경을 감지하고 검색 캐시를 비웁니다.
+-- 테이블이 없으면 서버는 legal_chunks 행 수 + 최신 created_at을 버전으로 사용합니다. (수정/삭제는 감지 못함)
+-- Supabase SQL Editor에서 실행하세요.
+
+-- 1. 버전 테이블 (단일 행)
+CREATE TABLE IF NOT EXISTS legal_corpus_version (
+  id integer PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+  version bigint NOT NULL DEFAULT 1,
+  updated_at timestamptz NOT NULL DEFAULT now()
+);
+
+INSERT INTO legal_corpus_version (id, version)
+VALUES (1, 1)
+ON CONFLICT (id) DO NOTHING;
+
+-- 2. 버전 올리기 RPC (새 버전 반환)
+CREATE OR REPLACE FUNCTION bump_legal_corpus_version()
+RETURNS bigint
+LANGUAGE sql AS $$
+  INSERT INTO legal_corpus_version (id, version, updated_at)
+  VALUES (1, 1, now())
+  ON CONFLICT (id) DO UPDATE
+    SET version = legal_corpus_version.version + 1,
+        updated_at = now()
+  RETURNING version;
+$$;
+
+COMMENT ON FUNCTION bump_legal_corpus_version IS
+'legal_chunks 코퍼스 버전 증가 (인덱싱 후 호출, 법령 검색 결과 캐시 무효화)';
+
+-- 완료 메시지
+DO $$
+BEGIN
+    RAISE NOTICE 'legal_corpus_version 테이블과 bump_legal_corpus_version RPC 함수가 생성되었습니다!';
+END $$;
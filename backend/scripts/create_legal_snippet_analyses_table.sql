@@ -0,0 +1,21 @@
+-- legal_chunks snippet 분석 결과 테이블 생성 스크립트
+-- 상황 분석 응답의 sources[].snippetAnalyzed를 요청마다 LLM으로 만들지 않도록 미리 계산해서 저장
+-- Supabase SQL Editor에서 실행하세요
+
+-- 1. legal_snippet_analyses 테이블
+-- snippet_hash = sha256(버전 + legal_chunks.content 앞 300자), 재인덱싱으로 chunk id가 바뀌어도 재사용
+CREATE TABLE IF NOT EXISTS public.legal_snippet_analyses (
+    snippet_hash TEXT PRIMARY KEY,
+    chunk_id UUID,               -- 분석 당시 legal_chunks.id (참고용, 재인덱싱 후에는 달라질 수 있음)
+    analysis JSONB NOT NULL,     -- {core_clause, easy_summary, action_tip}
+    model TEXT,                  -- 분석에 사용한 LLM 모델
+    created_at TIMESTAMPTZ DEFAULT now(),
+    updated_at TIMESTAMPTZ DEFAULT now()
+);
+
+-- 2. 인덱스 생성
+CREATE INDEX IF NOT EXISTS idx_legal_snippet_analyses_chunk_id
+    ON public.legal_snippet_analyses(chunk_id);
+
+-- 3. 백필
+-- python scripts/backfill_snippet_analyses.py
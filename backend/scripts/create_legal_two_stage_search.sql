@@ -0,0 +1,89 @@
+-- legal_chunks 2단계 벡터 검색 (binary quantization 1차 + float32 재계산)
+-- 1차: embedding을 부호 1비트로 양자화한 embedding_bq(bit(1024))의 해밍 거리로 후보 candidate_count개
+-- 2차: 후보만 원본 embedding(vector(1024))으로 코사인 유사도를 다시 계산해 match_count개 반환
+-- pgvector 0.7.0 이상 (binary_quantize, bit_hamming_ops) 필요
+-- create_match_legal_chunks_rpc.sql, create_compact_vector_rpcs.sql 실행 후 Supabase SQL Editor에서 실행하세요.
+-- 백엔드 설정: LEGAL_SEARCH_TWO_STAGE=true, LEGAL_TWO_STAGE_CANDIDATES=300
+
+-- 1. 축소 표현 컬럼 (generated column이므로 기존 행은 ALTER 시점에 채워지고, 이후 insert/update 시 자동 갱신)
+ALTER TABLE legal_chunks
+  ADD COLUMN IF NOT EXISTS embedding_bq bit(1024)
+  GENERATED ALWAYS AS (binary_quantize(embedding)::bit(1024)) STORED;
+
+-- 2. 해밍 거리 HNSW 인덱스
+CREATE INDEX IF NOT EXISTS legal_chunks_embedding_bq_idx
+ON legal_chunks
+USING hnsw (embedding_bq bit_hamming_ops);
+
+-- 3. 2단계 검색 RPC (반환 형식은 match_legal_chunks와 동일)
+-- HNSW는 쿼리당 최대 hnsw.ef_search개(기본 40)만 반환하므로, 1차 후보 수만큼 ef_search를 트랜잭션 범위로 올립니다.
+-- (ef_search 상한 1000, category/boilerplate 필터로 걸러지는 행이 많으면 pgvector 0.8+의 hnsw.iterative_scan도 고려)
+CREATE OR REPLACE FUNCTION match_legal_chunks_two_stage(
+  query_embedding_b64 text,
+  match_threshold float DEFAULT 0.5,
+  match_count int DEFAULT 8,
+  category text DEFAULT NULL,
+  candidate_count int DEFAULT 300,
+  dtype text DEFAULT 'float32'
+)
+RETURNS TABLE(
+  id uuid,
+  external_id text,
+  source_type text,
+  title text,
+  content text,
+  chunk_index integer,
+  file_path text,
+  metadata jsonb,
+  score float
+)
+LANGUAGE plpgsql STABLE AS $$
+BEGIN
+  PERFORM set_config(
+    'hnsw.ef_search',
+    LEAST(GREATEST(candidate_count, match_count, 40), 1000)::text,
+    true
+  );
+
+  RETURN QUERY
+  WITH q AS (
+    SELECT decode_vector_b64(query_embedding_b64, dtype) AS v
+  ),
+  candidates AS (
+    SELECT lc.id, lc.external_id, lc.source_type, lc.title, lc.content,
+           lc.chunk_index, lc.file_path, lc.metadata, lc.embedding
+    FROM legal_chunks AS lc, q
+    WHERE
+      (category IS NULL OR
+       (lc.metadata->>'topic_main' = category) OR
+       (lc.metadata->>'category' = category))
+      AND (lc.is_boilerplate IS NULL OR lc.is_boilerplate = false)
+    ORDER BY lc.embedding_bq <~> binary_quantize(q.v)
+    LIMIT GREATEST(candidate_count, match_count)
+  )
+  SELECT
+    c.id,
+    c.external_id,
+    c.source_type,
+    c.title,
+    c.content,
+    c.chunk_index,
+    c.file_path,
+    c.metadata,
+    1 - (c.embedding <=> q.v) AS score
+  FROM candidates AS c, q
+  WHERE 1 - (c.embedding <=> q.v) >= match_threshold
+  ORDER BY c.embedding <=> q.v
+  LIMIT match_count;
+END;
+$$;
+
+COMMENT ON FUNCTION match_legal_chunks_two_stage IS
+'legal_chunks 2단계 벡터 검색 (binary 해밍 1차 후보 → float32 코사인 재계산, category 필터 지원)';
+
+-- 완료 메시지
+DO $$
+BEGIN
+    RAISE NOTICE 'legal_chunks.embedding_bq 컬럼과 해밍 HNSW 인덱스가 생성되었습니다.';
+    RAISE NOTICE 'match_legal_chunks_two_stage RPC 함수가 생성되었습니다!';
+END $$;
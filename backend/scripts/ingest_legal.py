@@ -4,8 +4,10 @@ backend/data/legal/ 하위의 모든 파일을 legal_chunks 테이블에 인덱
 """
 
 import sys
+import argparse
+import asyncio
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 # 프로젝트 루트를 Python 경로에 추가
 backend_root = Path(__file__).resolve().parent.parent
@@ -15,6 +17,7 @@ sys.path.insert(0, str(backend_root))
 from core.supabase_vector_store import SupabaseVectorStore
 from core.generator_v2 import LLMGenerator
 from core.legal_chunker import LegalChunker, extract_doc_type_from_path
+from core.snippet_analyzer import SnippetAnalysisStore, legal_chunk_snippet
 
 # DocumentProcessor는 PDF/HWP 파일 처리 시에만 지연 로드
 _DocumentProcessor = None
@@ -60,11 +63,14 @@ def process_file(
     file_path: Path,
     store: SupabaseVectorStore,
     generator: LLMGenerator,
-    chunker: LegalChunker
+    chunker: LegalChunker,
+    snippet_store: Optional[SnippetAnalysisStore] = None
 ) -> int:
     """
     단일 파일 처리 및 인덱싱
     
+    snippet_store가 있으면 저장한 청크의 snippet 분석도 미리 계산 (상황 분석 응답에서 재사용)
+    
     Returns:
         저장된 청크 개수
     """
@@ -176,14 +182,32 @@ def process_file(
     try:
         store.bulk_upsert_legal_chunks(chunks_to_store)
         print(f"  ✓ {len(chunks_to_store)}개 청크 저장 완료")
-        return len(chunks_to_store)
     except Exception as e:
         print(f"[오류] 저장 실패: {file_path.name} - {str(e)}")
         return 0
+    
+    # snippet 분석 사전 계산 (실패해도 인덱싱은 유지, 백필 스크립트로 다시 채울 수 있음)
+    if snippet_store is not None:
+        try:
+            stats = asyncio.run(snippet_store.precompute(
+                [legal_chunk_snippet(c["content"]) for c in chunks_to_store]
+            ))
+            print(f"  ✓ snippet 분석: {stats['analyzed']}개 저장, {stats['skipped']}개 재사용, {stats['failed']}개 실패")
+        except Exception as e:
+            print(f"[경고] snippet 분석 실패: {file_path.name} - {str(e)}")
+    
+    return len(chunks_to_store)
 
 
 def main():
     """메인 함수"""
+    parser = argparse.ArgumentParser(description="법률 문서 인덱싱")
+    parser.add_argument(
+        "--skip-snippet-analysis", action="store_true",
+        help="snippet 분석 사전 계산 생략 (나중에 scripts/backfill_snippet_analyses.py로 채움)",
+    )
+    args = parser.parse_args()
+    
     print("=" * 60)
     print("법률 문서 인덱싱 시작")
     print("=" * 60)
@@ -193,6 +217,7 @@ def main():
     store = SupabaseVectorStore()
     generator = LLMGenerator()
     chunker = LegalChunker(max_chars=1200, overlap=200)
+    snippet_store = None if args.skip_snippet_analysis else SnippetAnalysisStore(vector_store=store)
     print("[완료] 컴포넌트 로딩 완료")
     
     # 처리할 파일 목록 수집
@@ -227,10 +252,17 @@ def main():
             file_path=file_path,
             store=store,
             generator=generator,
-            chunker=chunker
+            chunker=chunker,
+            snippet_store=snippet_store
         )
         total_chunks += chunks_count
     
+    # 서버 법령 검색 결과 캐시 무효화 (코퍼스 버전 증가)
+    if total_chunks > 0:
+        corpus_version = store.bump_legal_corpus_version()
+        if corpus_version is not None:
+            print(f"\n[완료] legal_chunks 코퍼스 버전: {corpus_version} (검색 캐시 무효화)")
+    
     print("\n" + "=" * 60)
     print(f"인덱싱 완료: 총 {total_chunks}개 청크 저장")
     print("=" * 60)
@@ -27,7 +27,7 @@ from config import settings
 
 # 상황분석 워크플로우 (선택적)
 try:
-    from core.situation_workflow import SituationWorkflow
+    from core.situation_workflow import get_situation_workflow
     SITUATION_WORKFLOW_AVAILABLE = True
 except ImportError:
     SITUATION_WORKFLOW_AVAILABLE = False
@@ -506,7 +506,7 @@ class PerformanceTester:
             pipeline_times = {}
             
             try:
-                workflow = SituationWorkflow()
+                workflow = get_situation_workflow()
                 
                 # 전체 파이프라인 시간 측정
                 start = time.time()
@@ -1,11 +1,32 @@
 """
 팀 임베딩 동기화 스크립트
 기존 팀들의 임베딩을 생성/업데이트합니다.
+
+- summary 해시를 저장된 임베딩과 비교해서 변경된 팀만 임베딩
+- 변경된 summary는 LLMGenerator.embed로 배치 임베딩, team_embeddings에 페이지 단위 upsert
+- incremental 모드: 마지막 동기화 이후 teams.updated_at이 바뀐 팀만 조회
+
+사용법:
+    # 전체 동기화 (변경된 팀만 재임베딩)
+    python scripts/sync_team_embeddings.py
+
+    # 증분 동기화 (마지막 동기화 이후 수정된 팀만)
+    python scripts/sync_team_embeddings.py --incremental
+
+    # 특정 시각 이후 수정된 팀만
+    python scripts/sync_team_embeddings.py --since 2025-01-01T00:00:00+00:00
+
+    # 해시 비교 없이 전부 재임베딩
+    python scripts/sync_team_embeddings.py --force
 """
 
 import os
 import sys
+import json
+import argparse
 from pathlib import Path
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
 
 # 프로젝트 루트를 Python 경로에 추가
 backend_root = Path(__file__).parent.parent
@@ -13,6 +34,14 @@ sys.path.insert(0, str(backend_root))
 
 from supabase import create_client
 from core.orchestrator_v2 import Orchestrator
+from core.supabase_vector_store import SupabaseVectorStore
+
+# summary 생성에 필요한 컬럼만 조회
+TEAM_COLUMNS = "id, name, bio, specialty, sub_specialty, prefered, updated_at"
+
+# 증분 동기화 기준 시각 저장 위치
+DEFAULT_STATE_FILE = backend_root / "data" / "team_embedding_sync_state.json"
+
 
 def generate_team_summary(team_data):
     """팀 데이터에서 summary 생성"""
@@ -50,69 +79,201 @@ def generate_team_summary(team_data):
     return summary, meta
 
 
-def sync_all_teams():
-    """모든 팀의 임베딩 동기화"""
+def load_last_synced_at(state_file: Path) -> Optional[str]:
+    """마지막 동기화 기준 시각 (teams.updated_at 최댓값)"""
+    try:
+        with open(state_file, "r", encoding="utf-8") as f:
+            return json.load(f).get("last_updated_at")
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def save_last_synced_at(state_file: Path, last_updated_at: str):
+    state_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(state_file, "w", encoding="utf-8") as f:
+        json.dump({
+            "last_updated_at": last_updated_at,
+            "synced_at": datetime.now().isoformat(),
+        }, f, ensure_ascii=False, indent=2)
+
+
+def fetch_teams(supabase, since: Optional[str] = None, page_size: int = 1000) -> List[Dict[str, Any]]:
+    """
+    삭제되지 않은 팀 조회 (페이지 단위)
+
+    Args:
+        since: 이 시각 이후 updated_at이 바뀐 팀만 (None이면 전체)
+    """
+    teams = []
+    offset = 0
+    while True:
+        query = supabase.table("teams")\
+            .select(TEAM_COLUMNS)\
+            .is_("deleted_at", None)
+        if since:
+            query = query.gt("updated_at", since)
+        result = query.order("id")\
+            .range(offset, offset + page_size - 1)\
+            .execute()
+        rows = result.data or []
+        teams.extend(rows)
+        if len(rows) < page_size:
+            break
+        offset += page_size
+    return teams
+
+
+def plan_team_updates(
+    teams: List[Dict[str, Any]],
+    stored_hashes: Dict[int, str],
+    force: bool = False
+) -> Tuple[List[Dict[str, Any]], int, int]:
+    """
+    summary 해시를 비교해서 재임베딩이 필요한 팀 선정
+
+    Returns:
+        (변경된 팀 [{team_id, summary, meta}], 변경 없음 수, 빈 팀 수)
+    """
+    changed = []
+    unchanged = 0
+    empty = 0
+    for team in teams:
+        summary, meta = generate_team_summary(team)
+        if not summary.strip():
+            empty += 1
+            continue
+        if not force and stored_hashes.get(team["id"]) == SupabaseVectorStore.content_hash(summary):
+            unchanged += 1
+            continue
+        changed.append({"team_id": team["id"], "summary": summary, "meta": meta})
+    return changed, unchanged, empty
+
+
+def sync_all_teams(
+    incremental: bool = False,
+    since: Optional[str] = None,
+    force: bool = False,
+    embed_batch_size: int = 64,
+    upsert_page_size: int = 200,
+    dry_run: bool = False,
+    state_file: Path = DEFAULT_STATE_FILE
+) -> Optional[Dict[str, Any]]:
+    """
+    팀 임베딩 동기화
+
+    Args:
+        incremental: 마지막 동기화 이후 수정된 팀만 처리
+        since: 기준 시각 직접 지정 (incremental보다 우선)
+        force: 해시 비교 없이 모든 팀 재임베딩
+        embed_batch_size: 한 번에 임베딩할 summary 수
+        upsert_page_size: 한 번에 upsert할 행 수
+        dry_run: 임베딩/저장 없이 변경 대상만 출력
+        state_file: 증분 동기화 기준 시각 저장 파일
+
+    Returns:
+        동기화 결과 요약
+    """
     # Supabase 클라이언트
     supabase_url = os.getenv("SUPABASE_URL")
     supabase_key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
-    
+
     if not supabase_url or not supabase_key:
         print("❌ SUPABASE_URL과 SUPABASE_SERVICE_ROLE_KEY 환경 변수가 필요합니다.")
-        return
-    
+        return None
+
     supabase = create_client(supabase_url, supabase_key)
-    
+
     # Orchestrator 초기화
     orchestrator = Orchestrator()
-    
-    # 모든 팀 조회
-    print("📋 팀 목록 조회 중...")
-    result = supabase.table("teams")\
-        .select("*")\
-        .is("deleted_at", None)\
-        .execute()
-    
-    teams = result.data if result.data else []
+
+    if since is None and incremental:
+        since = load_last_synced_at(state_file)
+        if since is None:
+            print("ℹ️  이전 동기화 기록이 없어 전체 동기화를 진행합니다.")
+
+    # 팀 조회
+    print(f"📋 팀 목록 조회 중... ({f'{since} 이후 수정분' if since else '전체'})")
+    teams = fetch_teams(supabase, since=since)
     print(f"✅ {len(teams)}개 팀 발견")
-    
-    # 각 팀의 임베딩 생성/업데이트
+
+    # 저장된 summary 해시와 비교
+    if force or not teams:
+        stored_hashes = {}
+    elif since:
+        stored_hashes = orchestrator.store.get_team_summary_hashes([t["id"] for t in teams])
+    else:
+        stored_hashes = orchestrator.store.get_team_summary_hashes()
+    changed, unchanged_count, empty_count = plan_team_updates(teams, stored_hashes, force=force)
+
+    print(f"🔍 변경: {len(changed)}개, 변경 없음: {unchanged_count}개, 정보 없음: {empty_count}개")
+
     success_count = 0
     error_count = 0
-    
-    for i, team in enumerate(teams, 1):
-        team_id = team['id']
-        team_name = team.get('name', f'팀 #{team_id}')
-        
-        print(f"\n[{i}/{len(teams)}] 팀 처리 중: {team_name} (ID: {team_id})")
-        
-        try:
-            # Summary 생성
-            summary, meta = generate_team_summary(team)
-            
-            if not summary.strip():
-                print(f"  ⚠️  팀 정보가 비어있어 임베딩을 건너뜁니다.")
-                continue
-            
-            # 임베딩 저장
-            orchestrator.store.upsert_team_embedding(
-                team_id=team_id,
-                summary=summary,
-                meta=meta
-            )
-            
-            print(f"  ✅ 임베딩 저장 완료")
-            success_count += 1
-            
-        except Exception as e:
-            print(f"  ❌ 오류: {str(e)}")
-            error_count += 1
-    
+
+    if dry_run:
+        for item in changed:
+            print(f"  - 팀 ID {item['team_id']}")
+    else:
+        # 배치 임베딩 + 페이지 단위 upsert
+        for i in range(0, len(changed), embed_batch_size):
+            batch = changed[i:i + embed_batch_size]
+            try:
+                embeddings = orchestrator.generator.embed([item["summary"] for item in batch])
+                rows = [
+                    {**item, "embedding": embeddings[j]}
+                    for j, item in enumerate(batch)
+                ]
+                success_count += orchestrator.store.bulk_upsert_team_embeddings(
+                    rows, page_size=upsert_page_size
+                )
+                print(f"  ✅ [{min(i + embed_batch_size, len(changed))}/{len(changed)}] 임베딩 저장 완료")
+            except Exception as e:
+                print(f"  ❌ 배치 오류 (팀 ID {batch[0]['team_id']}~{batch[-1]['team_id']}): {str(e)}")
+                error_count += len(batch)
+
+        # 오류가 없을 때만 증분 기준 시각 갱신 (실패한 팀은 다음 실행에서 다시 처리)
+        updated_ats = [t["updated_at"] for t in teams if t.get("updated_at")]
+        if error_count == 0 and updated_ats:
+            save_last_synced_at(state_file, max(updated_ats))
+
     print(f"\n{'='*50}")
     print(f"✅ 성공: {success_count}개")
+    print(f"⏭️  변경 없음: {unchanged_count}개")
     print(f"❌ 실패: {error_count}개")
     print(f"📊 총 처리: {len(teams)}개")
 
+    return {
+        "total": len(teams),
+        "changed": len(changed),
+        "unchanged": unchanged_count,
+        "empty": empty_count,
+        "success": success_count,
+        "failed": error_count,
+        "since": since,
+    }
 
-if __name__ == "__main__":
-    sync_all_teams()
 
+def main():
+    parser = argparse.ArgumentParser(description="팀 임베딩 동기화")
+    parser.add_argument("--incremental", action="store_true", help="마지막 동기화 이후 수정된 팀만 처리")
+    parser.add_argument("--since", type=str, default=None, help="이 시각 이후 updated_at이 바뀐 팀만 처리 (ISO 형식)")
+    parser.add_argument("--force", action="store_true", help="해시 비교 없이 모든 팀 재임베딩")
+    parser.add_argument("--batch-size", type=int, default=64, help="임베딩 배치 크기 (기본값: 64)")
+    parser.add_argument("--page-size", type=int, default=200, help="upsert 페이지 크기 (기본값: 200)")
+    parser.add_argument("--dry-run", action="store_true", help="변경 대상만 출력")
+    parser.add_argument("--state-file", type=str, default=str(DEFAULT_STATE_FILE), help="증분 동기화 상태 파일")
+    args = parser.parse_args()
+
+    sync_all_teams(
+        incremental=args.incremental,
+        since=args.since,
+        force=args.force,
+        embed_batch_size=args.batch_size,
+        upsert_page_size=args.page_size,
+        dry_run=args.dry_run,
+        state_file=Path(args.state_file),
+    )
+
+
+if __name__ == "__main__":
+    main()
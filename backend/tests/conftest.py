@@ -0,0 +1,10 @@
+"""
+pytest 공통 설정
+backend/ 디렉토리에서 `python -m pytest tests` 로 실행합니다.
+"""
+
+import sys
+from pathlib import Path
+
+# core/, config 등을 backend 기준으로 import
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
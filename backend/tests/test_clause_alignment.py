@@ -0,0 +1,90 @@
+"""
+clause_alignment (core/clause_alignment.py) 테스트
+헝가리안 매칭의 유사도 합이 모든 1:1 매칭을 전수 탐색한 최댓값과 같은지, compare_clauses가 조항 추가/삭제를 올바르게 잡는지 확인
+"""
+
+import itertools
+import random
+
+import pytest
+
+from core.clause_alignment import char_diff, compare_clauses, max_weight_assignment
+
+
+def brute_force_best(weights):
+    """참조 구현: 작은 쪽 축의 모든 원소를 큰 쪽에 배정하는 모든 경우 중 최대 합"""
+    n, m = len(weights), len(weights[0])
+    if n <= m:
+        return max(sum(weights[i][cols[i]] for i in range(n)) for cols in itertools.permutations(range(m), n))
+    return max(sum(weights[rows[j]][j] for j in range(m)) for rows in itertools.permutations(range(n), m))
+
+
+def test_assignment_is_optimal_against_brute_force():
+    rng = random.Random(46)
+    for _ in range(400):
+        n, m = rng.randint(1, 6), rng.randint(1, 6)
+        weights = [[round(rng.random(), 3) if rng.random() < 0.8 else 0.0 for _ in range(m)] for _ in range(n)]
+        pairs = max_weight_assignment(weights)
+        assert len(pairs) == min(n, m)
+        assert len({r for r, _ in pairs}) == len(pairs) and len({c for _, c in pairs}) == len(pairs)
+        assert all(0 <= r < n and 0 <= c < m for r, c in pairs)
+        assert sum(weights[r][c] for r, c in pairs) == pytest.approx(brute_force_best(weights))
+
+
+def test_assignment_empty():
+    assert max_weight_assignment([]) == []
+    assert max_weight_assignment([[]]) == []
+
+
+def test_char_diff_reconstructs_both_texts():
+    rng = random.Random(146)
+    for _ in range(200):
+        old = "".join(rng.choice("가나다 ab") for _ in range(rng.randint(0, 20)))
+        new = "".join(rng.choice("가나다 ab") for _ in range(rng.randint(0, 20)))
+        ops = char_diff(old, new)
+        assert "".join(op["oldText"] for op in ops) == old
+        assert "".join(op["newText"] for op in ops) == new
+
+
+def _clause(idx, title, content):
+    return {"id": f"clause-{idx}", "title": title, "content": content}
+
+
+OLD = [
+    _clause(1, "제1조(목적)", "이 계약은 근로조건을 정함을 목적으로 한다."),
+    _clause(2, "제2조(근로시간)", "근로시간은 1일 8시간, 1주 40시간으로 한다."),
+    _clause(3, "제3조(임금)", "임금은 월 250만원으로 하며 매월 25일에 지급한다."),
+    _clause(4, "제4조(수습기간)", "수습기간은 3개월로 하며 수습기간 중 임금은 90%를 지급한다."),
+]
+
+
+def test_inserted_clause_is_added_not_cascading_modifications():
+    # 제2조가 끼어들어 뒤 조항 번호가 하나씩 밀림
+    new = [
+        OLD[0],
+        _clause(2, "제2조(근무장소)", "근무장소는 서울 본사로 한다."),
+        _clause(3, "제3조(근로시간)", OLD[1]["content"]),
+        _clause(4, "제4조(임금)", OLD[2]["content"]),
+        _clause(5, "제5조(수습기간)", OLD[3]["content"]),
+    ]
+    stats = {}
+    changed = compare_clauses(OLD, new, min_similarity=0.3, stats=stats)
+    assert [(c["type"], c["clauseId"]) for c in changed] == [("added", "clause-2")]
+    assert stats == {"unchanged": 4, "moved": 3, "exact_matches": 4, "modified": 0, "added": 1, "removed": 0}
+
+
+def test_edited_and_removed_clauses():
+    new = [OLD[0], OLD[1], _clause(3, "제3조(임금)", "임금은 월 270만원으로 하며 매월 25일에 지급한다.")]
+    stats = {}
+    changed = compare_clauses(OLD, new, min_similarity=0.3, stats=stats)
+    assert [(c["type"], c["clauseId"]) for c in changed] == [("modified", "clause-3"), ("removed", "clause-4")]
+    modified = changed[0]
+    assert modified["oldClauseId"] == "clause-3"
+    assert "".join(op["newText"] for op in modified["diff"]) == new[2]["content"]
+    assert stats["modified"] == 1 and stats["removed"] == 1 and stats["added"] == 0
+
+
+def test_dissimilar_pair_below_threshold_is_removed_and_added():
+    new = [_clause(1, "제1조(비밀유지)", "을은 업무상 알게 된 비밀을 누설하지 않는다.")]
+    changed = compare_clauses(OLD[:1], new, min_similarity=0.5)
+    assert sorted(c["type"] for c in changed) == ["added", "removed"]
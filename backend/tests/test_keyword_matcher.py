@@ -0,0 +1,89 @@
+"""
+KeywordMatcher (core/keyword_matcher.py) 테스트
+Aho-Corasick 결과가 모든 키워드를 모든 위치에서 비교하는 단순 검색과 같은지 확인
+"""
+
+import random
+import re
+
+from core.keyword_matcher import (
+    CONTRACT_KEYWORD_MATCHER,
+    WAGE_WAIVER_PATTERNS,
+    KeywordHit,
+    KeywordMatcher,
+    _build_entries,
+    find_wage_waiver_pattern,
+)
+
+
+def naive_find_all(entries, text, tables=None):
+    """참조 구현: 모든 (키워드, 위치) 쌍을 lower 비교"""
+    lowered = text.lower()
+    hits = set()
+    for keyword, table, category, priority in entries:
+        if not keyword or (tables is not None and table not in tables):
+            continue
+        key = keyword.lower()
+        for start in range(len(text) - len(key) + 1):
+            if lowered[start:start + len(key)] == key:
+                hits.add(KeywordHit(keyword, start, start + len(key), table, category, priority))
+    return hits
+
+
+def test_overlapping_keywords_match_naive_reference():
+    entries = [
+        ("ab", "t", "x", 0), ("b", "t", "y", 1), ("abc", "u", "x", 0),
+        ("bca", "u", "y", 1), ("c", "t", "z", 2), ("aab", "u", "z", 2), ("", "t", "x", 3),
+    ]
+    matcher = KeywordMatcher(entries)
+    rng = random.Random(32)
+    for _ in range(500):
+        text = "".join(rng.choice("abcAB") for _ in range(rng.randint(0, 30)))
+        hits = matcher.find_all(text)
+        assert set(hits) == naive_find_all(entries, text)
+        assert len(hits) == len(set(hits))
+        assert [h.end for h in hits] == sorted(h.end for h in hits)
+        assert set(matcher.find_all(text, tables=("u",))) == naive_find_all(entries, text, tables={"u"})
+
+
+def test_contract_matcher_matches_naive_reference():
+    entries = _build_entries()
+    keywords = [keyword for keyword, _, _, _ in entries]
+    rng = random.Random(132)
+    for _ in range(100):
+        parts = []
+        for _ in range(rng.randint(1, 8)):
+            keyword = rng.choice(keywords)
+            # 키워드 일부만 넣어 부분 일치 실패도 섞음
+            parts.append(keyword if rng.random() < 0.7 else keyword[: rng.randint(1, len(keyword))])
+            parts.append(rng.choice(["", " ", "\n", "은 ", "를 "]))
+        text = "".join(parts)
+        assert set(CONTRACT_KEYWORD_MATCHER.find_all(text)) == naive_find_all(entries, text)
+
+
+def test_categories_groups_single_table():
+    grouped = CONTRACT_KEYWORD_MATCHER.categories("연장근로 수당과 임금, 연차 휴가", "category")
+    assert set(grouped) == {"working_hours", "wage", "vacation", "overtime"}
+    assert all(hit.table == "category" for hits in grouped.values() for hit in hits)
+
+
+def naive_wage_waiver(text):
+    """참조 구현: 패턴별로 따로 검색해서 가장 앞에서 시작하는 매칭 (같은 위치면 먼저 정의된 패턴)"""
+    found = []
+    for i, pattern in enumerate(WAGE_WAIVER_PATTERNS):
+        match = re.search(pattern, text, re.IGNORECASE)
+        if match:
+            found.append((match.start(), i))
+    return WAGE_WAIVER_PATTERNS[min(found)[1]] if found else None
+
+
+def test_wage_waiver_pattern_matches_naive_reference():
+    texts = [
+        "근로자는 포괄임금에 포함되므로 추가 연장 수당을 청구하지 않기로 한다.",
+        "연장·야간·휴일근로 수당은 별도로 청구하지 않는다.",
+        "제7조 법정 수당은 청구하지 않으며, 추가 수당을 청구하지 않기로 합의한다.",
+        "임금은 매월 25일에 지급한다.",
+        "",
+    ]
+    for text in texts:
+        assert find_wage_waiver_pattern(text) == naive_wage_waiver(text), text
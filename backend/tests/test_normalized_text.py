@@ -0,0 +1,78 @@
+"""
+NormalizedText (core/clause_extractor.py) 테스트
+공백 정규화 문자열에서 찾은 위치가 원문 정규식 검색(토큰 사이 공백 정규식)과 같은지 확인
+"""
+
+import random
+import re
+
+from core.clause_extractor import NormalizedText, normalize_whitespace
+
+
+def naive_find(text, needle, start=0):
+    """참조 구현: needle 토큰 사이를 \\s+로 바꾼 정규식으로 원문 직접 검색"""
+    tokens = normalize_whitespace(needle).split(" ")
+    if tokens == [""]:
+        return None
+    match = re.compile(r"\s+".join(re.escape(t) for t in tokens)).search(text, start)
+    return (match.start(), match.end()) if match else None
+
+
+def random_text(rng, length):
+    return "".join(rng.choice("가나a b\n\t  ") for _ in range(length))
+
+
+def test_normalized_string_and_offsets():
+    text = "  제1조 (목적)\n\n  이 계약은\t근로조건을   정한다.  "
+    nt = NormalizedText(text)
+    assert nt.normalized.strip() == normalize_whitespace(text)
+    assert len(nt.offsets) == len(nt.normalized)
+    for i, ch in enumerate(nt.normalized):
+        if ch == " ":
+            assert text[nt.offsets[i]].isspace()
+        else:
+            assert text[nt.offsets[i]] == ch
+    assert list(nt.offsets) == sorted(nt.offsets)
+
+
+def test_find_maps_back_to_original_span():
+    text = "제5조(수습기간)\n수습 기간은\n  3개월로 한다."
+    nt = NormalizedText(text)
+    start, end = nt.find("수습 기간은 3개월로")
+    assert text[start:end] == "수습 기간은\n  3개월로"
+    assert nt.find("존재하지 않는 문장") is None
+    assert nt.find("   ") is None
+
+
+def test_find_matches_naive_reference():
+    rng = random.Random(31)
+    for _ in range(500):
+        text = random_text(rng, rng.randint(0, 40))
+        nt = NormalizedText(text)
+        for _ in range(5):
+            if text.strip():
+                a = rng.randrange(len(text))
+                b = rng.randint(a, min(len(text), a + 8))
+                needle = text[a:b]
+            else:
+                needle = "가"
+            start = rng.randint(0, len(text))
+            assert nt.find(needle, start) == naive_find(text, needle, start), (text, needle, start)
+
+
+def test_locate_all_is_sequential_find():
+    rng = random.Random(131)
+    for _ in range(200):
+        text = random_text(rng, rng.randint(5, 60))
+        needles = []
+        for _ in range(rng.randint(1, 5)):
+            a = rng.randrange(len(text))
+            needles.append(text[a:a + rng.randint(1, 6)])
+        expected = []
+        cursor = 0
+        for needle in needles:
+            span = naive_find(text, needle, cursor)
+            expected.append(span)
+            if span:
+                cursor = span[1]
+        assert NormalizedText(text).locate_all(needles) == expected
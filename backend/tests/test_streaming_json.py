@@ -0,0 +1,123 @@
+"""
+StreamingJSONParser (core/streaming_json.py) 테스트
+임의 위치로 나눠 넣어도 json.loads와 같은 결과인지, 잘린 응답의 복구 결과가
+"잘린 위치 이전에 닫힌 필드/이슈만" 남기는 참조 구현과 같은지 확인
+"""
+
+import json
+import random
+
+from core.streaming_json import StreamingJSONParser
+
+PREFIX = "분석 결과입니다.\n```json\n"
+SUFFIX = "\n```\n추가 설명 {무시}"
+
+
+def build_response(members):
+    """
+    응답 텍스트 + 참조 위치
+
+    Returns:
+        (text, member_ends, item_ends)
+        - member_ends: [(key, value, 필드 종료 구분자(',' 또는 '}') 위치)]
+        - item_ends: [(issue, 닫는 '}' 위치)]
+    """
+    text = PREFIX + "{"
+    member_ends = []
+    item_ends = []
+    for idx, (key, value) in enumerate(members):
+        text += json.dumps(key, ensure_ascii=False) + ": "
+        if key == "issues":
+            text += "["
+            for j, item in enumerate(value):
+                text += json.dumps(item, ensure_ascii=False)
+                item_ends.append((item, len(text) - 1))
+                if j < len(value) - 1:
+                    text += ", "
+            text += "]"
+        else:
+            text += json.dumps(value, ensure_ascii=False)
+        member_ends.append((key, value, len(text)))
+        text += "," if idx < len(members) - 1 else "}"
+    return text + SUFFIX, member_ends, item_ends
+
+
+def random_members(rng):
+    tricky = ['괄호 {x} [y] 포함', '따옴표 "인용" 과 \\ 역슬래시', "줄바꿈\n탭\t", "", "a,b:c"]
+    issues = [
+        {
+            "name": rng.choice(tricky),
+            "severity": rng.choice(["low", "medium", "high"]),
+            "legal_basis": [{"title": rng.choice(tricky)}] if rng.random() < 0.5 else [],
+            "nested": {"clause": [1, {"deep": rng.choice(tricky)}]},
+        }
+        for _ in range(rng.randint(0, 4))
+    ]
+    members = [
+        ("risk_score", rng.randint(0, 100)),
+        ("summary", rng.choice(tricky)),
+        ("issues", issues),
+        ("recommendations", [{"title": rng.choice(tricky)}]),
+        ("flag", rng.choice([True, False, None])),
+    ]
+    rng.shuffle(members)
+    return members
+
+
+def feed_in_pieces(parser, text, rng):
+    emitted = []
+    pos = 0
+    while pos < len(text):
+        step = rng.randint(1, 12)
+        emitted.extend(parser.feed(text[pos:pos + step]))
+        pos += step
+    return emitted
+
+
+def naive_recover(member_ends, item_ends, cut):
+    """참조 구현: 잘린 위치(cut) 이전에 구분자까지 들어온 필드 + 닫힌 이슈"""
+    if cut <= len(PREFIX):
+        return None
+    recovered = {key: value for key, value, end in member_ends if end < cut}
+    items = [item for item, end in item_ends if end < cut]
+    if items or "issues" not in recovered:
+        recovered["issues"] = items
+    if not recovered.get("issues") and len(recovered) <= 1:
+        return None
+    return recovered
+
+
+def test_complete_response_matches_json_loads():
+    rng = random.Random(43)
+    for _ in range(200):
+        members = random_members(rng)
+        text, _, _ = build_response(members)
+        parser = StreamingJSONParser(stream_key="issues")
+        emitted = feed_in_pieces(parser, text, rng)
+        expected = dict(members)
+        assert parser.done
+        assert parser.result() == expected
+        assert emitted == expected["issues"]
+        assert parser.items == expected["issues"]
+        assert parser.members == expected
+
+
+def test_truncated_response_recovers_closed_parts():
+    rng = random.Random(143)
+    for _ in range(30):
+        members = random_members(rng)
+        text, member_ends, item_ends = build_response(members)
+        end_of_object = len(text) - len(SUFFIX)
+        for cut in range(0, end_of_object):
+            parser = StreamingJSONParser(stream_key="issues")
+            emitted = feed_in_pieces(parser, text[:cut], rng)
+            assert parser.result() is None
+            assert emitted == [item for item, end in item_ends if end < cut]
+            assert parser.recover() == naive_recover(member_ends, item_ends, cut), (text, cut)
+
+
+def test_feed_after_done_is_ignored():
+    parser = StreamingJSONParser()
+    parser.feed('{"issues": [{"a": 1}]} 꼬리 {"issues": [{"b": 2}]}')
+    assert parser.feed('{"issues": [{"c": 3}]}') == []
+    assert parser.result() == {"issues": [{"a": 1}]}
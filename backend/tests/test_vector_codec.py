@@ -0,0 +1,64 @@
+"""
+vector_codec (core/vector_codec.py) 테스트
+base64 인코딩이 struct로 직접 만든 big-endian 바이트와 같은지, PostgREST 문자열 파싱이 json.loads와 같은지 확인
+"""
+
+import base64
+import json
+import struct
+
+import numpy as np
+import pytest
+
+from core.vector_codec import decode_vector, encode_vector, is_missing_rpc_error, parse_vector
+
+
+def naive_encode(vector, fmt):
+    """참조 구현: 원소별 struct.pack (big-endian)"""
+    return base64.b64encode(b"".join(struct.pack(fmt, float(x)) for x in vector)).decode("ascii")
+
+
+@pytest.mark.parametrize("dim", [0, 1, 7, 1024])
+def test_float32_roundtrip_matches_struct(dim):
+    rng = np.random.default_rng(dim)
+    vector = rng.standard_normal(dim).astype(np.float32)
+    encoded = encode_vector(vector.tolist(), "float32")
+    assert encoded == naive_encode(vector, ">f")
+    decoded = decode_vector(encoded, "float32")
+    assert decoded.dtype == np.float32
+    np.testing.assert_array_equal(decoded, vector)
+
+
+def test_float16_roundtrip_matches_struct():
+    rng = np.random.default_rng(16)
+    vector = rng.uniform(-1, 1, 1024)
+    encoded = encode_vector(vector, "float16")
+    assert encoded == naive_encode(vector.astype(np.float16), ">e")
+    decoded = decode_vector(encoded, "float16")
+    assert decoded.dtype == np.float32
+    np.testing.assert_array_equal(decoded, vector.astype(np.float16).astype(np.float32))
+
+
+def test_parse_vector_matches_json_loads():
+    rng = np.random.default_rng(47)
+    vector = rng.standard_normal(64).astype(np.float32)
+    text = json.dumps([float(x) for x in vector], separators=(",", ":"))
+    expected = np.asarray(json.loads(text), dtype=np.float32)
+    np.testing.assert_array_equal(parse_vector(text), expected)
+    np.testing.assert_array_equal(parse_vector(" " + text.replace(",", ", ") + " "), expected)
+    np.testing.assert_array_equal(parse_vector(vector.tolist()), vector)
+    assert parse_vector("[1e-3,-2.5E+2]").tolist() == pytest.approx([1e-3, -250.0])
+
+
+@pytest.mark.parametrize("value", [None, "", [], ()])
+def test_parse_vector_empty(value):
+    assert parse_vector(value) is None
+
+
+def test_is_missing_rpc_error():
+    name = "match_legal_chunks_b64"
+    assert is_missing_rpc_error(Exception("{'code': 'PGRST202', 'message': 'Could not find the function'}"), name)
+    assert is_missing_rpc_error(Exception("42883: function decode_vector_b64(text) does not exist"), name)
+    assert is_missing_rpc_error(Exception(f"function public.{name}(text) does not exist"), name)
+    assert not is_missing_rpc_error(Exception("canceling statement due to statement timeout"), name)
+    assert not is_missing_rpc_error(Exception("relation legal_chunks does not exist"), name)
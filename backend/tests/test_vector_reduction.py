@@ -0,0 +1,87 @@
+"""
+vector_reduction (core/vector_reduction.py) 테스트
+2단계 top-k가 마스크/후보 수를 지키며 단순 정렬 기반 참조 구현과 같은 결과를 내는지,
+binary 점수가 비트 단위 해밍 거리와 같은지 확인
+"""
+
+import numpy as np
+import pytest
+
+from core.vector_reduction import VectorReducer, two_stage_top_k
+
+
+def make_corpus(seed, n=300, d=48):
+    rng = np.random.default_rng(seed)
+    matrix = rng.standard_normal((n, d)).astype(np.float32)
+    matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+    query = rng.standard_normal(d).astype(np.float32)
+    query /= np.linalg.norm(query)
+    return rng, matrix, query
+
+
+def naive_two_stage(matrix, reducer, query, top_k, candidates, mask):
+    """참조 구현: 마스크 행마다 1차 점수 → 정렬 후 상위 candidates개 → 정확 점수 정렬 후 상위 top_k"""
+    pool = [i for i in range(matrix.shape[0]) if mask is None or mask[i]]
+    query_reduced = reducer.transform(query[None, :])[0]
+    first = {i: float(reducer.scores(reducer.transform(matrix[i:i + 1]), query_reduced)[0]) for i in pool}
+    chosen = sorted(pool, key=lambda i: -first[i])[:max(candidates, top_k)]
+    exact = {i: float(matrix[i] @ query) for i in chosen}
+    return sorted(chosen, key=lambda i: -exact[i])[:top_k]
+
+
+@pytest.mark.parametrize("kind", ["pca", "binary"])
+@pytest.mark.parametrize("seed", range(5))
+def test_two_stage_matches_naive_reference(kind, seed):
+    rng, matrix, query = make_corpus(seed)
+    reducer = VectorReducer.fit(kind, matrix, dims=16)
+    reduced = reducer.transform(matrix)
+    for mask in (None, rng.random(matrix.shape[0]) < 0.3, np.zeros(matrix.shape[0], dtype=bool)):
+        for top_k, candidates in ((5, 40), (10, 10), (3, 1000), (50, 20)):
+            rows, scores = two_stage_top_k(matrix, reducer, reduced, query, top_k, candidates, mask=mask)
+            expected = naive_two_stage(matrix, reducer, query, top_k, candidates, mask)
+            if kind == "binary":
+                # 해밍 거리는 동점이 많아 1차 후보 경계가 구현마다 다를 수 있으므로 후보를 전체로 넓혀 비교
+                if candidates < matrix.shape[0]:
+                    continue
+            assert rows.tolist() == expected
+            np.testing.assert_allclose(scores, matrix[rows] @ query, rtol=1e-6)
+            if mask is not None:
+                assert mask[rows].all()
+
+
+def test_two_stage_with_all_candidates_is_exact_top_k():
+    rng, matrix, query = make_corpus(48)
+    mask = rng.random(matrix.shape[0]) < 0.5
+    for kind in ("pca", "binary"):
+        reducer = VectorReducer.fit(kind, matrix, dims=8)
+        rows, scores = two_stage_top_k(
+            matrix, reducer, reducer.transform(matrix), query, top_k=7, candidates=matrix.shape[0], mask=mask
+        )
+        pool = np.flatnonzero(mask)
+        expected = pool[np.argsort(-(matrix[pool] @ query))[:7]]
+        assert rows.tolist() == expected.tolist()
+        assert list(scores) == sorted(scores, reverse=True)
+
+
+def test_two_stage_empty_cases():
+    _, matrix, query = make_corpus(1, n=10)
+    reducer = VectorReducer.fit("pca", matrix, dims=4)
+    reduced = reducer.transform(matrix)
+    rows, scores = two_stage_top_k(matrix, reducer, reduced, query, 0, 5)
+    assert rows.size == 0 and scores.size == 0
+    mask = np.zeros(10, dtype=bool)
+    mask[3] = True
+    rows, _ = two_stage_top_k(matrix, reducer, reduced, query, 5, 1, mask=mask)
+    assert rows.tolist() == [3]
+
+
+@pytest.mark.parametrize("d", [16, 24, 40])
+def test_binary_scores_are_negative_hamming_distance(d):
+    rng, matrix, query = make_corpus(d, n=50, d=d)
+    reducer = VectorReducer.fit("binary", matrix)
+    reduced = reducer.transform(matrix)
+    query_reduced = reducer.transform(query[None, :])[0]
+    bits = (matrix - reducer.mean) > 0
+    query_bits = (query - reducer.mean) > 0
+    expected = -np.array([int(np.sum(row != query_bits)) for row in bits])
+    np.testing.assert_array_equal(reducer.scores(reduced, query_reduced), expected)